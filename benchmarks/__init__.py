@@ -0,0 +1,23 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark suite for ascii-guard's hot paths.
+
+Run from the repository root:
+
+    python -m benchmarks run --output results.json
+    python -m benchmarks compare benchmarks/baseline.json results.json
+
+ZERO dependencies - uses only Python stdlib (timeit + json).
+"""
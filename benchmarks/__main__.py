@@ -0,0 +1,234 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Command line for the benchmark suite: python -m benchmarks {run,compare,list,corpus}.
+
+ZERO dependencies - uses only Python stdlib (argparse).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from ascii_guard.memstats import format_bytes
+from benchmarks.corpus import SHAPES, write_corpus
+from benchmarks.harness import (
+    BENCHMARKS,
+    DEFAULT_MIN_TIME,
+    DEFAULT_REPEAT,
+    DEFAULT_TOLERANCE,
+    DEFAULT_WARMUP,
+    Comparison,
+    Measurement,
+    compare_results,
+    load_results,
+    run_benchmarks,
+    write_results,
+)
+
+DEFAULT_OUTPUT = "benchmark-results.json"
+
+
+def format_seconds(seconds: float) -> str:
+    """Format seconds per call with a readable unit."""
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f} ms"
+    return f"{seconds * 1e6:.1f} µs"
+
+
+def print_measurement(name: str, measurement: Measurement) -> None:
+    """Print one benchmark as it finishes."""
+    spread = measurement.stdev / measurement.median * 100 if measurement.median else 0.0
+    memory = measurement.memory
+    peak = f"  peak {format_bytes(memory.peak):>10}" if memory is not None else ""
+    print(
+        f"  {name:<16} {format_seconds(measurement.best):>12}  ±{spread:4.1f}%"
+        f"  ({measurement.number} calls x {len(measurement.times)}){peak}",
+        flush=True,
+    )
+
+
+def print_comparison(comparison: Comparison) -> None:
+    """Print one line of a comparison."""
+    ratio = comparison.ratio
+    change = f"{(ratio - 1) * 100:+7.1f}%" if ratio is not None else "      -"
+    marker = {"regression": "✗", "improvement": "✓"}.get(comparison.status, " ")
+    print(f"{marker} {comparison.name:<16} {change}  {comparison.status}")
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    """Run the benchmarks and write a results file."""
+    print("Benchmarks (best per call):")
+    try:
+        results = run_benchmarks(
+            args.benchmark or None,
+            warmup=args.warmup,
+            repeat=args.repeat,
+            min_time=args.min_time,
+            progress=print_measurement,
+            memory=args.memory,
+        )
+    except ValueError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 2
+
+    write_results(results, Path(args.output))
+    print(f"ℹ Results written to {args.output}")
+    return 0
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    """Compare a results file against a baseline; exit 1 on regressions."""
+    try:
+        baseline = load_results(Path(args.baseline))
+        current = load_results(Path(args.results))
+    except (OSError, ValueError) as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 2
+
+    normalize = not args.absolute
+    comparisons = compare_results(baseline, current, args.tolerance, normalize, args.memory)
+    unit = "peak memory" if args.memory else "calibrated" if normalize else "seconds"
+    print(f"Change against {args.baseline} ({unit}, tolerance {args.tolerance:.0%}):")
+    for comparison in comparisons:
+        print_comparison(comparison)
+
+    regressions = [c.name for c in comparisons if c.status == "regression"]
+    if regressions:
+        print(f"\n✗ {len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    print("\n✓ No regressions")
+    return 0
+
+
+def cmd_list(args: argparse.Namespace) -> int:
+    """List the benchmarks."""
+    for benchmark in BENCHMARKS:
+        print(f"{benchmark.name:<16} {benchmark.description}")
+    return 0
+
+
+def cmd_corpus(args: argparse.Namespace) -> int:
+    """Write a generated corpus."""
+    shapes = args.shape or SHAPES
+    try:
+        paths = write_corpus(
+            Path(args.directory), args.files, args.diagrams, shapes, args.seed, args.broken
+        )
+    except ValueError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 2
+
+    size = sum(path.stat().st_size for path in paths)
+    print(f"ℹ Wrote {len(paths)} file(s), {size / (1024 * 1024):.1f} MB, to {args.directory}")
+    return 0
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Benchmark ascii-guard's hot paths"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run benchmarks and write a results file")
+    run_parser.add_argument(
+        "benchmark", nargs="*", help="Benchmarks to run (default: all; see 'list')"
+    )
+    run_parser.add_argument(
+        "-o", "--output", default=DEFAULT_OUTPUT, help=f"Results file (default: {DEFAULT_OUTPUT})"
+    )
+    run_parser.add_argument(
+        "--warmup",
+        type=int,
+        default=DEFAULT_WARMUP,
+        help=f"Untimed repetitions per benchmark (default: {DEFAULT_WARMUP})",
+    )
+    run_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help=f"Timed repetitions per benchmark (default: {DEFAULT_REPEAT})",
+    )
+    run_parser.add_argument(
+        "--min-time",
+        type=float,
+        default=DEFAULT_MIN_TIME,
+        help=f"Minimum seconds per repetition (default: {DEFAULT_MIN_TIME})",
+    )
+    run_parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Also record each benchmark's peak and retained memory (tracemalloc)",
+    )
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="Compare results against a baseline; exit 1 on regressions"
+    )
+    compare_parser.add_argument("baseline", help="Baseline results file")
+    compare_parser.add_argument("results", help="Results file to check")
+    compare_parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=f"Allowed relative slowdown (default: {DEFAULT_TOLERANCE})",
+    )
+    compare_parser.add_argument(
+        "--absolute",
+        action="store_true",
+        help="Compare seconds instead of times relative to each run's calibration",
+    )
+    compare_parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Compare peak memory instead of time (needs results from 'run --memory')",
+    )
+
+    subparsers.add_parser("list", help="List the benchmarks")
+
+    corpus_parser = subparsers.add_parser(
+        "corpus", help="Write a generated corpus for stress and scaling tests"
+    )
+    corpus_parser.add_argument("directory", help="Directory to write to")
+    corpus_parser.add_argument("--files", type=int, default=10, help="Files (default: 10)")
+    corpus_parser.add_argument(
+        "--diagrams", type=int, default=100, help="Diagrams per file (default: 100)"
+    )
+    corpus_parser.add_argument(
+        "--shape",
+        action="append",
+        choices=SHAPES,
+        help="Shape to generate (repeatable; default: all)",
+    )
+    corpus_parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    corpus_parser.add_argument(
+        "--broken",
+        type=float,
+        default=0.0,
+        help="Fraction of diagrams to break, 0.0 to 1.0 (default: 0.0)",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark command line."""
+    args = create_parser().parse_args(argv)
+    commands = {"run": cmd_run, "compare": cmd_compare, "list": cmd_list, "corpus": cmd_corpus}
+    return commands[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
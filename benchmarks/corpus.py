@@ -0,0 +1,330 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Synthetic corpus generator for stress and scaling tests.
+
+Generates markdown documents shaped like real documentation: many boxes,
+nested boxes, side-by-side diagrams, tables with ┬/┼/┴ junctions, boxes in
+code fences and ignore regions, and long lines, separated by prose. Output
+is deterministic for a given seed (and Python version).
+
+Diagrams are valid unless broken: a broken diagram has one defect in its
+outermost box, either a bottom border or a right border on one content row
+that is one column short. Each generated document reports how many boxes the
+detector should find and how many broken diagrams lint should report, so
+tests can check results at any size.
+
+ZERO dependencies - uses only Python stdlib (random).
+"""
+
+import random
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+# Box styles: top-left, top-right, bottom-left, bottom-right, horizontal, vertical
+LIGHT = ("┌", "┐", "└", "┘", "─", "│")
+HEAVY = ("┏", "┓", "┗", "┛", "━", "┃")
+DOUBLE = ("╔", "╗", "╚", "╝", "═", "║")
+STYLES = (LIGHT, HEAVY, DOUBLE)
+
+# Unicode box drawing block
+BOX_DRAWING_FIRST = "\u2500"
+BOX_DRAWING_LAST = "\u257f"
+
+# Vocabulary of prose and box content
+WORDS = [
+    "service",
+    "api",
+    "request",
+    "queue",
+    "worker",
+    "cache",
+    "index",
+    "storage",
+    "config",
+    "parser",
+    "pipeline",
+    "event",
+    "handler",
+    "client",
+    "server",
+    "module",
+    "router",
+    "table",
+    "schema",
+    "token",
+    "session",
+    "backend",
+    "frontend",
+    "metrics",
+    "health",
+    "deploy",
+    "build",
+    "release",
+]
+
+# Shapes in the order they are generated; documents cycle through them
+SHAPES = ("boxes", "nested", "side_by_side", "table", "fenced", "ignored", "long_lines")
+
+# Files per directory written by write_corpus
+FILES_PER_DIRECTORY = 100
+
+Style = tuple[str, str, str, str, str, str]
+
+
+@dataclass(frozen=True)
+class Diagram:
+    """One generated diagram.
+
+    Attributes:
+        lines: Lines of the diagram, without newlines
+        boxes: Boxes the detector finds in it
+        broken: Whether lint reports it as broken
+    """
+
+    lines: list[str]
+    boxes: int
+    broken: bool = False
+
+
+@dataclass(frozen=True)
+class Document:
+    """A generated document.
+
+    Attributes:
+        text: Document content
+        diagrams: Number of diagrams
+        boxes: Boxes the detector finds in the document
+        broken: Broken diagrams lint reports (broken diagrams in ignore
+            regions are not counted)
+    """
+
+    text: str
+    diagrams: int
+    boxes: int
+    broken: int
+
+
+def phrase(rng: random.Random, words: int) -> str:
+    """Return a few random words."""
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def draw_box(width: int, rows: Sequence[str], style: Style = LIGHT) -> list[str]:
+    """Draw a box around rows, padded to an inner width of width + 2."""
+    top_left, top_right, bottom_left, bottom_right, horizontal, vertical = style
+    border = horizontal * (width + 2)
+    return [
+        top_left + border + top_right,
+        *(f"{vertical} {row:<{width}} {vertical}" for row in rows),
+        bottom_left + border + bottom_right,
+    ]
+
+
+def break_box(lines: list[str], rng: random.Random, broken: bool = True) -> list[str]:
+    """Add one defect to the box ending at the right end of lines, if broken.
+
+    Either the bottom border or the right border of a content row is moved
+    one column to the left. Only rows that end in text and padding are
+    used, so the moved border never touches the border of a nested box,
+    which would make the defect ambiguous.
+
+    The same random numbers are drawn whether or not the box is broken, so
+    a broken document differs from the valid one with the same seed only by
+    its defects.
+    """
+    on_row, pick = rng.random() < 0.5, rng.random()
+    if not broken:
+        return lines
+    lines = list(lines)
+    rows = [
+        i
+        for i, line in enumerate(lines[1:-1], start=1)
+        if line[-2] == " " and not BOX_DRAWING_FIRST <= line[-3] <= BOX_DRAWING_LAST
+    ]
+    row = rows[int(pick * len(rows))] if rows and on_row else len(lines) - 1
+    lines[row] = lines[row][:-2] + lines[row][-1]
+    return lines
+
+
+def _text_rows(rng: random.Random, count: int, width: int) -> list[str]:
+    """Return rows of random words that fit width."""
+    return [phrase(rng, rng.randint(1, 4))[:width] for _ in range(count)]
+
+
+def simple_box(rng: random.Random, broken: bool) -> Diagram:
+    """Generate a single box in a random style."""
+    width = rng.randint(12, 40)
+    lines = draw_box(width, _text_rows(rng, rng.randint(1, 6), width), rng.choice(STYLES))
+    return Diagram(break_box(lines, rng, broken), 1, broken)
+
+
+def nested_boxes(rng: random.Random, broken: bool) -> Diagram:
+    """Generate two to four boxes nested inside each other."""
+    depth = rng.randint(2, 4)
+    width = rng.randint(12, 30)
+    lines = draw_box(width, _text_rows(rng, rng.randint(1, 3), width))
+    for _ in range(depth - 1):
+        rows = [*_text_rows(rng, 1, len(lines[0])), *lines]
+        lines = draw_box(len(lines[0]), rows)
+    return Diagram(break_box(lines, rng, broken), depth, broken)
+
+
+def side_by_side(rng: random.Random, broken: bool) -> Diagram:
+    """Generate two to four boxes of equal height next to each other."""
+    count = rng.randint(2, 4)
+    height = rng.randint(1, 4)
+    columns = []
+    for _ in range(count):
+        width = rng.randint(8, 20)
+        columns.append(draw_box(width, _text_rows(rng, height, width)))
+    gap = " " * rng.randint(2, 6)
+    lines = [gap.join(parts) for parts in zip(*columns, strict=True)]
+    return Diagram(break_box(lines, rng, broken), count, broken)
+
+
+def table(rng: random.Random, broken: bool) -> Diagram:
+    """Generate a table with ┬/┼/┴ junctions and row separators."""
+    widths = [rng.randint(6, 24) for _ in range(rng.randint(3, 8))]
+
+    def border(left: str, junction: str, right: str) -> str:
+        return left + junction.join("─" * (width + 2) for width in widths) + right
+
+    def row() -> str:
+        return "│" + "│".join(f" {phrase(rng, 1)[:w]:<{w}} " for w in widths) + "│"
+
+    lines = [border("┌", "┬", "┐"), row(), border("├", "┼", "┤")]
+    for _ in range(rng.randint(2, 10)):
+        lines.append(row())
+    lines.append(border("└", "┴", "┘"))
+    return Diagram(break_box(lines, rng, broken), 1, broken)
+
+
+def fenced_box(rng: random.Random, broken: bool) -> Diagram:
+    """Generate a box inside a code fence (detected unless code blocks are excluded)."""
+    diagram = simple_box(rng, broken)
+    return Diagram(["```text", *diagram.lines, "```"], diagram.boxes, broken)
+
+
+def ignored_box(rng: random.Random, broken: bool) -> Diagram:
+    """Generate a box in an ignore region, which is neither detected nor reported."""
+    diagram = simple_box(rng, broken)
+    if rng.random() < 0.5:
+        lines = ["<!-- ascii-guard-ignore-next -->", *diagram.lines]
+    else:
+        lines = ["<!-- ascii-guard-ignore -->", *diagram.lines, "<!-- ascii-guard-ignore-end -->"]
+    return Diagram(lines, 0, False)
+
+
+def long_lines(rng: random.Random, broken: bool) -> Diagram:
+    """Generate a very wide box after a very long prose line."""
+    width = rng.randint(150, 400)
+    rows = [phrase(rng, width // 6)[:width] for _ in range(rng.randint(1, 4))]
+    lines = draw_box(width, rows)
+    prose = phrase(rng, rng.randint(100, 400))
+    return Diagram([prose, "", *break_box(lines, rng, broken)], 1, broken)
+
+
+GENERATORS: dict[str, Callable[[random.Random, bool], Diagram]] = {
+    "boxes": simple_box,
+    "nested": nested_boxes,
+    "side_by_side": side_by_side,
+    "table": table,
+    "fenced": fenced_box,
+    "ignored": ignored_box,
+    "long_lines": long_lines,
+}
+
+
+def generate_document(
+    diagrams: int = 100,
+    shapes: Sequence[str] = SHAPES,
+    seed: int | str = 0,
+    broken: float = 0.0,
+) -> Document:
+    """Generate a markdown document.
+
+    Shapes are used in turn, so their proportions are the same at any size.
+
+    Args:
+        diagrams: Number of diagrams
+        shapes: Shapes to cycle through (see SHAPES)
+        seed: Random seed
+        broken: Fraction of diagrams to break (0.0 = valid, 1.0 = all)
+
+    Returns:
+        The document with its expected box and broken diagram counts
+
+    Raises:
+        ValueError: If a shape is unknown or no shapes are given
+    """
+    unknown = set(shapes) - set(GENERATORS)
+    if unknown or not shapes:
+        raise ValueError(f"Unknown shape(s): {', '.join(sorted(unknown)) or '(none given)'}")
+
+    rng = random.Random(seed)
+    lines = [f"# Generated document {seed}", ""]
+    boxes = broken_count = 0
+    for index in range(diagrams):
+        if index % 10 == 0:
+            lines.extend([f"## Section {index // 10 + 1}", ""])
+        lines.extend([phrase(rng, rng.randint(5, 20)).capitalize() + ".", ""])
+
+        diagram = GENERATORS[shapes[index % len(shapes)]](rng, rng.random() < broken)
+        indent = " " * rng.choice((0, 0, 0, 2, 4))
+        lines.extend(indent + line if line else line for line in diagram.lines)
+        lines.append("")
+        boxes += diagram.boxes
+        broken_count += diagram.broken
+
+    return Document("\n".join(lines) + "\n", diagrams, boxes, broken_count)
+
+
+def write_corpus(
+    root: Path,
+    files: int = 10,
+    diagrams: int = 100,
+    shapes: Sequence[str] = SHAPES,
+    seed: int = 0,
+    broken: float = 0.0,
+) -> list[Path]:
+    """Write a corpus of generated documents.
+
+    Files are spread over directories of FILES_PER_DIRECTORY files, and each
+    file has its own seed derived from seed, so files differ.
+
+    Args:
+        root: Directory to write to (created if missing)
+        files: Number of files
+        diagrams: Diagrams per file
+        shapes: Shapes to cycle through (see SHAPES)
+        seed: Random seed of the corpus
+        broken: Fraction of diagrams to break
+
+    Returns:
+        Paths of the written files, in order
+
+    Raises:
+        ValueError: If a shape is unknown
+    """
+    paths = []
+    for index in range(files):
+        document = generate_document(diagrams, shapes, f"{seed}-{index}", broken)
+        directory = root / f"part-{index // FILES_PER_DIRECTORY:03d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"doc-{index:05d}.md"
+        path.write_text(document.text, encoding="utf-8")
+        paths.append(path)
+    return paths
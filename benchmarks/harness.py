@@ -0,0 +1,544 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark definitions, timing and comparison.
+
+Each benchmark times one operation on a fixed corpus built from the test
+fixtures, so runs are comparable across commits. Times are per call: every
+repetition runs the operation often enough to last at least min_time, with
+garbage collection disabled (as timeit does). Comparisons use the fastest
+repetition, which is the least disturbed by other load on the machine.
+
+Every run also times a calibration loop of plain Python work. Comparisons
+divide by it, so a baseline recorded on one machine can be checked against
+results from a faster or slower one.
+
+With memory measurement, each benchmark is also run under tracemalloc,
+recording its peak and retained memory and the source lines of the core
+modules holding the most at the end of the call. Memory use does not depend
+on the machine's speed, so peaks are compared as they are.
+
+ZERO dependencies - uses only Python stdlib (timeit + tracemalloc + json).
+"""
+
+import datetime
+import gc
+import json
+import platform
+import statistics
+import tempfile
+import timeit
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ascii_guard import __version__
+from ascii_guard.config import Config
+from ascii_guard.detector import detect_boxes, detect_boxes_in_lines, split_lines
+from ascii_guard.fixer import fix_box
+from ascii_guard.linter import fix_file, lint_file
+from ascii_guard.memstats import LineMemory, MemoryTracker
+from ascii_guard.patterns import match_path
+from ascii_guard.scanner import scan_directory
+from ascii_guard.validator import validate_box
+from benchmarks.corpus import generate_document
+
+FIXTURES_DIR = Path(__file__).parent.parent / "tests" / "fixtures"
+
+# Format of the results file; bump when its layout changes
+RESULTS_VERSION = 1
+
+DEFAULT_WARMUP = 1
+DEFAULT_REPEAT = 7
+DEFAULT_MIN_TIME = 0.1
+
+# Allowed slowdown before a benchmark counts as a regression (0.25 = 25%)
+DEFAULT_TOLERANCE = 0.25
+
+# Shape of the directory tree scanned by scan_directory
+TREE_DIRECTORIES = 20
+TREE_FILES = 25
+
+# Diagrams in the generated document, every shape of benchmarks.corpus
+MIXED_DIAGRAMS = 200
+MIXED_SEED = 42
+
+
+@dataclass
+class Corpus:
+    """Fixed inputs shared by all benchmarks of a run.
+
+    Attributes:
+        broken_lines: Lines of a document with 100 boxes, each with its
+            bottom border one column short
+        broken_file: broken_lines written to disk
+        mixed_file: Generated document with diagrams of every shape, half
+            of them broken
+        tree: Directory tree of fixture files, with excluded directories
+        paths: Every path in the tree, for match_path
+        config: Default configuration
+    """
+
+    broken_lines: list[str]
+    broken_file: Path
+    mixed_file: Path
+    tree: Path
+    paths: list[Path]
+    config: Config = field(default_factory=Config)
+
+
+def break_boxes(text: str) -> str:
+    """Shorten every bottom border by one column, so each box needs a fix."""
+    return "".join(
+        line.replace("─┘", "┘", 1) if line.startswith("└") else line
+        for line in text.splitlines(keepends=True)
+    )
+
+
+def build_corpus(root: Path) -> Corpus:
+    """Write the benchmark corpus below root.
+
+    Args:
+        root: Empty directory to write files to
+
+    Returns:
+        Corpus describing the written files
+    """
+    text = (FIXTURES_DIR / "benchmark_test.md").read_text(encoding="utf-8")
+    broken = break_boxes(text)
+    broken_file = root / "broken.md"
+    broken_file.write_text(broken, encoding="utf-8")
+    mixed_file = root / "mixed.md"
+    mixed = generate_document(MIXED_DIAGRAMS, seed=MIXED_SEED, broken=0.5)
+    mixed_file.write_text(mixed.text, encoding="utf-8")
+
+    fixtures = sorted(path for path in FIXTURES_DIR.iterdir() if path.is_file())
+    tree = root / "tree"
+    for d in range(TREE_DIRECTORIES):
+        directory = tree / f"section-{d:02d}" / "pages"
+        directory.mkdir(parents=True)
+        for f in range(TREE_FILES):
+            fixture = fixtures[(d + f) % len(fixtures)]
+            target = directory / f"page-{f:02d}{fixture.suffix}"
+            target.write_bytes(fixture.read_bytes())
+    for excluded in ("node_modules/pkg", ".git/objects", "build"):
+        directory = tree / excluded
+        directory.mkdir(parents=True)
+        for f in range(TREE_FILES):
+            (directory / f"file-{f:02d}.md").write_text(text, encoding="utf-8")
+
+    return Corpus(
+        broken_lines=split_lines(broken),
+        broken_file=broken_file,
+        mixed_file=mixed_file,
+        tree=tree,
+        paths=sorted(tree.rglob("*")),
+    )
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """One timed operation.
+
+    Attributes:
+        name: Unique name, used as key in the results file
+        description: What one call does
+        prepare: Builds the operation to time from the corpus; work done
+            here (e.g. detecting the boxes to validate) is not timed
+    """
+
+    name: str
+    description: str
+    prepare: Callable[[Corpus], Callable[[], object]]
+
+
+def _validate_all(corpus: Corpus) -> Callable[[], object]:
+    """Return an operation validating every broken box."""
+    boxes = detect_boxes_in_lines(corpus.broken_lines)
+    return lambda: [validate_box(box) for box in boxes]
+
+
+def _fix_all(corpus: Corpus) -> Callable[[], object]:
+    """Return an operation fixing every broken box."""
+    boxes = detect_boxes_in_lines(corpus.broken_lines)
+    return lambda: [fix_box(box) for box in boxes]
+
+
+def _match_all(corpus: Corpus) -> Callable[[], object]:
+    """Return an operation matching every tree path against the default excludes."""
+    patterns = corpus.config.exclude
+    return lambda: [match_path(path, patterns, corpus.tree) for path in corpus.paths]
+
+
+BENCHMARKS = (
+    Benchmark(
+        "detect_boxes",
+        "Read a file and detect its 100 boxes",
+        lambda corpus: lambda: detect_boxes(corpus.broken_file),
+    ),
+    Benchmark("validate_box", "Validate 100 broken boxes", _validate_all),
+    Benchmark("fix_box", "Fix 100 broken boxes", _fix_all),
+    Benchmark(
+        "lint_file",
+        "Lint a file with 100 broken boxes",
+        lambda corpus: lambda: lint_file(corpus.broken_file),
+    ),
+    Benchmark(
+        "fix_file",
+        "Fix a file with 100 broken boxes (dry run)",
+        lambda corpus: lambda: fix_file(corpus.broken_file, dry_run=True),
+    ),
+    Benchmark(
+        "lint_mixed",
+        f"Lint a generated file with {MIXED_DIAGRAMS} diagrams of all shapes, half broken",
+        lambda corpus: lambda: lint_file(corpus.mixed_file),
+    ),
+    Benchmark(
+        "fix_mixed",
+        f"Fix a generated file with {MIXED_DIAGRAMS} diagrams of all shapes (dry run)",
+        lambda corpus: lambda: fix_file(corpus.mixed_file, dry_run=True),
+    ),
+    Benchmark(
+        "match_path",
+        "Match every path of the scan_directory tree against the default excludes",
+        _match_all,
+    ),
+    Benchmark(
+        "scan_directory",
+        f"Scan a tree of {TREE_DIRECTORIES * TREE_FILES} files plus excluded directories",
+        lambda corpus: lambda: scan_directory(corpus.tree, corpus.config),
+    ),
+)
+
+
+def calibration_work() -> int:
+    """Plain Python work resembling the linter's: string slicing and searching."""
+    total = 0
+    for i in range(2000):
+        line = f"│ cell {i:<8} │ value │"
+        total += line.find("│", 1) + line.count("─") + len(line[2:-2].split())
+    return total
+
+
+@dataclass
+class MemoryUse:
+    """Memory used by one call of a benchmark.
+
+    Attributes:
+        peak: Highest memory allocated during the call, in bytes
+        retained: Bytes still allocated after the call and its result are
+            gone (e.g. kept in caches)
+        lines: Source lines of the core modules holding the most memory
+            when the call returned, its result included
+    """
+
+    peak: int
+    retained: int
+    lines: list[LineMemory] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the memory use as JSON-serializable data."""
+        return {
+            "peak": self.peak,
+            "retained": self.retained,
+            "lines": [line.to_dict() for line in self.lines],
+        }
+
+
+@dataclass
+class Measurement:
+    """Timings of one benchmark.
+
+    Attributes:
+        number: Calls per repetition
+        times: Seconds per call, one entry per repetition
+        memory: Memory use of one call, if measured
+    """
+
+    number: int
+    times: list[float]
+    memory: MemoryUse | None = None
+
+    @property
+    def best(self) -> float:
+        """Return the fastest repetition, in seconds per call."""
+        return min(self.times)
+
+    @property
+    def median(self) -> float:
+        """Return the median repetition, in seconds per call."""
+        return statistics.median(self.times)
+
+    @property
+    def stdev(self) -> float:
+        """Return the standard deviation of the repetitions."""
+        return statistics.stdev(self.times) if len(self.times) > 1 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the measurement as JSON-serializable data."""
+        data: dict[str, Any] = {
+            "number": self.number,
+            "times": self.times,
+            "min": self.best,
+            "median": self.median,
+            "stdev": self.stdev,
+        }
+        if self.memory is not None:
+            data["memory"] = self.memory.to_dict()
+        return data
+
+
+def measure(
+    operation: Callable[[], object],
+    warmup: int = DEFAULT_WARMUP,
+    repeat: int = DEFAULT_REPEAT,
+    min_time: float = DEFAULT_MIN_TIME,
+) -> Measurement:
+    """Time an operation.
+
+    The number of calls per repetition is doubled until a repetition lasts
+    at least min_time; then warmup repetitions are discarded and repeat
+    repetitions are recorded.
+
+    Args:
+        operation: Function to time
+        warmup: Repetitions run before timing
+        repeat: Repetitions timed (at least 1)
+        min_time: Minimum seconds per repetition
+
+    Returns:
+        Measurement with seconds per call
+    """
+    timer = timeit.Timer(operation)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    for _ in range(warmup):
+        timer.timeit(number)
+    times = [timer.timeit(number) / number for _ in range(max(repeat, 1))]
+    return Measurement(number, times)
+
+
+def measure_memory(operation: Callable[[], object], repeat: int = 3) -> MemoryUse:
+    """Measure the memory used by one call of an operation with tracemalloc.
+
+    The operation is called once untraced first, so one-time allocations
+    (lazy imports, compiled patterns) are not counted. Of repeat traced
+    calls, the one with the lowest peak is kept: like timings, a call can be
+    disturbed by unrelated work, such as a shared table growing.
+
+    Args:
+        operation: Function to measure
+        repeat: Traced calls (at least 1)
+
+    Returns:
+        Peak and retained memory of the call
+    """
+    operation()
+    uses = []
+    for _ in range(max(repeat, 1)):
+        gc.collect()
+        tracker = MemoryTracker(top=0, snapshot_phases=("call",))
+        tracker.start()
+        try:
+            with tracker.phase("call"):
+                result = operation()
+            del result
+        finally:
+            tracker.stop()
+        uses.append(MemoryUse(tracker.phases["call"].peak, tracker.retained, tracker.high_water))
+    return min(uses, key=lambda use: use.peak)
+
+
+def select_benchmarks(names: Iterable[str] | None = None) -> list[Benchmark]:
+    """Return the benchmarks with the given names, in suite order (all if None).
+
+    Raises:
+        ValueError: If a name is unknown
+    """
+    if names is None:
+        return list(BENCHMARKS)
+    wanted = set(names)
+    unknown = wanted - {benchmark.name for benchmark in BENCHMARKS}
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s): {', '.join(sorted(unknown))}")
+    return [benchmark for benchmark in BENCHMARKS if benchmark.name in wanted]
+
+
+def run_benchmarks(
+    names: Iterable[str] | None = None,
+    warmup: int = DEFAULT_WARMUP,
+    repeat: int = DEFAULT_REPEAT,
+    min_time: float = DEFAULT_MIN_TIME,
+    progress: Callable[[str, Measurement], None] | None = None,
+    memory: bool = False,
+) -> dict[str, Any]:
+    """Run benchmarks on a freshly built corpus.
+
+    Args:
+        names: Benchmarks to run (default: all)
+        warmup: Repetitions run before timing
+        repeat: Repetitions timed
+        min_time: Minimum seconds per repetition
+        progress: Called with each benchmark name and measurement
+        memory: Also measure the memory use of each benchmark
+
+    Returns:
+        Results as JSON-serializable data (see write_results)
+
+    Raises:
+        ValueError: If a name is unknown
+    """
+    selected = select_benchmarks(names)
+    calibration = measure(calibration_work, warmup, repeat, min_time)
+    if progress is not None:
+        progress("calibration", calibration)
+
+    benchmarks: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="ascii-guard-bench-") as root:
+        corpus = build_corpus(Path(root))
+        for benchmark in selected:
+            operation = benchmark.prepare(corpus)
+            result = measure(operation, warmup, repeat, min_time)
+            if memory:
+                result.memory = measure_memory(operation)
+            benchmarks[benchmark.name] = {"description": benchmark.description}
+            benchmarks[benchmark.name].update(result.to_dict())
+            if progress is not None:
+                progress(benchmark.name, result)
+
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "ascii_guard": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "settings": {
+            "warmup": warmup,
+            "repeat": repeat,
+            "min_time": min_time,
+            "memory": memory,
+        },
+        "calibration": calibration.best,
+        "benchmarks": benchmarks,
+    }
+
+
+def write_results(results: dict[str, Any], path: Path) -> None:
+    """Write results as JSON."""
+    path.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+
+def load_results(path: Path) -> dict[str, Any]:
+    """Read a results file.
+
+    Raises:
+        OSError: If the file can't be read
+        ValueError: If it isn't a results file of a supported version
+    """
+    try:
+        results = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{path}: not valid JSON ({e})") from e
+    if not isinstance(results, dict) or results.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path}: not a version {RESULTS_VERSION} benchmark results file")
+    return results
+
+
+@dataclass
+class Comparison:
+    """One benchmark compared against the baseline.
+
+    Attributes:
+        name: Benchmark name
+        baseline: Score in the baseline, None if it wasn't run there
+        current: Score in the current results, None if it wasn't run
+        status: "ok", "regression", "improvement", "new" or "missing"
+    """
+
+    name: str
+    baseline: float | None
+    current: float | None
+    status: str
+
+    @property
+    def ratio(self) -> float | None:
+        """Return current / baseline, or None if either is missing."""
+        if self.baseline is None or self.current is None or self.baseline <= 0:
+            return None
+        return self.current / self.baseline
+
+
+def _scores(results: dict[str, Any], normalize: bool, memory: bool) -> dict[str, float]:
+    """Return the best time per benchmark, divided by the calibration if normalize.
+
+    With memory, return the peak memory of the benchmarks that measured it.
+    """
+    if memory:
+        return {
+            name: entry["memory"]["peak"]
+            for name, entry in results["benchmarks"].items()
+            if "memory" in entry
+        }
+    scale = results.get("calibration") if normalize else None
+    return {
+        name: entry["min"] / scale if scale else entry["min"]
+        for name, entry in results["benchmarks"].items()
+    }
+
+
+def compare_results(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+    normalize: bool = True,
+    memory: bool = False,
+) -> list[Comparison]:
+    """Compare results against a baseline.
+
+    A benchmark regresses when its score grows by more than tolerance, and
+    improves when it shrinks by the same factor.
+
+    Args:
+        baseline: Results of the reference run
+        current: Results to check
+        tolerance: Allowed relative slowdown (0.25 = 25%)
+        normalize: Divide by each run's calibration time, so results from
+            different machines can be compared; otherwise compare seconds
+        memory: Compare peak memory instead of time; benchmarks run without
+            memory measurement count as new or missing
+
+    Returns:
+        One comparison per benchmark in either run, in current order
+    """
+    before = _scores(baseline, normalize, memory)
+    after = _scores(current, normalize, memory)
+
+    comparisons: list[Comparison] = []
+    for name in [*after, *(name for name in before if name not in after)]:
+        old, new = before.get(name), after.get(name)
+        if old is None:
+            status = "new"
+        elif new is None:
+            status = "missing"
+        elif new > old * (1 + tolerance):
+            status = "regression"
+        elif new * (1 + tolerance) < old:
+            status = "improvement"
+        else:
+            status = "ok"
+        comparisons.append(Comparison(name, old, new, status))
+    return comparisons
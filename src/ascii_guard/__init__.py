@@ -19,7 +19,11 @@ boxes in documentation and markdown files.
 
 Public API:
     - lint_file: Lint a file for ASCII art alignment issues
+    - lint_text: Lint in-memory text for ASCII art alignment issues
     - fix_file: Fix ASCII art alignment issues in a file
+    - lint_paths: Lint files and directories, yielding results lazily
+    - fix_paths: Fix files and directories, yielding results lazily
+    - Linter: Reusable session keeping configs, caches and a box memo
     - detect_boxes: Detect ASCII art boxes in a file
     - validate_box: Validate a single Box object
     - fix_box: Fix a single Box object
@@ -27,20 +31,33 @@ Public API:
     - ValidationError: Validation error representation
     - LintResult: Results from linting a file
     - FixResult: Results from fixing a file
+    - RunStats: Per-phase timings and throughput of a run (--stats)
+    - PhaseTimer: Wall and CPU time per phase, e.g. for lint_file(timer=...)
 """
 
-from ascii_guard.detector import detect_boxes
-from ascii_guard.fixer import fix_box
-from ascii_guard.linter import fix_file, lint_file
-from ascii_guard.models import Box, FixResult, LintResult, ValidationError
-from ascii_guard.validator import validate_box
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ascii_guard.batch import fix_paths, lint_paths
+    from ascii_guard.detector import detect_boxes
+    from ascii_guard.fixer import fix_box
+    from ascii_guard.linter import fix_file, lint_file, lint_text
+    from ascii_guard.models import Box, FixResult, LintResult, ValidationError
+    from ascii_guard.session import Linter
+    from ascii_guard.stats import PhaseTimer, RunStats
+    from ascii_guard.validator import validate_box
 
 __version__ = "2.3.0"
 __all__ = [
     "__version__",
     # High-level functions
     "lint_file",
+    "lint_text",
     "fix_file",
+    "lint_paths",
+    "fix_paths",
+    "Linter",
     "detect_boxes",
     # Programmatic functions
     "validate_box",
@@ -50,4 +67,43 @@ __all__ = [
     "ValidationError",
     "LintResult",
     "FixResult",
+    # Instrumentation
+    "RunStats",
+    "PhaseTimer",
 ]
+
+# Module defining each public name. They are imported on first access, so
+# that importing the package (and starting the CLI for --version or --help)
+# does not load the detector, linter and their imports.
+_LAZY_IMPORTS = {
+    "lint_file": "ascii_guard.linter",
+    "lint_text": "ascii_guard.linter",
+    "fix_file": "ascii_guard.linter",
+    "lint_paths": "ascii_guard.batch",
+    "fix_paths": "ascii_guard.batch",
+    "Linter": "ascii_guard.session",
+    "detect_boxes": "ascii_guard.detector",
+    "validate_box": "ascii_guard.validator",
+    "fix_box": "ascii_guard.fixer",
+    "Box": "ascii_guard.models",
+    "ValidationError": "ascii_guard.models",
+    "LintResult": "ascii_guard.models",
+    "FixResult": "ascii_guard.models",
+    "RunStats": "ascii_guard.stats",
+    "PhaseTimer": "ascii_guard.stats",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import a public name from its module on first access."""
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # Later lookups no longer reach __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    """List the public names, including those not imported yet."""
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,261 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Asyncio API for async services (ascii_guard.aio).
+
+Coroutine versions of lint_file, fix_file and lint_paths that never block
+the event loop. Files are read and written in the loop's default thread
+pool; detection, validation and fixing run on the executor passed in (a
+ProcessPoolExecutor uses all CPUs), or without one in the default thread
+pool as well. A semaphore shared by concurrent calls bounds how many files
+are in progress at once.
+
+Cancellation is supported: a cancelled call stops waiting at once and
+drops work that has not started yet. Work already running in a thread or
+worker finishes in the background, but its result is discarded; a
+cancelled fix_file writes nothing unless the write had already begun.
+
+ZERO dependencies - uses only Python stdlib (asyncio).
+"""
+
+import asyncio
+import concurrent.futures
+import contextlib
+import functools
+import threading
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any, TypeVar, cast
+
+from ascii_guard import batch, linter
+from ascii_guard.config import Config, PerformanceConfig
+from ascii_guard.detector import read_file
+from ascii_guard.models import FixResult, LintResult
+
+T = TypeVar("T")
+
+# Results of lint_paths buffered ahead of the consumer
+RESULT_BUFFER = 64
+
+
+async def _run(executor: Executor | None, func: Callable[..., T], *args: Any) -> T:
+    """Run func(*args) on executor (None = the loop's default thread pool)."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args))
+
+
+@contextlib.asynccontextmanager
+async def _limited(limit: asyncio.Semaphore | None) -> AsyncIterator[None]:
+    """Hold limit, if given, for the duration of the block."""
+    if limit is None:
+        yield
+        return
+    async with limit:
+        yield
+
+
+async def lint_file(
+    file_path: str | Path,
+    exclude_code_blocks: bool = False,
+    performance: PerformanceConfig | None = None,
+    *,
+    executor: Executor | None = None,
+    limit: asyncio.Semaphore | None = None,
+) -> LintResult:
+    """Lint a file without blocking the event loop.
+
+    Args:
+        file_path: Path to file to lint (str or Path)
+        exclude_code_blocks: Skip ASCII boxes inside markdown code blocks
+        performance: [performance] settings (prefilter, max_box_height,
+            file_timeout); defaults when None
+        executor: Executor for detection and validation (None = the loop's
+            default thread pool)
+        limit: Optional semaphore shared by concurrent calls, held while the
+            file is read and linted
+
+    Returns:
+        LintResult with errors and warnings
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        OSError: If file cannot be read
+        TimeoutError: If the file exceeds performance.file_timeout
+    """
+    async with _limited(limit):
+        data = await asyncio.to_thread(read_file, file_path)
+        return await _run(
+            executor, linter.lint_file, file_path, exclude_code_blocks, data, performance
+        )
+
+
+async def fix_file(
+    file_path: str | Path,
+    dry_run: bool = False,
+    exclude_code_blocks: bool = False,
+    performance: PerformanceConfig | None = None,
+    *,
+    executor: Executor | None = None,
+    limit: asyncio.Semaphore | None = None,
+) -> FixResult:
+    """Fix a file without blocking the event loop.
+
+    The fixed lines are computed on the executor and written afterwards in
+    a thread, so a call cancelled before the write leaves the file as it
+    was.
+
+    Args:
+        file_path: Path to file to fix (str or Path)
+        dry_run: Report fixes without writing the file
+        exclude_code_blocks: Skip ASCII boxes inside markdown code blocks
+        performance: [performance] settings; defaults when None
+        executor: Executor for detection and fixing (None = the loop's
+            default thread pool)
+        limit: Optional semaphore shared by concurrent calls
+
+    Returns:
+        FixResult with fixed lines and metadata
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        OSError: If file cannot be read/written
+        TimeoutError: If the file exceeds performance.file_timeout
+    """
+    async with _limited(limit):
+        data = await asyncio.to_thread(read_file, file_path)
+        result = await _run(
+            executor, linter.fix_file, file_path, True, exclude_code_blocks, data, performance
+        )
+        if dry_run or result.boxes_fixed == 0:
+            return result
+        try:
+            await asyncio.to_thread(linter.write_lines, Path(file_path), result.lines)
+        except OSError as e:
+            raise OSError(f"Cannot write file {file_path}: {e}") from e
+        result.modified = True
+        return result
+
+
+class _Raised:
+    """An exception raised by the producer thread of _iterate_in_thread."""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+_DONE = object()
+
+
+async def _iterate_in_thread(make: Callable[[], Iterator[T]], maxsize: int) -> AsyncIterator[T]:
+    """Create a blocking iterator and iterate over it in a background thread.
+
+    Items are handed over through a bounded queue, like scanner.prefetch.
+    When the consumer stops (or is cancelled), the thread stops at its next
+    item and closes the iterator itself, as a generator can only be closed
+    by the thread running it.
+    """
+    loop = asyncio.get_running_loop()
+    buffer: asyncio.Queue[object] = asyncio.Queue(maxsize)
+    stop = threading.Event()
+
+    def put(item: object) -> bool:
+        if loop.is_closed():
+            return False
+        coro = buffer.put(item)
+        try:
+            future = asyncio.run_coroutine_threadsafe(coro, loop)
+        except RuntimeError:
+            coro.close()  # The loop closed meanwhile; never awaited
+            return False
+        while not stop.is_set():
+            try:
+                future.result(timeout=0.1)
+                return True
+            except concurrent.futures.TimeoutError:
+                continue
+        future.cancel()
+        return False
+
+    def produce() -> None:
+        items: Iterator[T] | None = None
+        try:
+            items = make()
+            for item in items:
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(_Raised(e))
+        finally:
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce, name="ascii-guard-aio", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = await buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Raised):
+                raise item.error
+            yield cast("T", item)
+    finally:
+        stop.set()
+
+
+async def lint_paths(
+    paths: Iterable[Path | str] | Path | str,
+    config: Config | None = None,
+    *,
+    exclude_code_blocks: bool = False,
+    executor: Executor | None = None,
+    jobs: int | None = None,
+    cache: bool | None = None,
+    ordered: bool = False,
+    on_error: batch.ErrorHandler | None = None,
+) -> AsyncIterator[LintResult]:
+    """Lint files and directories, yielding a LintResult per file.
+
+    Runs batch.lint_paths in a background thread (scanning, reading,
+    caches, and without an executor the linting too) and hands the results
+    to the event loop as they are ready, at most RESULT_BUFFER ahead of the
+    consumer. Leaving the loop early, or cancelling it, stops the scan and
+    drops pending work. The arguments are those of batch.lint_paths;
+    on_error is called in the background thread.
+
+    Yields:
+        LintResult for each file
+
+    Example:
+        >>> async for result in lint_paths("docs", executor=pool):
+        ...     if result.has_errors:
+        ...         print(result.file_path)
+    """
+    # Created in the thread too: finding the config reads files
+    results = functools.partial(
+        batch.lint_paths,
+        paths,
+        config,
+        exclude_code_blocks=exclude_code_blocks,
+        executor=executor,
+        jobs=jobs,
+        cache=cache,
+        ordered=ordered,
+        on_error=on_error,
+    )
+    async for result in _iterate_in_thread(results, RESULT_BUFFER):
+        yield result
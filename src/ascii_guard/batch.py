@@ -0,0 +1,281 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Lint or fix whole trees from Python (lint_paths, fix_paths).
+
+The pipeline behind the CLI as generator functions: paths are scanned
+lazily, each file is read once in a background thread, persistent caches
+are used as configured, and files are processed in the calling thread or by
+any concurrent.futures.Executor. Results are yielded as they are ready and
+only a bounded number of files is held at a time, so trees of any size can
+be processed in constant memory.
+
+ZERO dependencies - uses only Python stdlib (concurrent.futures).
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any, cast
+
+from ascii_guard.cache import ResultCache, ScanCache, result_fingerprint
+from ascii_guard.config import Config, ConfigResolver, PerformanceConfig
+from ascii_guard.models import FixResult, LintResult
+from ascii_guard.parallel import TaskOptions, WorkerPool, iter_results, resolve_jobs
+from ascii_guard.scanner import ScannedFile, prefetch, scan_files, unique_files
+
+# Called with the path of a file that could not be processed and the error
+ErrorHandler = Callable[[str, Exception], None]
+
+
+def _performance(config: Config | None, resolver: ConfigResolver) -> PerformanceConfig:
+    """Return the [performance] settings: the config's, or those of the current directory."""
+    if config is not None:
+        return config.performance
+    return resolver.resolve(Path.cwd())[0].performance
+
+
+def process_paths(
+    paths: Iterable[Path | str] | Path | str,
+    config: Config | None,
+    resolver: ConfigResolver,
+    options: TaskOptions,
+    *,
+    scan_cache: ScanCache | None = None,
+    result_cache: ResultCache | None = None,
+    pool: WorkerPool | None = None,
+    jobs: int = 1,
+    ordered: bool = False,
+    on_error: ErrorHandler | None = None,
+    run_inline: Callable[[ScannedFile], LintResult | FixResult] | None = None,
+) -> Iterator[LintResult | FixResult]:
+    """Scan paths and yield the result of processing each file.
+
+    The pipeline behind lint_paths and fix_paths, with its state passed in
+    so that a long-lived caller (see session.Linter) keeps it between
+    calls. The caches are updated but not saved.
+
+    Args:
+        paths: Paths to process (a single path or an iterable)
+        config: Config for all paths, or None to resolve one per directory
+        resolver: Per-directory config resolver, used when config is None
+        options: What to do with each file
+        scan_cache: Optional scan cache
+        result_cache: Optional lint result cache (lint mode only)
+        pool: Optional worker pool; files are processed inline without one
+        jobs: Number of workers of the pool
+        ordered: Yield results in scan order instead of as they complete
+        on_error: Called with the path and exception of a failed file;
+            without it, the exception is raised
+        run_inline: Function processing one file in this thread (default:
+            parallel.process_file with options)
+
+    Yields:
+        LintResult or FixResult for each file, depending on options.mode
+    """
+    # A single file has no reads to overlap with: skip the prefetch thread
+    single_file = isinstance(paths, str | Path) and not Path(paths).is_dir()
+    if isinstance(paths, str | Path):
+        paths = [paths]
+
+    scanned_files: Iterator[ScannedFile] = scan_files(
+        paths,
+        config,
+        cache=scan_cache,
+        resolver=resolver if config is None else None,
+        skip_read=result_cache.is_unchanged if result_cache is not None else None,
+        report_missing=True,
+    )
+    if not single_file:
+        scanned_files = prefetch(scanned_files, options.performance.prefetch)
+    if options.mode == "fix":
+        scanned_files = unique_files(scanned_files)
+
+    def cached(scanned: ScannedFile) -> tuple[Any, ...] | None:
+        if result_cache is None:
+            return None
+        return result_cache.lookup(scanned.path, scanned.data)
+
+    results = iter_results(
+        scanned_files,
+        options,
+        jobs=jobs,
+        run_inline=run_inline,
+        pool=pool,
+        min_parallel_files=1,
+        cached=cached if result_cache is not None else None,
+        ordered=ordered,
+    )
+    for scanned, outcome in results:
+        if isinstance(outcome, Exception):
+            if on_error is None:
+                raise outcome
+            on_error(str(scanned.path), outcome)
+            continue
+        if result_cache is not None:
+            result_cache.store(scanned.path, scanned.data, cast("LintResult", outcome))
+        yield outcome
+
+
+def _results(
+    paths: Iterable[Path | str] | Path | str,
+    config: Config | None,
+    resolver: ConfigResolver,
+    options: TaskOptions,
+    executor: Executor | None,
+    jobs: int | None,
+    cache: bool | None,
+    ordered: bool,
+    on_error: ErrorHandler | None,
+) -> Iterator[LintResult | FixResult]:
+    """Load the caches, process paths and save the caches (see lint_paths)."""
+    performance = options.performance
+    cache_dir = performance.cache_dir if (performance.cache if cache is None else cache) else None
+
+    scan_cache = ScanCache.load(cache_dir) if cache_dir is not None else None
+    result_cache: ResultCache | None = None
+    if cache_dir is not None and options.mode == "lint":
+        fingerprint = result_fingerprint(options.exclude_code_blocks, performance)
+        result_cache = ResultCache.load(cache_dir, fingerprint, performance.cache_max_size)
+
+    # A caller's executor gets all files: it is already running, so there
+    # is no pool start-up to amortize
+    workers = resolve_jobs(jobs, performance) if executor is not None else 1
+    pool = WorkerPool(performance.backend, workers, executor) if executor is not None else None
+    try:
+        yield from process_paths(
+            paths,
+            config,
+            resolver,
+            options,
+            scan_cache=scan_cache,
+            result_cache=result_cache,
+            pool=pool,
+            jobs=workers,
+            ordered=ordered,
+            on_error=on_error,
+        )
+    finally:
+        # Also runs when the caller stops early; results are kept either way
+        if scan_cache is not None:
+            scan_cache.save()
+        if result_cache is not None:
+            result_cache.save()
+
+
+def lint_paths(
+    paths: Iterable[Path | str] | Path | str,
+    config: Config | None = None,
+    *,
+    exclude_code_blocks: bool = False,
+    executor: Executor | None = None,
+    jobs: int | None = None,
+    cache: bool | None = None,
+    ordered: bool = False,
+    on_error: ErrorHandler | None = None,
+) -> Iterator[LintResult]:
+    """Lint files and directories, yielding a LintResult per file.
+
+    Directories are scanned like the CLI does, with the exclude/include
+    patterns and extensions of the config; explicitly named files are
+    always linted. Results are yielded lazily: the scan runs ahead in a
+    background thread, and with an executor at most a few chunks of files
+    per worker are in flight, so memory stays bounded however large the
+    tree. Stopping the iteration early stops the scan and drops the
+    pending work.
+
+    Args:
+        paths: Paths to lint (a single path or an iterable, which is
+            consumed lazily)
+        config: Config to apply to all paths; None uses the nearest
+            .ascii-guard.toml of each scanned directory, and the
+            [performance] settings of the current directory
+        exclude_code_blocks: Skip ASCII boxes inside markdown code blocks
+        executor: Optional executor running the linting, e.g. a
+            ProcessPoolExecutor for all CPUs; it is not shut down. Files are
+            sent in chunks and results come back in compact form. Without
+            one, files are linted in the calling thread
+        jobs: Number of workers of the executor, bounding the work in flight
+            (default: [performance] jobs; 0 = one per CPU)
+        cache: Use the persistent caches in [performance] cache_dir
+            (default: [performance] cache); unchanged files are answered
+            without being read or linted
+        ordered: Yield results in scan order; by default they are yielded
+            as the executor completes them
+        on_error: Called with the path and exception of a file that could
+            not be read or linted; without it, the exception is raised
+
+    Yields:
+        LintResult for each file
+
+    Example:
+        >>> from concurrent.futures import ProcessPoolExecutor
+        >>> with ProcessPoolExecutor() as pool:
+        ...     for result in lint_paths(["docs"], executor=pool):
+        ...         if result.has_errors:
+        ...             print(result.file_path)
+    """
+    resolver = ConfigResolver()
+    options = TaskOptions(
+        mode="lint",
+        exclude_code_blocks=exclude_code_blocks,
+        performance=_performance(config, resolver),
+    )
+    results = _results(paths, config, resolver, options, executor, jobs, cache, ordered, on_error)
+    return cast("Iterator[LintResult]", results)
+
+
+def fix_paths(
+    paths: Iterable[Path | str] | Path | str,
+    config: Config | None = None,
+    *,
+    dry_run: bool = False,
+    exclude_code_blocks: bool = False,
+    executor: Executor | None = None,
+    jobs: int | None = None,
+    cache: bool | None = None,
+    ordered: bool = False,
+    on_error: ErrorHandler | None = None,
+) -> Iterator[FixResult]:
+    """Fix files and directories, yielding a FixResult per file.
+
+    Works like lint_paths; a file reached through several paths is fixed
+    once. Only the scan cache is used. Files fixed by an executor come
+    back without their lines (FixResult.lines is empty); read the file, or
+    fix without an executor, to get them.
+
+    Args:
+        paths: Paths to fix (a single path or an iterable)
+        config: Config to apply to all paths (None: per-directory configs)
+        dry_run: Report fixes without writing files
+        exclude_code_blocks: Skip ASCII boxes inside markdown code blocks
+        executor: Optional executor running the fixes; it is not shut down
+        jobs: Number of workers of the executor (default: [performance] jobs)
+        cache: Use the persistent scan cache (default: [performance] cache)
+        ordered: Yield results in scan order instead of as they complete
+        on_error: Called with the path and exception of a file that could
+            not be fixed; without it, the exception is raised
+
+    Yields:
+        FixResult for each file
+    """
+    resolver = ConfigResolver()
+    options = TaskOptions(
+        mode="fix",
+        exclude_code_blocks=exclude_code_blocks,
+        dry_run=dry_run,
+        performance=_performance(config, resolver),
+    )
+    results = _results(paths, config, resolver, options, executor, jobs, cache, ordered, on_error)
+    return cast("Iterator[FixResult]", results)
@@ -0,0 +1,319 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the lint pipeline on a user's own files (ascii-guard bench).
+
+The real pipeline (scanning, reading, linting, worker pools, caches) is run
+over the given paths in several configurations: serial, serial without the
+prefilter, with growing numbers of workers, and with a cold and a warm
+cache. The fastest of a few repetitions of each is kept, and a [performance]
+configuration is recommended from the results. Runs with several workers
+always use a pool, even for trees so small that lint would process them in
+one process (see parallel.MIN_PARALLEL_FILES); the report says so.
+
+Nothing is written to the linted files. Caches go to a temporary directory,
+so existing caches are neither used nor changed.
+
+ZERO dependencies - uses only Python stdlib (tempfile).
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from ascii_guard.defaults import DEFAULT_BENCH_REPEAT
+from ascii_guard.parallel import MIN_PARALLEL_BYTES, MIN_PARALLEL_FILES
+from ascii_guard.stats import RunStats
+
+# A configuration using fewer workers (or no cache or prefilter change) is
+# preferred unless the alternative is more than this much faster (0.1 = 10%)
+RECOMMEND_MARGIN = 0.10
+
+
+@dataclass(frozen=True)
+class BenchConfig:
+    """One configuration of the lint pipeline.
+
+    Attributes:
+        name: Label in the report
+        jobs: Number of workers (1 = serial)
+        prefilter: Skip box detection in files without top-left corners
+        cache: "off", "cold" (empty cache directory) or "warm" (cache
+            filled by an untimed run of the same configuration)
+    """
+
+    name: str
+    jobs: int = 1
+    prefilter: bool = True
+    cache: str = "off"
+
+
+# Lints the paths once in a configuration, with caches in the given
+# directory (None = caching off), and returns the finished run stats
+Runner = Callable[[BenchConfig, str | None], RunStats]
+
+
+@dataclass
+class BenchResult:
+    """Fastest run of one configuration.
+
+    Attributes:
+        config: Configuration measured
+        stats: Stats of the fastest repetition
+        speedup: Wall time of the serial run divided by this one's
+    """
+
+    config: BenchConfig
+    stats: RunStats
+    speedup: float = 1.0
+
+    @property
+    def efficiency(self) -> float | None:
+        """Return the speedup per worker (1.0 = perfect scaling), None with a cache."""
+        if self.config.cache != "off":
+            return None
+        return self.speedup / self.config.jobs
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the result as JSON-serializable data."""
+        return {
+            "name": self.config.name,
+            "jobs": self.config.jobs,
+            "prefilter": self.config.prefilter,
+            "cache": self.config.cache,
+            "speedup": self.speedup,
+            "efficiency": self.efficiency,
+            "stats": self.stats.to_dict(),
+        }
+
+
+@dataclass
+class Recommendation:
+    """[performance] settings recommended by a benchmark.
+
+    Attributes:
+        jobs: Number of workers
+        prefilter: Whether to keep the prefilter on
+        cache: Whether to enable persistent caches
+        reasons: One explanation per setting
+    """
+
+    jobs: int
+    prefilter: bool
+    cache: bool
+    reasons: list[str]
+
+    def to_toml(self) -> str:
+        """Return the settings as a [performance] section."""
+        return "\n".join(
+            [
+                "[performance]",
+                f"jobs = {self.jobs}",
+                f"prefilter = {str(self.prefilter).lower()}",
+                f"cache = {str(self.cache).lower()}",
+            ]
+        )
+
+
+@dataclass
+class BenchReport:
+    """Results of all configurations and the recommendation.
+
+    Attributes:
+        results: One result per configuration, in the order run
+        recommendation: Recommended settings
+        below_parallel_threshold: The paths are too small for lint to start
+            a pool, so jobs has no effect on them outside of bench
+    """
+
+    results: list[BenchResult]
+    recommendation: Recommendation
+    below_parallel_threshold: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the report as JSON-serializable data."""
+        recommendation = self.recommendation
+        return {
+            "results": [result.to_dict() for result in self.results],
+            "below_parallel_threshold": self.below_parallel_threshold,
+            "recommendation": {
+                "jobs": recommendation.jobs,
+                "prefilter": recommendation.prefilter,
+                "cache": recommendation.cache,
+                "reasons": recommendation.reasons,
+                "toml": recommendation.to_toml(),
+            },
+        }
+
+
+def job_counts(max_jobs: int) -> list[int]:
+    """Return the worker counts to measure: 1, 2, 4, ... up to max_jobs, and max_jobs."""
+    counts = [1]
+    while counts[-1] * 2 <= max_jobs:
+        counts.append(counts[-1] * 2)
+    if counts[-1] < max_jobs:
+        counts.append(max_jobs)
+    return counts
+
+
+def measure_config(run: Runner, config: BenchConfig, repeat: int, cache_root: Path) -> RunStats:
+    """Run a configuration repeat times and return the stats of the fastest run.
+
+    A cold cache starts from an empty directory in every repetition; a warm
+    cache is filled once by an untimed run.
+    """
+    cache_dir: str | None = None
+    if config.cache == "warm":
+        cache_dir = str(cache_root / "warm")
+        run(config, cache_dir)
+    runs = []
+    for repetition in range(max(repeat, 1)):
+        if config.cache == "cold":
+            cache_dir = str(cache_root / f"cold-{repetition}")
+        runs.append(run(config, cache_dir))
+    return min(runs, key=lambda stats: stats.wall)
+
+
+def choose_jobs(parallel: list[BenchResult]) -> BenchResult:
+    """Return the result with the fewest workers within RECOMMEND_MARGIN of the fastest."""
+    fastest = min(result.stats.wall for result in parallel)
+    return next(r for r in parallel if r.stats.wall <= fastest * (1 + RECOMMEND_MARGIN))
+
+
+def below_parallel_threshold(stats: RunStats) -> bool:
+    """Return whether lint would process a run of this size in one process."""
+    return stats.files < MIN_PARALLEL_FILES and stats.size < MIN_PARALLEL_BYTES
+
+
+def recommend(
+    parallel: list[BenchResult],
+    no_prefilter: BenchResult,
+    cold: BenchResult,
+    warm: BenchResult,
+    below_threshold: bool = False,
+) -> Recommendation:
+    """Recommend settings from the measured configurations.
+
+    Args:
+        parallel: Results with prefilter and no cache, serial first, by jobs
+        no_prefilter: Serial result without the prefilter
+        cold: Result of the recommended jobs with an empty cache
+        warm: Result of the recommended jobs with a filled cache
+        below_threshold: The paths are below the parallel threshold (see
+            below_parallel_threshold)
+
+    Returns:
+        Fewest workers within RECOMMEND_MARGIN of the fastest run; the
+        prefilter unless turning it off is clearly faster; the cache if a
+        warm cache is clearly faster
+    """
+    chosen = choose_jobs(parallel)
+    jobs = chosen.config.jobs
+    if len(parallel) == 1:
+        job_reason = "jobs = 1: only one worker was measured (see --max-jobs)"
+    elif jobs == 1:
+        job_reason = "jobs = 1: more workers were not faster"
+    else:
+        job_reason = (
+            f"jobs = {jobs}: {chosen.speedup:.1f}x faster than serial "
+            f"({chosen.speedup / jobs:.0%} efficiency per worker)"
+        )
+    if chosen is not parallel[-1] and jobs > 1:
+        job_reason += f"; more workers gained less than {RECOMMEND_MARGIN:.0%}"
+    if below_threshold and len(parallel) > 1:
+        from ascii_guard.parallel import MIN_PARALLEL_BYTES, MIN_PARALLEL_FILES
+
+        job_reason += (
+            f"; the job runs were forced to use a pool: lint processes fewer than "
+            f"{MIN_PARALLEL_FILES} files and {MIN_PARALLEL_BYTES // (1024 * 1024)} MB "
+            "in one process whatever jobs is"
+        )
+
+    serial = parallel[0]
+    prefilter = no_prefilter.stats.wall * (1 + RECOMMEND_MARGIN) >= serial.stats.wall
+    change = no_prefilter.stats.wall / serial.stats.wall - 1 if serial.stats.wall else 0.0
+    prefilter_reason = (
+        f"prefilter = {str(prefilter).lower()}: turning it off changed the serial time "
+        f"by {change:+.0%}"
+    )
+
+    cache = warm.stats.wall * (1 + RECOMMEND_MARGIN) < chosen.stats.wall
+    warm_speedup = chosen.stats.wall / warm.stats.wall if warm.stats.wall else 0.0
+    cold_cost = cold.stats.wall / chosen.stats.wall - 1 if chosen.stats.wall else 0.0
+    if cache:
+        cache_reason = (
+            f"cache = true: unchanged files are {warm_speedup:.1f}x faster from a warm cache "
+            f"(filling it costs {cold_cost:+.0%}); keep the cache directory between CI runs"
+        )
+    else:
+        cache_reason = f"cache = false: a warm cache was only {warm_speedup:.1f}x faster"
+
+    return Recommendation(jobs, prefilter, cache, [job_reason, prefilter_reason, cache_reason])
+
+
+def run_bench(
+    run: Runner,
+    max_jobs: int,
+    repeat: int = DEFAULT_BENCH_REPEAT,
+    progress: Callable[[BenchResult], None] | None = None,
+) -> BenchReport:
+    """Measure every configuration and recommend settings.
+
+    An untimed serial run comes first, so all configurations find the
+    files in the operating system's cache.
+
+    Args:
+        run: Function running the pipeline once in a configuration
+        max_jobs: Highest number of workers to try
+        repeat: Repetitions per configuration; the fastest is kept
+        progress: Called with each result as it is measured
+
+    Returns:
+        Report with one result per configuration
+
+    Raises:
+        ValueError: If the paths contain no files to lint
+    """
+    import tempfile  # Imported here: only bench runs need it
+
+    warm_up = run(BenchConfig("warm-up"), None)
+    if warm_up.files == 0:
+        raise ValueError("No files found to lint")
+    below_threshold = below_parallel_threshold(warm_up)
+    results: list[BenchResult] = []
+
+    with tempfile.TemporaryDirectory(prefix="ascii-guard-bench-") as root:
+
+        def measure(config: BenchConfig) -> BenchResult:
+            stats = measure_config(run, config, repeat, Path(root) / str(len(results)))
+            serial_wall = results[0].stats.wall if results else stats.wall
+            result = BenchResult(config, stats, serial_wall / stats.wall if stats.wall else 0.0)
+            results.append(result)
+            if progress is not None:
+                progress(result)
+            return result
+
+        parallel = [measure(BenchConfig("serial"))]
+        no_prefilter = measure(BenchConfig("serial, no prefilter", prefilter=False))
+        for jobs in job_counts(max_jobs)[1:]:
+            parallel.append(measure(BenchConfig(f"{jobs} jobs", jobs=jobs)))
+
+        jobs = choose_jobs(parallel).config.jobs
+        label = "serial" if jobs == 1 else f"{jobs} jobs"
+        cold = measure(BenchConfig(f"{label}, cold cache", jobs=jobs, cache="cold"))
+        warm = measure(BenchConfig(f"{label}, warm cache", jobs=jobs, cache="warm"))
+
+    recommendation = recommend(parallel, no_prefilter, cold, warm, below_threshold)
+    return BenchReport(results, recommendation, below_threshold)
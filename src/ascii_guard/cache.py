@@ -0,0 +1,463 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Persistent on-disk caches for ascii-guard.
+
+ZERO dependencies - uses only Python stdlib (json + hashlib).
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from ascii_guard import __version__
+from ascii_guard.config import Config, PerformanceConfig
+from ascii_guard.models import LintResult, ValidationError
+
+# Bump when the on-disk layout changes
+CACHE_FORMAT_VERSION = 2
+
+# Directories modified this recently (in seconds) before the scan started are
+# not cached: on filesystems with coarse timestamps a later change could keep
+# the same mtime and go unnoticed
+RACY_WINDOW = 2.0
+
+# Scan cache entries not used for this many days are dropped on save, so
+# deleted or no longer scanned directories do not pile up
+SCAN_MAX_AGE_DAYS = 30
+
+
+def config_fingerprint(config: Config) -> str:
+    """Hash the settings that decide which files the scanner selects.
+
+    Args:
+        config: Config object to fingerprint
+
+    Returns:
+        Short hex digest; changes whenever filters or patterns change
+    """
+    payload = json.dumps(
+        {
+            "extensions": config.extensions,
+            "exclude": config.exclude,
+            "include": config.include,
+            "follow_symlinks": config.follow_symlinks,
+            "max_file_size": config.max_file_size,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def result_fingerprint(exclude_code_blocks: bool, performance: PerformanceConfig) -> str:
+    """Hash the settings that can change the lint result of a file.
+
+    File selection settings are left out: they decide which files are
+    linted, not what linting a given file reports.
+
+    Args:
+        exclude_code_blocks: Whether boxes in code blocks are skipped
+        performance: [performance] settings of the run
+
+    Returns:
+        Short hex digest
+    """
+    payload = json.dumps(
+        {
+            "exclude_code_blocks": exclude_code_blocks,
+            "max_box_height": performance.max_box_height,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def content_digest(data: bytes) -> str:
+    """Hash file content for the result cache."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _encode_errors(errors: list[ValidationError]) -> list[list[Any]]:
+    """Pack ValidationErrors into JSON-friendly lists."""
+    return [[e.line, e.column, e.message, e.severity, e.fix] for e in errors]
+
+
+class ScanCache:
+    """Per-directory scan results keyed on directory mtimes.
+
+    For every directory visited during a scan, records its mtime, the
+    subdirectories that survived the exclude patterns, and the files that
+    passed the filters and text checks. A directory whose mtime has not
+    moved since is served from the cache without being listed or filtered
+    again.
+
+    Each entry also stores a key naming the config it was filtered with
+    (fingerprint plus pattern base directory), so entries are ignored when
+    the config or pattern set that applies to the directory changes, and
+    the day it was last used: entries unused for SCAN_MAX_AGE_DAYS are
+    dropped on save. The whole cache is discarded when the tool version
+    changes.
+    """
+
+    FILE_NAME = "scan.json"
+
+    def __init__(self, path: Path | None) -> None:
+        """Create an empty cache stored at path.
+
+        Args:
+            path: Cache file location, or None for a cache kept in memory only
+                (e.g. by a Linter session)
+        """
+        self.path = path
+        # directory -> [mtime_ns, key, dirs, files, day last used]
+        self._entries: dict[str, list[Any]] = {}
+        self._dirty = False
+        self.begin_run()
+
+    def begin_run(self) -> None:
+        """Start a new scan: take the current time for recency and racy checks.
+
+        Called on creation; long-lived processes that reuse the cache call
+        it again before each scan.
+        """
+        self._today = int(time.time() // 86400)
+        self._racy_cutoff_ns = int((time.time() - RACY_WINDOW) * 1_000_000_000)
+
+    @staticmethod
+    def _version_key() -> str:
+        """Key identifying caches written by this version and format."""
+        return f"{__version__}/{CACHE_FORMAT_VERSION}"
+
+    @classmethod
+    def load(cls, cache_dir: Path | str) -> "ScanCache":
+        """Load the scan cache from cache_dir, or start an empty one.
+
+        Missing, unreadable or corrupt cache files, and caches written by a
+        different ascii-guard version, yield an empty cache.
+
+        Args:
+            cache_dir: Cache directory
+
+        Returns:
+            ScanCache instance
+        """
+        path = Path(cache_dir) / cls.FILE_NAME
+        cache = cls(path)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cache
+
+        if isinstance(data, dict) and data.get("version") == cls._version_key():
+            entries = data.get("entries")
+            if isinstance(entries, dict):
+                cache._entries = entries
+        return cache
+
+    def lookup(
+        self, directory: Path, mtime_ns: int, key: str
+    ) -> tuple[list[str], list[str]] | None:
+        """Return the cached listing of a directory if it is still valid.
+
+        Args:
+            directory: Directory to look up
+            mtime_ns: Current mtime of the directory in nanoseconds
+            key: Key of the config that applies to the directory
+
+        Returns:
+            Tuple of (subdirectory names, file names), or None on a miss
+        """
+        entry = self._entries.get(str(directory))
+        if not entry or entry[0] != mtime_ns or entry[1] != key:
+            return None
+        if entry[4] != self._today:
+            entry[4] = self._today
+            self._dirty = True
+        return list(entry[2]), list(entry[3])
+
+    def store(
+        self, directory: Path, mtime_ns: int, key: str, dirs: list[str], files: list[str]
+    ) -> None:
+        """Record the listing of a directory.
+
+        Args:
+            directory: Directory that was listed
+            mtime_ns: Directory mtime in nanoseconds at listing time
+            key: Key of the config the listing was filtered with
+            dirs: Subdirectory names to descend into
+            files: File names that passed the filters and text checks
+        """
+        if mtime_ns >= self._racy_cutoff_ns:
+            return  # Too recent to trust (see RACY_WINDOW)
+        self._entries[str(directory)] = [mtime_ns, key, dirs, files, self._today]
+        self._dirty = True
+
+    def _prune(self) -> None:
+        """Drop entries not used for SCAN_MAX_AGE_DAYS."""
+        cutoff = self._today - SCAN_MAX_AGE_DAYS
+        stale = [directory for directory, entry in self._entries.items() if entry[4] < cutoff]
+        for directory in stale:
+            del self._entries[directory]
+        if stale:
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache to disk if it changed.
+
+        Entries unused for SCAN_MAX_AGE_DAYS are dropped first. The file is
+        replaced atomically. Failures are ignored: the cache is an
+        optimization and must never fail a run. Memory-only caches are only
+        pruned.
+        """
+        self._prune()
+        if not self._dirty:
+            return
+        if self.path is None:
+            self._dirty = False
+            return
+        data = {"version": self._version_key(), "entries": self._entries}
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            with contextlib.suppress(OSError):
+                tmp_path.unlink(missing_ok=True)
+            return
+        self._dirty = False
+
+
+class ResultCache:
+    """Lint results keyed on file content.
+
+    Results are stored under the digest of the file content combined with
+    a fingerprint of the result-affecting settings (see
+    result_fingerprint), so they stay valid across checkouts, machines and
+    CI runners: restoring the cache directory is enough to reuse them.
+
+    A second table maps paths to their last seen stat data (size, mtime,
+    inode) and content digest. When the stat data still matches, the file
+    is not read or hashed at all.
+
+    Results are stored in the same compact tuple form that parallel
+    workers send back: (boxes_found, errors, warnings). When the cache file
+    would exceed its size limit, the least recently used results are
+    evicted on save.
+    """
+
+    FILE_NAME = "results.json"
+
+    def __init__(self, path: Path | None, fingerprint: str, max_size_mb: int = 64) -> None:
+        """Create an empty cache stored at path.
+
+        Args:
+            path: Cache file location, or None for a cache kept in memory only
+                (e.g. by the daemon)
+            fingerprint: result_fingerprint of the run's settings
+            max_size_mb: Size limit of the cache file in MB (0 = unlimited)
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+        self.max_size = max_size_mb * 1024 * 1024
+        self._files: dict[str, list[Any]] = {}  # path -> [size, mtime_ns, ino, digest]
+        self._results: dict[str, list[Any]] = {}  # key -> [last_used, encoded result]
+        self._dirty = False
+        self.begin_run()
+
+    def begin_run(self) -> None:
+        """Start a new run: take the current time for recency and racy checks.
+
+        Called on creation; long-lived processes that reuse the cache call
+        it again before each run.
+        """
+        self._now = int(time.time())
+        self._racy_cutoff_ns = int((time.time() - RACY_WINDOW) * 1_000_000_000)
+
+    @classmethod
+    def load(cls, cache_dir: Path | str, fingerprint: str, max_size_mb: int = 64) -> "ResultCache":
+        """Load the result cache from cache_dir, or start an empty one.
+
+        Missing, unreadable or corrupt cache files, and caches written by a
+        different ascii-guard version, yield an empty cache.
+
+        Args:
+            cache_dir: Cache directory
+            fingerprint: result_fingerprint of the run's settings
+            max_size_mb: Size limit of the cache file in MB (0 = unlimited)
+
+        Returns:
+            ResultCache instance
+        """
+        path = Path(cache_dir) / cls.FILE_NAME
+        cache = cls(path, fingerprint, max_size_mb)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cache
+
+        if isinstance(data, dict) and data.get("version") == ScanCache._version_key():
+            files = data.get("files")
+            results = data.get("results")
+            if isinstance(files, dict) and isinstance(results, dict):
+                cache._files = files
+                cache._results = results
+        return cache
+
+    def _key(self, digest: str) -> str:
+        """Result key for content with the given digest."""
+        return f"{digest}:{self.fingerprint}"
+
+    def _stat_digest(self, path: Path) -> str | None:
+        """Return the recorded digest of path if its stat data is unchanged."""
+        entry = self._files.get(str(path))
+        if entry is None:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if [st.st_size, st.st_mtime_ns, st.st_ino] != entry[:3]:
+            return None
+        return str(entry[3])
+
+    def is_unchanged(self, path: Path) -> bool:
+        """Check whether path can be answered from the cache without reading it.
+
+        Args:
+            path: File path
+
+        Returns:
+            True if the file's stat data is unchanged and its result is cached
+        """
+        digest = self._stat_digest(path)
+        return digest is not None and self._key(digest) in self._results
+
+    def lookup(self, path: Path, data: bytes | None) -> tuple[Any, ...] | None:
+        """Return the cached result of a file in compact form.
+
+        Files without content (skipped via is_unchanged) are identified by
+        their stat data; files with content by its digest.
+
+        Args:
+            path: File path
+            data: File content, or None if it was not read
+
+        Returns:
+            (boxes_found, errors, warnings) tuple, or None on a miss
+        """
+        digest = self._stat_digest(path) if data is None else content_digest(data)
+        if digest is None:
+            return None
+
+        entry = self._results.get(self._key(digest))
+        if entry is None:
+            return None
+        if entry[0] != self._now:
+            entry[0] = self._now
+            self._dirty = True
+        boxes_found, errors, warnings = entry[1]
+        return (boxes_found, [tuple(e) for e in errors], [tuple(w) for w in warnings])
+
+    def store(
+        self, path: Path, data: bytes | None, result: LintResult, from_file: bool = True
+    ) -> None:
+        """Record the lint result of a file.
+
+        Files without content were answered from the cache and are skipped.
+
+        Args:
+            path: File path
+            data: Content the file was linted from, or None if it was not read
+            result: Lint result
+            from_file: False for content that was not read from path (e.g.
+                an editor buffer); only its result is recorded, not the
+                file's stat data
+        """
+        if data is None:
+            return
+        digest = content_digest(data)
+        self._results[self._key(digest)] = [
+            self._now,
+            [result.boxes_found, _encode_errors(result.errors), _encode_errors(result.warnings)],
+        ]
+        self._dirty = True
+        if not from_file:
+            return
+
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        # A file modified right before or after it was read could keep this
+        # mtime with different content (see RACY_WINDOW)
+        if st.st_mtime_ns < self._racy_cutoff_ns and st.st_size == len(data):
+            self._files[str(path)] = [st.st_size, st.st_mtime_ns, st.st_ino, digest]
+
+    def _evict(self) -> None:
+        """Drop least recently used results until the cache fits its size limit."""
+        if self.max_size <= 0:
+            return
+        sizes = {key: len(json.dumps(entry)) + len(key) + 6 for key, entry in self._results.items()}
+        total = sum(sizes.values())
+        total += sum(len(json.dumps(entry)) + len(path) for path, entry in self._files.items())
+        if total <= self.max_size:
+            return
+
+        for key in sorted(self._results, key=lambda k: self._results[k][0]):
+            del self._results[key]
+            total -= sizes[key]
+            if total <= self.max_size:
+                break
+
+        # Forget stat entries whose results are all gone
+        live = {key.split(":", 1)[0] for key in self._results}
+        self._files = {path: entry for path, entry in self._files.items() if entry[3] in live}
+
+    def save(self) -> None:
+        """Write the cache to disk if it changed.
+
+        The file is replaced atomically. Failures are ignored: the cache is
+        an optimization and must never fail a run. Memory-only caches are
+        only trimmed to their size limit.
+        """
+        if not self._dirty:
+            return
+        self._evict()
+        if self.path is None:
+            self._dirty = False
+            return
+        data = {
+            "version": ScanCache._version_key(),
+            "files": self._files,
+            "results": self._results,
+        }
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            with contextlib.suppress(OSError):
+                tmp_path.unlink(missing_ok=True)
+            return
+        self._dirty = False
@@ -18,14 +18,47 @@ ZERO dependencies - uses only Python stdlib (argparse).
 """
 
 import argparse
+import contextlib
+import dataclasses
+import io
+import json
+import os
 import sys
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import NoReturn
+from typing import TYPE_CHECKING, Any, BinaryIO, NoReturn, TextIO, cast
 
 from ascii_guard import __version__
-from ascii_guard.config import load_config
-from ascii_guard.linter import fix_file, lint_file
-from ascii_guard.scanner import scan_paths
+from ascii_guard.config import (
+    DEFAULT_CACHE_DIR,
+    Config,
+    ConfigError,
+    ConfigResolver,
+    PerformanceConfig,
+    load_config,
+)
+from ascii_guard.defaults import (
+    DEFAULT_BENCH_REPEAT,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_TOP_FILES,
+    OUTPUT_FORMATS,
+)
+from ascii_guard.models import FixResult, LintResult
+
+# Modules only some commands need (linting, caches, worker pools, scanning,
+# git, watching, output formats, stats, the daemon client) are imported in
+# the functions using them, so that --version, --help and a pre-commit run
+# on a handful of files start quickly.
+if TYPE_CHECKING:
+    from ascii_guard.bench import BenchConfig, BenchReport, BenchResult
+    from ascii_guard.cache import ResultCache, ScanCache
+    from ascii_guard.memstats import MemoryTracker
+    from ascii_guard.parallel import WorkerPool
+    from ascii_guard.scanner import ScannedFile
+    from ascii_guard.stats import PhaseTimer, RunStats
+    from ascii_guard.vcs import LineRanges
 
 # ANSI color codes (no colorama needed - stdlib only)
 COLOR_RED = "\033[91m"
@@ -35,25 +68,791 @@ COLOR_BLUE = "\033[94m"
 COLOR_BOLD = "\033[1m"
 COLOR_RESET = "\033[0m"
 
+# Path argument that reads the content from stdin
+STDIN_PATH = "-"
+
+# Bytes read at a time from a --files-from list
+FILES_FROM_CHUNK = 64 * 1024
+
+
+def color_enabled(stream: TextIO) -> bool:
+    """Return whether ANSI colors should be written to stream.
+
+    Colors are only used on terminals, and never when NO_COLOR is set, so
+    redirected output and CI logs stay free of escape codes.
+    """
+    if os.environ.get("NO_COLOR"):
+        return False
+    isatty = getattr(stream, "isatty", None)
+    return bool(isatty and isatty())
+
+
+def styled(text: str, color: str, stream: TextIO | None = None) -> str:
+    """Wrap text in an ANSI color if stream (default: stdout) supports it."""
+    if color_enabled(stream or sys.stdout):
+        return f"{color}{text}{COLOR_RESET}"
+    return text
+
 
 def print_error(message: str) -> None:
     """Print error message in red."""
-    print(f"{COLOR_RED}✗ {message}{COLOR_RESET}", file=sys.stderr)
+    print(styled(f"✗ {message}", COLOR_RED, sys.stderr), file=sys.stderr)
 
 
 def print_success(message: str) -> None:
     """Print success message in green."""
-    print(f"{COLOR_GREEN}✓ {message}{COLOR_RESET}")
+    print(styled(f"✓ {message}", COLOR_GREEN))
 
 
 def print_warning(message: str) -> None:
     """Print warning message in yellow."""
-    print(f"{COLOR_YELLOW}⚠ {message}{COLOR_RESET}")
+    print(styled(f"⚠ {message}", COLOR_YELLOW))
 
 
 def print_info(message: str) -> None:
     """Print info message in blue."""
-    print(f"{COLOR_BLUE}ℹ {message}{COLOR_RESET}")
+    print(styled(f"ℹ {message}", COLOR_BLUE))
+
+
+@dataclass
+class WarmState:
+    """State a long-lived process keeps between commands (see daemon).
+
+    Set as args.warm; commands then reuse parsed configs, in-memory result
+    caches and running worker pools instead of starting from scratch.
+    """
+
+    resolver: ConfigResolver = field(default_factory=ConfigResolver)
+    result_caches: dict[tuple[str | None, str], "ResultCache"] = field(default_factory=dict)
+    pools: dict[tuple[str, int], "WorkerPool"] = field(default_factory=dict)
+
+    def shutdown(self) -> None:
+        """Stop all worker pools."""
+        for pool in self.pools.values():
+            pool.shutdown()
+        self.pools.clear()
+
+
+def cache_dir_for(args: argparse.Namespace, performance: PerformanceConfig) -> str | None:
+    """Return the persistent cache directory, or None if caching is disabled.
+
+    --cache/--no-cache and --cache-dir override the [performance] cache and
+    cache_dir settings.
+    """
+    enabled = getattr(args, "cache", None)
+    if enabled is None:
+        enabled = performance.cache
+    if not enabled:
+        return None
+    return getattr(args, "cache_dir", None) or performance.cache_dir
+
+
+def load_scan_cache(
+    args: argparse.Namespace, performance: PerformanceConfig | None = None
+) -> "ScanCache | None":
+    """Load the persistent scan cache if enabled."""
+    from ascii_guard.cache import ScanCache
+
+    cache_dir = cache_dir_for(args, performance or PerformanceConfig())
+    return ScanCache.load(cache_dir) if cache_dir is not None else None
+
+
+def load_result_cache(
+    args: argparse.Namespace, performance: PerformanceConfig, exclude_code_blocks: bool
+) -> "ResultCache | None":
+    """Load the persistent lint result cache if enabled.
+
+    A long-lived process keeps its result caches in memory between runs;
+    without a cache directory they are never written to disk.
+    """
+    from ascii_guard.cache import ResultCache, result_fingerprint
+
+    cache_dir = cache_dir_for(args, performance)
+    fingerprint = result_fingerprint(exclude_code_blocks, performance)
+    warm: WarmState | None = getattr(args, "warm", None)
+    if warm is not None:
+        key = (cache_dir, fingerprint)
+        cache = warm.result_caches.get(key)
+        if cache is None:
+            if cache_dir is None:
+                cache = ResultCache(None, fingerprint, performance.cache_max_size)
+            else:
+                cache = ResultCache.load(cache_dir, fingerprint, performance.cache_max_size)
+            warm.result_caches[key] = cache
+        cache.begin_run()
+        return cache
+    if cache_dir is None:
+        return None
+    return ResultCache.load(cache_dir, fingerprint, performance.cache_max_size)
+
+
+def worker_pool(args: argparse.Namespace, backend: str, jobs: int) -> "WorkerPool | None":
+    """Return the warm worker pool for backend and jobs, if the process keeps one."""
+    from ascii_guard.parallel import WorkerPool
+
+    warm: WarmState | None = getattr(args, "warm", None)
+    if warm is None or backend == "serial" or jobs <= 1:
+        return None
+    pool = warm.pools.get((backend, jobs))
+    if pool is None:
+        pool = warm.pools[(backend, jobs)] = WorkerPool(backend, jobs)
+    return pool
+
+
+def load_run_config(args: argparse.Namespace) -> tuple[Config | None, ConfigResolver | None]:
+    """Load the config given with --config, or set up per-directory discovery.
+
+    Without --config, every scanned directory uses the nearest
+    .ascii-guard.toml above it, so subprojects of a monorepo can carry
+    their own settings. A long-lived process reuses its resolver, which
+    reloads config files that changed since the last run.
+
+    Returns:
+        Tuple of (explicit config, resolver); exactly one is not None
+
+    Raises:
+        FileNotFoundError: If the --config file doesn't exist
+        ConfigError: If the --config file is invalid
+    """
+    config_path = getattr(args, "config", None)
+    if config_path:
+        try:
+            return load_config(config_path), None
+        except FileNotFoundError:
+            raise
+        except ValueError as e:
+            raise ConfigError(Path(config_path), str(e)) from e
+    warm: WarmState | None = getattr(args, "warm", None)
+    if warm is not None:
+        warm.resolver.refresh()
+        return None, warm.resolver
+    return None, ConfigResolver()
+
+
+def run_performance(config: Config | None, resolver: ConfigResolver | None) -> PerformanceConfig:
+    """Return the [performance] settings for this run.
+
+    Performance settings apply to the whole run, so they come from the
+    --config file or, without one, from the config that applies to the
+    current directory.
+    """
+    if config is not None:
+        return config.performance
+    if resolver is not None:
+        return resolver.resolve(Path.cwd())[0].performance
+    return PerformanceConfig()
+
+
+def prefetch_size(performance: PerformanceConfig, stats: "RunStats | None") -> int:
+    """Return the number of files to read ahead of the linter.
+
+    With --memstats, files are read in the linting thread instead, so the
+    memory of each read is charged to the right file and phase.
+    """
+    if stats is not None and stats.memory is not None:
+        return 0
+    return performance.prefetch
+
+
+def load_changed_files(args: argparse.Namespace) -> set[Path] | None:
+    """Return the files changed since --changed-since, or None for a full scan.
+
+    Falls back to a full scan (with a warning) when git is unavailable, the
+    inputs are not in a repository, or the ref is unknown.
+    """
+    ref = getattr(args, "changed_since", None)
+    if not ref:
+        return None
+    from ascii_guard.vcs import GitError, changed_files
+
+    try:
+        return changed_files(ref, input_directory(args))
+    except GitError as e:
+        print_warning(f"Cannot determine files changed since {ref} ({e}); linting all files")
+        return None
+
+
+def load_diff_ranges(args: argparse.Namespace) -> "dict[Path, LineRanges] | None":
+    """Return changed line ranges per file for --diff, or None without it.
+
+    --diff REF computes the hunks with git; --diff - reads a unified diff
+    from stdin, with paths relative to the repository root (or the current
+    directory outside a repository). If git fails, a warning is printed and
+    every box is validated.
+    """
+    source = getattr(args, "diff", None)
+    if not source:
+        return None
+    from ascii_guard.vcs import GitError, changed_lines, parse_unified_diff, repository_root
+
+    cwd = input_directory(args)
+
+    if source == "-":
+        try:
+            root = repository_root(cwd)
+        except GitError:
+            root = Path.cwd()
+        return parse_unified_diff(sys.stdin.read(), root)
+
+    try:
+        return changed_lines(source, cwd)
+    except GitError as e:
+        print_warning(f"Cannot compute diff against {source} ({e}); validating all boxes")
+        return None
+
+
+def input_directory(args: argparse.Namespace) -> Path:
+    """Return the directory of the first input path, or the current directory without one.
+
+    Paths listed with --files-from are not consulted, as reading the list
+    would consume it.
+    """
+    if not args.files:
+        return Path.cwd()
+    first = Path(args.files[0]).resolve()
+    return first if first.is_dir() else first.parent
+
+
+def read_path_list(stream: BinaryIO, separator: bytes) -> Iterator[str]:
+    """Yield the paths of a list, reading it in chunks as the paths are consumed.
+
+    Empty entries are skipped, and with newline separators a trailing
+    carriage return is removed. Paths are decoded like command-line
+    arguments, so undecodable bytes round-trip.
+    """
+    pending = b""
+    while chunk := stream.read(FILES_FROM_CHUNK):
+        *entries, pending = (pending + chunk).split(separator)
+        for entry in entries:
+            if separator == b"\n":
+                entry = entry.removesuffix(b"\r")
+            if entry:
+                yield os.fsdecode(entry)
+    if separator == b"\n":
+        pending = pending.removesuffix(b"\r")
+    if pending:
+        yield os.fsdecode(pending)
+
+
+def input_paths(args: argparse.Namespace) -> Iterator[str]:
+    """Yield the paths given as arguments, then those listed by --files-from.
+
+    The list is read lazily, so a scan consumes it as a stream.
+    """
+    yield from args.files
+    source = getattr(args, "files_from", None)
+    if source is None:
+        return
+    separator = b"\0" if getattr(args, "null", False) else b"\n"
+    if source == STDIN_PATH:
+        buffer = getattr(sys.stdin, "buffer", None)
+        stream = buffer if buffer is not None else io.BytesIO(sys.stdin.read().encode("utf-8"))
+        yield from read_path_list(stream, separator)
+        return
+    with open(source, "rb") as stream:
+        yield from read_path_list(stream, separator)
+
+
+def files_from_usage_error(args: argparse.Namespace) -> str | None:
+    """Return why --files-from cannot be used with the other arguments, if so."""
+    source = getattr(args, "files_from", None)
+    if source is None:
+        if getattr(args, "null", False):
+            return "-0/--null requires --files-from"
+        return None
+    if getattr(args, "watch", False):
+        return "--watch cannot be combined with --files-from"
+    if reads_stdin(args):
+        return f"'{STDIN_PATH}' (stdin) cannot be combined with --files-from"
+    if source == STDIN_PATH and getattr(args, "diff", None) == STDIN_PATH:
+        return f"--files-from {STDIN_PATH} cannot be combined with --diff {STDIN_PATH}"
+    return None
+
+
+def missing_inputs(args: argparse.Namespace) -> list[str]:
+    """Return the path arguments and --files-from list that do not exist.
+
+    Paths inside the list are not checked here; the scan reports those it
+    cannot open.
+    """
+    paths = [path for path in args.files if path != STDIN_PATH]
+    source = getattr(args, "files_from", None)
+    if source is not None and source != STDIN_PATH:
+        paths.append(source)
+    return [path for path in paths if not Path(path).exists()]
+
+
+def reads_stdin(args: argparse.Namespace) -> bool:
+    """Return whether the content comes from stdin ('-' as the path)."""
+    return STDIN_PATH in args.files
+
+
+def stdin_usage_error(args: argparse.Namespace) -> str | None:
+    """Return why the stdin-related arguments cannot be used together, if so."""
+    if not reads_stdin(args):
+        if getattr(args, "stdin_filename", None):
+            return f"--stdin-filename requires '{STDIN_PATH}' as the path"
+        return None
+    if args.files != [STDIN_PATH]:
+        return f"'{STDIN_PATH}' (stdin) cannot be combined with other paths"
+    if getattr(args, "diff", None) == STDIN_PATH:
+        return f"--diff {STDIN_PATH} cannot be used when the content comes from stdin"
+    return None
+
+
+def watch_usage_error(args: argparse.Namespace) -> str | None:
+    """Return why --watch cannot be used with the other arguments, if so."""
+    if not getattr(args, "watch", False):
+        return None
+    if reads_stdin(args):
+        return f"--watch cannot read from stdin ('{STDIN_PATH}')"
+    if getattr(args, "diff", None):
+        return "--watch cannot be combined with --diff"
+    if (getattr(args, "format", None) or "text") != "text":
+        return "--watch only supports the text output format"
+    if any(getattr(args, name, None) for name in ("stats", "memstats", "profile")):
+        return "--watch cannot be combined with --stats, --memstats or --profile"
+    return None
+
+
+def read_stdin() -> bytes:
+    """Read all of stdin as bytes."""
+    buffer = getattr(sys.stdin, "buffer", None)
+    if buffer is not None:
+        return cast("bytes", buffer.read())
+    return sys.stdin.read().encode("utf-8")
+
+
+def write_stdout(data: bytes) -> None:
+    """Write bytes to stdout unchanged."""
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is not None:
+        buffer.write(data)
+        buffer.flush()
+    else:
+        sys.stdout.write(data.decode("utf-8", "surrogateescape"))
+
+
+def stdin_file(args: argparse.Namespace) -> "ScannedFile":
+    """Read stdin as a file named after --stdin-filename, or "<stdin>".
+
+    The name is resolved like scanned paths, so output and --diff ranges
+    refer to the file the content belongs to.
+    """
+    from ascii_guard.scanner import ScannedFile
+
+    name = getattr(args, "stdin_filename", None)
+    return ScannedFile(Path(name).resolve() if name else Path("<stdin>"), read_stdin())
+
+
+def stdin_selected(
+    args: argparse.Namespace,
+    scanned: "ScannedFile",
+    config: Config | None,
+    resolver: ConfigResolver | None,
+    only: set[Path] | None = None,
+) -> bool:
+    """Return whether a scan would select the file named by --stdin-filename.
+
+    Without a name the content is always checked. With one, the config that
+    applies to it decides, and only (e.g. from --changed-since) must
+    contain it.
+    """
+    from ascii_guard.scanner import select_path
+
+    if not getattr(args, "stdin_filename", None):
+        return True
+    if only is not None and scanned.path not in only:
+        return False
+    return select_path(scanned.path, config, resolver) is not None
+
+
+def non_negative_int(value: str) -> int:
+    """Parse a non-negative integer command-line argument."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value!r}") from None
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be non-negative: {value}")
+    return number
+
+
+def positive_int(value: str) -> int:
+    """Parse a positive integer command-line argument."""
+    number = non_negative_int(value)
+    if number == 0:
+        raise argparse.ArgumentTypeError(f"must be positive: {value}")
+    return number
+
+
+def print_config(config: Config, source: str) -> None:
+    """Print the effective settings of a config."""
+    print(styled(f"Config loaded from: {source}", COLOR_BLUE))
+    print(f"  Extensions: {config.extensions or 'all text files'}")
+    print(f"  Exclude: {config.exclude}")
+    print(f"  Include: {config.include}")
+    print(f"  Follow symlinks: {config.follow_symlinks}")
+    print(f"  Max file size: {config.max_file_size}MB")
+    performance = config.performance
+    if performance != PerformanceConfig():
+        print(f"  Performance: {performance}")
+
+
+def lint_results(
+    args: argparse.Namespace,
+    config: Config | None,
+    resolver: ConfigResolver | None,
+    stats: "RunStats | None" = None,
+) -> Iterator[tuple["ScannedFile", LintResult | Exception]]:
+    """Lint the input paths, yielding (file, result or exception) in scan order.
+
+    Content is read once by the scanner in a background thread and handed
+    straight to the linter, so linting starts before the walk finishes.
+    With several jobs, files are linted by a worker pool. Persistent caches
+    are updated as results arrive and saved once the run is complete.
+    Files and the time spent scanning, reading and linting them are
+    recorded in stats, if given. args.performance, if set, replaces the
+    [performance] settings, and args.min_parallel_files and
+    args.min_parallel_bytes the size from which a pool is started (see
+    cmd_bench).
+    """
+    from ascii_guard.linter import lint_file
+    from ascii_guard.parallel import (
+        MIN_PARALLEL_BYTES,
+        MIN_PARALLEL_FILES,
+        TaskOptions,
+        iter_results,
+        resolve_jobs,
+    )
+    from ascii_guard.scanner import prefetch, scan_files
+
+    exclude_code_blocks = getattr(args, "exclude_code_blocks", False)
+    performance = getattr(args, "performance", None) or run_performance(config, resolver)
+    scan_cache = load_scan_cache(args, performance)
+    # Files whose content is unchanged are answered from the result cache
+    # without being read, and never reach a worker
+    result_cache = load_result_cache(args, performance, exclude_code_blocks)
+
+    # Restrict the run to changed files, and with --diff to boxes touching
+    # changed lines. Partial results are never cached
+    only = load_changed_files(args)
+    diff_ranges = load_diff_ranges(args)
+    if diff_ranges is not None:
+        only = set(diff_ranges) if only is None else only & set(diff_ranges)
+        result_cache = None
+
+    options = TaskOptions(
+        mode="lint",
+        exclude_code_blocks=exclude_code_blocks,
+        performance=performance,
+        line_ranges=(
+            {str(path): ranges for path, ranges in diff_ranges.items()}
+            if diff_ranges is not None
+            else None
+        ),
+        stats=stats is not None,
+    )
+
+    def cached_result(scanned: "ScannedFile") -> tuple[Any, ...] | None:
+        if result_cache is None:
+            return None
+        return result_cache.lookup(scanned.path, scanned.data)
+
+    def lint_scanned(scanned: "ScannedFile", timer: "PhaseTimer | None" = None) -> LintResult:
+        return lint_file(
+            str(scanned.path),
+            exclude_code_blocks=exclude_code_blocks,
+            data=scanned.data,
+            performance=performance,
+            line_ranges=diff_ranges.get(scanned.path) if diff_ranges is not None else None,
+            timer=timer,
+        )
+
+    if reads_stdin(args):
+        # Content that is not on disk is never cached
+        scanned = stdin_file(args)
+        if stdin_selected(args, scanned, config, resolver, only):
+            outcome: LintResult | Exception
+            timer = stats.new_timer() if stats is not None else None
+            try:
+                outcome = lint_scanned(scanned, timer)
+            except Exception as e:
+                outcome = e
+            if stats is not None and timer is not None:
+                boxes = outcome.boxes_found if isinstance(outcome, LintResult) else 0
+                stats.add_file(str(scanned.path), scanned.data, boxes, timer.totals())
+            yield scanned, outcome
+        return
+
+    # The walk and reads happen in the scan thread, timed by a timer of its own
+    scan_timer = stats.new_timer() if stats is not None else None
+    scanned_files = scan_files(
+        input_paths(args),
+        config,
+        cache=scan_cache,
+        resolver=resolver,
+        skip_read=result_cache.is_unchanged if result_cache is not None else None,
+        only=only,
+        timer=scan_timer,
+        report_missing=True,
+    )
+    if scan_timer is not None:
+        scanned_files = scan_timer.iterate("scan", scanned_files)
+    jobs = resolve_jobs(getattr(args, "jobs", None), performance)
+    results = iter_results(
+        prefetch(scanned_files, prefetch_size(performance, stats)),
+        options,
+        jobs=jobs,
+        backend=performance.backend,
+        run_inline=lint_scanned,
+        min_parallel_files=getattr(args, "min_parallel_files", MIN_PARALLEL_FILES),
+        min_parallel_bytes=getattr(args, "min_parallel_bytes", MIN_PARALLEL_BYTES),
+        pool=worker_pool(args, performance.backend, jobs),
+        cached=cached_result if result_cache is not None else None,
+        stats=stats,
+    )
+
+    for scanned, result in results:
+        if isinstance(result, Exception):
+            yield scanned, result
+            continue
+        result = cast("LintResult", result)
+        if result_cache is not None:
+            result_cache.store(scanned.path, scanned.data, result)
+        yield scanned, result
+
+    if stats is not None and scan_timer is not None:
+        stats.add_phases(scan_timer.totals())
+    if scan_cache is not None:
+        scan_cache.save()
+    if result_cache is not None:
+        result_cache.save()
+
+
+def report_lint(
+    args: argparse.Namespace,
+    config: Config | None,
+    resolver: ConfigResolver | None,
+    output_format: str,
+) -> int:
+    """Lint the input paths and write results in a machine-readable format.
+
+    Records go to stdout as each file completes; human-readable notices
+    (warnings, processing errors) go to stderr so stdout stays parseable.
+    """
+    from ascii_guard.reporters import create_reporter
+    from ascii_guard.stats import timing
+
+    reporter = create_reporter(output_format, sys.stdout)
+    stats: "RunStats | None" = getattr(args, "run_stats", None)
+    timer = stats.timer if stats is not None else None
+    with contextlib.redirect_stdout(sys.stderr):
+        with timing(timer, "output"):
+            reporter.start()
+        for scanned, result in lint_results(args, config, resolver, stats):
+            with timing(timer, "output"):
+                if isinstance(result, Exception):
+                    print_error(f"Error processing {scanned.path}: {result}")
+                    reporter.failure(str(scanned.path), result)
+                else:
+                    reporter.result(str(scanned.path), result)
+        with timing(timer, "output"):
+            reporter.finish()
+
+    summary = reporter.summary
+    return 1 if summary.files_with_errors or summary.files_failed else 0
+
+
+Outcomes = dict[Path, LintResult | Exception]
+
+
+def lint_snapshot(
+    args: argparse.Namespace,
+    config: Config | None,
+    resolver: ConfigResolver | None,
+    files: list[Path] | None = None,
+) -> Outcomes:
+    """Lint the input paths, or only the given files, and map each file to its outcome."""
+    if files is not None:
+        args = argparse.Namespace(**{**vars(args), "files": [str(path) for path in files]})
+    return {scanned.path: result for scanned, result in lint_results(args, config, resolver)}
+
+
+def watch_triggers(args: argparse.Namespace, resolver: ConfigResolver | None) -> list[Path]:
+    """Return the paths whose changes require a full rescan: input directories and configs."""
+    triggers = [Path(path).resolve() for path in args.files if Path(path).is_dir()]
+    config_path = getattr(args, "config", None)
+    if config_path:
+        triggers.append(Path(config_path).resolve())
+    elif resolver is not None:
+        triggers.extend(resolver.config_files)
+    return triggers
+
+
+def print_stats(stats: "RunStats") -> None:
+    """Print run stats to stderr, keeping stdout (e.g. JSON output) clean."""
+    megabytes = stats.size / (1024 * 1024)
+    lines = [
+        "\n" + styled("Stats:", COLOR_BOLD, sys.stderr),
+        f"  Wall time: {stats.wall:.3f}s (CPU {stats.cpu:.3f}s)",
+        f"  Files: {stats.files} ({stats.cached} cached), {megabytes:.2f} MB, "
+        f"{stats.lines} lines, {stats.boxes} boxes",
+        f"  Throughput: {stats.files_per_second:.1f} files/s, {stats.mb_per_second:.2f} MB/s, "
+        f"{stats.lines_per_second:.0f} lines/s, {stats.boxes_per_second:.1f} boxes/s",
+        "  Phases (wall / CPU, summed over threads and workers):",
+    ]
+    for name, phase in stats.phases.items():
+        lines.append(f"    {name:<10} {phase.wall:9.3f}s {phase.cpu:9.3f}s")
+    if stats.slowest:
+        lines.append("  Slowest files:")
+        for entry in stats.slowest:
+            lines.append(f"    {entry.seconds:8.3f}s {entry.boxes:6d} box(es)  {entry.path}")
+    print("\n".join(lines), file=sys.stderr)
+
+
+def print_memstats(tracker: "MemoryTracker") -> None:
+    """Print memory stats to stderr, keeping stdout (e.g. JSON output) clean."""
+    from ascii_guard.memstats import format_bytes
+
+    lines = [
+        "\n" + styled("Memory (tracemalloc):", COLOR_BOLD, sys.stderr),
+        f"  Peak: {format_bytes(tracker.peak)}, "
+        f"still allocated at the end: {format_bytes(tracker.retained)}",
+        "  Phases (peak / retained, summed over calls):",
+    ]
+    for name, phase in tracker.phases.items():
+        lines.append(
+            f"    {name:<10} {format_bytes(phase.peak):>10} {format_bytes(phase.retained):>10}"
+        )
+    if tracker.largest:
+        lines.append("  Highest peaks (peak / retained):")
+        for entry in tracker.largest:
+            peak, retained = format_bytes(entry.peak), format_bytes(entry.retained)
+            lines.append(f"    {peak:>10} {retained:>10}  {entry.path}")
+    for title, entries in (
+        ("Lines holding the most memory at the high-water mark:", tracker.high_water),
+        ("Lines still holding memory at the end:", tracker.still_allocated),
+    ):
+        if entries:
+            lines.append(f"  {title}")
+            for line in entries:
+                lines.append(f"    {format_bytes(line.size):>10} {line.count:8d} blocks  {line}")
+    print("\n".join(lines), file=sys.stderr)
+
+
+def print_changes(
+    path: Path, before: LintResult | Exception | None, after: LintResult | Exception | None
+) -> None:
+    """Print the issues of a file that were introduced or resolved by a change."""
+    from ascii_guard.watch import compare_issues
+
+    old_issues = [*before.errors, *before.warnings] if isinstance(before, LintResult) else []
+    new_issues = [*after.errors, *after.warnings] if isinstance(after, LintResult) else []
+    introduced, resolved = compare_issues(old_issues, new_issues)
+    failed = isinstance(after, Exception) and str(after) != str(before)
+    if not (introduced or resolved or failed):
+        return
+
+    print("\n" + styled(str(path), COLOR_BOLD))
+    if failed:
+        print_error(f"  Error processing {path}: {after}")
+    for issue in introduced:
+        if issue.severity == "error":
+            print_error(f"  {issue}")
+        else:
+            print_warning(f"  {issue}")
+    for issue in resolved:
+        print_success(f"  Resolved: {issue}")
+
+
+def print_watch_status(outcomes: Outcomes) -> None:
+    """Print the totals after a (re-)lint."""
+    results = [result for result in outcomes.values() if isinstance(result, LintResult)]
+    errors = sum(len(result.errors) for result in results)
+    warnings = sum(len(result.warnings) for result in results)
+    print_info(
+        f"[{time.strftime('%H:%M:%S')}] {len(outcomes)} file(s), {errors} error(s), "
+        f"{warnings} warning(s); watching for changes (Ctrl+C to stop)"
+    )
+
+
+def watch_lint(
+    args: argparse.Namespace,
+    config: Config | None,
+    resolver: ConfigResolver | None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> int:
+    """Lint, then re-lint files as they change until interrupted.
+
+    Only modified files are linted again. When files may have been added
+    (a watched directory changed) or a config file changed, the inputs are
+    scanned again and unchanged files are answered from the in-memory
+    result cache. Each round prints the issues it introduced and resolved.
+    A round failing on an invalid config file or an unreadable input
+    prints the error and keeps the previous outcomes.
+
+    Returns:
+        Exit code for the last state: 1 if errors remain, else 0
+    """
+    from ascii_guard.watch import FileWatcher
+
+    owns_warm = getattr(args, "warm", None) is None
+    if owns_warm:
+        args.warm = WarmState()  # Keeps results of unchanged files between rounds
+
+    outcomes = lint_snapshot(args, config, resolver)
+    for path, outcome in outcomes.items():
+        print_changes(path, None, outcome)
+    print_watch_status(outcomes)
+    watcher = FileWatcher(outcomes, watch_triggers(args, resolver))
+    changed = False
+
+    try:
+        while True:
+            sleep(watcher.next_interval(changed))
+            changes = watcher.poll()
+            changed = bool(changes)
+            if not changes:
+                continue
+
+            try:
+                if changes.rescan:
+                    config, resolver = load_run_config(args)
+                    updated = lint_snapshot(args, config, resolver)
+                    watcher.watch(updated, watch_triggers(args, resolver))
+                else:
+                    updated = {
+                        path: outcomes[path] for path in outcomes if path not in changes.files
+                    }
+                    modified = [path for path in changes.files if path.exists()]
+                    if modified:
+                        updated.update(lint_snapshot(args, config, resolver, modified))
+            except (ValueError, OSError) as e:
+                # E.g. a config file saved half-way through an edit: keep the
+                # last outcomes and try again on the next change to it
+                print_error(str(e))
+                if isinstance(e, ConfigError):
+                    watcher.watch(outcomes, [*watch_triggers(args, resolver), e.path])
+                continue
+
+            for path in sorted(outcomes.keys() | updated.keys()):
+                before, after = outcomes.get(path), updated.get(path)
+                if before is not after:
+                    print_changes(path, before, after)
+            outcomes = updated
+            print_watch_status(outcomes)
+    except KeyboardInterrupt:
+        print_info("Stopped watching")
+    finally:
+        if owns_warm:
+            args.warm.shutdown()
+            del args.warm
+
+    failed = any(
+        isinstance(outcome, Exception) or outcome.has_errors for outcome in outcomes.values()
+    )
+    return 1 if failed else 0
 
 
 def cmd_lint(args: argparse.Namespace) -> int:
@@ -64,46 +863,66 @@ def cmd_lint(args: argparse.Namespace) -> int:
     total_boxes = 0
 
     # Load config
-    config = load_config(args.config) if hasattr(args, "config") and args.config else None
+    config, resolver = load_run_config(args)
 
     # Show config if requested
     if hasattr(args, "show_config") and args.show_config:
         if config:
-            print(f"{COLOR_BLUE}Config loaded from: {args.config}{COLOR_RESET}")
-            print(f"  Extensions: {config.extensions or 'all text files'}")
-            print(f"  Exclude: {config.exclude}")
-            print(f"  Include: {config.include}")
-            print(f"  Follow symlinks: {config.follow_symlinks}")
-            print(f"  Max file size: {config.max_file_size}MB")
-        else:
-            print(f"{COLOR_BLUE}Using default config (no .ascii-guard.toml found){COLOR_RESET}")
+            print_config(config, args.config)
+        elif resolver is not None:
+            # Show the config that applies to each input path
+            shown: set[Path | None] = set()
+            for input_path in args.files:
+                path = Path(input_path).resolve()
+                directory = path if path.is_dir() else path.parent
+                config_file = resolver.find_config_file(directory)
+                if config_file is None:
+                    if None not in shown:
+                        print(
+                            styled("Using default config (no .ascii-guard.toml found)", COLOR_BLUE)
+                        )
+                elif config_file not in shown:
+                    print_config(resolver.resolve(directory)[0], str(config_file))
+                shown.add(config_file)
         print()
 
+    usage_error = stdin_usage_error(args) or files_from_usage_error(args) or watch_usage_error(args)
+    if usage_error is not None:
+        print_error(usage_error)
+        return 1
+
     # Check that input paths exist
-    for input_path in args.files:
-        path = Path(input_path)
-        if not path.exists():
-            print_error(f"Path not found: {input_path}")
-            exit_code = 1
+    for input_path in missing_inputs(args):
+        print_error(f"Path not found: {input_path}")
+        exit_code = 1
 
     if exit_code != 0:
         return exit_code
 
-    # Scan paths (handles both files and directories)
-    file_paths = scan_paths(args.files, config)
+    if getattr(args, "watch", False):
+        return watch_lint(args, config, resolver)
 
-    if not file_paths:
-        print_warning("No files found to lint")
-        return 0
+    output_format = getattr(args, "format", None) or "text"
+    if output_format != "text":
+        return report_lint(args, config, resolver, output_format)
 
-    for file_path in file_paths:
-        try:
-            exclude_code_blocks = getattr(args, "exclude_code_blocks", False)
-            result = lint_file(str(file_path), exclude_code_blocks=exclude_code_blocks)
+    from ascii_guard.stats import timing
+
+    files_checked = 0
+    stats: "RunStats | None" = getattr(args, "run_stats", None)
+    timer = stats.timer if stats is not None else None
+    for scanned, result in lint_results(args, config, resolver, stats):
+        with timing(timer, "output"):
+            file_path = scanned.path
+            files_checked += 1
+            if isinstance(result, Exception):
+                print_error(f"Error processing {file_path}: {result}")
+                exit_code = 1
+                continue
             total_boxes += result.boxes_found
 
             if not args.quiet:
-                print(f"\n{COLOR_BOLD}Checking {file_path}...{COLOR_RESET}")
+                print("\n" + styled(f"Checking {file_path}...", COLOR_BOLD))
                 print(f"  Found {result.boxes_found} ASCII box(es)")
 
             if result.has_errors:
@@ -124,13 +943,13 @@ def cmd_lint(args: argparse.Namespace) -> int:
             if result.is_clean and not args.quiet:
                 print_success("  No issues found")
 
-        except Exception as e:
-            print_error(f"Error processing {file_path}: {e}")
-            exit_code = 1
+    if files_checked == 0:
+        print_warning("No files found to lint")
+        return 0
 
     # Summary
-    print(f"\n{COLOR_BOLD}Summary:{COLOR_RESET}")
-    print(f"  Files checked: {len(file_paths)}")
+    print("\n" + styled("Summary:", COLOR_BOLD))
+    print(f"  Files checked: {files_checked}")
     print(f"  Boxes found: {total_boxes}")
 
     if total_errors > 0:
@@ -144,37 +963,140 @@ def cmd_lint(args: argparse.Namespace) -> int:
     return exit_code
 
 
+def fix_stdin(
+    args: argparse.Namespace, config: Config | None, resolver: ConfigResolver | None
+) -> int:
+    """Fix content read from stdin and write the fixed text to stdout.
+
+    Nothing is written to disk. Content without fixes, or whose
+    --stdin-filename the config excludes, is passed through byte for byte;
+    on errors nothing is written. With --dry-run stdout stays empty. Status
+    messages go to stderr.
+    """
+    from ascii_guard.linter import fix_file
+
+    scanned = stdin_file(args)
+    output = cast("bytes", scanned.data)  # Passed through unless fixed
+    stats: "RunStats | None" = getattr(args, "run_stats", None)
+    timer = stats.new_timer() if stats is not None else None
+    with contextlib.redirect_stdout(sys.stderr):
+        if stdin_selected(args, scanned, config, resolver):
+            try:
+                result = fix_file(
+                    str(scanned.path),
+                    dry_run=True,
+                    exclude_code_blocks=getattr(args, "exclude_code_blocks", False),
+                    data=output,
+                    performance=run_performance(config, resolver),
+                    timer=timer,
+                )
+            except Exception as e:
+                print_error(f"Error processing {scanned.path}: {e}")
+                return 1
+            if stats is not None and timer is not None:
+                stats.add_file(str(scanned.path), output, result.boxes_fixed, timer.totals())
+
+            if result.boxes_fixed == 0:
+                print_success(f"{scanned.path}: No fixes needed")
+            elif args.dry_run:
+                print_info(f"{scanned.path}: Would fix {result.boxes_fixed} box(es)")
+            else:
+                print_success(f"{scanned.path}: Fixed {result.boxes_fixed} box(es)")
+                # Same line endings as a fix written to disk
+                output = "".join(line + "\n" for line in result.lines).encode("utf-8")
+
+    if not args.dry_run:
+        write_stdout(output)
+    return 0
+
+
 def cmd_fix(args: argparse.Namespace) -> int:
     """Execute fix command."""
     exit_code = 0
     total_fixed = 0
 
     # Load config
-    config = load_config(args.config) if hasattr(args, "config") and args.config else None
+    config, resolver = load_run_config(args)
+
+    usage_error = stdin_usage_error(args) or files_from_usage_error(args)
+    if usage_error is not None:
+        print_error(usage_error)
+        return 1
 
     # Check that input paths exist
-    for input_path in args.files:
-        path = Path(input_path)
-        if not path.exists():
-            print_error(f"Path not found: {input_path}")
-            exit_code = 1
+    for input_path in missing_inputs(args):
+        print_error(f"Path not found: {input_path}")
+        exit_code = 1
 
     if exit_code != 0:
         return exit_code
 
-    # Scan paths (handles both files and directories)
-    file_paths = scan_paths(args.files, config)
+    if reads_stdin(args):
+        return fix_stdin(args, config, resolver)
 
-    if not file_paths:
-        print_warning("No files found to fix")
-        return 0
+    from ascii_guard.linter import fix_file
+    from ascii_guard.parallel import TaskOptions, iter_results, resolve_jobs
+    from ascii_guard.scanner import prefetch, scan_files, unique_files
+    from ascii_guard.stats import timing
 
-    for file_path in file_paths:
-        try:
-            exclude_code_blocks = getattr(args, "exclude_code_blocks", False)
-            result = fix_file(
-                str(file_path), dry_run=args.dry_run, exclude_code_blocks=exclude_code_blocks
-            )
+    # Scan paths (handles both files and directories); content is read once
+    # by the scanner in a background thread and handed straight to the fixer.
+    # With several jobs, each file is fixed by exactly one worker
+    files_processed = 0
+    exclude_code_blocks = getattr(args, "exclude_code_blocks", False)
+    performance = run_performance(config, resolver)
+    scan_cache = load_scan_cache(args, performance)
+    stats: "RunStats | None" = getattr(args, "run_stats", None)
+    scan_timer = stats.new_timer() if stats is not None else None
+    scanned_files = scan_files(
+        input_paths(args),
+        config,
+        cache=scan_cache,
+        resolver=resolver,
+        timer=scan_timer,
+        report_missing=True,
+    )
+    if scan_timer is not None:
+        scanned_files = scan_timer.iterate("scan", scanned_files)
+    options = TaskOptions(
+        mode="fix",
+        exclude_code_blocks=exclude_code_blocks,
+        dry_run=args.dry_run,
+        performance=performance,
+        stats=stats is not None,
+    )
+
+    def fix_scanned(scanned: "ScannedFile", timer: "PhaseTimer | None" = None) -> FixResult:
+        return fix_file(
+            str(scanned.path),
+            dry_run=args.dry_run,
+            exclude_code_blocks=exclude_code_blocks,
+            data=scanned.data,
+            performance=performance,
+            timer=timer,
+        )
+
+    jobs = resolve_jobs(getattr(args, "jobs", None), performance)
+    results = iter_results(
+        unique_files(prefetch(scanned_files, prefetch_size(performance, stats))),
+        options,
+        jobs=jobs,
+        backend=performance.backend,
+        run_inline=fix_scanned,
+        pool=worker_pool(args, performance.backend, jobs),
+        stats=stats,
+    )
+
+    timer = stats.timer if stats is not None else None
+    for scanned, result in results:
+        with timing(timer, "output"):
+            file_path = scanned.path
+            files_processed += 1
+            if isinstance(result, Exception):
+                print_error(f"Error processing {file_path}: {result}")
+                exit_code = 1
+                continue
+            result = cast("FixResult", result)
             total_fixed += result.boxes_fixed
 
             if result.boxes_fixed > 0:
@@ -185,13 +1107,18 @@ def cmd_fix(args: argparse.Namespace) -> int:
             else:
                 print_success(f"{file_path}: No fixes needed")
 
-        except Exception as e:
-            print_error(f"Error processing {file_path}: {e}")
-            exit_code = 1
+    if stats is not None and scan_timer is not None:
+        stats.add_phases(scan_timer.totals())
+    if scan_cache is not None:
+        scan_cache.save()
+
+    if files_processed == 0:
+        print_warning("No files found to fix")
+        return 0
 
     # Summary
-    print(f"\n{COLOR_BOLD}Summary:{COLOR_RESET}")
-    print(f"  Files processed: {len(file_paths)}")
+    print("\n" + styled("Summary:", COLOR_BOLD))
+    print(f"  Files processed: {files_processed}")
 
     if args.dry_run:
         print_info(f"  Boxes that would be fixed: {total_fixed}")
@@ -201,8 +1128,96 @@ def cmd_fix(args: argparse.Namespace) -> int:
     return exit_code
 
 
-def main() -> NoReturn:
-    """Main CLI entry point."""
+def print_bench_result(result: "BenchResult") -> None:
+    """Print one configuration of a benchmark as it finishes."""
+    stats = result.stats
+    efficiency = f"{result.efficiency:.0%}" if result.efficiency is not None else "-"
+    print(
+        f"  {result.config.name:<26} {stats.wall:8.3f}s {stats.files_per_second:10.1f} "
+        f"{stats.mb_per_second:8.2f} {result.speedup:7.2f}x {efficiency:>10}",
+        flush=True,
+    )
+
+
+def print_bench_report(report: "BenchReport") -> None:
+    """Print the phase breakdown of the serial run and the recommendation."""
+    serial = report.results[0].stats
+    total = sum(phase.wall for phase in serial.phases.values()) or 1.0
+    print("\n" + styled("Phases of the serial run (wall):", COLOR_BOLD))
+    for name, phase in serial.phases.items():
+        print(f"    {name:<10} {phase.wall:9.3f}s {phase.wall / total:6.1%}")
+
+    recommendation = report.recommendation
+    print("\n" + styled("Recommended configuration:", COLOR_BOLD))
+    for line in recommendation.to_toml().splitlines():
+        print(f"  {line}")
+    print()
+    for reason in recommendation.reasons:
+        print_info(reason)
+
+
+def cmd_bench(args: argparse.Namespace) -> int:
+    """Execute bench command: lint the paths in several configurations and compare.
+
+    Runs the lint pipeline without modifying any file; caches are kept in a
+    temporary directory (see bench.run_bench). Runs with several jobs always
+    use a pool, however few files there are.
+    """
+    from ascii_guard.bench import run_bench
+    from ascii_guard.parallel import available_cpus
+    from ascii_guard.stats import RunStats
+
+    config, resolver = load_run_config(args)
+    for input_path in args.files:
+        if not Path(input_path).exists():
+            print_error(f"Path not found: {input_path}")
+            return 1
+    performance = run_performance(config, resolver)
+
+    def run(bench_config: "BenchConfig", cache_dir: str | None) -> "RunStats":
+        run_args = argparse.Namespace(
+            files=args.files,
+            exclude_code_blocks=args.exclude_code_blocks,
+            jobs=bench_config.jobs,
+            cache=cache_dir is not None,
+            cache_dir=cache_dir,
+            performance=dataclasses.replace(performance, prefilter=bench_config.prefilter),
+            # Measure the pool even for trees lint would run in one process
+            min_parallel_files=1,
+            min_parallel_bytes=0,
+        )
+        stats = RunStats(top=0)
+        for _ in lint_results(run_args, config, resolver, stats):
+            pass
+        stats.finish()
+        return stats
+
+    text = args.format == "text"
+    max_jobs = args.max_jobs or available_cpus()
+    if text:
+        print(
+            f"Benchmarking {', '.join(args.files)} with up to {max_jobs} job(s), "
+            f"best of {args.repeat} run(s) each:"
+        )
+        print(
+            f"  {'Configuration':<26} {'Wall':>9} {'Files/s':>10} {'MB/s':>8} "
+            f"{'Speedup':>8} {'Efficiency':>10}"
+        )
+    try:
+        report = run_bench(run, max_jobs, args.repeat, print_bench_result if text else None)
+    except ValueError as e:
+        print_warning(str(e))
+        return 1
+
+    if text:
+        print_bench_report(report)
+    else:
+        print(json.dumps(report.to_dict(), indent=2))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser."""
     parser = argparse.ArgumentParser(
         prog="ascii-guard",
         description="Lint and fix ASCII art boxes in documentation",
@@ -219,7 +1234,9 @@ def main() -> NoReturn:
 
     # Lint command
     lint_parser = subparsers.add_parser("lint", help="Check files for ASCII art issues")
-    lint_parser.add_argument("files", nargs="+", help="Files or directories to lint")
+    lint_parser.add_argument(
+        "files", nargs="*", help="Files or directories to lint ('-' reads from stdin)"
+    )
     lint_parser.add_argument(
         "-q",
         "--quiet",
@@ -236,15 +1253,69 @@ def main() -> NoReturn:
         action="store_true",
         help="Show effective configuration and exit",
     )
+    lint_parser.add_argument(
+        "--stdin-filename",
+        metavar="PATH",
+        help="File name for content read from stdin ('-'); selects the config and "
+        "applies its exclude/include patterns",
+    )
     lint_parser.add_argument(
         "--exclude-code-blocks",
         action="store_true",
         help="Skip ASCII boxes inside markdown code blocks (```)",
     )
+    lint_parser.add_argument(
+        "--cache",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Reuse scan and lint results from previous runs (stored in --cache-dir; "
+        "default: [performance] cache)",
+    )
+    lint_parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help=f"Directory for persistent caches (default: [performance] cache_dir "
+        f"or {DEFAULT_CACHE_DIR})",
+    )
+
+    lint_parser.add_argument(
+        "--changed-since",
+        metavar="REF",
+        help="Only lint files changed since git REF (plus untracked files)",
+    )
+    lint_parser.add_argument(
+        "--diff",
+        metavar="REF|-",
+        help="Only validate boxes touching lines changed since git REF, or in a "
+        "unified diff read from stdin ('-')",
+    )
+    lint_parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and re-lint files as they change, printing new and resolved issues",
+    )
+    lint_parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="text",
+        help="Output format: human-readable text (default), JSON Lines, JSON, "
+        "SARIF or GitHub Actions annotations",
+    )
+    lint_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=non_negative_int,
+        help="Number of parallel workers (default: [performance] jobs; 0 = one per CPU)",
+    )
 
     # Fix command
     fix_parser = subparsers.add_parser("fix", help="Auto-fix ASCII art issues")
-    fix_parser.add_argument("files", nargs="+", help="Files or directories to fix")
+    fix_parser.add_argument(
+        "files",
+        nargs="*",
+        help="Files or directories to fix ('-' reads from stdin and writes the fixed text "
+        "to stdout)",
+    )
     fix_parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -255,28 +1326,277 @@ def main() -> NoReturn:
         type=str,
         help="Path to config file (default: auto-detect .ascii-guard.toml)",
     )
+    fix_parser.add_argument(
+        "--stdin-filename",
+        metavar="PATH",
+        help="File name for content read from stdin ('-'); selects the config and "
+        "applies its exclude/include patterns",
+    )
     fix_parser.add_argument(
         "--exclude-code-blocks",
         action="store_true",
         help="Skip ASCII boxes inside markdown code blocks (```)",
     )
+    fix_parser.add_argument(
+        "--cache",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Reuse directory scan results from previous runs (stored in --cache-dir; "
+        "default: [performance] cache)",
+    )
+    fix_parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help=f"Directory for persistent caches (default: [performance] cache_dir "
+        f"or {DEFAULT_CACHE_DIR})",
+    )
 
-    args = parser.parse_args()
+    fix_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=non_negative_int,
+        help="Number of parallel workers (default: [performance] jobs; 0 = one per CPU)",
+    )
+
+    for command_parser in (lint_parser, fix_parser):
+        command_parser.add_argument(
+            "--files-from",
+            metavar="FILE|-",
+            help="Also process the paths listed in FILE ('-' reads the list from stdin), "
+            "one per line; the list is streamed, so it may hold any number of paths",
+        )
+        command_parser.add_argument(
+            "-0",
+            "--null",
+            action="store_true",
+            help="Paths in the --files-from list are separated by NUL characters "
+            "(e.g. from git ls-files -z or find -print0)",
+        )
+        command_parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Print per-phase wall and CPU time, throughput and the slowest files to stderr",
+        )
+        command_parser.add_argument(
+            "--stats-top",
+            type=non_negative_int,
+            default=DEFAULT_TOP_FILES,
+            metavar="N",
+            help=f"Number of files (and source lines) listed by --stats and --memstats "
+            f"(default: {DEFAULT_TOP_FILES})",
+        )
+        command_parser.add_argument(
+            "--memstats",
+            action="store_true",
+            help="Print peak and retained memory per phase and file, and the source lines "
+            "allocating the most, to stderr (tracemalloc; runs with one job)",
+        )
+        command_parser.add_argument(
+            "--profile",
+            metavar="FILE",
+            help="Write a cProfile profile of the run to FILE (pstats format; worker "
+            "processes are not profiled, use -j 1 to see all the work)",
+        )
+
+    bench_parser = subparsers.add_parser(
+        "bench",
+        help="Measure lint throughput on your files in several configurations "
+        "and recommend [performance] settings (no files are modified)",
+    )
+    bench_parser.add_argument("files", nargs="+", help="Files or directories to lint")
+    bench_parser.add_argument(
+        "--config",
+        type=str,
+        help="Path to config file (default: auto-detect .ascii-guard.toml)",
+    )
+    bench_parser.add_argument(
+        "--exclude-code-blocks",
+        action="store_true",
+        help="Skip ASCII boxes inside markdown code blocks (```)",
+    )
+    bench_parser.add_argument(
+        "--max-jobs",
+        type=non_negative_int,
+        default=0,
+        metavar="N",
+        help="Highest number of workers to try (default: 0 = one per available CPU)",
+    )
+    bench_parser.add_argument(
+        "--repeat",
+        type=positive_int,
+        default=DEFAULT_BENCH_REPEAT,
+        metavar="N",
+        help=f"Runs per configuration; the fastest is kept (default: {DEFAULT_BENCH_REPEAT})",
+    )
+    bench_parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format (default: text)",
+    )
+
+    daemon_parser = subparsers.add_parser(
+        "daemon", help="Serve lint and fix requests from ascii-guard-client"
+    )
+    daemon_parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="Unix socket to listen on (default: per-user socket in $XDG_RUNTIME_DIR or /tmp)",
+    )
+    daemon_parser.add_argument(
+        "--idle-timeout",
+        type=non_negative_int,
+        default=DEFAULT_IDLE_TIMEOUT,
+        metavar="SECONDS",
+        help=f"Exit after this long without requests (default: {DEFAULT_IDLE_TIMEOUT}; 0 = never)",
+    )
+    daemon_parser.add_argument(
+        "--status",
+        action="store_true",
+        help="Report whether a daemon is running and exit",
+    )
+    daemon_parser.add_argument(
+        "--stop",
+        action="store_true",
+        help="Stop a running daemon and exit",
+    )
+
+    lsp_parser = subparsers.add_parser(
+        "lsp", help="Run a Language Server Protocol server on stdin/stdout"
+    )
+    lsp_parser.add_argument(
+        "--stdio",
+        action="store_true",
+        help="Communicate over stdin/stdout (the default; accepted for editor clients)",
+    )
+    lsp_parser.add_argument(
+        "--config",
+        type=str,
+        help="Path to config file (default: auto-detect .ascii-guard.toml per document)",
+    )
+    lsp_parser.add_argument(
+        "--exclude-code-blocks",
+        action="store_true",
+        help="Skip ASCII boxes inside markdown code blocks (```)",
+    )
 
+    return parser
+
+
+def run_command(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    """Execute the command selected by parsed arguments.
+
+    Returns:
+        Exit code
+    """
     if not args.command:
         parser.print_help()
-        sys.exit(0)
+        return 0
+
+    if args.command in ("lint", "fix") and not args.files and args.files_from is None:
+        parser.error(f"{args.command}: the following arguments are required: files")
 
     # Execute command
-    if args.command == "lint":
-        exit_code = cmd_lint(args)
-    elif args.command == "fix":
-        exit_code = cmd_fix(args)
-    else:
-        parser.print_help()
-        exit_code = 1
+    try:
+        if args.command == "lint":
+            return run_instrumented(args, cmd_lint)
+        if args.command == "fix":
+            return run_instrumented(args, cmd_fix)
+        if args.command == "bench":
+            return cmd_bench(args)
+        if args.command == "lsp":
+            return cmd_lsp(args)
+    except ConfigError as e:
+        # Also raised for config files found while scanning, e.g. a stray
+        # invalid .ascii-guard.toml in a subdirectory
+        print_error(str(e))
+        return 1
+    if args.command == "daemon":
+        return cmd_daemon(args)
+    parser.print_help()
+    return 1
+
 
-    sys.exit(exit_code)
+def run_instrumented(args: argparse.Namespace, command: Callable[[argparse.Namespace], int]) -> int:
+    """Run lint or fix, with --stats, --memstats and --profile if requested.
+
+    The stats are set as args.run_stats for the command to fill in, and
+    printed to stderr when it returns. With --memstats, the run is traced
+    by a MemoryTracker and uses one job, as worker processes can't be traced.
+    """
+    from ascii_guard.stats import RunStats, profiled
+
+    stats = tracker = None
+    top = getattr(args, "stats_top", DEFAULT_TOP_FILES)
+    if getattr(args, "memstats", False):
+        from ascii_guard.memstats import MemoryTracker
+
+        tracker = MemoryTracker(top=top, top_lines=top)
+        args.jobs = 1
+    if getattr(args, "stats", False) or tracker is not None:
+        stats = args.run_stats = RunStats(top=top, memory=tracker)
+        stats.timer = stats.new_timer()
+    profile = getattr(args, "profile", None)
+    if tracker is not None:
+        tracker.start()
+    try:
+        with profiled(profile) if profile else contextlib.nullcontext():
+            return command(args)
+    finally:
+        if tracker is not None:
+            tracker.stop()
+        if stats is not None:
+            del args.run_stats
+            stats.finish()
+            if getattr(args, "stats", False):
+                print_stats(stats)
+        if tracker is not None:
+            print_memstats(tracker)
+        if profile:
+            print(
+                styled(f"ℹ Profile written to {profile}", COLOR_BLUE, sys.stderr), file=sys.stderr
+            )
+
+
+def cmd_daemon(args: argparse.Namespace) -> int:
+    """Execute daemon command: serve requests, or query a running daemon."""
+    from ascii_guard import daemon  # Imported here: the daemon module imports this one
+    from ascii_guard.client import default_socket_path
+
+    socket_path = Path(args.socket) if args.socket else default_socket_path()
+    if args.status or args.stop:
+        running = daemon.is_running(socket_path)
+        if not running:
+            print_info(f"No daemon listening on {socket_path}")
+            return 1 if args.status else 0
+        if args.stop:
+            daemon.stop(socket_path)
+            print_success(f"Stopped daemon on {socket_path}")
+        else:
+            print_success(f"Daemon listening on {socket_path}")
+        return 0
+
+    try:
+        daemon.serve(socket_path, idle_timeout=args.idle_timeout)
+    except daemon.DaemonError as e:
+        print_error(str(e))
+        return 1
+    return 0
+
+
+def cmd_lsp(args: argparse.Namespace) -> int:
+    """Execute lsp command: serve editor requests until the client exits."""
+    from ascii_guard import lsp  # Imported here: no other command needs it
+
+    config, resolver = load_run_config(args)
+    return lsp.serve(config, resolver, exclude_code_blocks=args.exclude_code_blocks)
+
+
+def main() -> NoReturn:
+    """Main CLI entry point."""
+    parser = build_parser()
+    args = parser.parse_args()
+    sys.exit(run_command(parser, args))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,257 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Thin client that forwards lint and fix commands to the daemon.
+
+ascii-guard-client takes the same arguments as ascii-guard. lint and fix
+are sent to a running daemon (see daemon.py), which answers from warm
+configs, caches and worker pools; lint --watch never returns and always
+runs locally. If no daemon is listening, one is
+started in the background and the command runs in this process, so the
+output is the same either way. Everything else runs locally.
+
+Messages are single lines of JSON over a Unix socket: the request carries
+the arguments, working directory and (for '-') stdin; the response carries
+the exit code and the captured stdout and stderr.
+
+ZERO dependencies - uses only Python stdlib (socket + json).
+"""
+
+import contextlib
+import io
+import json
+import os
+import socket
+import stat
+import sys
+from pathlib import Path
+from typing import Any, NoReturn
+
+from ascii_guard import __version__
+
+# Seconds to wait for a connection before falling back to a local run
+CONNECT_TIMEOUT = 1.0
+
+# Largest accepted message (stdin content and captured output included)
+MAX_MESSAGE_BYTES = 256 * 1024 * 1024
+
+# Commands the daemon runs; others never leave the client
+FORWARDED_COMMANDS = ("lint", "fix")
+
+# Options that keep a command running; such commands always run locally
+LOCAL_OPTIONS = ("--watch",)
+
+
+def default_socket_path() -> Path:
+    """Return the per-user, per-version daemon socket path.
+
+    ASCII_GUARD_SOCKET overrides it. The version is part of the name so a
+    client never talks to a daemon running different code.
+    """
+    override = os.environ.get("ASCII_GUARD_SOCKET")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or "/tmp"
+    return Path(base) / f"ascii-guard-{os.getuid()}-{__version__}.sock"
+
+
+def is_forwarded(argv: list[str]) -> bool:
+    """Return whether the daemon runs a command (lint or fix, without --watch)."""
+    return (
+        bool(argv)
+        and argv[0] in FORWARDED_COMMANDS
+        and not any(arg in LOCAL_OPTIONS for arg in argv)
+    )
+
+
+def send_message(conn: socket.socket, message: dict[str, Any]) -> None:
+    """Send one JSON message."""
+    conn.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def receive_message(conn: socket.socket) -> dict[str, Any]:
+    """Receive one JSON message.
+
+    Raises:
+        ConnectionError: If the peer closed the connection first
+        ValueError: If the message is too large or not a JSON object
+    """
+    with conn.makefile("rb") as stream:
+        line = stream.readline(MAX_MESSAGE_BYTES + 1)
+    if not line:
+        raise ConnectionError("Connection closed without a message")
+    if len(line) > MAX_MESSAGE_BYTES:
+        raise ValueError("Message too large")
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError("Message is not a JSON object")
+    return message
+
+
+def check_socket(socket_path: Path) -> None:
+    """Refuse a socket that another user could have created or can reach.
+
+    Without XDG_RUNTIME_DIR the socket lives in a shared directory, where
+    another user could bind the name first and receive our arguments,
+    working directory and stdin, and answer with a fake exit code. The
+    daemon binds its socket with mode 0600; anything else is not ours.
+
+    Raises:
+        FileNotFoundError: If there is no socket
+        PermissionError: If the path is not a socket owned by the current
+            user, or group or others have access to it
+    """
+    st = os.lstat(socket_path)
+    if not stat.S_ISSOCK(st.st_mode):
+        raise PermissionError(f"Not a socket: {socket_path}")
+    if st.st_uid != os.getuid():
+        raise PermissionError(f"Socket owned by another user: {socket_path}")
+    if st.st_mode & 0o077:
+        raise PermissionError(f"Socket accessible to other users: {socket_path}")
+
+
+def connect(socket_path: Path) -> socket.socket:
+    """Connect to the daemon socket after checking it (see check_socket).
+
+    Raises:
+        OSError: If no daemon is listening, or the socket is not the
+            current user's
+    """
+    check_socket(socket_path)
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.settimeout(CONNECT_TIMEOUT)
+        conn.connect(str(socket_path))
+        conn.settimeout(None)
+    except OSError:
+        conn.close()
+        raise
+    return conn
+
+
+def request(socket_path: Path, message: dict[str, Any]) -> dict[str, Any]:
+    """Send a message to the daemon and return its response.
+
+    Raises:
+        OSError: If the daemon cannot be reached
+        ValueError: If the response is malformed
+    """
+    with connect(socket_path) as conn:
+        send_message(conn, message)
+        return receive_message(conn)
+
+
+def start_daemon(socket_path: Path) -> None:
+    """Start a daemon in the background, detached from this process."""
+    import subprocess  # Imported here: only needed when no daemon is running
+
+    command = [sys.executable, "-m", "ascii_guard.cli", "daemon", "--socket", str(socket_path)]
+    with contextlib.suppress(OSError):  # The command still runs locally
+        subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            cwd="/",
+            start_new_session=True,
+        )
+
+
+def _color(stream: Any) -> bool:
+    """Return whether the daemon should color output meant for stream."""
+    isatty = getattr(stream, "isatty", None)
+    return bool(isatty and isatty()) and not os.environ.get("NO_COLOR")
+
+
+def _write(stream: Any, text: str) -> None:
+    """Write daemon output to a local stream, bytes preserved."""
+    data = text.encode("utf-8", "surrogateescape")
+    buffer = getattr(stream, "buffer", None)
+    if buffer is not None:
+        stream.flush()
+        buffer.write(data)
+        buffer.flush()
+    else:
+        stream.write(data.decode("utf-8", "replace"))
+
+
+def forward(argv: list[str], socket_path: Path | None = None) -> int | None:
+    """Run a command on the daemon and write its output here.
+
+    Args:
+        argv: ascii-guard arguments, e.g. ["lint", "docs/"]
+        socket_path: Daemon socket (default: default_socket_path())
+
+    Returns:
+        The command's exit code, or None if it must run locally (not a
+        forwarded command, or no usable daemon). When None is returned
+        after stdin was consumed, sys.stdin is replaced with its content.
+    """
+    if not is_forwarded(argv):
+        return None
+    path = socket_path or default_socket_path()
+    try:
+        conn = connect(path)
+    except OSError:
+        return None
+
+    message: dict[str, Any] = {
+        "version": __version__,
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "color": {"stdout": _color(sys.stdout), "stderr": _color(sys.stderr)},
+    }
+    stdin_data: bytes | None = None
+    # '-' as a path, or as the value of --files-from or --diff
+    if any(arg == "-" or arg.endswith("=-") for arg in argv):
+        buffer = getattr(sys.stdin, "buffer", None)
+        stdin_data = buffer.read() if buffer is not None else sys.stdin.read().encode("utf-8")
+        message["stdin"] = stdin_data.decode("utf-8", "surrogateescape")
+
+    try:
+        with conn:
+            send_message(conn, message)
+            response = receive_message(conn)
+    except (OSError, ValueError):
+        response = {}
+
+    if "exit_code" not in response:
+        if stdin_data is not None:
+            sys.stdin = io.TextIOWrapper(io.BytesIO(stdin_data), encoding="utf-8")
+        return None
+
+    _write(sys.stdout, str(response.get("stdout", "")))
+    _write(sys.stderr, str(response.get("stderr", "")))
+    return int(response["exit_code"])
+
+
+def main() -> NoReturn:
+    """Client entry point (ascii-guard-client)."""
+    argv = sys.argv[1:]
+    path = default_socket_path()
+    exit_code = forward(argv, path)
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    if is_forwarded(argv) and not os.environ.get("ASCII_GUARD_NO_DAEMON"):
+        start_daemon(path)  # Ready for the next invocation
+
+    from ascii_guard.cli import main as cli_main
+
+    sys.argv = ["ascii-guard", *argv]
+    cli_main()
+
+
+if __name__ == "__main__":
+    main()
@@ -19,21 +19,11 @@ Minimal dependencies:
 - Python 3.10: Uses tomli package (one dependency)
 """
 
+import math
 import sys
 from dataclasses import dataclass, field
 from pathlib import Path
-
-# Version-aware TOML import
-# Python 3.11+ has tomllib in stdlib, Python 3.10 needs tomli package
-if sys.version_info >= (3, 11):
-    import tomllib
-else:
-    try:
-        import tomli as tomllib
-    except ImportError as e:
-        raise ImportError(
-            "tomli package is required for Python 3.10. Install with: pip install ascii-guard"
-        ) from e
+from typing import Any
 
 # Default exclusion patterns (used when no config file exists)
 DEFAULT_EXCLUDES = [
@@ -49,9 +39,59 @@ DEFAULT_EXCLUDES = [
     ".pytest_cache/",
     ".ruff_cache/",
     "*.egg-info/",
+    ".ascii-guard-cache/",
 ]
 
 
+# Default cache directory (relative to the current directory)
+DEFAULT_CACHE_DIR = ".ascii-guard-cache"
+
+# Execution backends accepted by [performance] backend
+PERFORMANCE_BACKENDS = ("process", "thread", "serial")
+
+
+class ConfigError(ValueError):
+    """A config file is invalid.
+
+    Attributes:
+        path: Path to the config file
+    """
+
+    def __init__(self, path: Path, message: str) -> None:
+        """Create the error for a config file and the problem found in it."""
+        super().__init__(f"Invalid config {path}: {message}")
+        self.path = path
+
+
+@dataclass
+class PerformanceConfig:
+    """Throughput settings from the [performance] section.
+
+    Attributes:
+        jobs: Number of parallel workers (0 = one per available CPU)
+        backend: Worker pool type: "process", "thread" or "serial"
+        cache: Whether persistent caches are enabled
+        cache_dir: Directory for persistent caches
+        cache_max_size: Maximum size of the result cache in MB (0 = unlimited)
+        max_box_height: Maximum box height in lines (0 = unlimited); bounds
+            the search for a box's bottom border
+        file_timeout: Time budget per file in seconds (0 = unlimited)
+        prefilter: Skip box detection in files without top-left corners
+        prefetch: Number of files read ahead of the linter (0 = no
+            background scanning)
+    """
+
+    jobs: int = 0
+    backend: str = "process"
+    cache: bool = False
+    cache_dir: str = DEFAULT_CACHE_DIR
+    cache_max_size: int = 64
+    max_box_height: int = 0
+    file_timeout: float = 0
+    prefilter: bool = True
+    prefetch: int = 64
+
+
 @dataclass
 class Config:
     """Configuration for ascii-guard linter.
@@ -62,6 +102,7 @@ class Config:
         include: Include patterns (negation - overrides excludes)
         follow_symlinks: Whether to follow symbolic links
         max_file_size: Maximum file size to scan in MB (0 = unlimited)
+        performance: Settings from the [performance] section
     """
 
     extensions: list[str] = field(default_factory=list)
@@ -69,6 +110,20 @@ class Config:
     include: list[str] = field(default_factory=list)
     follow_symlinks: bool = False
     max_file_size: int = 10
+    performance: PerformanceConfig = field(default_factory=PerformanceConfig)
+
+
+# Config file names, in order of preference
+CONFIG_FILE_NAMES = (".ascii-guard.toml", ".ascii-guard")
+
+
+def _config_in_directory(directory: Path) -> Path | None:
+    """Return the config file directly inside directory, if any."""
+    for name in CONFIG_FILE_NAMES:
+        candidate = directory / name
+        if candidate.is_file():
+            return candidate
+    return None
 
 
 def find_config_file(start_path: Path | None = None) -> Path | None:
@@ -89,15 +144,10 @@ def find_config_file(start_path: Path | None = None) -> Path | None:
 
     # Walk up directory tree
     while True:
-        # Check for .ascii-guard.toml (preferred)
-        config_toml = current / ".ascii-guard.toml"
-        if config_toml.exists() and config_toml.is_file():
-            return config_toml
-
-        # Check for .ascii-guard (fallback)
-        config_plain = current / ".ascii-guard"
-        if config_plain.exists() and config_plain.is_file():
-            return config_plain
+        # Check for .ascii-guard.toml (preferred), then .ascii-guard (fallback)
+        config_file = _config_in_directory(current)
+        if config_file is not None:
+            return config_file
 
         # Stop at git root
         if (current / ".git").exists():
@@ -113,6 +163,148 @@ def find_config_file(start_path: Path | None = None) -> Path | None:
     return None
 
 
+def _file_stamp(path: Path) -> tuple[int, int] | None:
+    """Return (mtime_ns, size) of a file, or None if it cannot be stat'ed."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class ConfigResolver:
+    """Resolve the config that applies to each directory of a tree.
+
+    The nearest config file is found by walking up from a directory, exactly
+    like find_config_file(), so a monorepo can keep one .ascii-guard.toml per
+    subproject. Lookups are memoized per directory: every directory visited
+    on the way up records the result, so files that share a subtree cost a
+    single dictionary lookup. Each config file is parsed only once.
+    """
+
+    def __init__(self, default: Config | None = None) -> None:
+        """Create a resolver.
+
+        Args:
+            default: Config used where no config file applies (default: Config())
+        """
+        self.default = default if default is not None else Config()
+        self._config_files: dict[Path, Path | None] = {}
+        self._configs: dict[Path, Config] = {}
+        self._stamps: dict[Path, tuple[int, int] | None] = {}
+
+    def find_config_file(self, directory: Path) -> Path | None:
+        """Find the config file applying to an absolute directory path.
+
+        Args:
+            directory: Absolute directory path
+
+        Returns:
+            Path to the nearest config file, or None if there is none
+        """
+        visited: list[Path] = []
+        current = directory
+        result: Path | None = None
+
+        while True:
+            if current in self._config_files:
+                result = self._config_files[current]
+                break
+            visited.append(current)
+
+            result = _config_in_directory(current)
+            if result is not None:
+                break
+
+            # Stop at git root or filesystem root
+            parent = current.parent
+            if parent == current or (current / ".git").exists():
+                break
+
+            current = parent
+
+        for visited_dir in visited:
+            self._config_files[visited_dir] = result
+        return result
+
+    def resolve(self, directory: Path) -> tuple[Config, Path | None]:
+        """Return the config for a directory and the directory it came from.
+
+        Args:
+            directory: Absolute directory path
+
+        Returns:
+            Tuple of (config, directory containing the config file); the
+            directory is None when the default config applies
+
+        Raises:
+            ConfigError: If a config file is invalid (see load_config)
+        """
+        config_file = self.find_config_file(directory)
+        if config_file is None:
+            return self.default, None
+
+        config = self._configs.get(config_file)
+        if config is None:
+            try:
+                config = load_config(config_file)
+            except ValueError as e:
+                raise ConfigError(config_file, str(e)) from e
+            self._stamps[config_file] = _file_stamp(config_file)
+            self._configs[config_file] = config
+        return config, config_file.parent
+
+    @property
+    def config_files(self) -> list[Path]:
+        """Return the config files parsed so far."""
+        return list(self._configs)
+
+    def refresh(self) -> None:
+        """Pick up config files created, edited or deleted since they were resolved.
+
+        Used by long-lived processes between runs. The directory lookups
+        are forgotten, so new and deleted config files are found again;
+        parsed configs are kept unless their file's mtime or size changed.
+        """
+        self._config_files.clear()
+        for config_file, stamp in list(self._stamps.items()):
+            if _file_stamp(config_file) != stamp:
+                del self._stamps[config_file]
+                self._configs.pop(config_file, None)
+
+    def config_for(self, file_path: Path | str) -> Config:
+        """Return the config that applies to a file.
+
+        Args:
+            file_path: Path to a file
+
+        Returns:
+            Config from the nearest config file, or the default config
+        """
+        return self.resolve(Path(file_path).resolve().parent)[0]
+
+
+def _load_toml(config_file: Path) -> dict[str, Any]:
+    """Parse a TOML file.
+
+    The TOML parser is imported here rather than at module level, so that
+    runs without a config file (most pre-commit runs) never pay for it.
+    """
+    # Python 3.11+ has tomllib in stdlib, Python 3.10 needs tomli package
+    if sys.version_info >= (3, 11):
+        import tomllib
+    else:
+        try:
+            import tomli as tomllib
+        except ImportError as e:
+            raise ImportError(
+                "tomli package is required for Python 3.10. Install with: pip install ascii-guard"
+            ) from e
+
+    with open(config_file, "rb") as f:
+        return tomllib.load(f)
+
+
 def load_config(config_path: Path | str | None = None) -> Config:
     """Load configuration from file or use defaults.
 
@@ -142,8 +334,7 @@ def load_config(config_path: Path | str | None = None) -> Config:
 
     # Parse TOML file
     try:
-        with open(config_file, "rb") as f:
-            data = tomllib.load(f)
+        data = _load_toml(config_file)
     except Exception as e:
         raise ValueError(f"Failed to parse config file {config_file}: {e}") from e
 
@@ -160,7 +351,10 @@ def load_config(config_path: Path | str | None = None) -> Config:
     }
     unknown_keys = set(files_config.keys()) - valid_files_keys
     if unknown_keys:
-        print(f"Warning: Unknown keys in [files] section: {', '.join(unknown_keys)}")
+        print(
+            f"Warning: Unknown keys in [files] section: {', '.join(unknown_keys)}",
+            file=sys.stderr,
+        )
 
     # Build Config object
     config = Config()
@@ -213,10 +407,110 @@ def load_config(config_path: Path | str | None = None) -> Config:
             raise ValueError("[files] max_file_size must be non-negative")
         config.max_file_size = max_file_size
 
-    # Warn about unknown sections (besides [files], [rules], [output])
-    valid_sections = {"files", "rules", "output"}
+    # Extract [performance] section
+    if "performance" in data:
+        performance_config = data["performance"]
+        if not isinstance(performance_config, dict):
+            raise ValueError("[performance] must be a table")
+        config.performance = _parse_performance(performance_config, config_file)
+
+    # Warn about unknown sections (besides [files], [performance], [rules], [output])
+    valid_sections = {"files", "performance", "rules", "output"}
     unknown_sections = set(data.keys()) - valid_sections
     if unknown_sections:
-        print(f"Warning: Unknown config sections: {', '.join(unknown_sections)}")
+        print(
+            f"Warning: Unknown config sections: {', '.join(unknown_sections)}",
+            file=sys.stderr,
+        )
 
     return config
+
+
+def _parse_performance(section: dict[str, object], config_file: Path) -> PerformanceConfig:
+    """Validate the [performance] section and build a PerformanceConfig.
+
+    Args:
+        section: Parsed [performance] table
+        config_file: Path to the config file; a relative cache_dir is
+            resolved against its directory
+
+    Returns:
+        PerformanceConfig with defaults for missing keys
+
+    Raises:
+        ValueError: If a value has the wrong type or is out of range
+    """
+    valid_keys = {
+        "jobs",
+        "backend",
+        "cache",
+        "cache_dir",
+        "cache_max_size",
+        "max_box_height",
+        "file_timeout",
+        "prefilter",
+        "prefetch",
+    }
+    unknown_keys = set(section.keys()) - valid_keys
+    if unknown_keys:
+        print(
+            f"Warning: Unknown keys in [performance] section: {', '.join(unknown_keys)}",
+            file=sys.stderr,
+        )
+
+    performance = PerformanceConfig()
+
+    # Non-negative integers
+    for key in ("jobs", "cache_max_size", "max_box_height", "prefetch"):
+        if key in section:
+            value = section[key]
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise ValueError(
+                    f"[performance] {key} must be an integer, got {type(value).__name__}"
+                )
+            if value < 0:
+                raise ValueError(f"[performance] {key} must be non-negative")
+            setattr(performance, key, value)
+
+    # Booleans
+    for key in ("cache", "prefilter"):
+        if key in section:
+            value = section[key]
+            if not isinstance(value, bool):
+                raise ValueError(
+                    f"[performance] {key} must be a boolean, got {type(value).__name__}"
+                )
+            setattr(performance, key, value)
+
+    # Backend (one of PERFORMANCE_BACKENDS)
+    if "backend" in section:
+        backend = section["backend"]
+        if backend not in PERFORMANCE_BACKENDS:
+            raise ValueError(
+                f"[performance] backend must be one of {', '.join(PERFORMANCE_BACKENDS)}, "
+                f"got {backend!r}"
+            )
+        performance.backend = str(backend)
+
+    # Cache directory (non-empty string)
+    if "cache_dir" in section:
+        cache_dir = section["cache_dir"]
+        if not isinstance(cache_dir, str) or not cache_dir:
+            raise ValueError("[performance] cache_dir must be a non-empty string")
+        # Relative to the config file, so every run shares the same cache
+        performance.cache_dir = str(config_file.resolve().parent / cache_dir)
+
+    # File timeout (non-negative number of seconds)
+    if "file_timeout" in section:
+        file_timeout = section["file_timeout"]
+        if not isinstance(file_timeout, int | float) or isinstance(file_timeout, bool):
+            raise ValueError(
+                f"[performance] file_timeout must be a number, got {type(file_timeout).__name__}"
+            )
+        if not math.isfinite(file_timeout):
+            raise ValueError("[performance] file_timeout must be a finite number")
+        if file_timeout < 0:
+            raise ValueError("[performance] file_timeout must be non-negative")
+        performance.file_timeout = float(file_timeout)
+
+    return performance
@@ -0,0 +1,248 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Long-lived server that runs lint and fix commands for ascii-guard-client.
+
+A one-shot ascii-guard run pays interpreter startup, imports, config
+discovery and pattern compilation every time. The daemon pays them once:
+it listens on a Unix socket and runs each forwarded command in-process
+with a shared WarmState (parsed configs, in-memory result caches keyed by
+content, running worker pools). Compiled patterns stay in their
+process-wide cache. Config files are re-checked by mtime before every
+request, so edits take effect immediately.
+
+Requests are handled one at a time, in arrival order; the daemon exits
+after idle_timeout seconds without requests.
+
+ZERO dependencies - uses only Python stdlib (socket + json).
+"""
+
+import contextlib
+import io
+import os
+import signal
+import socket
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from ascii_guard import __version__
+from ascii_guard.cli import WarmState, build_parser, print_error, run_command
+from ascii_guard.defaults import DEFAULT_IDLE_TIMEOUT
+from ascii_guard.client import (
+    is_forwarded,
+    receive_message,
+    request,
+    send_message,
+)
+
+# Seconds a client may take to send its request
+REQUEST_TIMEOUT = 30.0
+
+
+class DaemonError(RuntimeError):
+    """The daemon cannot start or be reached."""
+
+
+class CapturedOutput(io.TextIOWrapper):
+    """In-memory text stream that reports the client's terminal status.
+
+    Output is colored exactly as it would be in the client's terminal,
+    since styled() asks the stream whether it is a TTY.
+    """
+
+    def __init__(self, tty: bool) -> None:
+        """Create an empty stream; isatty() returns tty."""
+        self._bytes = io.BytesIO()
+        super().__init__(self._bytes, encoding="utf-8", errors="surrogateescape")
+        self._tty = tty
+
+    def isatty(self) -> bool:
+        """Return whether the client's stream is a terminal."""
+        return self._tty
+
+    def text(self) -> str:
+        """Return everything written so far."""
+        self.flush()
+        return self._bytes.getvalue().decode("utf-8", "surrogateescape")
+
+
+def is_running(socket_path: Path) -> bool:
+    """Check whether a daemon answers on socket_path."""
+    try:
+        return request(socket_path, {"command": "ping"}).get("ok") is True
+    except (OSError, ValueError):
+        return False
+
+
+def stop(socket_path: Path) -> None:
+    """Ask the daemon on socket_path to exit.
+
+    Raises:
+        DaemonError: If no daemon answers
+    """
+    try:
+        request(socket_path, {"command": "shutdown"})
+    except (OSError, ValueError) as e:
+        raise DaemonError(f"Cannot reach daemon on {socket_path}: {e}") from e
+
+
+@contextlib.contextmanager
+def _replace_stdin(data: bytes) -> Iterator[None]:
+    """Serve data as sys.stdin for the duration of a command."""
+    saved = sys.stdin
+    sys.stdin = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8")
+    try:
+        yield
+    finally:
+        sys.stdin = saved
+
+
+def run_request(message: dict[str, Any], warm: WarmState) -> dict[str, Any]:
+    """Run a forwarded command and capture its output.
+
+    Args:
+        message: Client request (argv, cwd, color, optional stdin)
+        warm: State shared by all requests
+
+    Returns:
+        Response with exit_code, stdout and stderr, or with error if the
+        request cannot be served
+    """
+    if message.get("version") != __version__:
+        return {"error": f"Daemon runs ascii-guard {__version__}"}
+    argv = message.get("argv")
+    if not isinstance(argv, list) or not is_forwarded([str(arg) for arg in argv]):
+        return {"error": "Only lint and fix without --watch are served"}
+
+    color = message.get("color") or {}
+    stdout = CapturedOutput(bool(color.get("stdout")))
+    stderr = CapturedOutput(bool(color.get("stderr")))
+    stdin = str(message.get("stdin", "")).encode("utf-8", "surrogateescape")
+    parser = build_parser()
+
+    saved_cwd = os.getcwd()
+    try:
+        os.chdir(str(message.get("cwd", saved_cwd)))
+        with (
+            contextlib.redirect_stdout(stdout),
+            contextlib.redirect_stderr(stderr),
+            _replace_stdin(stdin),
+        ):
+            try:
+                args = parser.parse_args([str(arg) for arg in argv])
+                args.warm = warm
+                exit_code = run_command(parser, args)
+            except SystemExit as e:
+                # argparse errors and --help
+                exit_code = e.code if isinstance(e.code, int) else int(e.code is not None)
+            except Exception as e:
+                print_error(f"Internal error: {e}")
+                exit_code = 1
+    except OSError as e:
+        return {"error": f"Cannot change to {message.get('cwd')}: {e}"}
+    finally:
+        os.chdir(saved_cwd)
+
+    return {"exit_code": exit_code, "stdout": stdout.text(), "stderr": stderr.text()}
+
+
+def _handle(conn: socket.socket, warm: WarmState) -> bool:
+    """Serve one connection; return False when the daemon should exit."""
+    conn.settimeout(REQUEST_TIMEOUT)
+    try:
+        message = receive_message(conn)
+    except (OSError, ValueError):
+        return True
+    conn.settimeout(None)
+
+    command = message.get("command")
+    if command == "ping":
+        response: dict[str, Any] = {"ok": True, "version": __version__, "pid": os.getpid()}
+    elif command == "shutdown":
+        response = {"ok": True}
+    else:
+        response = run_request(message, warm)
+
+    with contextlib.suppress(OSError):
+        send_message(conn, response)
+    return command != "shutdown"
+
+
+def _listen(socket_path: Path) -> socket.socket:
+    """Bind a socket only the current user can connect to.
+
+    Raises:
+        DaemonError: If a daemon already listens there or binding fails
+    """
+    if is_running(socket_path):
+        raise DaemonError(f"A daemon is already listening on {socket_path}")
+    with contextlib.suppress(FileNotFoundError):
+        socket_path.unlink()  # Left behind by a daemon that was killed
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    umask = os.umask(0o177)
+    try:
+        server.bind(str(socket_path))
+        server.listen(16)
+    except OSError as e:
+        server.close()
+        raise DaemonError(f"Cannot listen on {socket_path}: {e}") from e
+    finally:
+        os.umask(umask)
+    return server
+
+
+def _exit_on_signal(signum: int, frame: FrameType | None) -> None:
+    """Turn SIGTERM into a normal exit so the socket file is removed."""
+    raise SystemExit(0)
+
+
+def serve(socket_path: Path, idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> None:
+    """Serve requests on socket_path until stopped or idle.
+
+    Args:
+        socket_path: Unix socket to listen on
+        idle_timeout: Seconds without requests after which the daemon
+            exits (0 = never)
+
+    Raises:
+        DaemonError: If the socket cannot be set up
+    """
+    server = _listen(socket_path)
+    inode = os.stat(socket_path).st_ino
+    server.settimeout(idle_timeout or None)
+    warm = WarmState()
+
+    with contextlib.suppress(ValueError):  # Only possible in the main thread
+        signal.signal(signal.SIGTERM, _exit_on_signal)
+
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except TimeoutError:
+                break  # Idle
+            with conn:
+                if not _handle(conn, warm):
+                    break
+    finally:
+        server.close()
+        warm.shutdown()
+        # Leave the path alone if another daemon has taken it over
+        with contextlib.suppress(OSError):
+            if os.stat(socket_path).st_ino == inode:
+                socket_path.unlink()
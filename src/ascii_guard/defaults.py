@@ -0,0 +1,32 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Defaults shared by the command-line parser and the modules that use them.
+
+Kept free of imports, so that building the parser (--version, --help) does
+not load the modules the values belong to.
+"""
+
+# Values accepted by --format ("text" is the human-readable CLI output; the
+# others are reporters.REPORTERS)
+OUTPUT_FORMATS = ("text", "jsonl", "json", "sarif", "github")
+
+# Number of slowest files kept by default
+DEFAULT_TOP_FILES = 10
+
+# Runs per configuration in ascii-guard bench
+DEFAULT_BENCH_REPEAT = 3
+
+# Seconds a daemon may sit without requests before it exits
+DEFAULT_IDLE_TIMEOUT = 900
@@ -17,16 +17,100 @@
 ZERO dependencies - uses only Python stdlib.
 """
 
+import bisect
+import time
 from pathlib import Path
 
 from ascii_guard.models import ALL_BOX_CHARS, Box
 
+# Every box starts with one of these, so text without them cannot contain a box
+TOP_LEFT_CORNER_CHARS = ("┌", "╔", "┏")
+
+# Every box ends with one of these, in the column of its top-left corner
+BOTTOM_LEFT_CORNER_CHARS = ("└", "╚", "┗")
+
 
 def has_box_drawing_chars(line: str) -> bool:
     """Check if a line contains box-drawing characters."""
     return any(char in ALL_BOX_CHARS for char in line)
 
 
+def might_contain_boxes(text: str) -> bool:
+    """Cheap prefilter: check if text contains any top-left corner character.
+
+    Args:
+        text: Full text content to check
+
+    Returns:
+        False if the text cannot contain a box, True if detection is needed
+    """
+    return any(corner in text for corner in TOP_LEFT_CORNER_CHARS)
+
+
+def split_lines(text: str) -> list[str]:
+    """Split text into lines without newline characters.
+
+    Matches reading the text with universal newlines and readlines(), so
+    content decoded from a pre-read buffer yields the same lines as opening
+    the file in text mode.
+
+    Args:
+        text: Decoded file content
+
+    Returns:
+        List of lines with line endings removed
+    """
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return lines
+
+
+def read_file(file_path: str | Path) -> bytes:
+    """Read the raw content of a file in a single call.
+
+    Args:
+        file_path: Path to file to read (str or Path)
+
+    Returns:
+        File content as bytes
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        OSError: If file cannot be read
+    """
+    file_path_str = str(file_path)
+    try:
+        with open(file_path_str, "rb") as f:
+            return f.read()
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"File not found: {file_path_str}") from e
+    except OSError as e:
+        raise OSError(f"Cannot read file {file_path_str}: {e}") from e
+
+
+def read_lines(file_path: str | Path, data: bytes | None = None) -> list[str]:
+    """Read and decode a file into lines without newline characters.
+
+    Args:
+        file_path: Path to file to read (str or Path)
+        data: Raw file content if already read (e.g. by the scanner)
+
+    Returns:
+        List of lines with line endings removed
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        OSError: If file cannot be read
+        UnicodeDecodeError: If file is not valid UTF-8
+    """
+    if data is None:
+        data = read_file(file_path)
+    return split_lines(data.decode("utf-8"))
+
+
 def is_in_code_fence(line_idx: int, lines: list[str]) -> bool:
     """Check if a line is within a markdown code fence (```).
 
@@ -117,6 +201,40 @@ def is_in_ignore_region(line_idx: int, lines: list[str]) -> bool:
     return False
 
 
+def skipped_lines(lines: list[str], exclude_code_blocks: bool = False) -> list[bool]:
+    """Mark the lines detection must skip, in a single pass.
+
+    Equivalent to calling is_in_ignore_region() (and, with
+    exclude_code_blocks, is_in_code_fence()) for every line, without
+    rescanning the preceding lines each time.
+
+    Args:
+        lines: All lines in the file
+        exclude_code_blocks: If True, lines inside markdown code fences are skipped too
+
+    Returns:
+        One flag per line; True if the line is ignored
+    """
+    skipped: list[bool] = []
+    in_fence = False
+    in_block_ignore = False
+    after_ignore_next = False
+    for line in lines:
+        skipped.append(in_block_ignore or after_ignore_next or (exclude_code_blocks and in_fence))
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped.startswith("```"):
+            in_fence = not in_fence
+        marker_type, _ = is_ignore_marker(stripped)
+        if marker_type == "start":
+            in_block_ignore = True
+        elif marker_type == "end":
+            in_block_ignore = False
+        after_ignore_next = marker_type == "next"
+    return skipped
+
+
 def find_top_left_corner(line: str, start_col: int = 0) -> int:
     """Find the first top-left corner character in a line after start_col.
 
@@ -170,6 +288,33 @@ def find_all_top_left_corners(line: str) -> list[int]:
     return corners
 
 
+def bottom_corner_index(lines: list[str], skipped: list[bool]) -> dict[int, list[int]]:
+    """Index the bottom-left corners of all lines that are not skipped.
+
+    Finding a box's bottom then takes a lookup instead of a scan down the
+    rest of the file, which made unclosed corners quadratic.
+
+    Args:
+        lines: All lines in the file
+        skipped: Flags from skipped_lines()
+
+    Returns:
+        Column -> ascending indices of the lines with a bottom-left corner there
+    """
+    index: dict[int, list[int]] = {}
+    for line_idx, line in enumerate(lines):
+        if skipped[line_idx]:
+            continue
+        for corner in BOTTOM_LEFT_CORNER_CHARS:
+            col = line.find(corner)
+            while col != -1:
+                index.setdefault(col, []).append(line_idx)
+                col = line.find(corner, col + 1)
+    for line_indices in index.values():
+        line_indices.sort()  # A line with several corner styles is appended out of order
+    return index
+
+
 def detect_boxes(file_path: str | Path, exclude_code_blocks: bool = False) -> list[Box]:
     """Detect ASCII art boxes in a file.
 
@@ -198,32 +343,58 @@ def detect_boxes(file_path: str | Path, exclude_code_blocks: bool = False) -> li
         ...     print(f"Box at line {box.top_line + 1}: {box.width}x{box.height}")
     """
     file_path_str = str(file_path)
-    path = Path(file_path_str)
-    if not path.exists():
-        raise FileNotFoundError(f"File not found: {file_path_str}")
+    return detect_boxes_in_lines(
+        read_lines(file_path_str), file_path_str, exclude_code_blocks=exclude_code_blocks
+    )
 
-    try:
-        with open(path, encoding="utf-8") as f:
-            lines = f.readlines()
-    except OSError as e:
-        raise OSError(f"Cannot read file {file_path_str}: {e}") from e
 
-    # Strip newlines from all lines
-    stripped_lines = [line.rstrip("\n") for line in lines]
+def check_deadline(deadline: float | None) -> None:
+    """Raise TimeoutError once a per-file time budget is used up.
+
+    Args:
+        deadline: time.monotonic() value after which work must stop, or None
 
+    Raises:
+        TimeoutError: If the deadline has passed
+    """
+    if deadline is not None and time.monotonic() > deadline:
+        raise TimeoutError("Per-file time budget exceeded")
+
+
+def detect_boxes_in_lines(
+    stripped_lines: list[str],
+    file_path: str = "",
+    exclude_code_blocks: bool = False,
+    max_box_height: int = 0,
+    deadline: float | None = None,
+) -> list[Box]:
+    """Detect ASCII art boxes in already-read lines.
+
+    Args:
+        stripped_lines: File content as lines without newline characters
+        file_path: Source file path recorded on each Box
+        exclude_code_blocks: If True, skip ASCII boxes inside markdown code blocks (```)
+        max_box_height: Maximum box height in lines (0 = unlimited); the search
+            for a bottom border stops after this many lines
+        deadline: time.monotonic() value after which detection is aborted
+
+    Returns:
+        List of detected Box objects
+
+    Raises:
+        TimeoutError: If the deadline passes before detection finishes
+    """
     boxes: list[Box] = []
+    # Code fences (if requested) and ignore regions (always) are skipped
+    skipped = skipped_lines(stripped_lines, exclude_code_blocks)
+    bottoms: dict[int, list[int]] | None = None  # Built at the first corner
     i = 0
 
     while i < len(stripped_lines):
+        check_deadline(deadline)
         line = stripped_lines[i]
 
-        # Skip lines in markdown code fences (if requested)
-        if exclude_code_blocks and is_in_code_fence(i, stripped_lines):
-            i += 1
-            continue
-
-        # ALWAYS skip lines in ignore regions (regardless of exclude_code_blocks setting)
-        if is_in_ignore_region(i, stripped_lines):
+        if skipped[i]:
             i += 1
             continue
 
@@ -238,21 +409,19 @@ def detect_boxes(file_path: str | Path, exclude_code_blocks: bool = False) -> li
             # Found a potential box start
             top_line = i
 
-            # Find the bottom of the box
+            # Find the bottom of the box: the next bottom-left corner in the
+            # same column, outside code fences and ignore regions
+            check_deadline(deadline)
+            if bottoms is None:
+                bottoms = bottom_corner_index(stripped_lines, skipped)
             bottom_line = -1
-            for j in range(i + 1, len(stripped_lines)):
-                # Skip if bottom line would be in code fence (if requested)
-                if exclude_code_blocks and is_in_code_fence(j, stripped_lines):
-                    continue
-
-                # ALWAYS skip if bottom line would be in ignore region
-                if is_in_ignore_region(j, stripped_lines):
-                    continue
-
-                bottom_left = find_bottom_left_corner(stripped_lines[j], left_col)
-                if bottom_left == left_col:  # Same column as top-left
-                    bottom_line = j
-                    break
+            search_end = len(stripped_lines)
+            if max_box_height > 0:
+                search_end = min(search_end, i + max_box_height)
+            candidates = bottoms.get(left_col, [])
+            position = bisect.bisect_right(candidates, i)
+            if position < len(candidates) and candidates[position] < search_end:
+                bottom_line = candidates[position]
 
             if bottom_line == -1:
                 # No matching bottom found, skip this potential box
@@ -282,7 +451,7 @@ def detect_boxes(file_path: str | Path, exclude_code_blocks: bool = False) -> li
                 left_col=left_col,
                 right_col=right_col,
                 lines=box_lines,
-                file_path=file_path_str,
+                file_path=file_path,
             )
             boxes.append(box)
 
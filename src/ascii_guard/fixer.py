@@ -129,17 +129,17 @@ def fix_box(box: Box) -> list[str]:
 
         # Identify which positions need junction characters
         # Only place junctions where the top border also has a junction
-        junction_positions_to_place = []
-        for i in sorted(junction_positions):
+        junction_positions_to_place: set[int] = set()
+        for i in junction_positions:
             if i > box.left_col and i < right_corner_pos:
                 # Only include if top border has a junction at this position
                 # OR if it's a column position and top border has some junction structure
                 if i < len(top_line) and top_line[i] in JUNCTION_CHARS:
-                    junction_positions_to_place.append(i)
+                    junction_positions_to_place.add(i)
                 elif i in column_positions_abs:
                     # Column position from content rows - always add junction
                     # This ensures tables with column separators get proper ┴ in bottom border
-                    junction_positions_to_place.append(i)
+                    junction_positions_to_place.add(i)
 
         # Place border characters continuously from left_col+1 to right_corner_pos-1
         # Fill ALL positions - the structural width is determined by corner positions
@@ -17,20 +17,117 @@
 ZERO dependencies - uses only Python stdlib.
 """
 
+import contextlib
+import os
+import stat
+import time
+from collections.abc import Callable, Sequence
 from pathlib import Path
 
-from ascii_guard.detector import detect_boxes
+from ascii_guard.config import PerformanceConfig
+from ascii_guard.detector import (
+    check_deadline,
+    detect_boxes_in_lines,
+    might_contain_boxes,
+    read_file,
+    read_lines,
+    split_lines,
+)
 from ascii_guard.fixer import fix_box
-from ascii_guard.models import FixResult, LintResult, ValidationError
+from ascii_guard.models import Box, FixResult, LintResult, ValidationError
+from ascii_guard.stats import PhaseTimer, timing
 from ascii_guard.validator import validate_box
 
+# Validates one box; validate_box or e.g. ValidationMemo.validate
+Validator = Callable[[Box], list[ValidationError]]
 
-def lint_file(file_path: str | Path, exclude_code_blocks: bool = False) -> LintResult:
+
+def file_deadline(performance: PerformanceConfig) -> float | None:
+    """Return the monotonic deadline for one file, or None without a budget."""
+    if performance.file_timeout > 0:
+        return time.monotonic() + performance.file_timeout
+    return None
+
+
+def box_touches(box: Box, line_ranges: Sequence[tuple[int, int]]) -> bool:
+    """Check whether a box overlaps any of the given line ranges.
+
+    Args:
+        box: Detected box
+        line_ranges: 0-indexed inclusive (start, end) line ranges
+
+    Returns:
+        True if some line of the box lies in some range
+    """
+    return any(start <= box.bottom_line and box.top_line <= end for start, end in line_ranges)
+
+
+def write_lines(path: Path, lines: list[str]) -> None:
+    """Replace a file's content with lines, atomically where possible.
+
+    The new content is written to a temporary file next to the target and
+    renamed over it, so an interrupted run (or a killed worker) never
+    leaves a truncated file behind. Symlinks are written through, file
+    permissions are kept, and hard-linked files are rewritten in place so
+    that every link sees the change.
+
+    Args:
+        path: File to replace
+        lines: New content as lines without newline characters
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    target = path.resolve()
+    st = os.stat(target)
+    if not os.access(target, os.W_OK):
+        raise PermissionError(f"Permission denied: '{target}'")
+
+    if st.st_nlink > 1:
+        with open(target, "w", encoding="utf-8") as f:
+            for line in lines:
+                f.write(line + "\n")
+        return
+
+    import tempfile  # Imported here: lint runs never write files
+
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for line in lines:
+                f.write(line + "\n")
+        os.chmod(tmp_name, stat.S_IMODE(st.st_mode))
+        os.replace(tmp_name, target)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+
+
+def lint_file(
+    file_path: str | Path,
+    exclude_code_blocks: bool = False,
+    data: bytes | None = None,
+    performance: PerformanceConfig | None = None,
+    line_ranges: Sequence[tuple[int, int]] | None = None,
+    timer: PhaseTimer | None = None,
+    validate: Validator | None = None,
+) -> LintResult:
     """Lint a file for ASCII art alignment issues.
 
     Args:
         file_path: Path to file to lint (str or Path)
         exclude_code_blocks: If True, skip ASCII boxes inside markdown code blocks
+        data: Raw file content if already read (e.g. by scan_files); the file
+            is not opened again when provided
+        performance: [performance] settings (prefilter, max_box_height,
+            file_timeout); defaults when None
+        line_ranges: Only validate boxes overlapping these 0-indexed
+            inclusive (start, end) line ranges, e.g. the hunks of a diff;
+            None validates every box
+        timer: Optional timer charged with the read, detect and validate
+            phases (see stats.PhaseTimer)
+        validate: Function validating each box (default: validate_box)
 
     Returns:
         LintResult with errors and warnings
@@ -39,6 +136,7 @@ def lint_file(file_path: str | Path, exclude_code_blocks: bool = False) -> LintR
         FileNotFoundError: If file doesn't exist
         OSError: If file cannot be read
         ValueError: If file_path is invalid
+        TimeoutError: If the file exceeds performance.file_timeout
 
     Example:
         >>> result = lint_file("README.md")
@@ -46,87 +144,126 @@ def lint_file(file_path: str | Path, exclude_code_blocks: bool = False) -> LintR
         ...     print(f"Found {len(result.errors)} errors")
     """
     file_path_str = str(file_path)
-    boxes = detect_boxes(file_path_str, exclude_code_blocks=exclude_code_blocks)
+    with timing(timer, "read"):
+        if data is None:
+            data = read_file(file_path_str)
+        text = data.decode("utf-8")
+    return lint_text(
+        text, file_path_str, exclude_code_blocks, performance, line_ranges, timer, validate
+    )
+
+
+def lint_text(
+    text: str,
+    file_path: str = "",
+    exclude_code_blocks: bool = False,
+    performance: PerformanceConfig | None = None,
+    line_ranges: Sequence[tuple[int, int]] | None = None,
+    timer: PhaseTimer | None = None,
+    validate: Validator | None = None,
+) -> LintResult:
+    """Lint in-memory text for ASCII art alignment issues.
+
+    Args:
+        text: Text content to lint
+        file_path: Path reported in the result and on detected boxes
+        exclude_code_blocks: If True, skip ASCII boxes inside markdown code blocks
+        performance: [performance] settings (prefilter, max_box_height,
+            file_timeout); defaults when None
+        line_ranges: Only validate boxes overlapping these 0-indexed
+            inclusive (start, end) line ranges; None validates every box.
+            boxes_found still counts every detected box
+        timer: Optional timer charged with the detect and validate phases
+        validate: Function validating each box (default: validate_box)
+
+    Returns:
+        LintResult with errors and warnings
+
+    Raises:
+        TimeoutError: If the text exceeds performance.file_timeout
+    """
+    if performance is None:
+        performance = PerformanceConfig()
+    if validate is None:
+        validate = validate_box
+    deadline = file_deadline(performance)
+
+    with timing(timer, "detect"):
+        if performance.prefilter and not might_contain_boxes(text):
+            return LintResult(file_path=file_path, boxes_found=0, errors=[], warnings=[])
+
+        boxes = detect_boxes_in_lines(
+            split_lines(text),
+            file_path,
+            exclude_code_blocks=exclude_code_blocks,
+            max_box_height=performance.max_box_height,
+            deadline=deadline,
+        )
 
     all_errors: list[ValidationError] = []
     all_warnings: list[ValidationError] = []
 
-    for box in boxes:
-        validation_errors = validate_box(box)
+    with timing(timer, "validate"):
+        for box in boxes:
+            check_deadline(deadline)
+            if line_ranges is not None and not box_touches(box, line_ranges):
+                continue  # Untouched box: not validated, errors not reported
+            validation_errors = validate(box)
 
-        for error in validation_errors:
-            if error.severity == "error":
-                all_errors.append(error)
-            elif error.severity == "warning":
-                all_warnings.append(error)
+            for error in validation_errors:
+                if error.severity == "error":
+                    all_errors.append(error)
+                elif error.severity == "warning":
+                    all_warnings.append(error)
 
     return LintResult(
-        file_path=file_path_str,
+        file_path=file_path,
         boxes_found=len(boxes),
         errors=all_errors,
         warnings=all_warnings,
     )
 
 
-def fix_file(
-    file_path: str | Path, dry_run: bool = False, exclude_code_blocks: bool = False
-) -> FixResult:
-    """Fix ASCII art alignment issues in a file.
+def _fix_boxes(
+    lines: list[str],
+    boxes: list[Box],
+    deadline: float | None,
+    timer: PhaseTimer | None,
+    validate: Validator,
+) -> tuple[list[str], int]:
+    """Fix every box that needs it, merging fixes of boxes sharing lines.
 
     Args:
-        file_path: Path to file to fix (str or Path)
-        dry_run: If True, don't write changes to file (returns fixed lines)
-        exclude_code_blocks: If True, skip ASCII boxes inside markdown code blocks
+        lines: File content as lines
+        boxes: Boxes detected in lines
+        deadline: Monotonic deadline (see file_deadline), or None
+        timer: Optional timer; validation is charged to "validate"
+        validate: Function validating each box
 
     Returns:
-        FixResult with fixed lines and metadata
-
-    Raises:
-        FileNotFoundError: If file doesn't exist
-        OSError: If file cannot be read/written
-        ValueError: If file_path is invalid
-
-    Example:
-        >>> result = fix_file("README.md", dry_run=True)
-        >>> print(f"Would fix {result.boxes_fixed} boxes")
-        >>> if not result.dry_run:
-        ...     print(f"Fixed {result.boxes_fixed} boxes in {result.file_path}")
+        Tuple of (fixed lines, number of boxes fixed)
     """
-    file_path_str = str(file_path)
-    path = Path(file_path_str)
-    if not path.exists():
-        raise FileNotFoundError(f"File not found: {file_path_str}")
-
-    # Read original file
-    try:
-        with open(path, encoding="utf-8") as f:
-            original_lines = f.readlines()
-    except OSError as e:
-        raise OSError(f"Cannot read file {file_path_str}: {e}") from e
-
-    # Detect boxes
-    boxes = detect_boxes(file_path_str, exclude_code_blocks=exclude_code_blocks)
-
-    if not boxes:
-        # No boxes to fix
-        return FixResult(
-            file_path=file_path_str,
-            boxes_fixed=0,
-            lines=[line.rstrip("\n") for line in original_lines],
-            modified=False,
-        )
-
     # Start with original lines
-    result_lines = [line.rstrip("\n") for line in original_lines]
+    result_lines = lines.copy()
 
     # Fix each box
     boxes_fixed = 0
     # Track which lines have been modified and by which boxes
     modified_lines: dict[int, str] = {}  # line_idx -> fixed_line
 
+    # Boxes spanning each line, so checks against other boxes only look at
+    # the boxes sharing a line instead of every box in the file
+    boxes_by_line: dict[int, list[Box]] = {}
     for box in boxes:
+        for line_idx in range(box.top_line, box.bottom_line + 1):
+            boxes_by_line.setdefault(line_idx, []).append(box)
+
+    for box in boxes:
+        check_deadline(deadline)
+
         # Check if box needs fixing
-        errors = validate_box(box)
+        with timing(timer, "validate"):
+            errors = validate(box)
 
         # Also check if bottom border is non-continuous (has spaces in middle)
         # or if there are duplicate borders in middle lines
@@ -233,13 +370,10 @@ def fix_file(
                             # (unless it's inside THIS box)
                             is_owned_by_other = False
                             if col < box.left_col or col > box.right_col:
-                                for other_box in boxes:
+                                for other_box in boxes_by_line[line_idx]:
                                     if other_box is box:
                                         continue
-                                    if (
-                                        other_box.top_line <= line_idx <= other_box.bottom_line
-                                        and other_box.left_col <= col <= other_box.right_col
-                                    ):
+                                    if other_box.left_col <= col <= other_box.right_col:
                                         is_owned_by_other = True
                                         break
 
@@ -264,10 +398,7 @@ def fix_file(
                     # Remove any duplicate corners that might have been created
                     # Look for corner chars immediately after any box's right_col on this line
                     # We need to check all boxes that affect this line
-                    max_right_col = box.right_col
-                    for other_box in boxes:
-                        if other_box.top_line <= line_idx <= other_box.bottom_line:
-                            max_right_col = max(max_right_col, other_box.right_col)
+                    max_right_col = max(other.right_col for other in boxes_by_line[line_idx])
 
                     # Remove duplicate corners after the maximum right_col
                     for col in range(max_right_col + 1, min(len(merged_line), max_right_col + 10)):
@@ -296,14 +427,88 @@ def fix_file(
         if line_idx < len(result_lines):
             result_lines[line_idx] = fixed_line
 
-    # Write back to file if not dry-run
-    if not dry_run and boxes_fixed > 0:
-        try:
-            with open(path, "w", encoding="utf-8") as f:
-                for line in result_lines:
-                    f.write(line + "\n")
-        except OSError as e:
-            raise OSError(f"Cannot write file {file_path_str}: {e}") from e
+    return result_lines, boxes_fixed
+
+
+def fix_file(
+    file_path: str | Path,
+    dry_run: bool = False,
+    exclude_code_blocks: bool = False,
+    data: bytes | None = None,
+    performance: PerformanceConfig | None = None,
+    timer: PhaseTimer | None = None,
+    validate: Validator | None = None,
+) -> FixResult:
+    """Fix ASCII art alignment issues in a file.
+
+    Args:
+        file_path: Path to file to fix (str or Path)
+        dry_run: If True, don't write changes to file (returns fixed lines)
+        exclude_code_blocks: If True, skip ASCII boxes inside markdown code blocks
+        data: Raw file content if already read (e.g. by scan_files); the file
+            is not opened again for reading when provided
+        performance: [performance] settings (max_box_height, file_timeout);
+            defaults when None
+        timer: Optional timer charged with the read, detect, validate and
+            fix phases (see stats.PhaseTimer)
+        validate: Function validating each box (default: validate_box)
+
+    Returns:
+        FixResult with fixed lines and metadata
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        OSError: If file cannot be read/written
+        ValueError: If file_path is invalid
+        TimeoutError: If the file exceeds performance.file_timeout; nothing
+            is written in that case
+
+    Example:
+        >>> result = fix_file("README.md", dry_run=True)
+        >>> print(f"Would fix {result.boxes_fixed} boxes")
+        >>> if not result.dry_run:
+        ...     print(f"Fixed {result.boxes_fixed} boxes in {result.file_path}")
+    """
+    file_path_str = str(file_path)
+    path = Path(file_path_str)
+    if performance is None:
+        performance = PerformanceConfig()
+    deadline = file_deadline(performance)
+
+    # Read original file once; detection works on the same lines
+    with timing(timer, "read"):
+        original_lines = read_lines(file_path_str, data)
+
+    # Detect boxes
+    with timing(timer, "detect"):
+        boxes = detect_boxes_in_lines(
+            original_lines,
+            file_path_str,
+            exclude_code_blocks=exclude_code_blocks,
+            max_box_height=performance.max_box_height,
+            deadline=deadline,
+        )
+
+    if not boxes:
+        # No boxes to fix
+        return FixResult(
+            file_path=file_path_str,
+            boxes_fixed=0,
+            lines=original_lines,
+            modified=False,
+        )
+
+    with timing(timer, "fix"):
+        result_lines, boxes_fixed = _fix_boxes(
+            original_lines, boxes, deadline, timer, validate or validate_box
+        )
+
+        # Write back to file if not dry-run
+        if not dry_run and boxes_fixed > 0:
+            try:
+                write_lines(path, result_lines)
+            except OSError as e:
+                raise OSError(f"Cannot write file {file_path_str}: {e}") from e
 
     return FixResult(
         file_path=file_path_str,
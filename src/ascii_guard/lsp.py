@@ -0,0 +1,589 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Language Server Protocol server for editors.
+
+ascii-guard lsp speaks LSP (JSON-RPC with Content-Length framing) on stdin
+and stdout. Open documents are kept in memory and didChange edits are
+applied to them incrementally. After every change the boxes are detected
+again in a single linear pass, and only boxes whose content changed are
+validated: validation results are memoized per box content, so typing in
+one box of a long document re-validates that box alone. Diagnostics are the
+validate_box() errors and warnings; fix_box() results are offered as quick
+fixes, and fix_file() as a source.fixAll action.
+
+ZERO dependencies - uses only Python stdlib (json).
+"""
+
+import contextlib
+import json
+import sys
+from collections.abc import Callable
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, BinaryIO
+from urllib.parse import unquote, urlparse
+
+from ascii_guard import __version__
+from ascii_guard.config import Config, ConfigError, ConfigResolver, PerformanceConfig
+from ascii_guard.detector import check_deadline, detect_boxes_in_lines
+from ascii_guard.fixer import fix_box
+from ascii_guard.linter import box_touches, file_deadline, fix_file
+from ascii_guard.models import Box, ValidationError
+from ascii_guard.scanner import select_path
+from ascii_guard.validator import BoxKey, box_key, validate_box
+
+# JSON-RPC and LSP error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+SERVER_NOT_INITIALIZED = -32002
+
+# TextDocumentSyncKind.Incremental
+SYNC_INCREMENTAL = 2
+
+# DiagnosticSeverity values
+SEVERITIES = {"error": 1, "warning": 2}
+
+# MessageType values for window/logMessage and window/showMessage
+MESSAGE_ERROR = 1
+LOG_WARNING = 2
+
+QUICK_FIX_KIND = "quickfix"
+FIX_ALL_KIND = "source.fixAll"
+DIAGNOSTIC_SOURCE = "ascii-guard"
+
+# Handles the params of one request or notification; returns the result
+Handler = Callable[[dict[str, Any]], Any]
+
+
+class ProtocolError(Exception):
+    """A request that is answered with a JSON-RPC error."""
+
+    def __init__(self, code: int, message: str) -> None:
+        """Create an error with a JSON-RPC error code."""
+        super().__init__(message)
+        self.code = code
+
+
+def read_message(stream: BinaryIO) -> dict[str, Any] | None:
+    """Read one Content-Length framed JSON-RPC message.
+
+    Returns:
+        The decoded message, or None at end of input
+
+    Raises:
+        ValueError: If the headers or the JSON body are malformed
+    """
+    length: int | None = None
+    while True:
+        header = stream.readline()
+        if not header:
+            return None
+        header = header.strip()
+        if not header:
+            break
+        name, _, value = header.decode("ascii").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    if length is None:
+        raise ValueError("Missing Content-Length header")
+
+    body = stream.read(length)
+    if len(body) < length:
+        return None
+    message = json.loads(body)
+    if not isinstance(message, dict):
+        raise ValueError("Message is not a JSON object")
+    return message
+
+
+def write_message(stream: BinaryIO, message: dict[str, Any]) -> None:
+    """Write one Content-Length framed JSON-RPC message and flush."""
+    body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    stream.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+    stream.flush()
+
+
+def split_text(text: str) -> list[str]:
+    """Split text into lines the way LSP counts them.
+
+    Unlike split_lines(), a trailing newline starts a final empty line, so
+    positions sent by the client always fall inside the list.
+    """
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text.split("\n")
+
+
+def uri_to_path(uri: str) -> Path | None:
+    """Return the local path of a file:// URI, or None for other schemes."""
+    parsed = urlparse(uri)
+    if parsed.scheme != "file":
+        return None
+    return Path(unquote(parsed.path))
+
+
+def _utf16_length(text: str) -> int:
+    """Return the length of text in UTF-16 code units."""
+    if text.isascii():
+        return len(text)
+    return len(text) + sum(1 for char in text if ord(char) > 0xFFFF)
+
+
+def _wanted(kind: str, only: list[str] | None) -> bool:
+    """Check a code action kind against the client's context.only filter."""
+    return only is None or any(kind == base or kind.startswith(base + ".") for base in only)
+
+
+class TextDocument:
+    """An open document and the validation state of its boxes.
+
+    Attributes:
+        uri: Document URI
+        version: Version of the last applied change
+        lines: Current content as lines without newline characters
+        config: Config that applies to the document, or None if a scan
+            would skip it (no diagnostics are published then)
+        boxes: Boxes of the last check() with their errors and warnings
+        boxes_validated: Number of validate_box() calls so far
+    """
+
+    def __init__(self, uri: str, text: str, version: int, utf16: bool = True) -> None:
+        """Open a document.
+
+        Args:
+            uri: Document URI
+            text: Full content
+            version: Version number sent by the client
+            utf16: If True, positions count UTF-16 code units (the LSP
+                default); otherwise they count code points
+        """
+        self.uri = uri
+        self.version = version
+        self.lines = split_text(text)
+        self.config: Config | None = None
+        self.boxes: list[tuple[Box, list[ValidationError]]] = []
+        self.boxes_validated = 0
+        self._utf16 = utf16
+        self._validated: dict[BoxKey, list[ValidationError]] = {}
+
+    @property
+    def text(self) -> str:
+        """Return the full content."""
+        return "\n".join(self.lines)
+
+    def column(self, line: int, character: int) -> int:
+        """Convert a position's character offset to a code point column."""
+        text = self.lines[line]
+        if not self._utf16 or text.isascii():
+            return min(character, len(text))
+        units = 0
+        for column, char in enumerate(text):
+            if units >= character:
+                return column
+            units += 2 if ord(char) > 0xFFFF else 1
+        return len(text)
+
+    def character(self, line: int, column: int) -> int:
+        """Convert a code point column to a position's character offset."""
+        text = self.lines[line]
+        if not self._utf16:
+            return column
+        return _utf16_length(text[:column]) + max(0, column - len(text))
+
+    def position(self, position: dict[str, Any]) -> tuple[int, int]:
+        """Return the (line, column) of an LSP position, clamped to the document."""
+        line = int(position["line"])
+        if line >= len(self.lines):
+            return len(self.lines) - 1, len(self.lines[-1])
+        line = max(line, 0)
+        return line, self.column(line, int(position["character"]))
+
+    def apply_change(self, change: dict[str, Any]) -> None:
+        """Apply one TextDocumentContentChangeEvent.
+
+        A change with a range replaces that range; only the lines it spans
+        are rebuilt. A change without a range replaces the whole content.
+        """
+        text = str(change["text"])
+        if change.get("range") is None:
+            self.lines = split_text(text)
+            return
+        start_line, start_col = self.position(change["range"]["start"])
+        end_line, end_col = self.position(change["range"]["end"])
+        if (end_line, end_col) < (start_line, start_col):
+            raise ValueError("Range end precedes its start")
+        self.lines[start_line : end_line + 1] = split_text(
+            self.lines[start_line][:start_col] + text + self.lines[end_line][end_col:]
+        )
+
+    def check(self, exclude_code_blocks: bool, performance: PerformanceConfig) -> None:
+        """Detect boxes and validate those not seen with the same content before.
+
+        Results are stored in boxes. Validation results are kept relative
+        to the box's top line, so a box that only moved (lines inserted or
+        deleted above it) is not validated again.
+
+        Raises:
+            TimeoutError: If the document exceeds performance.file_timeout
+        """
+        deadline = file_deadline(performance)
+        detected = detect_boxes_in_lines(
+            self.lines,
+            self.uri,
+            exclude_code_blocks=exclude_code_blocks,
+            max_box_height=performance.max_box_height,
+            deadline=deadline,
+        )
+
+        validated: dict[BoxKey, list[ValidationError]] = {}
+        boxes = []
+        for box in detected:
+            key = box_key(box)
+            relative = validated.get(key)
+            if relative is None:
+                relative = self._validated.get(key)
+            if relative is None:
+                check_deadline(deadline)
+                relative = [
+                    replace(issue, line=issue.line - box.top_line) for issue in validate_box(box)
+                ]
+                self.boxes_validated += 1
+            validated[key] = relative
+            issues = [replace(issue, line=issue.line + box.top_line) for issue in relative]
+            boxes.append((box, issues))
+
+        # Only boxes still present are remembered
+        self._validated = validated
+        self.boxes = boxes
+
+    def diagnostic(self, issue: ValidationError) -> dict[str, Any]:
+        """Return the LSP diagnostic for an error or warning."""
+        line = min(max(issue.line, 0), len(self.lines) - 1)
+        return {
+            "range": {
+                "start": {"line": line, "character": self.character(line, issue.column)},
+                "end": {"line": line, "character": self.character(line, issue.column + 1)},
+            },
+            "severity": SEVERITIES.get(issue.severity, SEVERITIES["warning"]),
+            "source": DIAGNOSTIC_SOURCE,
+            "message": issue.message,
+        }
+
+    def replace_lines(self, first: int, last: int, new_lines: list[str]) -> dict[str, Any]:
+        """Return a TextEdit replacing lines first..last (inclusive) with new_lines."""
+        return {
+            "range": {
+                "start": {"line": first, "character": 0},
+                "end": {"line": last, "character": self.character(last, len(self.lines[last]))},
+            },
+            "newText": "\n".join(new_lines),
+        }
+
+
+class LanguageServer:
+    """LSP server over a pair of binary streams.
+
+    Requests are handled one at a time, in arrival order.
+    """
+
+    def __init__(
+        self,
+        reader: BinaryIO,
+        writer: BinaryIO,
+        config: Config | None = None,
+        resolver: ConfigResolver | None = None,
+        exclude_code_blocks: bool = False,
+    ) -> None:
+        """Create a server.
+
+        Args:
+            reader: Stream the client writes messages to
+            writer: Stream messages are sent to
+            config: Config for every document (--config); if None, each
+                document uses the config resolver's
+            resolver: Per-directory config resolver (default: a new one)
+            exclude_code_blocks: If True, skip boxes inside markdown code blocks
+        """
+        self.reader = reader
+        self.writer = writer
+        if config is None and resolver is None:
+            resolver = ConfigResolver()
+        self.config = config
+        self.resolver = resolver
+        # Config for documents without a path (unsaved buffers)
+        self.default_config = config or Config()
+        if config is None and resolver is not None:
+            self.default_config = resolver.default
+        self.exclude_code_blocks = exclude_code_blocks
+        self.documents: dict[str, TextDocument] = {}
+        self.initialized = False
+        self.shutdown_requested = False
+        self._utf16 = True
+        self._handlers: dict[str, Handler] = {
+            "initialize": self._initialize,
+            "shutdown": self._shutdown,
+            "textDocument/didOpen": self._did_open,
+            "textDocument/didChange": self._did_change,
+            "textDocument/didSave": self._did_save,
+            "textDocument/didClose": self._did_close,
+            "textDocument/codeAction": self._code_action,
+            "workspace/didChangeWatchedFiles": self._did_change_watched_files,
+        }
+
+    def serve(self) -> int:
+        """Handle messages until exit or end of input.
+
+        Returns:
+            Exit code: 0 if the client sent shutdown before exiting, else 1
+        """
+        while True:
+            try:
+                message = read_message(self.reader)
+            except ValueError as e:
+                self._send({"id": None, "error": {"code": PARSE_ERROR, "message": str(e)}})
+                continue
+            if message is None or message.get("method") == "exit":
+                return 0 if self.shutdown_requested else 1
+            self.dispatch(message)
+
+    def dispatch(self, message: dict[str, Any]) -> None:
+        """Handle one request or notification, answering requests."""
+        method = message.get("method")
+        if not isinstance(method, str):
+            return  # A response; this server sends no requests
+        is_request = "id" in message
+        handler = self._handlers.get(method)
+        try:
+            if not self.initialized and method != "initialize":
+                raise ProtocolError(SERVER_NOT_INITIALIZED, "Server is not initialized")
+            if self.shutdown_requested:
+                raise ProtocolError(INVALID_REQUEST, "Server is shutting down")
+            if handler is None:
+                if not is_request:
+                    return  # Unknown notifications are ignored
+                raise ProtocolError(METHOD_NOT_FOUND, f"Unknown method: {method}")
+            result = handler(message.get("params") or {})
+        except ProtocolError as e:
+            error = {"code": e.code, "message": str(e)}
+        except (KeyError, TypeError, ValueError) as e:
+            error = {"code": INVALID_PARAMS, "message": f"Invalid params: {e!r}"}
+        except Exception as e:
+            error = {"code": INTERNAL_ERROR, "message": f"Internal error: {e}"}
+        else:
+            if is_request:
+                self._send({"id": message["id"], "result": result})
+            return
+        if is_request:
+            self._send({"id": message["id"], "error": error})
+        elif self.initialized:
+            # Notifications get no reply; log the error so it is not lost
+            self._log(f"ascii-guard: {method} failed: {error['message']}")
+
+    def _send(self, message: dict[str, Any]) -> None:
+        write_message(self.writer, {"jsonrpc": "2.0", **message})
+
+    def _notify(self, method: str, params: dict[str, Any]) -> None:
+        self._send({"method": method, "params": params})
+
+    def _log(self, message: str) -> None:
+        self._notify("window/logMessage", {"type": LOG_WARNING, "message": message})
+
+    def _configure(self, document: TextDocument) -> None:
+        """Look up the config for a document, or None if a scan would skip it.
+
+        A document whose config file is invalid is not checked; the error
+        is shown to the user, as the notifications that open and reload
+        documents get no reply.
+        """
+        path = uri_to_path(document.uri)
+        if path is None:
+            document.config = self.default_config
+            return
+        try:
+            document.config = select_path(path, self.config, self.resolver)
+        except ConfigError as e:
+            document.config = None
+            self._notify(
+                "window/showMessage", {"type": MESSAGE_ERROR, "message": f"ascii-guard: {e}"}
+            )
+
+    def _publish(self, document: TextDocument) -> None:
+        """Check a document and publish its diagnostics."""
+        diagnostics = []
+        if document.config is not None:
+            try:
+                document.check(self.exclude_code_blocks, document.config.performance)
+            except TimeoutError:
+                document.boxes = []
+                self._log(f"ascii-guard: {document.uri} exceeds the per-file time budget")
+            diagnostics = [
+                document.diagnostic(issue) for _, issues in document.boxes for issue in issues
+            ]
+        self._notify(
+            "textDocument/publishDiagnostics",
+            {"uri": document.uri, "version": document.version, "diagnostics": diagnostics},
+        )
+
+    def _reload(self) -> None:
+        """Re-read changed config files and re-check every open document."""
+        if self.resolver is not None:
+            self.resolver.refresh()
+        for document in self.documents.values():
+            self._configure(document)
+            self._publish(document)
+
+    def _document(self, params: dict[str, Any]) -> TextDocument:
+        uri = params["textDocument"]["uri"]
+        try:
+            return self.documents[uri]
+        except KeyError:
+            raise ProtocolError(INVALID_PARAMS, f"Document is not open: {uri}") from None
+
+    def _initialize(self, params: dict[str, Any]) -> dict[str, Any]:
+        general = (params.get("capabilities") or {}).get("general") or {}
+        # Positions in code points avoid conversions; UTF-16 is the default
+        self._utf16 = "utf-32" not in (general.get("positionEncodings") or [])
+        self.initialized = True
+        return {
+            "capabilities": {
+                "positionEncoding": "utf-16" if self._utf16 else "utf-32",
+                "textDocumentSync": {
+                    "openClose": True,
+                    "change": SYNC_INCREMENTAL,
+                    "save": {"includeText": False},
+                },
+                "codeActionProvider": {"codeActionKinds": [QUICK_FIX_KIND, FIX_ALL_KIND]},
+            },
+            "serverInfo": {"name": "ascii-guard", "version": __version__},
+        }
+
+    def _shutdown(self, params: dict[str, Any]) -> None:
+        self.shutdown_requested = True
+
+    def _did_open(self, params: dict[str, Any]) -> None:
+        item = params["textDocument"]
+        document = TextDocument(
+            item["uri"], str(item["text"]), int(item.get("version", 0)), self._utf16
+        )
+        self.documents[document.uri] = document
+        self._configure(document)
+        self._publish(document)
+
+    def _did_change(self, params: dict[str, Any]) -> None:
+        document = self._document(params)
+        for change in params["contentChanges"]:
+            document.apply_change(change)
+        document.version = int(params["textDocument"].get("version", document.version))
+        self._publish(document)
+
+    def _did_save(self, params: dict[str, Any]) -> None:
+        # A saved .ascii-guard.toml changes the config of other documents
+        self._reload()
+
+    def _did_close(self, params: dict[str, Any]) -> None:
+        uri = params["textDocument"]["uri"]
+        if self.documents.pop(uri, None) is not None:
+            self._notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": []})
+
+    def _did_change_watched_files(self, params: dict[str, Any]) -> None:
+        self._reload()
+
+    def _code_action(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        document = self._document(params)
+        if document.config is None:
+            return []
+        first = document.position(params["range"]["start"])[0]
+        last = document.position(params["range"]["end"])[0]
+        only = (params.get("context") or {}).get("only")
+        actions: list[dict[str, Any]] = []
+
+        if _wanted(QUICK_FIX_KIND, only):
+            for box, issues in document.boxes:
+                if not box_touches(box, [(first, last)]):
+                    continue
+                fixed = fix_box(box)
+                if fixed == box.lines:
+                    continue
+                actions.append(
+                    {
+                        "title": f"Fix ASCII box at line {box.top_line + 1}",
+                        "kind": QUICK_FIX_KIND,
+                        "diagnostics": [document.diagnostic(issue) for issue in issues],
+                        "isPreferred": True,
+                        "edit": {
+                            "changes": {
+                                document.uri: [
+                                    document.replace_lines(box.top_line, box.bottom_line, fixed)
+                                ]
+                            }
+                        },
+                    }
+                )
+
+        if _wanted(FIX_ALL_KIND, only) and document.boxes:
+            edits = self._fix_all(document, document.config.performance)
+            if edits:
+                actions.append(
+                    {
+                        "title": "Fix all ASCII boxes",
+                        "kind": FIX_ALL_KIND,
+                        "edit": {"changes": {document.uri: edits}},
+                    }
+                )
+        return actions
+
+    def _fix_all(
+        self, document: TextDocument, performance: PerformanceConfig
+    ) -> list[dict[str, Any]]:
+        """Return TextEdits for the lines fix_file() would change."""
+        try:
+            result = fix_file(
+                uri_to_path(document.uri) or document.uri,
+                dry_run=True,
+                exclude_code_blocks=self.exclude_code_blocks,
+                data=document.text.encode("utf-8"),
+                performance=performance,
+            )
+        except TimeoutError:
+            self._log(f"ascii-guard: {document.uri} exceeds the per-file time budget")
+            return []
+        return [
+            document.replace_lines(index, index, [fixed])
+            for index, (line, fixed) in enumerate(zip(document.lines, result.lines, strict=False))
+            if line != fixed
+        ]
+
+
+def serve(
+    config: Config | None = None,
+    resolver: ConfigResolver | None = None,
+    exclude_code_blocks: bool = False,
+) -> int:
+    """Run the server on stdin and stdout.
+
+    Anything printed while serving goes to stderr, so stdout carries only
+    protocol messages.
+
+    Returns:
+        Exit code
+    """
+    server = LanguageServer(
+        sys.stdin.buffer, sys.stdout.buffer, config, resolver, exclude_code_blocks
+    )
+    with contextlib.redirect_stdout(sys.stderr):
+        return server.serve()
@@ -0,0 +1,286 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Memory instrumentation for --memstats.
+
+A MemoryTracker traces allocations with tracemalloc and records, for each
+phase and each file, the peak (highest traced memory above the level at its
+start) and the retained memory (still allocated when it ended). A
+MemoryTimer is a PhaseTimer that reports its phases to the tracker, so the
+linter's existing phase hooks are reused. Phases nest, and unlike times, memory is
+inclusive: the peak of "fix" includes the validation done inside it.
+
+Allocations are attributed to source lines of the core modules: when a
+detect, validate or fix phase ends holding more memory than any before it
+(the high-water mark), and at the end of the run, for what is still
+allocated.
+
+tracemalloc sees one process and peaks are only meaningful when phases run
+one after another, so tracked runs process all files in the calling thread.
+Tracing slows Python down several times; times taken alongside are inflated.
+
+ZERO dependencies - uses only Python stdlib (tracemalloc).
+"""
+
+import contextlib
+import heapq
+import os
+import tracemalloc
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from ascii_guard.defaults import DEFAULT_TOP_FILES
+from ascii_guard.stats import PHASES, PhaseTimer
+
+# Modules whose source lines allocations are attributed to
+MEMORY_MODULES = ("detector.py", "linter.py", "fixer.py", "models.py")
+
+# Number of source lines listed by default
+DEFAULT_TOP_LINES = 10
+
+# Phases that run the tracked modules; high-water snapshots are taken as they end
+SNAPSHOT_PHASES = ("detect", "validate", "fix")
+
+# Growth of held memory needed before a new high-water snapshot is taken;
+# bounds the number of (costly) snapshots in runs whose memory keeps growing
+SNAPSHOT_GROWTH = 1.5
+
+
+def format_bytes(size: float) -> str:
+    """Format a byte count with a binary unit, e.g. "1.5 MiB"."""
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+@dataclass
+class PhaseMemory:
+    """Memory used by one phase, over all its calls.
+
+    Attributes:
+        peak: Highest traced memory above the level at the start of a call,
+            in bytes
+        retained: Bytes allocated during the calls and still held when they
+            ended, summed (negative when a phase frees more than it keeps)
+        calls: Number of times the phase ran
+    """
+
+    peak: int = 0
+    retained: int = 0
+    calls: int = 0
+
+
+@dataclass(order=True)
+class FileMemory:
+    """Memory used while one file was read and processed.
+
+    Attributes:
+        peak: Highest traced memory above the level at the start of the
+            file, in bytes
+        path: File path
+        retained: Bytes still held after the file was processed
+    """
+
+    peak: int
+    path: str = field(compare=False)
+    retained: int = field(default=0, compare=False)
+
+
+@dataclass
+class LineMemory:
+    """Memory allocated by one source line and held at snapshot time.
+
+    Attributes:
+        module: File name of the module, e.g. "detector.py"
+        line: Line number
+        size: Bytes held
+        count: Memory blocks held
+    """
+
+    module: str
+    line: int
+    size: int
+    count: int
+
+    def __str__(self) -> str:
+        """Return module:line."""
+        return f"{self.module}:{self.line}"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the line as JSON-serializable data."""
+        return {"module": self.module, "line": self.line, "size": self.size, "count": self.count}
+
+
+class MemoryTracker:
+    """Records peak and retained memory per phase and per file with tracemalloc."""
+
+    def __init__(
+        self,
+        top: int = DEFAULT_TOP_FILES,
+        top_lines: int = DEFAULT_TOP_LINES,
+        modules: tuple[str, ...] = MEMORY_MODULES,
+        snapshot_phases: tuple[str, ...] = SNAPSHOT_PHASES,
+    ) -> None:
+        """Create a tracker; tracing begins with start().
+
+        Args:
+            top: Number of files with the highest peaks to keep
+            top_lines: Number of source lines to report
+            modules: Module file names allocations are attributed to
+            snapshot_phases: Phases whose ends may take a high-water snapshot
+        """
+        self.top = top
+        self.top_lines = top_lines
+        self.modules = modules
+        self.snapshot_phases = snapshot_phases
+        self.peak = 0
+        self.retained = 0
+        self.phases: dict[str, PhaseMemory] = {name: PhaseMemory() for name in PHASES}
+        self.high_water: list[LineMemory] = []
+        self.still_allocated: list[LineMemory] = []
+        # Open frames, outermost first: [memory at start, highest memory seen].
+        # The first frame is the file in progress
+        self._frames: list[list[int]] = []
+        self._heap: list[FileMemory] = []
+        self._base = 0
+        self._snapshot_level = 0
+        self._started_tracing = False
+
+    def start(self) -> None:
+        """Start tracing allocations."""
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        self._frames = [[current, current]]
+        self._base = current
+
+    def _update(self) -> int:
+        """Fold the peak since the last update into every open frame.
+
+        Returns:
+            Memory traced now
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for frame in self._frames:
+            frame[1] = max(frame[1], peak)
+        self.peak = max(self.peak, peak - self._base)
+        return current
+
+    def _snapshot(self) -> list[LineMemory]:
+        """Return the source lines of the tracked modules holding the most memory."""
+        filters = [
+            tracemalloc.Filter(True, os.path.join("*", "ascii_guard", module))
+            for module in self.modules
+        ]
+        snapshot = tracemalloc.take_snapshot().filter_traces(filters)
+        return [
+            LineMemory(
+                os.path.basename(stat.traceback[0].filename),
+                stat.traceback[0].lineno,
+                stat.size,
+                stat.count,
+            )
+            for stat in snapshot.statistics("lineno")[: self.top_lines]
+        ]
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Record the memory used by the block as a call of a phase."""
+        current = self._update()
+        self._frames.append([current, current])
+        try:
+            yield
+        finally:
+            current = self._update()
+            start, highest = self._frames.pop()
+            phase = self.phases.setdefault(name, PhaseMemory())
+            phase.peak = max(phase.peak, highest - start)
+            phase.retained += current - start
+            phase.calls += 1
+            if (
+                self.top_lines > 0
+                and name in self.snapshot_phases
+                and current > self._snapshot_level * SNAPSHOT_GROWTH
+            ):
+                self._snapshot_level = current
+                self.high_water = self._snapshot()
+
+    def end_file(self, path: str) -> None:
+        """Record the memory used since the previous file ended as this file's."""
+        current = self._update()
+        start, highest = self._frames[0]
+        self._frames[0] = [current, current]
+        if self.top <= 0:
+            return
+        entry = FileMemory(highest - start, path, current - start)
+        if len(self._heap) < self.top:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def stop(self) -> None:
+        """Stop tracing, recording what is still allocated."""
+        current = self._update()
+        self.retained = current - self._base
+        if self.top_lines > 0:
+            self.still_allocated = self._snapshot()
+        if self._started_tracing:
+            tracemalloc.stop()
+
+    def timer(self) -> "MemoryTimer":
+        """Return a PhaseTimer whose phases are also recorded by this tracker."""
+        return MemoryTimer(self)
+
+    @property
+    def largest(self) -> list[FileMemory]:
+        """Return the files with the highest peaks, highest first."""
+        return sorted(self._heap, reverse=True)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the memory stats as JSON-serializable data (sizes in bytes)."""
+        return {
+            "peak": self.peak,
+            "retained": self.retained,
+            "phases": {
+                name: {"peak": phase.peak, "retained": phase.retained, "calls": phase.calls}
+                for name, phase in self.phases.items()
+            },
+            "largest": [
+                {"path": entry.path, "peak": entry.peak, "retained": entry.retained}
+                for entry in self.largest
+            ],
+            "high_water": [line.to_dict() for line in self.high_water],
+            "still_allocated": [line.to_dict() for line in self.still_allocated],
+        }
+
+
+class MemoryTimer(PhaseTimer):
+    """PhaseTimer that also records the memory of its phases in a MemoryTracker."""
+
+    def __init__(self, tracker: MemoryTracker) -> None:
+        """Create a timer reporting to tracker."""
+        super().__init__()
+        self.tracker = tracker
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Charge the time and memory used by the block to a phase."""
+        with self.tracker.phase(name), super().phase(name):
+            yield
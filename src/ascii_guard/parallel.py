@@ -0,0 +1,651 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Parallel linting and fixing across files.
+
+Files are grouped into chunks of similar total size and handed to a worker
+pool. Workers send back compact tuples instead of result objects, and
+results are yielded in input order no matter which worker finishes first.
+
+ZERO dependencies - uses only Python stdlib (concurrent.futures).
+"""
+
+import itertools
+import math
+import multiprocessing
+import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, cast
+
+from ascii_guard.config import PerformanceConfig
+from ascii_guard.linter import fix_file, lint_file
+from ascii_guard.models import FixResult, LintResult, ValidationError
+from ascii_guard.scanner import ScannedFile
+from ascii_guard.stats import PhaseTimer, PhaseTotals, RunStats
+
+# Target total size of one chunk; large files travel alone
+CHUNK_BYTES = 1024 * 1024
+
+# Maximum number of files in one chunk
+CHUNK_FILES = 32
+
+# Chunks kept in flight per worker, bounding memory for huge trees
+CHUNKS_PER_WORKER = 2
+
+# Runs smaller than this are processed in-process: starting a pool costs
+# more than it saves
+MIN_PARALLEL_FILES = 64
+MIN_PARALLEL_BYTES = 4 * 1024 * 1024
+
+# Files held back while deciding whether to start a pool; cache hits count
+# too, so a warm cache cannot buffer the whole tree
+LOOKAHEAD_FILES = 4 * MIN_PARALLEL_FILES
+
+# Result of processing one file: a result object or the exception it raised
+Outcome = LintResult | FixResult | Exception
+
+# Compact per-file form sent back by workers (see process_chunk)
+Encoded = tuple[Any, ...] | Exception
+
+# Length of a compact lint and fix result, without the timings appended
+# when TaskOptions.stats is set
+ENCODED_LENGTH = {"lint": 3, "fix": 2}
+
+# Chunk as sent to workers: (path, content) pairs
+Payload = list[tuple[str, bytes | None]]
+
+# File paired with its cached outcome, if any
+Lookup = tuple[ScannedFile, Encoded | None]
+
+
+class WorkerCrashError(RuntimeError):
+    """A worker process died while processing a file."""
+
+
+@dataclass(frozen=True)
+class TaskOptions:
+    """What to do with each file.
+
+    Attributes:
+        mode: "lint" or "fix"
+        exclude_code_blocks: Skip ASCII boxes inside markdown code blocks
+        dry_run: In fix mode, report fixes without writing files
+        performance: [performance] settings passed to the linter
+        line_ranges: In lint mode, changed line ranges per file path (see
+            lint_file); files missing from the dict are validated in full
+        stats: Time each file; workers append its phase totals to the
+            compact result (see process_chunk)
+    """
+
+    mode: str = "lint"
+    exclude_code_blocks: bool = False
+    dry_run: bool = False
+    performance: PerformanceConfig = field(default_factory=PerformanceConfig)
+    line_ranges: dict[str, list[tuple[int, int]] | None] | None = None
+    stats: bool = False
+
+
+def _cgroup_cpu_limit() -> float | None:
+    """Return the CPU quota of the current cgroup, or None if unlimited.
+
+    Containers commonly see every host CPU while being throttled to a
+    fraction of them; sizing the pool by the host count then oversubscribes.
+    """
+    # cgroup v2: "<quota> <period>" or "max <period>"
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()[:2]
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+
+    # cgroup v1: quota of -1 means unlimited
+    try:
+        quota_us = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us").read_text())
+        period_us = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us").read_text())
+    except (OSError, ValueError):
+        return None
+    if quota_us > 0 and period_us > 0:
+        return quota_us / period_us
+    return None
+
+
+def available_cpus() -> int:
+    """Count the CPUs this process may actually use.
+
+    Honours CPU affinity and cgroup quotas, so a container limited to two
+    CPUs on a 64-core host gets 2, not 64.
+
+    Returns:
+        Number of usable CPUs (at least 1)
+    """
+    if hasattr(os, "sched_getaffinity"):
+        count = len(os.sched_getaffinity(0))
+    else:
+        count = os.cpu_count() or 1
+
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        count = min(count, max(1, math.ceil(limit)))
+    return max(1, count)
+
+
+def resolve_jobs(jobs: int | None, performance: PerformanceConfig | None = None) -> int:
+    """Return the number of workers to use.
+
+    Args:
+        jobs: Explicit worker count (--jobs), or None to use the config
+        performance: [performance] settings providing jobs when not given
+
+    Returns:
+        Worker count; 0 in either source means one per available CPU
+    """
+    if jobs is None:
+        jobs = performance.jobs if performance is not None else 0
+    if jobs <= 0:
+        return available_cpus()
+    return jobs
+
+
+def _encode_error(error: ValidationError) -> tuple[Any, ...]:
+    """Pack a ValidationError into a tuple."""
+    return (error.line, error.column, error.message, error.severity, error.fix)
+
+
+def process_file(
+    path: str, data: bytes | None, options: TaskOptions, timer: PhaseTimer | None = None
+) -> LintResult | FixResult:
+    """Lint or fix one file in the current process.
+
+    Args:
+        path: File path
+        data: File content if already read
+        options: What to do with the file
+        timer: Optional timer charged with the file's phases
+
+    Returns:
+        LintResult or FixResult, depending on options.mode
+    """
+    if options.mode == "fix":
+        return fix_file(
+            path,
+            dry_run=options.dry_run,
+            exclude_code_blocks=options.exclude_code_blocks,
+            data=data,
+            performance=options.performance,
+            timer=timer,
+        )
+    return lint_file(
+        path,
+        exclude_code_blocks=options.exclude_code_blocks,
+        data=data,
+        performance=options.performance,
+        line_ranges=options.line_ranges.get(path) if options.line_ranges else None,
+        timer=timer,
+    )
+
+
+def process_chunk(chunk: Payload, options: TaskOptions) -> list[Encoded]:
+    """Process a chunk of files in a worker.
+
+    Results are returned as plain tuples, which pickle far smaller than
+    the result objects: (boxes_found, errors, warnings) for lint and
+    (boxes_fixed, modified) for fix. With options.stats, the file's
+    PhaseTimer totals are appended to the tuple. Exceptions are returned in
+    place of the result so one bad file does not fail the chunk.
+
+    Args:
+        chunk: (path, content) pairs
+        options: What to do with each file
+
+    Returns:
+        One encoded outcome per file, in chunk order
+    """
+    encoded: list[Encoded] = []
+    for path, data in chunk:
+        timer = PhaseTimer() if options.stats else None
+        try:
+            result = process_file(path, data, options, timer)
+        except Exception as e:
+            encoded.append(e)
+            continue
+        compact: tuple[Any, ...]
+        if isinstance(result, FixResult):
+            compact = (result.boxes_fixed, result.modified)
+        else:
+            compact = (
+                result.boxes_found,
+                [_encode_error(e) for e in result.errors],
+                [_encode_error(e) for e in result.warnings],
+            )
+        encoded.append(compact if timer is None else (*compact, timer.totals()))
+    return encoded
+
+
+def split_timings(encoded: Encoded, options: TaskOptions) -> tuple[Encoded, PhaseTotals | None]:
+    """Separate the timings appended by process_chunk from a compact result.
+
+    Returns:
+        Tuple of (compact result, phase totals); the totals are None for a
+        result without timings (e.g. from the result cache) and empty for
+        an exception
+    """
+    if isinstance(encoded, Exception):
+        return encoded, {}
+    if len(encoded) > ENCODED_LENGTH[options.mode]:
+        return encoded[:-1], encoded[-1]
+    return encoded, None
+
+
+def _boxes(outcome: Outcome) -> int:
+    """Return the boxes found (lint) or fixed (fix) by an outcome."""
+    if isinstance(outcome, LintResult):
+        return outcome.boxes_found
+    if isinstance(outcome, FixResult):
+        return outcome.boxes_fixed
+    return 0
+
+
+def decode_outcome(path: str, encoded: Encoded, options: TaskOptions) -> Outcome:
+    """Rebuild a result object from a worker's compact form.
+
+    FixResult.lines is not sent back by workers and is left empty.
+
+    Args:
+        path: File path the outcome belongs to
+        encoded: Tuple produced by process_chunk, or an exception
+        options: Options the chunk was processed with
+
+    Returns:
+        LintResult, FixResult, or the exception raised for the file
+    """
+    if isinstance(encoded, Exception):
+        return encoded
+    if options.mode == "fix":
+        boxes_fixed, modified = encoded
+        return FixResult(file_path=path, boxes_fixed=boxes_fixed, lines=[], modified=modified)
+    boxes_found, errors, warnings = encoded
+    return LintResult(
+        file_path=path,
+        boxes_found=boxes_found,
+        errors=[ValidationError(*e) for e in errors],
+        warnings=[ValidationError(*w) for w in warnings],
+    )
+
+
+def _chunk_size(scanned: ScannedFile) -> int:
+    """Estimate the work for one file from its content size."""
+    if scanned.data is not None:
+        return len(scanned.data)
+    try:
+        return scanned.path.stat().st_size
+    except OSError:
+        return 0
+
+
+def chunk_files(
+    files: Iterable[ScannedFile],
+    chunk_bytes: int = CHUNK_BYTES,
+    chunk_files: int = CHUNK_FILES,
+) -> Iterator[list[ScannedFile]]:
+    """Group files into chunks of roughly chunk_bytes.
+
+    Small files are batched to amortize inter-process overhead; a file
+    larger than chunk_bytes forms a chunk of its own.
+
+    Args:
+        files: Files in input order
+        chunk_bytes: Target total content size per chunk
+        chunk_files: Maximum number of files per chunk
+
+    Yields:
+        Lists of files, preserving input order
+    """
+    chunk: list[ScannedFile] = []
+    size = 0
+    for scanned in files:
+        file_size = _chunk_size(scanned)
+        if chunk and (size + file_size > chunk_bytes or len(chunk) >= chunk_files):
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(scanned)
+        size += file_size
+    if chunk:
+        yield chunk
+
+
+def _payload(chunk: list[ScannedFile]) -> Payload:
+    """Convert a chunk into the picklable form sent to workers."""
+    return [(str(scanned.path), scanned.data) for scanned in chunk]
+
+
+def _make_executor(backend: str, jobs: int) -> Executor:
+    """Create the worker pool for a backend."""
+    if backend == "thread":
+        return ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="ascii-guard")
+    # Forking a process that runs the scan thread can deadlock; forkserver
+    # starts workers from a clean single-threaded process instead
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    return ProcessPoolExecutor(max_workers=jobs, mp_context=context)
+
+
+class WorkerPool:
+    """A worker pool that outlives a single run.
+
+    iter_results normally starts a pool for each run and shuts it down at
+    the end. A long-lived process (the daemon) passes a WorkerPool instead,
+    so worker processes start once and stay warm between runs. A pool can
+    also wrap an executor owned by the caller (see batch.lint_paths).
+    """
+
+    def __init__(self, backend: str, jobs: int, executor: Executor | None = None) -> None:
+        """Create a pool; workers start on first use.
+
+        Args:
+            backend: "process" or "thread"
+            jobs: Number of workers
+            executor: Optional executor to use instead of starting one; the
+                pool never shuts it down or replaces it
+        """
+        self.backend = backend
+        self.jobs = jobs
+        self._executor: Executor | None = executor
+        self._external = executor is not None
+
+    @property
+    def executor(self) -> Executor:
+        """The underlying executor, started on first access."""
+        if self._executor is None:
+            self._executor = _make_executor(self.backend, self.jobs)
+        return self._executor
+
+    def restart(self) -> Executor:
+        """Replace an executor that lost a worker.
+
+        An executor owned by the caller is kept; if it is broken, submitting
+        to it raises BrokenProcessPool.
+        """
+        if self._external:
+            return self.executor
+        self.shutdown(wait=False)
+        return self.executor
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the workers; the pool restarts them if used again."""
+        if self._executor is not None and not self._external:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+def _completed(encoded: list[Encoded]) -> Future[list[Encoded]]:
+    """Wrap already known outcomes in a finished future."""
+    future: Future[list[Encoded]] = Future()
+    future.set_result(encoded)
+    return future
+
+
+class _PoolRunner:
+    """Dispatch chunks to a pool and yield outcomes in input or completion order."""
+
+    def __init__(
+        self,
+        options: TaskOptions,
+        jobs: int,
+        backend: str,
+        worker: Callable[[Payload, TaskOptions], list[Encoded]],
+        pool: WorkerPool | None = None,
+        stats: RunStats | None = None,
+        ordered: bool = True,
+    ) -> None:
+        self.options = options
+        self.ordered = ordered
+        self.stats = stats
+        self.jobs = jobs
+        self.backend = backend
+        self.worker = worker
+        self.pool = pool if pool is not None else WorkerPool(backend, jobs)
+        self.owns_pool = pool is None
+        self.executor = self.pool.executor
+        self.pending: deque[tuple[list[ScannedFile], Future[list[Encoded]]]] = deque()
+
+    def run(self, lookups: Iterable[Lookup]) -> Iterator[tuple[ScannedFile, Outcome]]:
+        """Process files, keeping a bounded number of chunks in flight.
+
+        Files with a cached outcome never reach the pool; their outcomes are
+        queued as completed futures so they are yielded in input order.
+        """
+        try:
+            for is_hit, group in itertools.groupby(lookups, key=lambda item: item[1] is not None):
+                if is_hit:
+                    for scanned, encoded in group:
+                        self.pending.append(([scanned], _completed([cast("Encoded", encoded)])))
+                        yield from self.throttle()
+                else:
+                    for chunk in chunk_files(scanned for scanned, _ in group):
+                        self.submit(chunk)
+                        yield from self.throttle()
+            while self.pending:
+                yield from self.collect()
+        finally:
+            if self.owns_pool:
+                self.pool.shutdown()
+            else:
+                # A shared pool stays up; drop work nobody will collect
+                for _, future in self.pending:
+                    future.cancel()
+
+    def throttle(self) -> Iterator[tuple[ScannedFile, Outcome]]:
+        """Collect outcomes while too many chunks are in flight."""
+        while len(self.pending) >= self.jobs * CHUNKS_PER_WORKER:
+            yield from self.collect()
+
+    def submit(self, chunk: list[ScannedFile]) -> None:
+        """Queue a chunk on the pool."""
+        future = self.executor.submit(self.worker, _payload(chunk), self.options)
+        self.pending.append((chunk, future))
+
+    def restart(self) -> None:
+        """Replace a pool that lost a worker."""
+        self.executor = self.pool.restart()
+
+    def next_pending(self) -> tuple[list[ScannedFile], Future[list[Encoded]]]:
+        """Remove and return the oldest pending chunk, or unordered the first to finish."""
+        if self.ordered:
+            return self.pending.popleft()
+        done = next((item for item in self.pending if item[1].done()), None)
+        if done is None:
+            wait([future for _, future in self.pending], return_when=FIRST_COMPLETED)
+            done = next(item for item in self.pending if item[1].done())
+        self.pending.remove(done)
+        return done
+
+    def collect(self) -> Iterator[tuple[ScannedFile, Outcome]]:
+        """Yield the outcomes of the next pending chunk (see next_pending)."""
+        chunk, future = self.next_pending()
+        try:
+            encoded = future.result()
+        except BrokenProcessPool:
+            yield from self.recover(chunk)
+            return
+        except Exception as e:
+            # The chunk as a whole failed (e.g. content that cannot be pickled)
+            encoded = [e] * len(chunk)
+
+        for scanned, outcome in zip(chunk, encoded, strict=True):
+            yield scanned, self.decode(scanned, outcome)
+
+    def decode(self, scanned: ScannedFile, encoded: Encoded) -> Outcome:
+        """Rebuild a file's outcome, recording its timings in stats."""
+        encoded, totals = split_timings(encoded, self.options)
+        outcome = decode_outcome(str(scanned.path), encoded, self.options)
+        if self.stats is not None:
+            self.stats.add_file(str(scanned.path), scanned.data, _boxes(outcome), totals)
+        return outcome
+
+    def recover(self, chunk: list[ScannedFile]) -> Iterator[tuple[ScannedFile, Outcome]]:
+        """Pin a worker crash on a single file and carry on.
+
+        A dead worker breaks the whole pool and every pending future, so
+        the culprit is unknown. The oldest chunk is retried one file at a
+        time in a fresh pool - alone in the pool, a crash can only be that
+        file's. The other pending chunks are resubmitted afterwards; if one
+        of them was the culprit, it breaks the pool again once it reaches
+        the front and is isolated in turn.
+        """
+        others = list(self.pending)
+        self.pending.clear()
+        self.restart()
+
+        for scanned in chunk:
+            future = self.executor.submit(self.worker, _payload([scanned]), self.options)
+            try:
+                encoded = future.result()[0]
+            except BrokenProcessPool:
+                encoded = WorkerCrashError("Worker process crashed")
+                self.restart()
+            except Exception as e:
+                encoded = e
+            yield scanned, self.decode(scanned, encoded)
+
+        # Keep outcomes that completed before the crash; redo the rest
+        for pending_chunk, future in others:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self.pending.append((pending_chunk, future))
+            else:
+                self.submit(pending_chunk)
+
+
+def iter_results(
+    files: Iterable[ScannedFile],
+    options: TaskOptions,
+    jobs: int = 1,
+    backend: str = "process",
+    run_inline: Callable[..., LintResult | FixResult] | None = None,
+    min_parallel_files: int = MIN_PARALLEL_FILES,
+    min_parallel_bytes: int = MIN_PARALLEL_BYTES,
+    worker: Callable[[Payload, TaskOptions], list[Encoded]] = process_chunk,
+    cached: Callable[[ScannedFile], Encoded | None] | None = None,
+    pool: WorkerPool | None = None,
+    stats: RunStats | None = None,
+    ordered: bool = True,
+) -> Iterator[tuple[ScannedFile, Outcome]]:
+    """Lint or fix files, in parallel when it pays off.
+
+    Results are yielded in input order, or with ordered=False as workers
+    finish them. An exception raised for a file,
+    including WorkerCrashError when its worker process dies, is yielded
+    as that file's outcome instead of stopping the run.
+
+    Small runs (fewer than min_parallel_files files and min_parallel_bytes
+    bytes) are processed in this process, as are all runs with jobs <= 1 or
+    the "serial" backend unless a pool is given.
+
+    Args:
+        files: Files to process, e.g. from scan_files
+        options: What to do with each file
+        jobs: Number of workers
+        backend: "process", "thread" or "serial"
+        run_inline: Function processing one file in this process (default:
+            process_file with options); with stats it is also passed the
+            file's PhaseTimer
+        min_parallel_files: File count at which a pool is started
+        min_parallel_bytes: Total content size at which a pool is started
+        worker: Function run in the pool on each chunk
+        cached: Optional lookup returning a file's outcome in compact form
+            (e.g. from ResultCache); files it answers are not processed
+        pool: Optional long-lived pool to use instead of starting one; it
+            must match jobs and backend and is left running afterwards
+        stats: Optional run stats; every file and the time spent on it are
+            recorded, wherever it was processed. options.stats must be set
+            for workers to send timings back
+        ordered: Yield outcomes in input order; otherwise each chunk's
+            outcomes are yielded as soon as it is done
+
+    Yields:
+        Tuples of (file, result or exception)
+    """
+
+    def process_inline(scanned: ScannedFile, timer: PhaseTimer | None) -> LintResult | FixResult:
+        if run_inline is not None:
+            return run_inline(scanned) if timer is None else run_inline(scanned, timer)
+        return process_file(str(scanned.path), scanned.data, options, timer)
+
+    def inline(items: Iterable[Lookup]) -> Iterator[tuple[ScannedFile, Outcome]]:
+        for scanned, encoded in items:
+            outcome: Outcome
+            totals: PhaseTotals | None = None
+            if encoded is not None:
+                outcome = decode_outcome(str(scanned.path), encoded, options)
+            else:
+                timer = stats.new_timer() if stats is not None else None
+                try:
+                    outcome = process_inline(scanned, timer)
+                except Exception as e:
+                    outcome = e
+                if timer is not None:
+                    totals = timer.totals()
+            if stats is not None:
+                stats.add_file(str(scanned.path), scanned.data, _boxes(outcome), totals)
+            yield scanned, outcome
+
+    lookups: Iterator[Lookup] = (
+        (scanned, cached(scanned) if cached is not None else None) for scanned in files
+    )
+    if pool is None and (jobs <= 1 or backend == "serial"):
+        yield from inline(lookups)
+        return
+
+    # Look ahead until there is enough uncached work to be worth a pool.
+    # Hits with no miss before them are yielded right away, and a look-ahead
+    # that grows past LOOKAHEAD_FILES without finding enough misses is
+    # processed in this process, so results keep streaming on warm caches.
+    lookahead = max(LOOKAHEAD_FILES, min_parallel_files)
+    head: list[Lookup] = []
+    misses = 0
+    miss_bytes = 0
+    for lookup in lookups:
+        if lookup[1] is not None and not head:
+            yield from inline([lookup])
+            continue
+        head.append(lookup)
+        if lookup[1] is None:
+            misses += 1
+            miss_bytes += _chunk_size(lookup[0])
+            if misses >= min_parallel_files or miss_bytes >= min_parallel_bytes:
+                break
+        if len(head) >= lookahead:
+            yield from inline(head)
+            head = []
+            misses = 0
+            miss_bytes = 0
+    else:
+        yield from inline(head)
+        return
+
+    runner = _PoolRunner(options, jobs, backend, worker, pool, stats, ordered)
+    yield from runner.run(itertools.chain(head, lookups))
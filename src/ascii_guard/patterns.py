@@ -14,13 +14,115 @@
 
 """Pattern matching for file filtering (gitignore-style patterns).
 
-ZERO dependencies - uses only Python stdlib (fnmatch + pathlib).
+ZERO dependencies - uses only Python stdlib (fnmatch + functools + pathlib).
 """
 
 import fnmatch
+import functools
 from pathlib import Path, PurePosixPath
 
 
+class PathMatcher:
+    """A pattern list prepared once for repeated matching.
+
+    Comments and empty patterns are dropped and negations split off up
+    front, and since the last matching pattern decides the outcome, patterns
+    are evaluated from the end and matching stops at the first hit. Results
+    are identical to match_path().
+
+    Use compile_patterns() to obtain a cached instance.
+    """
+
+    def __init__(self, patterns: list[str] | tuple[str, ...]) -> None:
+        """Prepare a pattern list.
+
+        Args:
+            patterns: Gitignore-style patterns (see match_path)
+        """
+        self.patterns = tuple(patterns)
+        rules: list[tuple[str, bool]] = []
+        for pattern in self.patterns:
+            # Skip empty patterns and comments
+            if not pattern or pattern.startswith("#"):
+                continue
+            # Check for negation (include override)
+            if pattern.startswith("!"):
+                rules.append((pattern[1:], True))
+            else:
+                rules.append((pattern, False))
+        # Later patterns override earlier ones, so check them first
+        self._rules = tuple(reversed(rules))
+
+    def match(self, path: Path | str, base_path: Path | str | None = None) -> bool:
+        """Check if a path is excluded, resolving it against the filesystem.
+
+        Args:
+            path: Path to check
+            base_path: Base path for relative pattern matching (default: current dir)
+
+        Returns:
+            True if path should be excluded (matches pattern), False if included
+        """
+        if not self._rules:
+            return False
+
+        path_obj = Path(path).resolve()
+        base_obj = Path(base_path).resolve() if base_path is not None else Path.cwd().resolve()
+
+        # Make path relative to base for pattern matching
+        try:
+            rel_path = path_obj.relative_to(base_obj)
+        except ValueError:
+            # Path is not relative to base, use absolute path
+            rel_path = path_obj
+
+        # Convert to POSIX path for consistent pattern matching
+        posix_path = PurePosixPath(rel_path)
+
+        # Check if path is a directory (check original path object)
+        return self._match(str(posix_path), posix_path.parts, path_obj.is_dir())
+
+    def match_relative(self, rel_path: str, is_directory: bool) -> bool:
+        """Check if a path is excluded without touching the filesystem.
+
+        The caller must supply a normalized POSIX path relative to the base
+        path that contains no symlinks, and whether it is a directory; this
+        is what match() would compute after resolving the path.
+
+        Args:
+            rel_path: Relative POSIX path such as "docs/guide.md"
+            is_directory: Whether the path is a directory
+
+        Returns:
+            True if path should be excluded (matches pattern), False if included
+        """
+        if not self._rules:
+            return False
+        return self._match(rel_path, tuple(rel_path.split("/")), is_directory)
+
+    def _match(self, path_str: str, path_parts: tuple[str, ...], is_directory: bool) -> bool:
+        """Return the outcome of the last pattern matching the path."""
+        for pattern, is_negation in self._rules:
+            if _match_single_pattern(pattern, path_str, path_parts, is_directory):
+                # If negation, include (not excluded)
+                # If not negation, exclude
+                return not is_negation
+        return False
+
+
+@functools.lru_cache(maxsize=128)
+def compile_patterns(patterns: tuple[str, ...]) -> PathMatcher:
+    """Return a cached PathMatcher for a pattern list.
+
+    Args:
+        patterns: Gitignore-style patterns as a tuple (hashable cache key)
+
+    Returns:
+        PathMatcher shared by all callers using the same patterns
+    """
+    return PathMatcher(patterns)
+
+
 def match_path(
     path: Path | str,
     patterns: list[str],
@@ -45,46 +147,7 @@ def match_path(
     if not patterns:
         return False
 
-    path_obj = Path(path).resolve()
-    base_obj = Path(base_path).resolve() if base_path is not None else Path.cwd().resolve()
-
-    # Make path relative to base for pattern matching
-    try:
-        rel_path = path_obj.relative_to(base_obj)
-    except ValueError:
-        # Path is not relative to base, use absolute path
-        rel_path = path_obj
-
-    # Convert to POSIX path for consistent pattern matching
-    posix_path = PurePosixPath(rel_path)
-    path_str = str(posix_path)
-    path_parts = posix_path.parts
-
-    # Check if path is a directory (check original path object)
-    is_directory = path_obj.is_dir()
-
-    # Process patterns in order (later patterns override earlier ones)
-    excluded = False
-
-    for pattern in patterns:
-        # Skip empty patterns and comments
-        if not pattern or pattern.startswith("#"):
-            continue
-
-        # Check for negation (include override)
-        is_negation = pattern.startswith("!")
-        if is_negation:
-            pattern = pattern[1:]  # Remove ! prefix
-
-        # Match the pattern
-        matched = _match_single_pattern(pattern, path_str, path_parts, is_directory)
-
-        if matched:
-            # If negation, include (not excluded)
-            # If not negation, exclude
-            excluded = not is_negation
-
-    return excluded
+    return compile_patterns(tuple(patterns)).match(path, base_path)
 
 
 def _match_single_pattern(
@@ -0,0 +1,314 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Machine-readable output formats for lint results.
+
+Reporters write each file's record as soon as its result arrives, with one
+write per file to the output stream, so large runs stream their output
+instead of holding it in memory. The JSON and SARIF documents are produced
+in the same single pass: their result arrays stay open until finish().
+
+ZERO dependencies - uses only Python stdlib (json).
+"""
+
+import json
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TextIO
+from urllib.parse import quote
+
+from ascii_guard import __version__
+from ascii_guard.models import LintResult, ValidationError
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_RULE_ID = "box-alignment"
+INFORMATION_URI = "https://github.com/fxstein/ascii-guard"
+
+
+@dataclass
+class Summary:
+    """Totals over all reported files."""
+
+    files: int = 0
+    files_with_errors: int = 0
+    files_failed: int = 0
+    boxes: int = 0
+    errors: int = 0
+    warnings: int = 0
+
+
+def display_path(path: str, cwd: Path) -> str:
+    """Return path relative to cwd when it is inside it, in POSIX form."""
+    try:
+        return Path(path).relative_to(cwd).as_posix()
+    except ValueError:
+        return Path(path).as_posix()
+
+
+def issue_record(issue: ValidationError) -> dict[str, Any]:
+    """Return the JSON form of an error or warning (1-indexed positions)."""
+    return {
+        "line": issue.line + 1,
+        "column": issue.column + 1,
+        "message": issue.message,
+        "severity": issue.severity,
+    }
+
+
+def file_record(path: str, result: LintResult) -> dict[str, Any]:
+    """Return the JSON form of one file's lint result."""
+    return {
+        "path": path,
+        "boxes_found": result.boxes_found,
+        "errors": [issue_record(e) for e in result.errors],
+        "warnings": [issue_record(w) for w in result.warnings],
+    }
+
+
+class Reporter(ABC):
+    """Base class for streaming reporters.
+
+    Subclasses implement the _result and _failure hooks and may override
+    _begin and _end; the public methods keep the run summary.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        """Initialize a reporter writing to stream."""
+        self.stream = stream
+        self.summary = Summary()
+        self._cwd = Path.cwd()
+
+    def start(self) -> None:
+        """Write anything that precedes the first result."""
+        self._begin()
+
+    def result(self, path: str, result: LintResult) -> None:
+        """Report the lint result of one file."""
+        summary = self.summary
+        summary.files += 1
+        summary.boxes += result.boxes_found
+        summary.errors += len(result.errors)
+        summary.warnings += len(result.warnings)
+        if result.has_errors:
+            summary.files_with_errors += 1
+        self._result(display_path(path, self._cwd), result)
+
+    def failure(self, path: str, error: Exception) -> None:
+        """Report a file that could not be linted."""
+        self.summary.files += 1
+        self.summary.files_failed += 1
+        self._failure(display_path(path, self._cwd), error)
+
+    def finish(self) -> None:
+        """Write anything that follows the last result and flush."""
+        self._end()
+        self.stream.flush()
+
+    def _begin(self) -> None:
+        """Write the output's opening, e.g. a document header (default: nothing)."""
+        return
+
+    @abstractmethod
+    def _result(self, path: str, result: LintResult) -> None:
+        """Write the record of one linted file.
+
+        Args:
+            path: Display path of the file (relative to the working directory)
+            result: Lint result of the file
+        """
+
+    @abstractmethod
+    def _failure(self, path: str, error: Exception) -> None:
+        """Write the record of a file that could not be linted.
+
+        Args:
+            path: Display path of the file
+            error: Exception raised while reading or linting it
+        """
+
+    def _end(self) -> None:
+        """Write the output's closing, e.g. closing brackets (default: nothing)."""
+        return
+
+
+class JsonLinesReporter(Reporter):
+    """One JSON object per line and file."""
+
+    def _result(self, path: str, result: LintResult) -> None:
+        self.stream.write(json.dumps(file_record(path, result), ensure_ascii=False) + "\n")
+
+    def _failure(self, path: str, error: Exception) -> None:
+        record = {"path": path, "failure": str(error)}
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class JsonReporter(Reporter):
+    """A single JSON document with a files array and a summary."""
+
+    def _begin(self) -> None:
+        self._separator = "\n"
+        self.stream.write('{"files": [')
+
+    def _write(self, record: dict[str, Any]) -> None:
+        self.stream.write(self._separator + json.dumps(record, ensure_ascii=False))
+        self._separator = ",\n"
+
+    def _result(self, path: str, result: LintResult) -> None:
+        self._write(file_record(path, result))
+
+    def _failure(self, path: str, error: Exception) -> None:
+        self._write({"path": path, "failure": str(error)})
+
+    def _end(self) -> None:
+        summary = {
+            "total_files": self.summary.files,
+            "files_with_errors": self.summary.files_with_errors,
+            "files_failed": self.summary.files_failed,
+            "total_boxes": self.summary.boxes,
+            "total_errors": self.summary.errors,
+            "total_warnings": self.summary.warnings,
+        }
+        self.stream.write(f'\n], "summary": {json.dumps(summary)}}}\n')
+
+
+def _artifact_uri(path: str) -> str:
+    """Return a SARIF artifact URI: relative paths resolve against the checkout."""
+    return Path(path).as_uri() if Path(path).is_absolute() else quote(path)
+
+
+class SarifReporter(Reporter):
+    """A SARIF 2.1.0 log for code scanning tools."""
+
+    def _begin(self) -> None:
+        self._separator = "\n"
+        self._notifications: list[dict[str, Any]] = []
+        driver = {
+            "name": "ascii-guard",
+            "version": __version__,
+            "informationUri": INFORMATION_URI,
+            "rules": [
+                {
+                    "id": SARIF_RULE_ID,
+                    "shortDescription": {"text": "ASCII art box is misaligned or broken"},
+                }
+            ],
+        }
+        header = json.dumps({"tool": {"driver": driver}}, ensure_ascii=False)
+        # Leave the run object open after the tool so results can be appended
+        self.stream.write(
+            f'{{"$schema": "{SARIF_SCHEMA}", "version": "2.1.0", "runs": [{header[:-1]}, '
+            f'"results": ['
+        )
+
+    def _result(self, path: str, result: LintResult) -> None:
+        uri = _artifact_uri(path)
+        chunk = []
+        for issue in (*result.errors, *result.warnings):
+            sarif_result = {
+                "ruleId": SARIF_RULE_ID,
+                "level": "error" if issue.severity == "error" else "warning",
+                "message": {"text": issue.message},
+                "locations": [
+                    {
+                        "physicalLocation": {
+                            "artifactLocation": {"uri": uri},
+                            "region": {
+                                "startLine": issue.line + 1,
+                                "startColumn": issue.column + 1,
+                            },
+                        }
+                    }
+                ],
+            }
+            chunk.append(self._separator + json.dumps(sarif_result, ensure_ascii=False))
+            self._separator = ",\n"
+        if chunk:
+            self.stream.write("".join(chunk))
+
+    def _failure(self, path: str, error: Exception) -> None:
+        self._notifications.append(
+            {
+                "level": "error",
+                "message": {"text": str(error)},
+                "locations": [
+                    {"physicalLocation": {"artifactLocation": {"uri": _artifact_uri(path)}}}
+                ],
+            }
+        )
+
+    def _end(self) -> None:
+        invocation = {
+            "executionSuccessful": not self._notifications,
+            "toolExecutionNotifications": self._notifications,
+        }
+        self.stream.write(
+            f'\n], "invocations": [{json.dumps(invocation, ensure_ascii=False)}]}}]}}\n'
+        )
+
+
+def _escape_data(value: str) -> str:
+    """Escape a GitHub workflow command message."""
+    return value.replace("%", "%25").replace("\r", "%0D").replace("\n", "%0A")
+
+
+def _escape_property(value: str) -> str:
+    """Escape a GitHub workflow command property value."""
+    return _escape_data(value).replace(":", "%3A").replace(",", "%2C")
+
+
+class GithubReporter(Reporter):
+    """GitHub Actions workflow commands that annotate the changed files."""
+
+    def _result(self, path: str, result: LintResult) -> None:
+        file = _escape_property(path)
+        lines = [
+            f"::{'error' if issue.severity == 'error' else 'warning'} file={file},"
+            f"line={issue.line + 1},col={issue.column + 1},title=ascii-guard::"
+            f"{_escape_data(issue.message)}\n"
+            for issue in (*result.errors, *result.warnings)
+        ]
+        if lines:
+            self.stream.write("".join(lines))
+
+    def _failure(self, path: str, error: Exception) -> None:
+        self.stream.write(
+            f"::error file={_escape_property(path)},title=ascii-guard::"
+            f"{_escape_data(f'Error processing file: {error}')}\n"
+        )
+
+
+REPORTERS: dict[str, type[Reporter]] = {
+    "jsonl": JsonLinesReporter,
+    "json": JsonReporter,
+    "sarif": SarifReporter,
+    "github": GithubReporter,
+}
+
+
+def create_reporter(output_format: str, stream: TextIO) -> Reporter:
+    """Return the reporter for a machine-readable output format.
+
+    Args:
+        output_format: One of defaults.OUTPUT_FORMATS other than "text"
+        stream: Text stream to write to
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    try:
+        reporter_class = REPORTERS[output_format]
+    except KeyError:
+        raise ValueError(f"Unknown output format: {output_format}") from None
+    return reporter_class(stream)
@@ -18,10 +18,67 @@ ZERO dependencies - uses only Python stdlib.
 """
 
 import os
+import queue
+import stat
+import threading
+from collections.abc import Callable, Collection, Iterable, Iterator
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TypeVar, cast
 
-from ascii_guard.config import Config
-from ascii_guard.patterns import match_path
+from ascii_guard.cache import ScanCache, config_fingerprint
+from ascii_guard.config import Config, ConfigResolver
+from ascii_guard.patterns import PathMatcher, compile_patterns
+from ascii_guard.stats import PhaseTimer
+
+# Number of leading bytes inspected by the text heuristics
+SNIFF_SIZE = 8192
+
+# Default number of scanned items buffered ahead of the consumer by prefetch()
+PREFETCH_SIZE = 64
+
+# Flags for opening explicit paths: binary on Windows, and FIFOs named by
+# mistake do not block (they are skipped after the open)
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0) | getattr(os, "O_NONBLOCK", 0)
+
+T = TypeVar("T")
+
+
+@dataclass
+class ScannedFile:
+    """A file selected by the scanner, together with its content.
+
+    Attributes:
+        path: Path to the file
+        data: Raw file content, or None if the file could not be read
+            (the linter then reads it itself and reports the error)
+    """
+
+    path: Path
+    data: bytes | None
+
+
+def _looks_like_text(chunk: bytes) -> bool:
+    """Apply the text heuristics to the leading bytes of a file."""
+    # Empty file is considered text
+    if not chunk:
+        return True
+
+    # Check for NULL bytes (common in binary files)
+    if b"\x00" in chunk:
+        return False
+
+    # Try to decode as UTF-8
+    try:
+        chunk.decode("utf-8")
+        return True
+    except UnicodeDecodeError:
+        # Try other common encodings
+        try:
+            chunk.decode("latin-1")
+            return True
+        except UnicodeDecodeError:
+            return False
 
 
 def is_text_file(file_path: Path, max_size_mb: int = 10) -> bool:
@@ -48,49 +105,282 @@ def is_text_file(file_path: Path, max_size_mb: int = 10) -> bool:
 
         # Try to read first 8KB as text
         with open(file_path, "rb") as f:
-            chunk = f.read(8192)
+            chunk = f.read(SNIFF_SIZE)
 
-        # Empty file is considered text
-        if not chunk:
-            return True
+        return _looks_like_text(chunk)
 
-        # Check for NULL bytes (common in binary files)
-        if b"\x00" in chunk:
-            return False
+    except (OSError, PermissionError):
+        return False
 
-        # Try to decode as UTF-8
-        try:
-            chunk.decode("utf-8")
-            return True
-        except UnicodeDecodeError:
-            # Try other common encodings
-            try:
-                chunk.decode("latin-1")
-                return True
-            except UnicodeDecodeError:
-                return False
 
+def read_text_file(file_path: Path, max_size_mb: int = 10) -> bytes | None:
+    """Read a file in full if it passes the same checks as is_text_file.
+
+    The size check, binary check and content read share a single open, so
+    the linter can consume the returned buffer without touching the file
+    again.
+
+    Args:
+        file_path: Path to file to read
+        max_size_mb: Maximum file size in MB (0 = unlimited)
+
+    Returns:
+        File content if file appears to be text, None otherwise
+    """
+    try:
+        with open(file_path, "rb") as f:
+            if max_size_mb > 0:
+                size_mb = os.fstat(f.fileno()).st_size / (1024 * 1024)
+                if size_mb > max_size_mb:
+                    return None
+            # Sniff the leading bytes before reading the rest, so binary
+            # files cost one SNIFF_SIZE read like in is_text_file
+            chunk = f.read(SNIFF_SIZE)
+            if not _looks_like_text(chunk):
+                return None
+            return chunk + f.read()
     except (OSError, PermissionError):
-        return False
+        return None
 
 
-def scan_directory(
-    directory: Path | str,
+def _list_directory(
+    directory: Path, rel_dir: str | None, base: Path, config: Config, matcher: PathMatcher
+) -> tuple[list[str], list[Path]]:
+    """List one directory, applying the pattern and extension filters.
+
+    Mirrors os.walk(topdown=True): unreadable directories are skipped, and
+    symlinked directories are only descended into when follow_symlinks is set.
+
+    Patterns are matched against paths relative to base. When rel_dir (the
+    directory relative to base) is known and no symlink is involved, the
+    relative path is built directly instead of resolving every entry.
+
+    Returns:
+        Tuple of (subdirectory names to descend into, candidate file paths)
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except OSError:
+        return [], []
+
+    dirs: list[str] = []
+    files: list[Path] = []
+    for entry in entries:
+        entry_path = directory / entry.name
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+
+        if is_dir and not config.follow_symlinks and entry.is_symlink():
+            continue  # Symlinked directories are not descended into
+
+        # Check if entry matches exclude/include patterns
+        if rel_dir is None or entry.is_symlink():
+            excluded = matcher.match(entry_path, base)
+        else:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            excluded = matcher.match_relative(rel_path, is_dir)
+
+        if excluded:
+            continue  # Excluded directories are not descended into
+
+        if is_dir:
+            dirs.append(entry.name)
+            continue
+
+        # Check file extension if configured
+        if config.extensions and not any(entry.name.endswith(ext) for ext in config.extensions):
+            continue  # File extension not in allowed list
+
+        files.append(entry_path)
+
+    return dirs, files
+
+
+def _scan_tree(
+    root: Path,
     config: Config,
-) -> list[Path]:
-    """Recursively scan directory for text files matching config filters.
+    accept: Callable[[Path, Config], T | None],
+    accept_cached: Callable[[Path, Config], T | None] | None = None,
+    cache: ScanCache | None = None,
+    resolver: ConfigResolver | None = None,
+) -> Iterator[T]:
+    """Walk root and yield accept(file) for every file that passes the filters.
+
+    accept() applies the text checks (possibly reading the file) and returns
+    None to reject it. With a cache, directories whose mtime is unchanged are
+    not listed or filtered again: their previously accepted files are passed
+    to accept_cached() instead (defaults to accept).
 
     Args:
-        directory: Directory to scan
+        root: Resolved directory to walk
         config: Config object with file filtering settings
+        accept: Callback for files from freshly listed directories
+        accept_cached: Callback for files served from the cache
+        cache: Optional persistent scan cache
+        resolver: Optional per-directory config resolver; when given, each
+            directory uses the nearest config file and its patterns are
+            matched relative to that file's directory
+
+    Yields:
+        Non-None results of the accept callbacks, in os.walk order
+    """
+    if accept_cached is None:
+        accept_cached = accept
+
+    cache_keys: dict[tuple[int, Path], str] = {}
+    matchers: dict[int, PathMatcher] = {}
+
+    # Each entry: (directory, reached without following a symlink)
+    stack = [(root, True)]
+    while stack:
+        directory, direct = stack.pop()
+
+        dir_config, base = config, root
+        if resolver is not None:
+            dir_config, config_dir = resolver.resolve(directory)
+            if config_dir is not None:
+                base = config_dir
+
+        # Combine into single list (excludes first, then includes), once
+        # per config rather than once per directory
+        matcher = matchers.get(id(dir_config))
+        if matcher is None:
+            matcher = compile_patterns(tuple(dir_config.exclude + dir_config.include))
+            matchers[id(dir_config)] = matcher
+
+        mtime_ns = -1
+        listing = None
+        cache_key = ""
+        if cache is not None:
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            key_id = (id(dir_config), base)
+            if key_id not in cache_keys:
+                cache_keys[key_id] = f"{config_fingerprint(dir_config)}:{base}"
+            cache_key = cache_keys[key_id]
+            listing = cache.lookup(directory, mtime_ns, cache_key)
+
+        if listing is not None:
+            dirs, names = listing
+            for name in names:
+                result = accept_cached(directory / name, dir_config)
+                if result is not None:
+                    yield result
+        else:
+            rel_dir = None
+            if direct:
+                try:
+                    rel_dir = directory.relative_to(base).as_posix()
+                except ValueError:
+                    rel_dir = None
+                if rel_dir == ".":
+                    rel_dir = ""
+            dirs, candidates = _list_directory(directory, rel_dir, base, dir_config, matcher)
+            names = []
+            for file_path in candidates:
+                result = accept(file_path, dir_config)
+                if result is not None:
+                    names.append(file_path.name)
+                    yield result
+            if cache is not None:
+                cache.store(directory, mtime_ns, cache_key, dirs, names)
+
+        # Depth-first, in listing order (same as os.walk topdown)
+        for name in reversed(dirs):
+            subdir = directory / name
+            # Symlinked directories only appear here when following symlinks
+            followed = dir_config.follow_symlinks and subdir.is_symlink()
+            stack.append((subdir, direct and not followed))
+
+
+def _walk_config(
+    file_path: Path, root: Path, config: Config, resolver: ConfigResolver | None
+) -> Config | None:
+    """Decide whether a walk of root would select file_path, without walking.
+
+    Applies the same checks as _scan_tree to every directory on the way
+    down from root: excluded directories prune the file, and the file
+    itself must pass the patterns and extension filter of its directory's
+    config. Text checks are left to the caller.
 
     Returns:
-        List of text file paths that should be linted
+        Config that applies to the file, or None if the walk would skip it
+    """
+    try:
+        parts = file_path.relative_to(root).parts
+    except ValueError:
+        return None
+
+    directory = root
+    for index, name in enumerate(parts):
+        dir_config, base = config, root
+        if resolver is not None:
+            dir_config, config_dir = resolver.resolve(directory)
+            if config_dir is not None:
+                base = config_dir
+        matcher = compile_patterns(tuple(dir_config.exclude + dir_config.include))
+
+        entry_path = directory / name
+        is_dir = index < len(parts) - 1
+        try:
+            excluded = matcher.match_relative(entry_path.relative_to(base).as_posix(), is_dir)
+        except ValueError:
+            excluded = matcher.match(entry_path, base)
+        if excluded:
+            return None
 
-    Raises:
-        FileNotFoundError: If directory doesn't exist
-        NotADirectoryError: If path is not a directory
+        if not is_dir:
+            if dir_config.extensions and not any(
+                name.endswith(ext) for ext in dir_config.extensions
+            ):
+                return None
+            return dir_config
+        directory = entry_path
+
+    return None
+
+
+def select_path(
+    file_path: Path | str,
+    config: Config | None = None,
+    resolver: ConfigResolver | None = None,
+) -> Config | None:
+    """Decide whether a scan would select a file, which need not exist.
+
+    Used for content that arrives without a file, such as stdin with a
+    --stdin-filename: the exclude/include patterns and extension filter are
+    applied as a walk from the directory of the applicable config file (or
+    the current directory) would apply them.
+
+    Args:
+        file_path: Path the content belongs to
+        config: Config object (uses default if None)
+        resolver: Optional per-directory config resolver
+
+    Returns:
+        Config that applies to the file, or None if a scan would skip it
     """
+    if config is None:
+        config = resolver.default if resolver is not None else Config()
+
+    path = Path(file_path).resolve()
+    root = Path.cwd()
+    if resolver is not None:
+        config_dir = resolver.resolve(path.parent)[1]
+        if config_dir is not None:
+            root = config_dir
+    if not path.is_relative_to(root):
+        root = path.parent
+    return _walk_config(path, root, config, resolver)
+
+
+def _resolve_directory(directory: Path | str) -> Path:
+    """Resolve a directory argument, raising if it is missing or not a directory."""
     dir_path = Path(directory).resolve()
 
     if not dir_path.exists():
@@ -99,53 +389,96 @@ def scan_directory(
     if not dir_path.is_dir():
         raise NotADirectoryError(f"Not a directory: {directory}")
 
-    # Collect all patterns for filtering
-    exclude_patterns = config.exclude
-    include_patterns = config.include
+    return dir_path
 
-    # Combine into single list (excludes first, then includes)
-    all_patterns = exclude_patterns + include_patterns
 
-    found_files: list[Path] = []
+def _accept_text_path(file_path: Path, config: Config) -> Path | None:
+    """Accept a file if is_text_file considers it text."""
+    return file_path if is_text_file(file_path, config.max_file_size) else None
 
-    # Walk directory tree
-    for root, dirs, files in os.walk(dir_path, followlinks=config.follow_symlinks):
-        root_path = Path(root)
 
-        # Filter out excluded directories (modify dirs in-place to prevent descent)
-        filtered_dirs = []
-        for dirname in dirs:
-            dir_full_path = root_path / dirname
-            if not match_path(dir_full_path, all_patterns, dir_path):
-                filtered_dirs.append(dirname)
+def _accept_text_file(file_path: Path, config: Config) -> ScannedFile | None:
+    """Accept a file with its content if read_text_file considers it text."""
+    data = read_text_file(file_path, config.max_file_size)
+    return None if data is None else ScannedFile(file_path, data)
 
-        # Update dirs list to only include non-excluded directories
-        dirs[:] = filtered_dirs
 
-        # Process files in this directory
-        for filename in files:
-            file_path = root_path / filename
+def _trust_cached(file_path: Path, config: Config) -> Path:
+    """Accept a cached file without sniffing it again."""
+    return file_path
 
-            # Check if file matches exclude/include patterns
-            if match_path(file_path, all_patterns, dir_path):
-                continue  # File is excluded
 
-            # Check file extension if configured
-            if config.extensions and not any(filename.endswith(ext) for ext in config.extensions):
-                continue  # File extension not in allowed list
+def scan_directory(
+    directory: Path | str,
+    config: Config,
+    cache: ScanCache | None = None,
+) -> list[Path]:
+    """Recursively scan directory for text files matching config filters.
 
-            # Check if file is text
-            if not is_text_file(file_path, config.max_file_size):
-                continue  # Not a text file or too large
+    Args:
+        directory: Directory to scan
+        config: Config object with file filtering settings
+        cache: Optional scan cache; unchanged directories are not re-listed
 
-            found_files.append(file_path)
+    Returns:
+        List of text file paths that should be linted
+
+    Raises:
+        FileNotFoundError: If directory doesn't exist
+        NotADirectoryError: If path is not a directory
+    """
+    dir_path = _resolve_directory(directory)
+
+    return list(_scan_tree(dir_path, config, _accept_text_path, _trust_cached, cache))
 
-    return found_files
+
+def iter_scan_paths(
+    paths: Iterable[Path | str],
+    config: Config | None = None,
+    cache: ScanCache | None = None,
+    resolver: ConfigResolver | None = None,
+) -> Iterator[Path]:
+    """Scan a list of paths (files or directories), yielding files lazily.
+
+    Generator version of scan_paths: files are yielded as soon as the walk
+    finds them, so callers can start work before the whole tree is scanned
+    and memory does not grow with the number of files.
+
+    Args:
+        paths: File or directory paths
+        config: Config object (uses default if None)
+        cache: Optional scan cache; unchanged directories are not re-listed
+            and their files are not sniffed again
+        resolver: Optional per-directory config resolver (overrides config
+            wherever a config file applies)
+
+    Yields:
+        File paths to lint
+    """
+    if config is None:
+        config = resolver.default if resolver is not None else Config()
+
+    for path in paths:
+        path_obj = Path(path).resolve()
+
+        if not path_obj.exists():
+            continue  # Skip non-existent paths
+
+        if path_obj.is_file():
+            # Explicit file paths bypass config filters
+            yield path_obj
+        elif path_obj.is_dir():
+            # Directory: scan recursively with filters
+            yield from _scan_tree(
+                path_obj, config, _accept_text_path, _trust_cached, cache, resolver
+            )
 
 
 def scan_paths(
     paths: list[Path | str],
     config: Config | None = None,
+    cache: ScanCache | None = None,
+    resolver: ConfigResolver | None = None,
 ) -> list[Path]:
     """Scan a list of paths (files or directories).
 
@@ -155,27 +488,234 @@ def scan_paths(
     Args:
         paths: List of file or directory paths
         config: Config object (uses default if None)
+        cache: Optional scan cache; unchanged directories are not re-listed
+        resolver: Optional per-directory config resolver
 
     Returns:
         List of file paths to lint
     """
+    return list(iter_scan_paths(paths, config, cache, resolver))
+
+
+def scan_files(
+    paths: Iterable[Path | str],
+    config: Config | None = None,
+    cache: ScanCache | None = None,
+    resolver: ConfigResolver | None = None,
+    skip_read: Callable[[Path], bool] | None = None,
+    only: Collection[Path] | None = None,
+    timer: PhaseTimer | None = None,
+    report_missing: bool = False,
+) -> Iterator[ScannedFile]:
+    """Scan paths like iter_scan_paths, yielding each file with its content.
+
+    Each candidate file is opened once: the size check, binary check and
+    read happen together, and the content is handed to the linter via
+    ScannedFile.data. Files are yielded lazily as the walk proceeds, and
+    paths are consumed lazily too, so they can be streamed from a list.
+    Explicit file paths are not checked with separate stat calls: opening
+    the path tells whether it exists and whether it is a directory.
+
+    Args:
+        paths: File or directory paths
+        config: Config object (uses default if None)
+        cache: Optional scan cache; unchanged directories are not re-listed
+        resolver: Optional per-directory config resolver
+        skip_read: Optional predicate for files whose content is not needed
+            (e.g. ResultCache.is_unchanged); such files are yielded with
+            data=None without being opened
+        only: Optional set of absolute file paths (e.g. from
+            vcs.changed_files). Only these files are considered; each is
+            checked against the filters a directory walk would apply, but
+            directories are not walked
+        timer: Optional timer; opening, sniffing and reading files is
+            charged to the "read" phase. Iterate with
+            timer.iterate("scan", ...) to charge the walk itself to "scan"
+        report_missing: Yield paths that do not exist with data=None, so
+            the linter reports them, instead of skipping them
+
+    Yields:
+        ScannedFile for each file to lint
+    """
     if config is None:
-        config = Config()
+        config = resolver.default if resolver is not None else Config()
+
+    accept: Callable[[Path, Config], ScannedFile | None] = _accept_text_file
+    if skip_read is not None:
 
-    result_files: list[Path] = []
+        def accept(file_path: Path, config: Config) -> ScannedFile | None:
+            if skip_read(file_path):
+                return ScannedFile(file_path, None)
+            return _accept_text_file(file_path, config)
+
+    read_explicit = _read_explicit
+    if timer is not None:
+        accept = timer.wrap("read", accept)
+        read_explicit = timer.wrap("read", _read_explicit)
 
     for path in paths:
         path_obj = Path(path).resolve()
 
-        if not path_obj.exists():
-            continue  # Skip non-existent paths
+        if only is not None:
+            if path_obj.exists():
+                yield from _scan_only(
+                    path_obj, only, config, resolver, accept, lambda p: read_explicit(p, skip_read)
+                )
+            elif report_missing and path_obj in only:
+                yield ScannedFile(path_obj, None)
+            continue
 
-        if path_obj.is_file():
-            # Explicit file paths bypass config filters
-            result_files.append(path_obj)
-        elif path_obj.is_dir():
+        try:
+            scanned = read_explicit(path_obj, skip_read)
+        except FileNotFoundError:
+            if report_missing:
+                yield ScannedFile(path_obj, None)
+            continue
+        except IsADirectoryError:
             # Directory: scan recursively with filters
-            dir_files = scan_directory(path_obj, config)
-            result_files.extend(dir_files)
+            yield from _scan_tree(path_obj, config, accept, cache=cache, resolver=resolver)
+            continue
+        if scanned is not None:
+            # Explicit file paths bypass config filters
+            yield scanned
+
+
+def _read_explicit(path: Path, skip_read: Callable[[Path], bool] | None) -> ScannedFile | None:
+    """Read a file named explicitly on the command line (no text checks).
+
+    Returns:
+        The file, with data=None if it could not be read or skip_read
+        selects it; None for paths that are neither files nor directories
+
+    Raises:
+        FileNotFoundError: If path does not exist
+        IsADirectoryError: If path is a directory
+    """
+    if skip_read is not None and skip_read(path):
+        return ScannedFile(path, None)
+    try:
+        fd = os.open(path, _OPEN_FLAGS)
+    except FileNotFoundError:
+        raise
+    except OSError:
+        # Windows cannot open directories
+        if path.is_dir():
+            raise IsADirectoryError(path) from None
+        return ScannedFile(path, None)
+
+    with open(fd, "rb") as f:
+        mode = os.fstat(fd).st_mode
+        if stat.S_ISDIR(mode):
+            raise IsADirectoryError(path)
+        if not stat.S_ISREG(mode):
+            return None
+        try:
+            return ScannedFile(path, f.read())
+        except OSError:
+            return ScannedFile(path, None)
+
 
-    return result_files
+def _scan_only(
+    path: Path,
+    only: Collection[Path],
+    config: Config,
+    resolver: ConfigResolver | None,
+    accept: Callable[[Path, Config], ScannedFile | None],
+    read_explicit: Callable[[Path], ScannedFile | None],
+) -> Iterator[ScannedFile]:
+    """Yield the files of only that a scan of path would select."""
+    if path.is_file():
+        # Explicit file paths bypass config filters
+        if path in only:
+            scanned = read_explicit(path)
+            if scanned is not None:
+                yield scanned
+        return
+
+    for file_path in sorted(only):
+        if not file_path.is_file():
+            continue
+        file_config = _walk_config(file_path, path, config, resolver)
+        if file_config is None:
+            continue
+        result = accept(file_path, file_config)
+        if result is not None:
+            yield result
+
+
+def unique_files(files: Iterable[ScannedFile]) -> Iterator[ScannedFile]:
+    """Drop files already seen under another path (overlapping inputs, symlinks).
+
+    Fixing the same file twice is wasted work, and with parallel workers two
+    writers could race on it.
+    """
+    seen: set[Path] = set()
+    for scanned in files:
+        try:
+            key = scanned.path.resolve()
+        except OSError:
+            key = scanned.path
+        if key not in seen:
+            seen.add(key)
+            yield scanned
+
+
+_DONE = object()
+
+
+def prefetch(items: Iterable[T], maxsize: int = PREFETCH_SIZE) -> Iterator[T]:
+    """Iterate over items produced ahead of time by a background thread.
+
+    Used to overlap directory walking and file reading (I/O bound) with
+    linting: the scan runs in a worker thread and hands items over through a
+    bounded queue, so at most maxsize items are held in memory. Exceptions
+    raised by the producer are re-raised in the consumer. Closing the
+    iterator early stops the producer.
+
+    Args:
+        items: Iterable to consume in the background (e.g. scan_files(...))
+        maxsize: Maximum number of items buffered ahead (0 = no thread)
+
+    Yields:
+        Items in the order produced
+    """
+    if maxsize <= 0:
+        yield from items
+        return
+
+    buffer: queue.Queue[object] = queue.Queue(maxsize)
+    stop = threading.Event()
+    errors: list[BaseException] = []
+
+    def put(item: object) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put(item):
+                    return
+        except BaseException as e:  # re-raised in the consumer
+            errors.append(e)
+        put(_DONE)
+
+    producer = threading.Thread(target=produce, name="ascii-guard-scan", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                break
+            yield cast("T", item)
+    finally:
+        stop.set()
+        producer.join()
+
+    if errors:
+        raise errors[0]
@@ -0,0 +1,348 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Reusable linting sessions for long-running hosts (Linter).
+
+lint_file, lint_paths and friends start from scratch on every call: they
+look up config files, load caches and validate every box again. A host
+calling the API thousands of times, such as a documentation build plugin
+or an editor integration, keeps a Linter instead. It holds the config (or
+the per-directory configs found so far), a memo of validated boxes, an
+in-memory scan cache and document cache (persistent if [performance]
+cache is on), and an optional executor, and reuses them on every call.
+
+ZERO dependencies - uses only Python stdlib.
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor
+from pathlib import Path
+from types import TracebackType
+from typing import cast
+
+from ascii_guard.batch import ErrorHandler, process_paths
+from ascii_guard.cache import ResultCache, ScanCache, result_fingerprint
+from ascii_guard.config import Config, ConfigResolver
+from ascii_guard.linter import fix_file, lint_file, lint_text
+from ascii_guard.models import FixResult, LintResult
+from ascii_guard.parallel import TaskOptions, WorkerPool, decode_outcome, resolve_jobs
+from ascii_guard.scanner import ScannedFile, iter_scan_paths
+from ascii_guard.validator import ValidationMemo
+
+# Boxes kept by a session's validation memo
+MEMO_SIZE = 4096
+
+
+class Linter:
+    """A linting session keeping its state between calls.
+
+    Not thread-safe: use one Linter per thread, or serialize calls.
+
+    Attributes:
+        config: Config applied to all paths, or None for per-directory
+            configs (found once per directory and then remembered)
+        performance: [performance] settings of the session: the config's,
+            or those of the current directory
+        exclude_code_blocks: Skip ASCII boxes inside markdown code blocks
+        memo: Validation results of boxes seen before (see ValidationMemo)
+        scan_cache: Directory listings of earlier scans
+        result_cache: Lint results by content; unchanged files and texts
+            are answered without being linted again
+
+    Example:
+        >>> with Linter() as linter:
+        ...     for page in pages:
+        ...         result = linter.lint_text(page.text, page.path)
+    """
+
+    def __init__(
+        self,
+        config: Config | None = None,
+        *,
+        exclude_code_blocks: bool = False,
+        executor: Executor | None = None,
+        jobs: int | None = None,
+        cache: bool | None = None,
+        memo_size: int = MEMO_SIZE,
+    ) -> None:
+        """Start a session.
+
+        Config files are read once per directory; start a new session to
+        pick up changes to them.
+
+        Args:
+            config: Config to apply to all paths; None uses the nearest
+                .ascii-guard.toml of each scanned directory
+            exclude_code_blocks: Skip ASCII boxes inside markdown code blocks
+            executor: Optional executor running lint and fix over paths, e.g.
+                a ProcessPoolExecutor; it is not shut down by close(). Boxes
+                validated by other processes do not reach the memo
+            jobs: Number of workers of the executor (default: [performance]
+                jobs; 0 = one per CPU)
+            cache: Load the caches from, and save them to, [performance]
+                cache_dir (default: [performance] cache); otherwise they
+                are kept in memory only
+            memo_size: Number of boxes kept by the validation memo
+        """
+        self.config = config
+        self.exclude_code_blocks = exclude_code_blocks
+        self._resolver = ConfigResolver()
+        if config is not None:
+            self.performance = config.performance
+        else:
+            self.performance = self._resolver.resolve(Path.cwd())[0].performance
+        performance = self.performance
+
+        self.memo = ValidationMemo(memo_size)
+        enabled = performance.cache if cache is None else cache
+        fingerprint = result_fingerprint(exclude_code_blocks, performance)
+        if enabled:
+            self.scan_cache = ScanCache.load(performance.cache_dir)
+            self.result_cache = ResultCache.load(
+                performance.cache_dir, fingerprint, performance.cache_max_size
+            )
+        else:
+            self.scan_cache = ScanCache(None)
+            self.result_cache = ResultCache(None, fingerprint, performance.cache_max_size)
+
+        self._jobs = resolve_jobs(jobs, performance) if executor is not None else 1
+        self._pool: WorkerPool | None = None
+        if executor is not None:
+            self._pool = WorkerPool(performance.backend, self._jobs, executor)
+        self._closed = False
+
+    def _check_open(self) -> None:
+        """Raise if the session is closed."""
+        if self._closed:
+            raise ValueError("Linter is closed")
+
+    def _options(self, mode: str, dry_run: bool = False) -> TaskOptions:
+        """Return the task options of the session for a mode."""
+        return TaskOptions(
+            mode=mode,
+            exclude_code_blocks=self.exclude_code_blocks,
+            dry_run=dry_run,
+            performance=self.performance,
+        )
+
+    def _run_inline(self, options: TaskOptions) -> Callable[[ScannedFile], LintResult | FixResult]:
+        """Return a function processing one file in this thread with the memo."""
+
+        def run(scanned: ScannedFile) -> LintResult | FixResult:
+            path = str(scanned.path)
+            if options.mode == "fix":
+                return fix_file(
+                    path,
+                    dry_run=options.dry_run,
+                    exclude_code_blocks=options.exclude_code_blocks,
+                    data=scanned.data,
+                    performance=options.performance,
+                    validate=self.memo.validate,
+                )
+            return lint_file(
+                path,
+                exclude_code_blocks=options.exclude_code_blocks,
+                data=scanned.data,
+                performance=options.performance,
+                validate=self.memo.validate,
+            )
+
+        return run
+
+    def _process(
+        self,
+        paths: Iterable[Path | str] | Path | str,
+        options: TaskOptions,
+        ordered: bool,
+        on_error: ErrorHandler | None,
+    ) -> Iterator[LintResult | FixResult]:
+        """Run the batch pipeline with the session's state."""
+        self._check_open()
+        self.scan_cache.begin_run()
+        self.result_cache.begin_run()
+        return process_paths(
+            paths,
+            self.config,
+            self._resolver,
+            options,
+            scan_cache=self.scan_cache,
+            result_cache=self.result_cache if options.mode == "lint" else None,
+            pool=self._pool,
+            jobs=self._jobs,
+            ordered=ordered,
+            on_error=on_error,
+            run_inline=self._run_inline(options),
+        )
+
+    def lint(
+        self,
+        paths: Iterable[Path | str] | Path | str,
+        *,
+        ordered: bool = False,
+        on_error: ErrorHandler | None = None,
+    ) -> Iterator[LintResult]:
+        """Lint files and directories, yielding a LintResult per file.
+
+        Works like lint_paths with the session's config, caches and
+        executor. A single file is linted in the calling thread without
+        scanning ahead.
+
+        Args:
+            paths: Paths to lint (a single path or an iterable)
+            ordered: Yield results in scan order instead of as they complete
+            on_error: Called with the path and exception of a file that could
+                not be read or linted; without it, the exception is raised
+
+        Yields:
+            LintResult for each file
+
+        Raises:
+            ValueError: If the session is closed
+        """
+        results = self._process(paths, self._options("lint"), ordered, on_error)
+        return cast("Iterator[LintResult]", results)
+
+    def fix(
+        self,
+        paths: Iterable[Path | str] | Path | str,
+        *,
+        dry_run: bool = False,
+        ordered: bool = False,
+        on_error: ErrorHandler | None = None,
+    ) -> Iterator[FixResult]:
+        """Fix files and directories, yielding a FixResult per file.
+
+        Works like fix_paths with the session's config, scan cache and
+        executor.
+
+        Args:
+            paths: Paths to fix (a single path or an iterable)
+            dry_run: Report fixes without writing files
+            ordered: Yield results in scan order instead of as they complete
+            on_error: Called with the path and exception of a file that could
+                not be fixed; without it, the exception is raised
+
+        Yields:
+            FixResult for each file
+
+        Raises:
+            ValueError: If the session is closed
+        """
+        results = self._process(paths, self._options("fix", dry_run), ordered, on_error)
+        return cast("Iterator[FixResult]", results)
+
+    def lint_text(
+        self,
+        text: str,
+        file_path: str = "",
+        line_ranges: list[tuple[int, int]] | None = None,
+    ) -> LintResult:
+        """Lint in-memory text, e.g. a rendered page or an editor buffer.
+
+        Text linted before (under any path) is answered from the document
+        cache, unless line_ranges is given.
+
+        Args:
+            text: Text content to lint
+            file_path: Path reported in the result and on detected boxes
+            line_ranges: Only validate boxes overlapping these 0-indexed
+                inclusive (start, end) line ranges; None validates every box
+
+        Returns:
+            LintResult with errors and warnings
+
+        Raises:
+            ValueError: If the session is closed
+            TimeoutError: If the text exceeds performance.file_timeout
+        """
+        self._check_open()
+        if line_ranges is not None:
+            return lint_text(
+                text,
+                file_path,
+                self.exclude_code_blocks,
+                self.performance,
+                line_ranges,
+                validate=self.memo.validate,
+            )
+
+        data = text.encode("utf-8")
+        path = Path(file_path)
+        encoded = self.result_cache.lookup(path, data)
+        if encoded is not None:
+            return cast("LintResult", decode_outcome(file_path, encoded, self._options("lint")))
+        result = lint_text(
+            text,
+            file_path,
+            self.exclude_code_blocks,
+            self.performance,
+            validate=self.memo.validate,
+        )
+        self.result_cache.store(path, data, result, from_file=False)
+        return result
+
+    def scan(self, paths: Iterable[Path | str] | Path | str) -> Iterator[Path]:
+        """Yield the files lint() would cover, like iter_scan_paths.
+
+        Args:
+            paths: File or directory paths (a single path or an iterable)
+
+        Yields:
+            File paths to lint
+
+        Raises:
+            ValueError: If the session is closed
+        """
+        self._check_open()
+        self.scan_cache.begin_run()
+        if isinstance(paths, str | Path):
+            paths = [paths]
+        return iter_scan_paths(
+            paths,
+            self.config,
+            self.scan_cache,
+            self._resolver if self.config is None else None,
+        )
+
+    def save(self) -> None:
+        """Save the caches, or only trim them if they are kept in memory.
+
+        The document cache is trimmed to [performance] cache_max_size, and
+        scan cache entries of directories not scanned for
+        cache.SCAN_MAX_AGE_DAYS are dropped. close() saves them too;
+        long-running hosts call this now and then, e.g. after each build.
+        """
+        self.scan_cache.save()
+        self.result_cache.save()
+
+    def close(self) -> None:
+        """Save the caches and end the session; the executor is left running."""
+        if self._closed:
+            return
+        self.save()
+        self.memo.clear()
+        self._closed = True
+
+    def __enter__(self) -> "Linter":
+        """Return the session itself."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the session."""
+        self.close()
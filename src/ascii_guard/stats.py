@@ -0,0 +1,327 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Run instrumentation for --stats and --profile.
+
+A PhaseTimer charges wall and CPU time to named phases. Phases nest, and
+time is exclusive: while detection runs inside a file read, the read phase
+is paused. Each thread (the scan thread, each worker) uses its own timer,
+and the totals are merged into a RunStats, which also counts files, bytes,
+lines and boxes and keeps the slowest files.
+
+CPU time is per thread (time.thread_time), so time spent by the scan
+thread or by other workers is never charged to the wrong phase.
+
+ZERO dependencies - uses only Python stdlib (time + cProfile).
+"""
+
+import contextlib
+import heapq
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from ascii_guard.defaults import DEFAULT_TOP_FILES
+
+if TYPE_CHECKING:
+    from ascii_guard.memstats import MemoryTracker
+
+# Phases in report order
+PHASES = ("scan", "read", "detect", "validate", "fix", "output")
+
+# Seconds of (wall, CPU) time per phase, as sent back by workers
+PhaseTotals = dict[str, tuple[float, float]]
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class PhaseTimer:
+    """Charges wall and CPU time to nested phases of one thread."""
+
+    def __init__(self) -> None:
+        """Create a timer with no time charged."""
+        self.wall: dict[str, float] = {}
+        self.cpu: dict[str, float] = {}
+        self._stack: list[str] = []
+        self._wall_mark = 0.0
+        self._cpu_mark = 0.0
+
+    def _charge(self) -> None:
+        """Charge the time since the last mark to the innermost phase."""
+        wall, cpu = time.perf_counter(), time.thread_time()
+        if self._stack:
+            name = self._stack[-1]
+            self.wall[name] = self.wall.get(name, 0.0) + wall - self._wall_mark
+            self.cpu[name] = self.cpu.get(name, 0.0) + cpu - self._cpu_mark
+        self._wall_mark, self._cpu_mark = wall, cpu
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Charge the time spent in the block to a phase."""
+        self._charge()
+        self._stack.append(name)
+        try:
+            yield
+        finally:
+            self._charge()
+            self._stack.pop()
+
+    def wrap(self, name: str, func: Callable[..., R]) -> Callable[..., R]:
+        """Return func with every call charged to a phase."""
+
+        def timed(*args: Any, **kwargs: Any) -> R:
+            with self.phase(name):
+                return func(*args, **kwargs)
+
+        return timed
+
+    def iterate(self, name: str, items: Iterable[T]) -> Iterator[T]:
+        """Iterate over items, charging the time spent producing each to a phase."""
+        iterator = iter(items)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    @property
+    def elapsed(self) -> float:
+        """Return the wall time charged to all phases."""
+        return sum(self.wall.values())
+
+    def totals(self) -> PhaseTotals:
+        """Return (wall, CPU) seconds per phase, compact enough to send between processes."""
+        return {name: (wall, self.cpu.get(name, 0.0)) for name, wall in self.wall.items()}
+
+
+def timing(timer: PhaseTimer | None, name: str) -> contextlib.AbstractContextManager[None]:
+    """Charge a block to a phase of timer; does nothing when timer is None."""
+    return timer.phase(name) if timer is not None else contextlib.nullcontext()
+
+
+@dataclass
+class PhaseStats:
+    """Time spent in one phase, summed over all threads and workers.
+
+    Attributes:
+        wall: Wall-clock seconds
+        cpu: CPU seconds
+    """
+
+    wall: float = 0.0
+    cpu: float = 0.0
+
+
+@dataclass(order=True)
+class FileStats:
+    """Cost of one processed file.
+
+    Attributes:
+        seconds: Wall-clock seconds spent detecting, validating and fixing
+            the file, and reading it unless the scan thread did
+        path: File path
+        boxes: Boxes found (lint) or fixed (fix)
+        lines: Number of lines
+        size: Content size in bytes
+    """
+
+    seconds: float
+    path: str = field(compare=False)
+    boxes: int = field(default=0, compare=False)
+    lines: int = field(default=0, compare=False)
+    size: int = field(default=0, compare=False)
+
+
+def count_lines(data: bytes | None) -> int:
+    """Count the lines of file content, a last line without newline included."""
+    if not data:
+        return 0
+    return data.count(b"\n") + (not data.endswith(b"\n"))
+
+
+@dataclass
+class RunStats:
+    """Instrumentation of one lint or fix run.
+
+    Attributes:
+        top: Number of slowest files to keep
+        wall: Wall-clock seconds of the whole run (set by finish)
+        cpu: CPU seconds of this process for the whole run (set by finish);
+            worker processes are counted in the phases only
+        files: Files processed, cached ones included
+        cached: Files answered from the result cache without being linted
+        size: Bytes of content processed
+        lines: Lines of content processed
+        boxes: Boxes found (lint) or fixed (fix)
+        phases: Time per phase, in PHASES order
+        timer: Timer of the calling thread (e.g. for output), merged into
+            phases by finish
+        memory: Optional tracker of memory per phase and file (--memstats);
+            timers from new_timer report to it, and add_file ends its file
+    """
+
+    top: int = DEFAULT_TOP_FILES
+    wall: float = 0.0
+    cpu: float = 0.0
+    files: int = 0
+    cached: int = 0
+    size: int = 0
+    lines: int = 0
+    boxes: int = 0
+    phases: dict[str, PhaseStats] = field(
+        default_factory=lambda: {name: PhaseStats() for name in PHASES}
+    )
+    timer: PhaseTimer = field(default_factory=PhaseTimer, repr=False)
+    memory: "MemoryTracker | None" = field(default=None, repr=False)
+    _started: tuple[float, float] = field(
+        default_factory=lambda: (time.perf_counter(), time.process_time()), repr=False
+    )
+    _heap: list[FileStats] = field(default_factory=list, repr=False)
+
+    def new_timer(self) -> PhaseTimer:
+        """Return a timer for one file or thread, reporting to memory if tracked."""
+        return self.memory.timer() if self.memory is not None else PhaseTimer()
+
+    def add_phases(self, totals: PhaseTotals) -> None:
+        """Add (wall, CPU) seconds per phase, e.g. PhaseTimer.totals()."""
+        for name, (wall, cpu) in totals.items():
+            phase = self.phases.setdefault(name, PhaseStats())
+            phase.wall += wall
+            phase.cpu += cpu
+
+    def add_file(
+        self, path: str, data: bytes | None, boxes: int, totals: PhaseTotals | None
+    ) -> None:
+        """Record one file.
+
+        Args:
+            path: File path
+            data: File content, if it was read
+            boxes: Boxes found (lint) or fixed (fix)
+            totals: Time per phase spent on the file, or None if the result
+                came from the cache
+        """
+        self.files += 1
+        self.boxes += boxes
+        if totals is None:
+            self.cached += 1
+            return
+        if self.memory is not None:
+            self.memory.end_file(path)
+        lines = count_lines(data)
+        size = len(data) if data is not None else 0
+        self.size += size
+        self.lines += lines
+        self.add_phases(totals)
+
+        if self.top > 0:
+            entry = FileStats(sum(wall for wall, _ in totals.values()), path, boxes, lines, size)
+            if len(self._heap) < self.top:
+                heapq.heappush(self._heap, entry)
+            elif entry > self._heap[0]:
+                heapq.heapreplace(self._heap, entry)
+
+    def finish(self) -> None:
+        """Merge the calling thread's timer and set the run's wall and CPU time.
+
+        The run is measured from the creation of the stats.
+        """
+        self.add_phases(self.timer.totals())
+        self.timer = PhaseTimer()
+        wall, cpu = self._started
+        self.wall = time.perf_counter() - wall
+        self.cpu = time.process_time() - cpu
+
+    @property
+    def slowest(self) -> list[FileStats]:
+        """Return the slowest files, slowest first."""
+        return sorted(self._heap, reverse=True)
+
+    def _rate(self, amount: float) -> float:
+        """Return amount per second of wall time."""
+        return amount / self.wall if self.wall > 0 else 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        """Return the files processed per second."""
+        return self._rate(self.files)
+
+    @property
+    def mb_per_second(self) -> float:
+        """Return the megabytes of content processed per second."""
+        return self._rate(self.size / (1024 * 1024))
+
+    @property
+    def lines_per_second(self) -> float:
+        """Return the lines processed per second."""
+        return self._rate(self.lines)
+
+    @property
+    def boxes_per_second(self) -> float:
+        """Return the boxes processed per second."""
+        return self._rate(self.boxes)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the stats as JSON-serializable data."""
+        return {
+            "wall": self.wall,
+            "cpu": self.cpu,
+            "files": self.files,
+            "cached": self.cached,
+            "bytes": self.size,
+            "lines": self.lines,
+            "boxes": self.boxes,
+            "throughput": {
+                "files_per_second": self.files_per_second,
+                "mb_per_second": self.mb_per_second,
+                "lines_per_second": self.lines_per_second,
+                "boxes_per_second": self.boxes_per_second,
+            },
+            "phases": {
+                name: {"wall": phase.wall, "cpu": phase.cpu} for name, phase in self.phases.items()
+            },
+            "slowest": [
+                {
+                    "path": entry.path,
+                    "seconds": entry.seconds,
+                    "boxes": entry.boxes,
+                    "lines": entry.lines,
+                    "bytes": entry.size,
+                }
+                for entry in self.slowest
+            ],
+        }
+
+
+@contextlib.contextmanager
+def profiled(path: Path | str) -> Iterator[None]:
+    """Run the block under cProfile and write the profile to path.
+
+    The file can be read with pstats or tools such as snakeviz. Worker
+    processes are not profiled; profile with one job to see all the work.
+    """
+    import cProfile  # Imported here: only profiled runs need it
+
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        profile.dump_stats(str(path))
@@ -17,6 +17,9 @@
 ZERO dependencies - uses only Python stdlib.
 """
 
+from collections import OrderedDict
+from dataclasses import replace
+
 from ascii_guard.models import (
     CORNER_CHARS,
     HORIZONTAL_CHARS,
@@ -353,3 +356,72 @@ def validate_box(box: Box) -> list[ValidationError]:
                     )
 
     return errors
+
+
+# Memo key for a box's validation: everything validate_box() looks at
+# except the box's position in the document
+BoxKey = tuple[int, int, tuple[str, ...]]
+
+
+def box_key(box: Box) -> BoxKey:
+    """Return the memo key of a box (see BoxKey)."""
+    return (box.left_col, box.right_col, tuple(box.lines))
+
+
+class ValidationMemo:
+    """validate_box() results of boxes seen before, by content.
+
+    Results are kept relative to the box's top line, so the same box is
+    validated once wherever it appears: further down a file, in another
+    file, or in a later version of a document. Boxes repeated across
+    documents (shared headers, generated diagrams) are common in
+    documentation builds. At most max_size boxes are kept; the least
+    recently used are dropped first.
+
+    Attributes:
+        hits: Boxes answered from the memo
+        misses: Boxes validated
+    """
+
+    def __init__(self, max_size: int = 4096) -> None:
+        """Create an empty memo.
+
+        Args:
+            max_size: Number of boxes kept
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._results: OrderedDict[BoxKey, list[ValidationError]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of boxes kept."""
+        return len(self._results)
+
+    def validate(self, box: Box) -> list[ValidationError]:
+        """Validate a box, or return the result for the same box seen before.
+
+        Args:
+            box: Box object to validate
+
+        Returns:
+            List of ValidationError objects, as validate_box() returns them
+        """
+        key = box_key(box)
+        relative = self._results.get(key)
+        if relative is None:
+            self.misses += 1
+            relative = [
+                replace(issue, line=issue.line - box.top_line) for issue in validate_box(box)
+            ]
+            self._results[key] = relative
+            if len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+        else:
+            self.hits += 1
+            self._results.move_to_end(key)
+        return [replace(issue, line=issue.line + box.top_line) for issue in relative]
+
+    def clear(self) -> None:
+        """Forget all boxes."""
+        self._results.clear()
@@ -0,0 +1,236 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Git integration for linting only changed files.
+
+ZERO dependencies - uses only Python stdlib (subprocess + the git CLI).
+"""
+
+import os
+import re
+import subprocess
+from pathlib import Path
+
+# Seconds to wait for a git command before giving up
+GIT_TIMEOUT = 60
+
+# Path prefixes for git diff, set explicitly so that diff.noprefix and
+# diff.mnemonicPrefix in the user's config do not change the headers that
+# parse_unified_diff reads
+DIFF_PREFIXES = ("--src-prefix=a/", "--dst-prefix=b/")
+
+# Hunk header: @@ -old_start[,old_count] +new_start[,new_count] @@
+HUNK_HEADER = re.compile(r"^@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+# Changed line ranges per file: 0-indexed inclusive (start, end) pairs, or
+# None when the whole file counts as changed
+LineRanges = list[tuple[int, int]] | None
+
+
+class GitError(RuntimeError):
+    """A git command failed or git is not available."""
+
+
+def _git(args: list[str], cwd: Path) -> bytes:
+    """Run a git command and return its stdout.
+
+    Raises:
+        GitError: If git is missing, times out or exits with an error
+    """
+    try:
+        completed = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            capture_output=True,
+            check=False,
+            timeout=GIT_TIMEOUT,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise GitError(f"Cannot run git: {e}") from e
+
+    if completed.returncode != 0:
+        message = completed.stderr.decode("utf-8", "replace").strip()
+        raise GitError(message or f"git {args[0]} failed with exit code {completed.returncode}")
+    return completed.stdout
+
+
+def _split_z(output: bytes) -> list[str]:
+    """Split NUL-separated git output into paths."""
+    return [os.fsdecode(name) for name in output.split(b"\0") if name]
+
+
+def repository_root(cwd: Path | str = ".") -> Path:
+    """Return the top-level directory of the git work tree containing cwd.
+
+    Raises:
+        GitError: If cwd is not inside a git work tree
+    """
+    output = _git(["rev-parse", "--show-toplevel"], Path(cwd))
+    return Path(os.fsdecode(output.strip()))
+
+
+def _merge_base(ref: str, root: Path) -> str:
+    """Return the merge base of ref and HEAD, or ref if there is none."""
+    try:
+        return _git(["merge-base", ref, "HEAD"], root).decode("ascii").strip()
+    except GitError:
+        return ref  # No common history (or no HEAD yet): compare to ref itself
+
+
+def changed_files(ref: str, cwd: Path | str = ".") -> set[Path]:
+    """Return files changed relative to a git ref, plus untracked files.
+
+    Changes are taken from the merge base of ref and HEAD to the working
+    tree, so a PR branch reports its own commits plus uncommitted and
+    staged edits, but not unrelated commits that landed on ref since the
+    branch point. Deleted files are left out; untracked files that are not
+    ignored are included.
+
+    Args:
+        ref: Git ref to compare against (e.g. "origin/main")
+        cwd: Directory inside the repository
+
+    Returns:
+        Set of absolute file paths
+
+    Raises:
+        GitError: If git is unavailable, cwd is not in a repository, or the
+            ref is unknown
+    """
+    root = repository_root(cwd)
+    base = _merge_base(ref, root)
+
+    changed = _split_z(
+        _git(["diff", *DIFF_PREFIXES, "--name-only", "-z", "--diff-filter=d", base, "--"], root)
+    )
+    untracked = _split_z(_git(["ls-files", "--others", "--exclude-standard", "-z"], root))
+
+    return {root / name for name in (*changed, *untracked)}
+
+
+def _header_path(header: str) -> str | None:
+    """Extract the path from a ---/+++ diff header line, None for /dev/null."""
+    name = header[4:].split("\t", 1)[0].rstrip("\r\n")
+    if name == "/dev/null":
+        return None
+    if name.startswith('"') and name.endswith('"'):
+        # git quotes unusual names C-style
+        name = name[1:-1].encode("latin-1", "backslashreplace").decode("unicode_escape")
+        name = name.encode("latin-1").decode("utf-8", "replace")
+    return name
+
+
+def parse_unified_diff(text: str, root: Path) -> dict[Path, LineRanges]:
+    """Map a unified diff to the changed line ranges of each new file.
+
+    Only the new side of each hunk matters. A hunk that only deletes lines
+    marks the line it was deleted before, so boxes that lost lines count
+    as touched. Deleted files are left out.
+
+    Args:
+        text: Unified diff (e.g. git diff output)
+        root: Directory the diff paths are relative to
+
+    Returns:
+        Dict mapping absolute paths to 0-indexed inclusive line ranges
+    """
+    files: dict[Path, LineRanges] = {}
+    current: list[tuple[int, int]] | None = None
+    old_header: str | None = None
+    old_left = new_left = 0  # Lines left in the current hunk body
+
+    # Only "\n" ends a diff line: splitlines() would also split content
+    # lines at characters such as U+2028 or form feeds, throwing off the
+    # hunk line counts
+    for line in text.split("\n"):
+        line = line.removesuffix("\r")
+        if old_left > 0 or new_left > 0:
+            # Hunk body; content lines may look like headers ("--- x")
+            if line.startswith("-"):
+                old_left -= 1
+            elif line.startswith("+"):
+                new_left -= 1
+            elif not line.startswith("\\"):  # "\ No newline at end of file"
+                old_left -= 1
+                new_left -= 1
+            continue
+
+        if line.startswith("--- "):
+            old_header = line
+            continue
+        if line.startswith("+++ ") and old_header is not None:
+            old_path = _header_path(old_header)
+            new_path = _header_path(line)
+            old_header = None
+            if new_path is None:
+                current = None  # File deleted
+                continue
+            # Strip git's "b/" prefix (mirrored by "a/" on the old side)
+            if new_path.startswith("b/") and (old_path is None or old_path.startswith("a/")):
+                new_path = new_path[2:]
+            current = []
+            files[root / new_path] = current
+            continue
+
+        old_header = None
+        match = HUNK_HEADER.match(line)
+        if not match:
+            continue
+        old_left = int(match.group(1)) if match.group(1) is not None else 1
+        start = int(match.group(2))
+        new_left = int(match.group(3)) if match.group(3) is not None else 1
+        if current is None:
+            continue
+        if new_left == 0:
+            # Pure deletion after line `start` (1-indexed): touch both neighbours
+            index = max(start - 1, 0)
+            current.append((index, index + 1))
+        else:
+            current.append((start - 1, start + new_left - 2))
+
+    return files
+
+
+def changed_lines(ref: str, cwd: Path | str = ".") -> dict[Path, LineRanges]:
+    """Return the line ranges changed relative to a git ref, per file.
+
+    Uses the same file set as changed_files: changes from the merge base of
+    ref and HEAD to the working tree, plus untracked files, which count as
+    changed in full.
+
+    Args:
+        ref: Git ref to compare against (e.g. "origin/main")
+        cwd: Directory inside the repository
+
+    Returns:
+        Dict mapping absolute paths to 0-indexed inclusive line ranges, or
+        None for files changed as a whole
+
+    Raises:
+        GitError: If git is unavailable, cwd is not in a repository, or the
+            ref is unknown
+    """
+    root = repository_root(cwd)
+    base = _merge_base(ref, root)
+
+    diff = _git(
+        ["diff", *DIFF_PREFIXES, "-U0", "--no-color", "--no-ext-diff", "--diff-filter=d", base, "--"],
+        root,
+    )
+    ranges = parse_unified_diff(diff.decode("utf-8", "surrogateescape"), root)
+
+    untracked = _split_z(_git(["ls-files", "--others", "--exclude-standard", "-z"], root))
+    for name in untracked:
+        ranges[root / name] = None
+    return ranges
@@ -0,0 +1,47 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Shared fixtures and sample content for the test suite."""
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from ascii_guard.config import Config, PerformanceConfig
+
+BROKEN_BOX = "┌────┐\n│Test│\n└───┘\n"
+GOOD_BOX = "┌────┐\n│Test│\n└────┘\n"
+
+
+@pytest.fixture
+def docs(tmp_path: Path) -> Path:
+    """Create a directory with a mix of clean and broken files.
+
+    Every third of the 12 files has a broken box; node_modules/skipped.md
+    is excluded by the default config.
+    """
+    root = tmp_path / "docs"
+    root.mkdir()
+    for i in range(12):
+        (root / f"file{i:02d}.md").write_text(BROKEN_BOX if i % 3 == 0 else GOOD_BOX)
+    (root / "node_modules").mkdir()
+    (root / "node_modules" / "skipped.md").write_text(BROKEN_BOX)
+    return root
+
+
+def config(**performance: Any) -> Config:
+    """Return a default config with the given [performance] settings."""
+    return Config(performance=PerformanceConfig(**performance))
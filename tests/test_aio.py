@@ -0,0 +1,194 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the asyncio API (ascii_guard.aio)."""
+
+import asyncio
+import gc
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from ascii_guard import aio, batch, linter
+from ascii_guard.config import Config
+from ascii_guard.models import LintResult
+from tests.conftest import BROKEN_BOX, GOOD_BOX
+
+
+def aio_threads() -> list[threading.Thread]:
+    """Return the running lint_paths producer threads."""
+    return [thread for thread in threading.enumerate() if thread.name == "ascii-guard-aio"]
+
+
+class TestFiles:
+    """Test linting and fixing single files."""
+
+    def test_lint_file_matches_sync(self, docs: Path) -> None:
+        """Test that the coroutine returns what lint_file returns, also from a process pool."""
+        path = docs / "file00.md"
+
+        async def lint(executor: ProcessPoolExecutor) -> tuple[LintResult, LintResult]:
+            return await aio.lint_file(path), await aio.lint_file(path, executor=executor)
+
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            executor.submit(int).result()  # Start the worker before any threads
+            threaded, pooled = asyncio.run(lint(executor))
+
+        assert threaded == pooled == linter.lint_file(path)
+        assert threaded.has_errors
+
+    def test_loop_keeps_running(self, tmp_path: Path) -> None:
+        """Test that the event loop is served while a large file is linted."""
+        path = tmp_path / "large.md"
+        path.write_text(BROKEN_BOX * 20_000)
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        async def lint() -> LintResult:
+            ticker = asyncio.create_task(tick())
+            try:
+                return await aio.lint_file(path)
+            finally:
+                ticker.cancel()
+
+        result = asyncio.run(lint())
+
+        assert len(result.errors) == 20_000
+        assert ticks > 1
+
+    def test_limit(self, docs: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a shared semaphore bounds the files linted at once."""
+        active = 0
+        most = 0
+        lock = threading.Lock()
+        lint_file = linter.lint_file
+
+        def counting_lint(*args: Any) -> LintResult:
+            nonlocal active, most
+            with lock:
+                active += 1
+                most = max(most, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return lint_file(*args)
+
+        monkeypatch.setattr(linter, "lint_file", counting_lint)
+
+        async def lint_all() -> list[LintResult]:
+            limit = asyncio.Semaphore(2)
+            return await asyncio.gather(
+                *(aio.lint_file(path, limit=limit) for path in sorted(docs.glob("*.md")))
+            )
+
+        results = asyncio.run(lint_all())
+
+        assert len(results) == 12
+        assert most == 2
+
+    def test_fix_file(self, docs: Path) -> None:
+        """Test a dry run, then a fix that writes the file."""
+        path = docs / "file00.md"
+
+        preview = asyncio.run(aio.fix_file(path, dry_run=True))
+        assert (preview.boxes_fixed, preview.modified) == (1, False)
+        assert path.read_text() == BROKEN_BOX
+
+        fixed = asyncio.run(aio.fix_file(path))
+        assert (fixed.boxes_fixed, fixed.modified) == (1, True)
+        assert path.read_text() == GOOD_BOX
+
+    def test_cancelled_fix_writes_nothing(
+        self, docs: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that cancelling a fix before its write leaves the file unchanged."""
+        path = docs / "file00.md"
+        fix_file = linter.fix_file
+
+        def slow_fix(*args: Any) -> Any:
+            time.sleep(0.2)
+            return fix_file(*args)
+
+        monkeypatch.setattr(linter, "fix_file", slow_fix)
+
+        async def cancel() -> None:
+            task = asyncio.create_task(aio.fix_file(path))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            await asyncio.sleep(0.3)  # The fix itself finishes in its thread
+
+        asyncio.run(cancel())
+
+        assert path.read_text() == BROKEN_BOX
+
+
+class TestLintPaths:
+    """Test linting trees asynchronously."""
+
+    def test_results(self, docs: Path) -> None:
+        """Test that every file is linted, in scan order if requested."""
+
+        async def collect() -> list[LintResult]:
+            return [result async for result in aio.lint_paths(docs, Config(), ordered=True)]
+
+        results = asyncio.run(collect())
+
+        assert results == list(batch.lint_paths(docs, Config(), ordered=True))
+        assert sum(result.has_errors for result in results) == 4
+
+    def test_errors_are_raised(self, docs: Path) -> None:
+        """Test that a failure in the background thread is raised in the consumer."""
+
+        async def collect() -> list[LintResult]:
+            return [result async for result in aio.lint_paths(docs / "missing.md", Config())]
+
+        with pytest.raises(FileNotFoundError):
+            asyncio.run(collect())
+
+    @pytest.mark.filterwarnings("error")
+    def test_cancel_stops_producer(self, docs: Path) -> None:
+        """Test that cancelling the consumer stops the background thread."""
+        first: list[LintResult] = []
+
+        async def consume() -> None:
+            async for result in aio.lint_paths(docs, Config()):
+                first.append(result)
+                await asyncio.sleep(10)
+
+        async def cancel() -> None:
+            task = asyncio.create_task(consume())
+            while not first:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel())
+
+        for thread in aio_threads():
+            thread.join(timeout=5)
+        gc.collect()  # Surface "coroutine was never awaited" warnings here
+        assert not aio_threads()
+        assert len(first) == 1
@@ -0,0 +1,113 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for linting and fixing whole trees from Python (lint_paths, fix_paths)."""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from ascii_guard import fix_paths, lint_paths, parallel
+from ascii_guard.linter import lint_file
+from ascii_guard.scanner import scan_files
+from tests.conftest import BROKEN_BOX, GOOD_BOX, config
+
+
+class TestLintPaths:
+    """Test linting trees."""
+
+    def test_matches_lint_file_in_scan_order(self, docs: Path) -> None:
+        """Test that each scanned file is linted as lint_file would, in scan order."""
+        results = list(lint_paths([docs], config(), ordered=True))
+
+        expected = [lint_file(scanned.path) for scanned in scan_files([docs])]
+        assert results == expected
+        assert len(results) == 12
+
+    @pytest.mark.parametrize("executor_type", [ThreadPoolExecutor, ProcessPoolExecutor])
+    def test_executor(self, docs: Path, executor_type: type) -> None:
+        """Test that an executor gives the same results and is left running."""
+        serial = {result.file_path: result for result in lint_paths(str(docs), config())}
+
+        with executor_type(max_workers=2) as executor:
+            pooled = {
+                result.file_path: result
+                for result in lint_paths(str(docs), config(), executor=executor, jobs=2)
+            }
+            assert executor.submit(len, "ok").result() == 2
+
+        assert pooled == serial
+
+    def test_errors(self, docs: Path) -> None:
+        """Test that failures go to on_error, or are raised without it."""
+        missing = docs / "missing.md"
+        failed: list[str] = []
+
+        results = list(
+            lint_paths(
+                [missing, docs / "file01.md"],
+                config(),
+                on_error=lambda path, error: failed.append(path),
+            )
+        )
+
+        assert failed == [str(missing)]
+        assert [Path(result.file_path).name for result in results] == ["file01.md"]
+        with pytest.raises(FileNotFoundError):
+            list(lint_paths([missing], config()))
+
+    def test_result_cache(
+        self, docs: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a second run is answered from the persistent cache."""
+        settings = config(cache=True, cache_dir=str(tmp_path / "cache"))
+        first = list(lint_paths(docs, settings, ordered=True))
+
+        def fail(*args: object, **kwargs: object) -> None:
+            raise AssertionError("file was linted")
+
+        monkeypatch.setattr(parallel, "process_file", fail)
+        second = list(lint_paths(docs, settings, ordered=True))
+
+        assert second == first
+        assert (tmp_path / "cache").is_dir()
+
+    def test_stopping_early(self, docs: Path) -> None:
+        """Test that an abandoned iteration leaves the executor usable."""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = lint_paths(docs, config(), executor=executor, jobs=2)
+            next(results)
+            results.close()
+
+            assert len(list(lint_paths(docs, config(), executor=executor, jobs=2))) == 12
+
+
+class TestFixPaths:
+    """Test fixing trees."""
+
+    def test_dry_run_and_fix(self, docs: Path) -> None:
+        """Test previewing and applying fixes, fixing each file once."""
+        broken = {f"file{i:02d}.md" for i in (0, 3, 6, 9)}
+        previews = list(fix_paths([docs, docs / "file00.md"], config(), dry_run=True))
+
+        assert {Path(r.file_path).name for r in previews if r.boxes_fixed} == broken
+        assert len(previews) == 12
+        assert (docs / "file00.md").read_text() == BROKEN_BOX
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            fixed = list(fix_paths(docs, config(), executor=executor, jobs=2))
+
+        assert {Path(r.file_path).name for r in fixed if r.modified} == broken
+        assert all(path.read_text() == GOOD_BOX for path in docs.glob("*.md"))
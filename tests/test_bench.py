@@ -0,0 +1,135 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for benchmarking a user's own files (ascii-guard bench)."""
+
+from pathlib import Path
+
+import pytest
+
+from ascii_guard.bench import BenchConfig, job_counts, run_bench
+from ascii_guard.stats import RunStats
+
+
+class FakeRunner:
+    """Runner returning fixed wall times per configuration, recording its calls."""
+
+    def __init__(self, walls: dict[tuple[int, bool, str], float], files: int = 10) -> None:
+        """Create a runner with wall times keyed by (jobs, prefilter, cache)."""
+        self.walls = walls
+        self.files = files
+        self.calls: list[tuple[BenchConfig, str | None]] = []
+
+    def __call__(self, config: BenchConfig, cache_dir: str | None) -> RunStats:
+        """Return stats for one run."""
+        self.calls.append((config, cache_dir))
+        stats = RunStats(files=self.files)
+        stats.wall = self.walls.get((config.jobs, config.prefilter, config.cache), 1.0)
+        return stats
+
+
+class TestRunBench:
+    """Test the measured configurations and the recommendation."""
+
+    def test_job_counts(self) -> None:
+        """Test powers of two up to the maximum, plus the maximum."""
+        assert job_counts(1) == [1]
+        assert job_counts(4) == [1, 2, 4]
+        assert job_counts(6) == [1, 2, 4, 6]
+
+    def test_configurations_and_recommendation(self) -> None:
+        """Test that the fewest workers close to the fastest are recommended."""
+        runner = FakeRunner(
+            {
+                (1, True, "off"): 8.0,
+                (1, False, "off"): 9.0,
+                (2, True, "off"): 4.0,
+                (4, True, "off"): 2.1,
+                (8, True, "off"): 2.0,
+                (4, True, "cold"): 2.3,
+                (4, True, "warm"): 0.2,
+            }
+        )
+
+        report = run_bench(runner, max_jobs=8, repeat=2)
+
+        names = [result.config.name for result in report.results]
+        assert names == [
+            "serial",
+            "serial, no prefilter",
+            "2 jobs",
+            "4 jobs",
+            "8 jobs",
+            "4 jobs, cold cache",
+            "4 jobs, warm cache",
+        ]
+        four = report.results[3]
+        assert four.speedup == pytest.approx(8.0 / 2.1)
+        assert four.efficiency == pytest.approx(8.0 / 2.1 / 4)
+        assert report.results[-1].efficiency is None
+
+        recommendation = report.recommendation
+        assert (recommendation.jobs, recommendation.prefilter, recommendation.cache) == (
+            4,
+            True,
+            True,
+        )
+        assert "jobs = 4\nprefilter = true\ncache = true" in recommendation.to_toml()
+        assert report.to_dict()["recommendation"]["jobs"] == 4
+
+    def test_cache_directories(self) -> None:
+        """Test that cold runs start empty each time and warm runs are filled first."""
+        runner = FakeRunner({})
+
+        run_bench(runner, max_jobs=1, repeat=2)
+
+        cold = [cache_dir for config, cache_dir in runner.calls if config.cache == "cold"]
+        warm = [cache_dir for config, cache_dir in runner.calls if config.cache == "warm"]
+        assert len(set(cold)) == 2
+        assert len(warm) == 3  # Untimed fill, then two timed runs
+        assert len(set(warm)) == 1
+        assert all(not Path(cache_dir).exists() for cache_dir in cold + warm if cache_dir)
+
+    def test_slower_options_not_recommended(self) -> None:
+        """Test keeping one job, the prefilter and no cache when nothing else pays off."""
+        runner = FakeRunner({(1, False, "off"): 0.95, (2, True, "off"): 1.2})
+
+        recommendation = run_bench(runner, max_jobs=2, repeat=1).recommendation
+
+        assert (recommendation.jobs, recommendation.prefilter, recommendation.cache) == (
+            1,
+            True,
+            False,
+        )
+        assert "more workers were not faster" in recommendation.reasons[0]
+
+    @pytest.mark.parametrize(("files", "below"), [(10, True), (100, False)])
+    def test_parallel_threshold(self, files: int, below: bool) -> None:
+        """Test that paths lint would run in one process are labelled as such."""
+        runner = FakeRunner({}, files=files)
+
+        report = run_bench(runner, max_jobs=2, repeat=1)
+
+        assert report.below_parallel_threshold is below
+        assert report.to_dict()["below_parallel_threshold"] is below
+        assert ("forced to use a pool" in report.recommendation.reasons[0]) is below
+
+    def test_no_files(self) -> None:
+        """Test that an empty input is rejected after one run."""
+        runner = FakeRunner({}, files=0)
+
+        with pytest.raises(ValueError, match="No files"):
+            run_bench(runner, max_jobs=4)
+        assert len(runner.calls) == 1
+
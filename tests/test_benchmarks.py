@@ -0,0 +1,151 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the benchmark harness (benchmarks/)."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from benchmarks.__main__ import main
+from benchmarks.harness import (
+    BENCHMARKS,
+    RESULTS_VERSION,
+    build_corpus,
+    compare_results,
+    load_results,
+    measure,
+    measure_memory,
+    run_benchmarks,
+)
+
+
+def results(calibration: float, **times: float) -> dict[str, Any]:
+    """Return a minimal results file with the given best times."""
+    return {
+        "version": RESULTS_VERSION,
+        "calibration": calibration,
+        "benchmarks": {name: {"min": seconds} for name, seconds in times.items()},
+    }
+
+
+class TestHarness:
+    """Test timing and running benchmarks."""
+
+    def test_measure(self) -> None:
+        """Test that calls per repetition grow until min_time is reached."""
+        measurement = measure(lambda: sum(range(100)), warmup=0, repeat=3, min_time=0.001)
+
+        assert len(measurement.times) == 3
+        assert measurement.number > 1
+        assert 0 < measurement.best <= measurement.median
+
+    def test_corpus_needs_fixes(self, tmp_path: Path) -> None:
+        """Test that every box of the broken document is actually broken."""
+        from ascii_guard.linter import lint_file
+
+        corpus = build_corpus(tmp_path)
+        result = lint_file(corpus.broken_file)
+
+        assert result.boxes_found == 100
+        assert len(result.errors) >= 100
+        assert corpus.paths
+
+    def test_every_benchmark_runs(self, tmp_path: Path) -> None:
+        """Test one quick run of the whole suite and its JSON output."""
+        output = tmp_path / "results.json"
+        args = ["run", "-o", str(output), "--warmup", "0", "--repeat", "1", "--min-time", "0"]
+        assert main(args) == 0
+
+        data = load_results(output)
+        assert list(data["benchmarks"]) == [benchmark.name for benchmark in BENCHMARKS]
+        assert data["calibration"] > 0
+        assert all(entry["min"] > 0 for entry in data["benchmarks"].values())
+
+    def test_measure_memory(self) -> None:
+        """Test the peak and retained memory of a call, and the lines holding memory."""
+        from ascii_guard.detector import detect_boxes_in_lines
+
+        lines = ["┌────┐", "│ ok │", "└────┘"] * 200
+        kept: list[bytearray] = []
+
+        def operation() -> object:
+            kept.append(bytearray(10_000))
+            return detect_boxes_in_lines(lines)
+
+        use = measure_memory(operation)
+
+        assert use.peak > use.retained >= 10_000
+        assert use.lines[0].module == "detector.py"
+
+    def test_memory_run_and_compare(self, tmp_path: Path) -> None:
+        """Test recording memory and comparing peaks."""
+        output = tmp_path / "results.json"
+        args = ["run", "lint_file", "-o", str(output), "--repeat", "1", "--min-time", "0"]
+        assert main([*args, "--memory"]) == 0
+
+        data = load_results(output)
+        memory = data["benchmarks"]["lint_file"]["memory"]
+        assert memory["peak"] > 0
+        assert data["settings"]["memory"] is True
+        assert main(["compare", str(output), str(output), "--memory"]) == 0
+
+        memory["peak"] *= 2
+        doubled = tmp_path / "doubled.json"
+        doubled.write_text(json.dumps(data))
+        assert main(["compare", str(output), str(doubled), "--memory"]) == 1
+        assert main(["compare", str(output), str(doubled)]) == 0  # Times unchanged
+
+    def test_unknown_benchmark(self) -> None:
+        """Test that unknown names are rejected before anything runs."""
+        with pytest.raises(ValueError, match="no_such"):
+            run_benchmarks(["no_such"])
+
+
+class TestCompare:
+    """Test regression detection against a baseline."""
+
+    def test_statuses(self) -> None:
+        """Test regression, improvement, tolerance and added or removed benchmarks."""
+        baseline = results(1.0, slower=1.0, faster=1.0, same=1.0, removed=1.0)
+        current = results(1.0, slower=1.3, faster=0.7, same=1.2, added=1.0)
+
+        statuses = {c.name: c.status for c in compare_results(baseline, current, 0.25)}
+        assert statuses == {
+            "slower": "regression",
+            "faster": "improvement",
+            "same": "ok",
+            "added": "new",
+            "removed": "missing",
+        }
+
+    def test_calibration_cancels_machine_speed(self) -> None:
+        """Test that a uniformly slower machine is not a regression."""
+        baseline = results(1.0, lint=1.0)
+        current = results(2.0, lint=2.1)
+
+        assert compare_results(baseline, current)[0].status == "ok"
+        assert compare_results(baseline, current, normalize=False)[0].status == "regression"
+
+    def test_exit_codes(self, tmp_path: Path) -> None:
+        """Test that compare exits 1 on regressions and 2 on unreadable files."""
+        baseline, current = tmp_path / "baseline.json", tmp_path / "current.json"
+        baseline.write_text(json.dumps(results(1.0, lint=1.0)))
+        current.write_text(json.dumps(results(1.0, lint=2.0)))
+
+        assert main(["compare", str(baseline), str(current)]) == 1
+        assert main(["compare", str(baseline), str(current), "--tolerance", "1.5"]) == 0
+        assert main(["compare", str(baseline), str(tmp_path / "missing.json")]) == 2
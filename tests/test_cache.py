@@ -0,0 +1,384 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the persistent caches."""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from ascii_guard import scanner
+from ascii_guard.cache import (
+    SCAN_MAX_AGE_DAYS,
+    ResultCache,
+    ScanCache,
+    config_fingerprint,
+    content_digest,
+    result_fingerprint,
+)
+from ascii_guard.config import Config, PerformanceConfig
+from ascii_guard.linter import lint_file
+from ascii_guard.parallel import TaskOptions, decode_outcome
+from ascii_guard.scanner import iter_scan_paths, scan_files, scan_paths
+
+
+def age_tree(root: Path, seconds: float = 60.0) -> None:
+    """Move directory mtimes into the past so the cache trusts them."""
+    past = time.time() - seconds
+    for dirpath, _, _ in os.walk(root):
+        os.utime(dirpath, (past, past))
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    """Create a small project tree with aged directory mtimes."""
+    root = tmp_path / "project"
+    (root / "docs" / "guide").mkdir(parents=True)
+    (root / "node_modules").mkdir()
+    (root / "README.md").write_text("# Readme\n")
+    (root / "docs" / "index.md").write_text("┌──┐\n│ok│\n└──┘\n")
+    (root / "docs" / "guide" / "intro.md").write_text("Intro\n")
+    (root / "docs" / "logo.bin").write_bytes(b"\x00\x01")
+    (root / "node_modules" / "pkg.md").write_text("ignored\n")
+    age_tree(root)
+    return root
+
+
+@pytest.fixture
+def count_listings(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    """Record every directory the scanner actually lists."""
+    listed: list[Path] = []
+    original = scanner._list_directory
+
+    def recording(directory: Path, *args, **kwargs):  # type: ignore[no-untyped-def]
+        listed.append(directory)
+        return original(directory, *args, **kwargs)
+
+    monkeypatch.setattr(scanner, "_list_directory", recording)
+    return listed
+
+
+class TestConfigFingerprint:
+    """Test cache invalidation keys."""
+
+    def test_stable_for_equal_configs(self) -> None:
+        """Test that equal configs produce the same fingerprint."""
+        assert config_fingerprint(Config()) == config_fingerprint(Config())
+
+    def test_changes_with_patterns(self) -> None:
+        """Test that filter and pattern changes produce a new fingerprint."""
+        base = config_fingerprint(Config())
+        assert config_fingerprint(Config(exclude=["*.txt"])) != base
+        assert config_fingerprint(Config(include=["!keep.md"])) != base
+        assert config_fingerprint(Config(extensions=[".md"])) != base
+        assert config_fingerprint(Config(max_file_size=1)) != base
+        assert config_fingerprint(Config(follow_symlinks=True)) != base
+
+
+class TestScanCache:
+    """Test the directory scan cache."""
+
+    def test_same_results_with_and_without_cache(self, tree: Path, tmp_path: Path) -> None:
+        """Test that cached scans select exactly the same files."""
+        config = Config()
+        expected = scan_paths([tree], config)
+
+        cache = ScanCache.load(tmp_path / "cache")
+        assert scan_paths([tree], config, cache) == expected
+        cache.save()
+
+        cache = ScanCache.load(tmp_path / "cache")
+        assert scan_paths([tree], config, cache) == expected
+
+    def test_unchanged_directories_are_not_listed(
+        self, tree: Path, tmp_path: Path, count_listings: list[Path]
+    ) -> None:
+        """Test that a warm cache serves unchanged directories."""
+        config = Config()
+        cache = ScanCache.load(tmp_path / "cache")
+        list(iter_scan_paths([tree], config, cache))
+        cache.save()
+        assert len(count_listings) == 3  # project, docs, docs/guide
+
+        count_listings.clear()
+        cache = ScanCache.load(tmp_path / "cache")
+        list(iter_scan_paths([tree], config, cache))
+        assert count_listings == []
+
+    def test_cached_files_are_not_sniffed(
+        self, tree: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that files from cached directories skip is_text_file."""
+        config = Config()
+        cache = ScanCache.load(tmp_path / "cache")
+        list(iter_scan_paths([tree], config, cache))
+
+        def fail(*args, **kwargs):  # type: ignore[no-untyped-def]
+            raise AssertionError("is_text_file called for cached directory")
+
+        monkeypatch.setattr(scanner, "is_text_file", fail)
+        assert len(list(iter_scan_paths([tree], config, cache))) == 3
+
+    def test_modified_directory_is_relisted(
+        self, tree: Path, tmp_path: Path, count_listings: list[Path]
+    ) -> None:
+        """Test that only directories whose mtime moved are listed again."""
+        config = Config()
+        cache = ScanCache.load(tmp_path / "cache")
+        list(iter_scan_paths([tree], config, cache))
+
+        (tree / "docs" / "new.md").write_text("New\n")
+        past = time.time() - 30
+        os.utime(tree / "docs", (past, past))
+
+        count_listings.clear()
+        found = list(iter_scan_paths([tree], config, cache))
+
+        assert count_listings == [tree / "docs"]
+        assert tree / "docs" / "new.md" in found
+
+    def test_config_change_invalidates(self, tree: Path, tmp_path: Path) -> None:
+        """Test that a cache written for another config is discarded."""
+        cache = ScanCache.load(tmp_path / "cache")
+        list(iter_scan_paths([tree], Config(), cache))
+        cache.save()
+
+        config = Config(extensions=[".md"], exclude=["docs/", "node_modules/"])
+        cache = ScanCache.load(tmp_path / "cache")
+        found = list(iter_scan_paths([tree], config, cache))
+
+        assert found == [tree / "README.md"]
+
+    def test_recent_directories_not_cached(self, tmp_path: Path) -> None:
+        """Test that directories modified just now are not trusted."""
+        root = tmp_path / "fresh"
+        root.mkdir()
+        (root / "a.md").write_text("A\n")
+
+        cache = ScanCache.load(tmp_path / "cache")
+        list(iter_scan_paths([root], Config(), cache))
+        cache.save()
+
+        assert not (tmp_path / "cache" / ScanCache.FILE_NAME).exists()
+
+    def test_memory_only(self, tree: Path, tmp_path: Path, count_listings: list[Path]) -> None:
+        """Test that a cache without a path is reused but never written."""
+        cache = ScanCache(None)
+        list(iter_scan_paths([tree], Config(), cache))
+        listed = len(count_listings)
+        cache.save()
+        cache.begin_run()
+        list(iter_scan_paths([tree], Config(), cache))
+
+        assert len(count_listings) == listed
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["project"]
+
+    @pytest.mark.parametrize("persistent", [True, False])
+    def test_unused_entries_pruned(self, tmp_path: Path, persistent: bool) -> None:
+        """Test that directories not used for SCAN_MAX_AGE_DAYS are dropped on save."""
+        cache_file = tmp_path / "cache" / ScanCache.FILE_NAME
+        cache = ScanCache(cache_file if persistent else None)
+        today = cache._today
+        cache.store(tmp_path / "deleted", 1, "key", [], ["a.md"])
+        cache.store(tmp_path / "kept", 1, "key", [], ["b.md"])
+        cache.save()
+
+        cache._today = today + SCAN_MAX_AGE_DAYS
+        assert cache.lookup(tmp_path / "kept", 1, "key") is not None
+        cache._today = today + SCAN_MAX_AGE_DAYS + 1
+        cache.save()
+        if persistent:
+            cache = ScanCache.load(cache_file.parent)
+
+        assert cache.lookup(tmp_path / "deleted", 1, "key") is None
+        assert cache.lookup(tmp_path / "kept", 1, "key") == ([], ["b.md"])
+
+    def test_scan_files_uses_cache(self, tree: Path, tmp_path: Path) -> None:
+        """Test that scan_files returns content for cached directories."""
+        config = Config()
+        cache = ScanCache.load(tmp_path / "cache")
+        first = {f.path: f.data for f in scan_files([tree], config, cache)}
+        second = {f.path: f.data for f in scan_files([tree], config, cache)}
+
+        assert first == second
+        assert len(second) == 3
+
+    def test_corrupt_cache_file_ignored(self, tree: Path, tmp_path: Path) -> None:
+        """Test that an unreadable cache file starts an empty cache."""
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+        (cache_dir / ScanCache.FILE_NAME).write_text("{not json")
+
+        cache = ScanCache.load(cache_dir)
+
+        assert scan_paths([tree], Config(), cache) == scan_paths([tree], Config())
+
+    def test_save_failure_ignored(self, tree: Path, tmp_path: Path) -> None:
+        """Test that an unwritable cache location does not raise."""
+        blocker = tmp_path / "blocker"
+        blocker.write_text("not a directory")
+
+        cache = ScanCache.load(blocker / "cache")
+        list(iter_scan_paths([tree], Config(), cache))
+        cache.save()
+
+
+def age_file(path: Path, seconds: float = 60.0) -> None:
+    """Move a file's mtime into the past so its stat data is trusted."""
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+class TestResultFingerprint:
+    """Test result cache keys."""
+
+    def test_changes_with_result_settings(self) -> None:
+        """Test that settings affecting results change the fingerprint."""
+        base = result_fingerprint(False, PerformanceConfig())
+        assert result_fingerprint(True, PerformanceConfig()) != base
+        assert result_fingerprint(False, PerformanceConfig(max_box_height=5)) != base
+
+    def test_ignores_throughput_settings(self) -> None:
+        """Test that settings not affecting results keep the fingerprint."""
+        base = result_fingerprint(False, PerformanceConfig())
+        assert result_fingerprint(False, PerformanceConfig(jobs=8, prefetch=0)) == base
+
+
+class TestResultCache:
+    """Test the lint result cache."""
+
+    FINGERPRINT = result_fingerprint(False, PerformanceConfig())
+
+    @pytest.fixture
+    def doc(self, tmp_path: Path) -> Path:
+        """Create a file with one broken box and an old mtime."""
+        path = tmp_path / "doc.md"
+        path.write_text("┌────┐\n│Test│\n└───┘\n")
+        age_file(path)
+        return path
+
+    def lint_and_store(self, cache: ResultCache, path: Path) -> None:
+        """Lint a file and record its result."""
+        data = path.read_bytes()
+        cache.store(path, data, lint_file(path, data=data))
+
+    def test_replays_result(self, doc: Path, tmp_path: Path) -> None:
+        """Test that a stored result replays equal to a fresh lint."""
+        cache = ResultCache.load(tmp_path / "cache", self.FINGERPRINT)
+        self.lint_and_store(cache, doc)
+        cache.save()
+
+        cache = ResultCache.load(tmp_path / "cache", self.FINGERPRINT)
+        encoded = cache.lookup(doc, doc.read_bytes())
+
+        assert encoded is not None
+        assert decode_outcome(str(doc), encoded, TaskOptions()) == lint_file(doc)
+
+    def test_memory_only(self, doc: Path, tmp_path: Path) -> None:
+        """Test that a cache without a path works but never touches the disk."""
+        cache = ResultCache(None, self.FINGERPRINT)
+        self.lint_and_store(cache, doc)
+        cache.save()
+        cache.begin_run()
+
+        assert cache.lookup(doc, doc.read_bytes()) is not None
+        assert cache.is_unchanged(doc)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["doc.md"]
+
+    def test_content_not_from_file(self, doc: Path) -> None:
+        """Test that content stored with from_file=False is not trusted by stat."""
+        cache = ResultCache(None, self.FINGERPRINT)
+        data = doc.read_bytes()
+        cache.store(doc, data, lint_file(doc, data=data), from_file=False)
+
+        assert not cache.is_unchanged(doc)
+        assert cache.lookup(doc, data) is not None
+
+    def test_unchanged_file_needs_no_read(self, doc: Path, tmp_path: Path) -> None:
+        """Test that matching stat data answers a lookup without content."""
+        cache = ResultCache(tmp_path / "cache" / ResultCache.FILE_NAME, self.FINGERPRINT)
+        self.lint_and_store(cache, doc)
+
+        assert cache.is_unchanged(doc)
+        assert cache.lookup(doc, None) is not None
+
+    def test_modified_file_misses(self, doc: Path, tmp_path: Path) -> None:
+        """Test that changed content is linted again."""
+        cache = ResultCache(tmp_path / "cache" / ResultCache.FILE_NAME, self.FINGERPRINT)
+        self.lint_and_store(cache, doc)
+
+        doc.write_text("┌────┐\n│Test│\n└────┘\n")
+
+        assert not cache.is_unchanged(doc)
+        assert cache.lookup(doc, doc.read_bytes()) is None
+
+    def test_content_hit_after_checkout(self, doc: Path, tmp_path: Path) -> None:
+        """Test that identical content hits even when stat data differs."""
+        cache = ResultCache(tmp_path / "cache" / ResultCache.FILE_NAME, self.FINGERPRINT)
+        self.lint_and_store(cache, doc)
+
+        copy = tmp_path / "elsewhere.md"
+        copy.write_bytes(doc.read_bytes())
+
+        assert not cache.is_unchanged(copy)
+        assert cache.lookup(copy, copy.read_bytes()) is not None
+
+    def test_recent_files_not_trusted_by_stat(self, tmp_path: Path) -> None:
+        """Test that files modified just now are always read."""
+        path = tmp_path / "fresh.md"
+        path.write_text("text\n")
+        cache = ResultCache(tmp_path / "cache" / ResultCache.FILE_NAME, self.FINGERPRINT)
+        self.lint_and_store(cache, path)
+
+        assert not cache.is_unchanged(path)
+
+    def test_settings_change_misses(self, doc: Path, tmp_path: Path) -> None:
+        """Test that results for other settings are not replayed."""
+        cache = ResultCache.load(tmp_path / "cache", self.FINGERPRINT)
+        self.lint_and_store(cache, doc)
+        cache.save()
+
+        other = ResultCache.load(tmp_path / "cache", result_fingerprint(True, PerformanceConfig()))
+
+        assert other.lookup(doc, doc.read_bytes()) is None
+
+    def test_lru_eviction(self, tmp_path: Path) -> None:
+        """Test that the least recently used results are evicted first."""
+        cache = ResultCache(tmp_path / "cache" / ResultCache.FILE_NAME, self.FINGERPRINT)
+        cache.max_size = 400
+        contents = [f"file {i}\n".encode() for i in range(10)]
+        for i, data in enumerate(contents):
+            cache._now = i
+            path = tmp_path / f"f{i}.md"
+            path.write_bytes(data)
+            cache.store(path, data, lint_file(path, data=data))
+        cache.save()
+
+        size = cache.path.stat().st_size
+        cache = ResultCache.load(tmp_path / "cache", self.FINGERPRINT)
+        hits = [
+            cache.lookup(tmp_path / f"f{i}.md", data) is not None for i, data in enumerate(contents)
+        ]
+
+        assert size <= 400
+        assert hits[-1]
+        assert not hits[0]
+        assert hits == sorted(hits)  # Oldest results go first
+
+    def test_digest_is_content_only(self) -> None:
+        """Test that the digest depends only on content."""
+        assert content_digest(b"abc") == content_digest(b"abc")
+        assert content_digest(b"abc") != content_digest(b"abd")
@@ -17,13 +17,24 @@
 Tests command-line interface functionality.
 """
 
+import argparse
+import io
+import json
+import os
+import pstats
+import shutil
+import subprocess
 import sys
+import time
 from pathlib import Path
+from typing import Any
 from unittest.mock import patch
 
 import pytest
 
-from ascii_guard.cli import cmd_fix, cmd_lint, main
+from ascii_guard import cli
+from ascii_guard.cli import cmd_fix, cmd_lint, main, read_path_list
+from ascii_guard.linter import lint_file
 
 
 class TestCLILintCommand:
@@ -202,6 +213,65 @@ class TestCLIFixCommand:
         assert "not found" in captured.err.lower() or "✗" in captured.err
 
 
+class TestCLIFixStdin:
+    """Test fixing content from stdin to stdout."""
+
+    BROKEN = "┌────┐\r\n│Test│\r\n└───┘"
+
+    def run(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        capsysbinary: pytest.CaptureFixture[bytes],
+        content: str,
+        **options: object,
+    ) -> tuple[int, bytes, bytes]:
+        """Run fix on stdin content; return (exit code, stdout, stderr)."""
+        stdin = io.TextIOWrapper(io.BytesIO(content.encode("utf-8")), encoding="utf-8")
+        monkeypatch.setattr(sys, "stdin", stdin)
+        options.setdefault("dry_run", False)
+        args = argparse.Namespace(files=["-"], **options)
+        exit_code = cmd_fix(args)
+        captured = capsysbinary.readouterr()
+        return exit_code, captured.out, captured.err
+
+    def test_fixed_text_on_stdout(
+        self, monkeypatch: pytest.MonkeyPatch, capsysbinary: pytest.CaptureFixture[bytes]
+    ) -> None:
+        """Test that the fixed text goes to stdout and status to stderr."""
+        exit_code, out, err = self.run(monkeypatch, capsysbinary, self.BROKEN)
+
+        assert exit_code == 0
+        assert out.decode() == "┌────┐\n│Test│\n└────┘\n"
+        assert "Fixed 1 box(es)" in err.decode()
+
+    def test_clean_and_excluded_content_pass_through(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsysbinary: pytest.CaptureFixture[bytes],
+    ) -> None:
+        """Test that content without fixes is echoed byte for byte."""
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".ascii-guard.toml").write_text('[files]\nexclude = ["*.txt"]\n')
+        monkeypatch.chdir(tmp_path)
+        clean = "┌────┐\r\n│Test│\r\n└────┘"
+
+        assert self.run(monkeypatch, capsysbinary, clean)[1] == clean.encode()
+        excluded = self.run(monkeypatch, capsysbinary, self.BROKEN, stdin_filename="a.txt")
+        assert excluded[1] == self.BROKEN.encode()
+        assert not list(tmp_path.glob("*.txt"))  # Nothing written to disk
+
+    def test_dry_run_writes_nothing(
+        self, monkeypatch: pytest.MonkeyPatch, capsysbinary: pytest.CaptureFixture[bytes]
+    ) -> None:
+        """Test that --dry-run only reports."""
+        exit_code, out, err = self.run(monkeypatch, capsysbinary, self.BROKEN, dry_run=True)
+
+        assert exit_code == 0
+        assert out == b""
+        assert "Would fix 1 box(es)" in err.decode()
+
+
 class TestCLIMain:
     """Test suite for main CLI entry point."""
 
@@ -248,6 +318,67 @@ class TestCLIMain:
             # Should succeed
             assert exc_info.value.code == 0
 
+    def test_main_lint_json(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that JSON output is the only thing on stdout."""
+        (tmp_path / "good.md").write_text("┌────┐\n│ OK │\n└────┘\n")
+        (tmp_path / "bad.md").write_text("┌────┐\n│ OK │\n└───┘\n")
+
+        argv = ["ascii-guard", "lint", "--format", "json", str(tmp_path)]
+        with patch.object(sys, "argv", argv), pytest.raises(SystemExit) as exc_info:
+            main()
+
+        assert exc_info.value.code == 1
+        document = json.loads(capsys.readouterr().out)
+        assert document["summary"]["total_files"] == 2
+        assert document["summary"]["files_with_errors"] == 1
+
+    def test_main_lint_jsonl_sends_notices_to_stderr(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that warnings do not mix with machine-readable records."""
+        (tmp_path / "good.md").write_text("┌────┐\n│ OK │\n└────┘\n")
+        (tmp_path / ".git").write_text("not a repository\n")  # Stop git discovery
+        argv = ["ascii-guard", "lint", "--format", "jsonl", "--changed-since", "main"]
+
+        with (
+            patch.object(sys, "argv", [*argv, str(tmp_path)]),
+            pytest.raises(SystemExit) as exc_info,
+        ):
+            main()
+
+        assert exc_info.value.code == 0
+        captured = capsys.readouterr()
+        (record,) = [json.loads(line) for line in captured.out.splitlines()]
+        assert record["errors"] == []
+        assert "linting all files" in captured.err
+
+    @pytest.mark.parametrize("output_format", ["json", "jsonl", "sarif", "github"])
+    def test_main_lint_config_warnings_go_to_stderr(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str], output_format: str
+    ) -> None:
+        """Test that config warnings keep machine-readable stdout parseable."""
+        config_file = tmp_path / "cfg.toml"
+        config_file.write_text("[files]\nbogus = 1\n")
+        (tmp_path / "bad.md").write_text("┌────┐\n│ OK │\n└───┘\n")
+        argv = ["ascii-guard", "lint", "--config", str(config_file), "--format", output_format]
+
+        with (
+            patch.object(sys, "argv", [*argv, str(tmp_path / "bad.md")]),
+            pytest.raises(SystemExit) as exc_info,
+        ):
+            main()
+
+        assert exc_info.value.code == 1
+        captured = capsys.readouterr()
+        assert "Unknown keys in [files] section: bogus" in captured.err
+        assert "Warning" not in captured.out
+        if output_format == "jsonl":
+            assert [json.loads(line) for line in captured.out.splitlines()]
+        elif output_format == "github":
+            assert all(line.startswith("::") for line in captured.out.splitlines())
+        else:
+            json.loads(captured.out)
+
     def test_main_unknown_command(self, capsys: pytest.CaptureFixture[str]) -> None:
         """Test main with unknown command."""
         with patch.object(sys, "argv", ["ascii-guard", "unknown"]):
@@ -295,6 +426,31 @@ class TestCLIColors:
         assert isinstance(COLOR_BOLD, str) and len(COLOR_BOLD) > 0
         assert isinstance(COLOR_RESET, str) and len(COLOR_RESET) > 0
 
+    def test_no_colors_when_not_a_tty(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that redirected output carries no escape codes."""
+        from ascii_guard.cli import print_error, print_success
+
+        print_success("done")
+        print_error("failed")
+
+        captured = capsys.readouterr()
+        assert captured.out == "✓ done\n"
+        assert captured.err == "✗ failed\n"
+
+    def test_colors_on_a_tty(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that terminals get colors unless NO_COLOR is set."""
+        from ascii_guard.cli import COLOR_GREEN, styled
+
+        class Terminal(io.StringIO):
+            def isatty(self) -> bool:
+                return True
+
+        monkeypatch.delenv("NO_COLOR", raising=False)
+        assert styled("ok", COLOR_GREEN, Terminal()).startswith(COLOR_GREEN)
+
+        monkeypatch.setenv("NO_COLOR", "1")
+        assert styled("ok", COLOR_GREEN, Terminal()) == "ok"
+
 
 class TestCLIEdgeCases:
     """Test CLI edge cases to achieve better coverage."""
@@ -390,12 +546,10 @@ class TestCLIEdgeCases:
             quiet = False
 
         # Mock lint_file to raise an exception
-        from ascii_guard import cli
-
         def mock_lint_file(*args, **kwargs):  # type: ignore[no-untyped-def]
             raise ValueError("Simulated processing error")
 
-        with patch.object(cli, "lint_file", side_effect=mock_lint_file):
+        with patch("ascii_guard.linter.lint_file", side_effect=mock_lint_file):
             exit_code = cmd_lint(Args())
 
         # Should return error code
@@ -417,12 +571,10 @@ class TestCLIEdgeCases:
             dry_run = False
 
         # Mock fix_file to raise an exception
-        from ascii_guard import cli
-
         def mock_fix_file(*args, **kwargs):  # type: ignore[no-untyped-def]
             raise OSError("Permission denied")
 
-        with patch.object(cli, "fix_file", side_effect=mock_fix_file):
+        with patch("ascii_guard.linter.fix_file", side_effect=mock_fix_file):
             exit_code = cmd_fix(Args())
 
         # Should return error code
@@ -508,6 +660,286 @@ class TestCLIEdgeCases:
             "Using default config" in captured.out or "no .ascii-guard.toml found" in captured.out
         )
 
+    def test_lint_uses_per_directory_configs(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that subproject configs apply without --config."""
+        (tmp_path / ".git").mkdir()
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        (tmp_path / "b" / ".ascii-guard.toml").write_text('[files]\nexclude = ["broken.md"]\n')
+        broken = "┌────┐\n│Test│\n└───┘\n"
+        (tmp_path / "a" / "broken.md").write_text(broken)
+        (tmp_path / "b" / "broken.md").write_text(broken)
+
+        class Args:
+            files = [str(tmp_path)]
+            quiet = False
+
+        exit_code = cmd_lint(Args())
+
+        captured = capsys.readouterr()
+        assert exit_code == 1
+        assert "Files checked: 2" in captured.out  # a/broken.md and b/.ascii-guard.toml
+        assert str(tmp_path / "b" / "broken.md") not in captured.out
+
+    @pytest.mark.parametrize("command", ["lint", "fix"])
+    def test_invalid_per_directory_config(
+        self, tmp_path: Path, command: str, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that an invalid config found while scanning is reported, not raised."""
+        (tmp_path / ".git").mkdir()
+        (tmp_path / "sub").mkdir()
+        config_file = tmp_path / "sub" / ".ascii-guard.toml"
+        config_file.write_text("[files]\nexclude = 5\n")
+        (tmp_path / "sub" / "doc.md").write_text("┌────┐\n│Test│\n└───┘\n")
+
+        argv = ["ascii-guard", command, str(tmp_path)]
+        with patch.object(sys, "argv", argv), pytest.raises(SystemExit) as exc_info:
+            main()
+
+        assert exc_info.value.code == 1
+        err = capsys.readouterr().err
+        assert f"Invalid config {config_file}: [files] exclude must be a list" in err
+        assert "Traceback" not in err
+
+    @pytest.mark.parametrize("command", ["lint", "lsp"])
+    def test_invalid_explicit_config(
+        self, tmp_path: Path, command: str, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that an invalid --config file is reported the same way by every command."""
+        config_file = tmp_path / "bad.toml"
+        config_file.write_text('[performance]\njobs = "x"\n')
+
+        argv = ["ascii-guard", command, "--config", str(config_file)]
+        if command == "lint":
+            argv.append(str(tmp_path))
+        with patch.object(sys, "argv", argv), pytest.raises(SystemExit) as exc_info:
+            main()
+
+        assert exc_info.value.code == 1
+        err = capsys.readouterr().err
+        assert f"Invalid config {config_file}: [performance] jobs must be an integer" in err
+        assert "Traceback" not in err
+
+    def test_lint_uses_performance_settings(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that [performance] settings from --config apply to the run."""
+        cache_dir = tmp_path / "lint-cache"
+        config_file = tmp_path / "perf.toml"
+        config_file.write_text(
+            f'[performance]\ncache = true\ncache_dir = "{cache_dir.as_posix()}"\n'
+            "max_box_height = 2\nprefetch = 0\n"
+        )
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        (docs / "tall.md").write_text("┌────┐\n│Test\n└────┘\n")
+        past = time.time() - 60
+        os.utime(docs, (past, past))
+
+        class Args:
+            files = [str(docs)]
+            quiet = False
+            config = str(config_file)
+
+        exit_code = cmd_lint(Args())
+
+        captured = capsys.readouterr()
+        assert exit_code == 0  # The 3-line box exceeds max_box_height
+        assert "Found 0 ASCII box(es)" in captured.out
+        assert (cache_dir / "scan.json").exists()
+
+    def test_lint_with_jobs_matches_serial(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that --jobs output is identical to a serial run."""
+        for i in range(80):
+            box = "┌────┐\n│Test│\n└───┘\n" if i % 7 == 0 else "┌────┐\n│Test│\n└────┘\n"
+            (tmp_path / f"doc{i:02d}.md").write_text(box)
+
+        class Args:
+            files = [str(tmp_path)]
+            quiet = False
+            jobs = 1
+
+        serial_exit = cmd_lint(Args())
+        serial_out = capsys.readouterr().out
+
+        Args.jobs = 2
+        parallel_exit = cmd_lint(Args())
+        parallel_out = capsys.readouterr().out
+
+        assert serial_exit == parallel_exit == 1
+        assert parallel_out == serial_out
+        assert "Files checked: 80" in parallel_out
+
+    def test_lint_replays_cached_results(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that --cache replays results without linting unchanged files."""
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        (docs / "broken.md").write_text("┌────┐\n│Test│\n└───┘\n")
+        (docs / "clean.md").write_text("┌────┐\n│Test│\n└────┘\n")
+        past = time.time() - 60
+        for path in [*docs.iterdir(), docs]:
+            os.utime(path, (past, past))
+
+        class Args:
+            files = [str(docs)]
+            quiet = False
+            cache = True
+            cache_dir = str(tmp_path / "cache")
+
+        first_exit = cmd_lint(Args())
+        first_out = capsys.readouterr().out
+
+        with patch("ascii_guard.linter.lint_file", side_effect=AssertionError("linted again")):
+            second_exit = cmd_lint(Args())
+        second_out = capsys.readouterr().out
+
+        assert first_exit == second_exit == 1
+        assert second_out == first_out
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+    def test_lint_changed_since(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that --changed-since lints only files changed since the ref."""
+        broken = "┌────┐\n│Test│\n└───┘\n"
+        (tmp_path / "old.md").write_text(broken)
+        identity = ["-c", "user.name=Test", "-c", "user.email=test@example.com"]
+        for command in (["init", "-q", "-b", "main"], ["add", "."], ["commit", "-q", "-m", "x"]):
+            subprocess.run(["git", *identity, *command], cwd=tmp_path, check=True)
+        (tmp_path / "new.md").write_text(broken)
+
+        class Args:
+            files = [str(tmp_path)]
+            quiet = False
+            changed_since = "main"
+
+        exit_code = cmd_lint(Args())
+
+        captured = capsys.readouterr()
+        assert exit_code == 1
+        assert "Files checked: 1" in captured.out
+        assert "new.md" in captured.out
+        assert "old.md" not in captured.out
+
+    def test_lint_changed_since_falls_back_without_git_repo(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that a failing git lookup lints everything with a warning."""
+        (tmp_path / ".git").write_text("not a repository\n")
+        (tmp_path / "a.md").write_text("┌────┐\n│Test│\n└────┘\n")
+
+        class Args:
+            files = [str(tmp_path / "a.md")]
+            quiet = False
+            changed_since = "main"
+
+        exit_code = cmd_lint(Args())
+
+        captured = capsys.readouterr()
+        assert exit_code == 0
+        assert "linting all files" in captured.out
+        assert "Files checked: 1" in captured.out
+
+    def test_lint_diff_from_stdin(
+        self,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that --diff - validates only boxes touched by the diff."""
+        (tmp_path / ".git").write_text("not a repository\n")  # Paths relative to cwd
+        broken = "┌────┐\n│Test│\n└───┘\n"
+        (tmp_path / "doc.md").write_text(broken + "\n" + broken)
+        (tmp_path / "other.md").write_text(broken)
+        diff = "--- a/doc.md\n+++ b/doc.md\n@@ -5 +5 @@\n-x\n+│Test│\n"
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(sys, "stdin", io.StringIO(diff))
+
+        class Args:
+            files = [str(tmp_path)]
+            quiet = False
+            diff = "-"
+
+        exit_code = cmd_lint(Args())
+
+        captured = capsys.readouterr()
+        assert exit_code == 1
+        assert "Files checked: 1" in captured.out
+        assert "other.md" not in captured.out
+        assert "Line 7" in captured.err  # Second box's bottom border
+        assert "Line 3" not in captured.err  # First box untouched
+
+    def test_lint_stdin(
+        self,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test linting content piped to stdin."""
+        monkeypatch.setattr(sys, "stdin", io.StringIO("┌────┐\n│Test│\n└───┘\n"))
+
+        class Args:
+            files = ["-"]
+            quiet = False
+
+        exit_code = cmd_lint(Args())
+
+        captured = capsys.readouterr()
+        assert exit_code == 1
+        assert "Checking <stdin>" in captured.out
+        assert "Line 3" in captured.err
+
+    def test_lint_stdin_filename_excluded(
+        self,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that --stdin-filename applies the config's exclude patterns."""
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".ascii-guard.toml").write_text('[files]\nexclude = ["vendor/"]\n')
+        monkeypatch.chdir(tmp_path)
+        broken = "┌────┐\n│Test│\n└───┘\n"
+
+        class Args:
+            files = ["-"]
+            quiet = False
+            stdin_filename = "vendor/doc.md"
+
+        monkeypatch.setattr(sys, "stdin", io.StringIO(broken))
+        assert cmd_lint(Args()) == 0
+        assert "No files found to lint" in capsys.readouterr().out
+
+        Args.stdin_filename = "docs/doc.md"
+        monkeypatch.setattr(sys, "stdin", io.StringIO(broken))
+        assert cmd_lint(Args()) == 1
+        assert str(tmp_path / "docs" / "doc.md") in capsys.readouterr().out
+
+    @pytest.mark.parametrize(
+        ("files", "extra", "message"),
+        [
+            (["-", "README.md"], {}, "cannot be combined with other paths"),
+            (["-"], {"diff": "-"}, "--diff - cannot be used"),
+            (["README.md"], {"stdin_filename": "a.md"}, "--stdin-filename requires"),
+        ],
+    )
+    def test_lint_stdin_usage_errors(
+        self,
+        capsys: pytest.CaptureFixture[str],
+        files: list[str],
+        extra: dict[str, str],
+        message: str,
+    ) -> None:
+        """Test invalid combinations of stdin arguments."""
+        args = argparse.Namespace(files=files, quiet=False, **extra)
+
+        assert cmd_lint(args) == 1
+        assert message in capsys.readouterr().err
+
     def test_main_no_command_shows_help(self, capsys: pytest.CaptureFixture[str]) -> None:
         """Test that running without a subcommand shows help."""
         with patch.object(sys, "argv", ["ascii-guard"]), pytest.raises(SystemExit):
@@ -516,3 +948,378 @@ class TestCLIEdgeCases:
         captured = capsys.readouterr()
         # Should show help/usage
         assert "usage:" in captured.out.lower() or "ascii-guard" in captured.out
+
+
+class TestCLIFilesFrom:
+    """Test reading the paths to process from a list (--files-from)."""
+
+    BROKEN = "┌────┐\n│Test│\n└───┘\n"
+    GOOD = "┌────┐\n│Test│\n└────┘\n"
+
+    def run_main(self, argv: list[str]) -> int | str | None:
+        """Run the CLI with argv and return the exit code."""
+        with patch.object(sys, "argv", ["ascii-guard", *argv]), pytest.raises(SystemExit) as exc:
+            main()
+        return exc.value.code
+
+    def test_read_path_list_across_chunks(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that paths split across reads, blank entries and CRLF are handled."""
+        monkeypatch.setattr(cli, "FILES_FROM_CHUNK", 3)
+
+        lines = read_path_list(io.BytesIO(b"a.md\r\n\nlong name.md\nlast"), b"\n")
+        nul = read_path_list(io.BytesIO(b"x\ny.md\0\0z.md\0"), b"\0")
+
+        assert list(lines) == ["a.md", "long name.md", "last"]
+        assert list(nul) == ["x\ny.md", "z.md"]
+
+    def test_lint_files_from_file(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test linting listed files and directories, reporting listed paths that are missing."""
+        (tmp_path / "good.md").write_text(self.GOOD)
+        (tmp_path / "docs").mkdir()
+        (tmp_path / "docs" / "bad.md").write_text(self.BROKEN)
+        (tmp_path / "list.txt").write_text("good.md\ndocs\nmissing.md\n")
+        monkeypatch.chdir(tmp_path)
+
+        exit_code = self.run_main(["lint", "--files-from", "list.txt"])
+
+        captured = capsys.readouterr()
+        assert exit_code == 1
+        assert "Files checked: 3" in captured.out
+        assert "bad.md" in captured.out
+        assert f"Error processing {tmp_path / 'missing.md'}" in captured.err
+
+    def test_lint_nul_separated_stdin(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test a NUL-separated list read from stdin, combined with path arguments."""
+        odd = tmp_path / "odd\nname.md"
+        odd.write_text(self.BROKEN)
+        (tmp_path / "good.md").write_text(self.GOOD)
+        listing = f"{odd}\0".encode()
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(listing)))
+
+        exit_code = self.run_main(
+            ["lint", "--format", "jsonl", str(tmp_path / "good.md"), "--files-from", "-", "-0"]
+        )
+
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert exit_code == 1
+        assert [record.get("path") for record in records if "path" in record] == [
+            str(tmp_path / "good.md"),
+            str(odd),
+        ]
+
+    def test_fix_files_from(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test fixing the listed files."""
+        paths = [tmp_path / f"{i}.md" for i in range(3)]
+        for path in paths:
+            path.write_text(self.BROKEN)
+        listing = tmp_path / "list.txt"
+        listing.write_text("\n".join(str(path) for path in paths[:2]))
+
+        assert self.run_main(["fix", "--files-from", str(listing)]) == 0
+
+        assert [path.read_text() for path in paths] == [self.GOOD, self.GOOD, self.BROKEN]
+
+    @pytest.mark.parametrize(
+        ("argv", "message"),
+        [
+            (["lint", "-", "--files-from", "list.txt"], "cannot be combined with --files-from"),
+            (["lint", "--files-from", "-", "--diff", "-"], "cannot be combined with --diff -"),
+            (["lint", "--files-from", "list.txt", "--watch"], "--watch cannot be combined"),
+            (["fix", "a.md", "-0"], "-0/--null requires --files-from"),
+            (["lint", "--files-from", "missing.txt"], "Path not found: missing.txt"),
+        ],
+    )
+    def test_usage_errors(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+        argv: list[str],
+        message: str,
+    ) -> None:
+        """Test invalid combinations with --files-from."""
+        (tmp_path / "list.txt").write_text("")
+        (tmp_path / "a.md").write_text(self.GOOD)
+        monkeypatch.chdir(tmp_path)
+
+        assert self.run_main(argv) == 1
+        assert message in capsys.readouterr().err
+
+    def test_paths_required(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that lint without paths or a list is an argument error."""
+        assert self.run_main(["lint"]) == 2
+        assert "required: files" in capsys.readouterr().err
+
+
+class TestCLIWatch:
+    """Test lint --watch."""
+
+    BROKEN = "┌────┐\n│Test│\n└───┘\n"
+    GOOD = "┌────┐\n│Test│\n└────┘\n"
+
+    @staticmethod
+    def touch(path: Path, text: str) -> None:
+        """Rewrite a file with a later mtime, whatever the timestamp resolution."""
+        mtime = path.stat().st_mtime_ns if path.exists() else time.time_ns()
+        path.write_text(text)
+        os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+    def test_relints_changed_files(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that edits print introduced and resolved issues until interrupted."""
+        from ascii_guard.cli import watch_lint
+        from ascii_guard.config import ConfigResolver
+
+        bad, good = tmp_path / "bad.md", tmp_path / "good.md"
+        bad.write_text(self.BROKEN)
+        good.write_text(self.GOOD)
+        directory_mtime = tmp_path.stat().st_mtime_ns
+        outputs: list[str] = []
+
+        def edit_fix_bad() -> None:
+            self.touch(bad, "# Fixed\n" + self.GOOD)
+
+        def edit_break_good() -> None:
+            self.touch(good, "# Broken\n" + self.BROKEN)
+
+        def add_file() -> None:
+            (tmp_path / "new.md").write_text("# New\n" + self.BROKEN)
+            os.utime(tmp_path, ns=(directory_mtime + 10**9, directory_mtime + 10**9))
+
+        edits = [edit_fix_bad, edit_break_good, add_file]
+
+        def sleep(seconds: float) -> None:
+            captured = capsys.readouterr()
+            outputs.append(captured.out + captured.err)
+            if not edits:
+                raise KeyboardInterrupt
+            edits.pop(0)()
+
+        args = argparse.Namespace(files=[str(tmp_path)], quiet=False, watch=True)
+        with patch("ascii_guard.linter.lint_file", wraps=lint_file) as linted:
+            exit_code = watch_lint(args, None, ConfigResolver(), sleep=sleep)
+
+        outputs.append(capsys.readouterr().out)
+        assert exit_code == 1
+        assert "✗   Line 3" in outputs[0]  # Initial error in bad.md
+        assert "Resolved: Line 3" in outputs[1]  # bad.md fixed
+        assert "✗   Line 3" not in outputs[1]
+        assert str(good) in outputs[2]  # good.md broke
+        assert "✗   Line 4" in outputs[2]
+        assert str(tmp_path / "new.md") in outputs[3]
+        assert "Stopped watching" in outputs[4]
+        # Initial run, one file per edit, and only the new file on rescan
+        assert linted.call_count == 2 + 1 + 1 + 1
+
+    def test_invalid_config_keeps_watching(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that a config saved half-way through an edit does not end the session."""
+        from ascii_guard.cli import watch_lint
+        from ascii_guard.config import ConfigResolver
+
+        (tmp_path / ".git").mkdir()
+        config_file = tmp_path / ".ascii-guard.toml"
+        config_file.write_text("[files]\n")
+        (tmp_path / "bad.md").write_text(self.BROKEN)
+        outputs: list[str] = []
+        edits = [
+            lambda: self.touch(config_file, "[files]\nexclude = 5\n"),
+            lambda: self.touch(config_file, '[files]\nexclude = ["bad.md"]\n'),
+        ]
+
+        def sleep(seconds: float) -> None:
+            captured = capsys.readouterr()
+            outputs.append(captured.out + captured.err)
+            if not edits:
+                raise KeyboardInterrupt
+            edits.pop(0)()
+
+        args = argparse.Namespace(files=[str(tmp_path)], quiet=False, watch=True)
+        exit_code = watch_lint(args, None, ConfigResolver(), sleep=sleep)
+
+        outputs.append(capsys.readouterr().out)
+        assert f"Invalid config {config_file}" in outputs[1]
+        assert "Resolved: Line 3" not in outputs[1]  # Previous outcomes kept
+        assert "Resolved: Line 3" in outputs[2]  # bad.md excluded after the fix
+        assert "Stopped watching" in outputs[3]
+        assert exit_code == 0
+
+    @pytest.mark.parametrize(
+        ("files", "extra", "message"),
+        [
+            (["-"], {}, "cannot read from stdin"),
+            (["."], {"diff": "x.diff"}, "cannot be combined with --diff"),
+            (["."], {"format": "json"}, "only supports the text output format"),
+            (["."], {"stats": True}, "cannot be combined with --stats"),
+            (["."], {"memstats": True}, "--memstats"),
+        ],
+    )
+    def test_usage_errors(
+        self,
+        capsys: pytest.CaptureFixture[str],
+        files: list[str],
+        extra: dict[str, str],
+        message: str,
+    ) -> None:
+        """Test invalid combinations with --watch."""
+        args = argparse.Namespace(files=files, quiet=False, watch=True, **extra)
+
+        assert cmd_lint(args) == 1
+        assert message in capsys.readouterr().err
+
+
+class TestCLIStats:
+    """Test --stats and --profile."""
+
+    def run_main(self, argv: list[str]) -> int | str | None:
+        """Run the CLI with argv and return the exit code."""
+        with patch.object(sys, "argv", ["ascii-guard", *argv]), pytest.raises(SystemExit) as exc:
+            main()
+        return exc.value.code
+
+    def test_lint_stats_keep_stdout_parseable(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that stats go to stderr while JSON goes to stdout."""
+        (tmp_path / "bad.md").write_text("┌────┐\n│Stat│\n└───┘\n")
+        (tmp_path / "good.md").write_text("┌────┐\n│Stat│\n└────┘\n")
+
+        exit_code = self.run_main(
+            ["lint", str(tmp_path), "--format", "json", "--stats", "--stats-top", "1"]
+        )
+        captured = capsys.readouterr()
+
+        assert exit_code == 1
+        assert json.loads(captured.out)["summary"]["total_files"] == 2
+        assert "Files: 2 (0 cached)" in captured.err
+        assert "files/s" in captured.err
+        for phase in ("scan", "read", "detect", "validate", "output"):
+            assert f"    {phase} " in captured.err
+        assert captured.err.count("box(es)  ") == 1  # --stats-top 1
+
+    def test_fix_profile(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that --profile writes a pstats file for a fix run."""
+        (tmp_path / "bad.md").write_text("┌────┐\n│Prof│\n└───┘\n")
+        out = tmp_path / "fix.pstats"
+
+        assert self.run_main(["fix", str(tmp_path), "--profile", str(out), "--stats"]) == 0
+
+        assert pstats.Stats(str(out)).get_stats_profile().func_profiles
+        err = capsys.readouterr().err
+        assert f"Profile written to {out}" in err
+        assert "    fix " in err
+
+    def test_lint_memstats(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that --memstats reports memory to stderr and runs with one job."""
+        for name in ("a.md", "b.md", "c.md"):
+            (tmp_path / name).write_text("┌────┐\n│ Mem│\n└───┘\n" * 20)
+
+        exit_code = self.run_main(
+            ["lint", str(tmp_path), "--format", "json", "--memstats", "--stats-top", "2", "-j", "4"]
+        )
+        captured = capsys.readouterr()
+
+        assert exit_code == 1
+        assert json.loads(captured.out)["summary"]["total_files"] == 3
+        assert "Memory (tracemalloc):" in captured.err
+        assert "Stats:" not in captured.err  # Only with --stats
+        for phase in ("scan", "read", "detect", "validate"):
+            assert f"    {phase} " in captured.err
+        assert captured.err.count(f"  {tmp_path}") == 2  # --stats-top 2
+        assert "detector.py:" in captured.err
+
+
+class TestCLIBench:
+    """Test the bench command."""
+
+    def run_main(self, argv: list[str]) -> int | str | None:
+        """Run the CLI with argv and return the exit code."""
+        with patch.object(sys, "argv", ["ascii-guard", *argv]), pytest.raises(SystemExit) as exc:
+            main()
+        return exc.value.code
+
+    def test_bench_modifies_nothing(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test a JSON report, with files and caches on disk left alone."""
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        for i in range(3):
+            (docs / f"{i}.md").write_text("┌────┐\n│Test│\n└───┘\n")
+        (tmp_path / ".ascii-guard.toml").write_text("[performance]\ncache = true\n")
+        before = {path: path.read_bytes() for path in docs.iterdir()}
+        monkeypatch.chdir(tmp_path)
+
+        exit_code = self.run_main(
+            ["bench", "docs", "--repeat", "1", "--max-jobs", "2", "--format", "json"]
+        )
+        report = json.loads(capsys.readouterr().out)
+
+        assert exit_code == 0
+        assert [result["name"] for result in report["results"]][:3] == [
+            "serial",
+            "serial, no prefilter",
+            "2 jobs",
+        ]
+        assert report["results"][0]["stats"]["files"] == 3
+        assert "[performance]" in report["recommendation"]["toml"]
+        assert {path: path.read_bytes() for path in docs.iterdir()} == before
+        assert not (tmp_path / ".ascii-guard-cache").exists()
+
+    @pytest.mark.parametrize(("command", "pools"), [("bench", True), ("lint", False)])
+    def test_small_tree_pool(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+        command: str,
+        pools: bool,
+    ) -> None:
+        """Test that bench measures a pool for job runs lint would keep in one process."""
+        from ascii_guard import parallel
+
+        for i in range(3):
+            (tmp_path / f"{i}.md").write_text("┌────┐\n│Test│\n└────┘\n")
+        started: list[int] = []
+        original = parallel._PoolRunner.__init__
+
+        def record(runner: parallel._PoolRunner, *args: Any) -> None:
+            started.append(args[1])
+            original(runner, *args)
+
+        monkeypatch.setattr(parallel._PoolRunner, "__init__", record)
+        if command == "bench":
+            argv = ["bench", str(tmp_path), "--repeat", "1", "--max-jobs", "2"]
+        else:
+            argv = ["lint", str(tmp_path), "--jobs", "2"]
+
+        assert self.run_main(argv) == 0
+
+        out = capsys.readouterr().out
+        assert bool(started) is pools
+        assert set(started) <= {2}
+        assert ("forced to use a pool" in out) is pools
+
+    def test_bench_text(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test the text report."""
+        (tmp_path / "a.md").write_text("┌────┐\n│Test│\n└────┘\n")
+
+        assert self.run_main(["bench", str(tmp_path), "--repeat", "1", "--max-jobs", "1"]) == 0
+
+        out = capsys.readouterr().out
+        assert "serial, warm cache" in out
+        assert "Phases of the serial run" in out
+        assert "jobs = 1" in out
+
+    def test_bench_missing_path(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that missing paths and empty inputs fail."""
+        assert self.run_main(["bench", str(tmp_path / "missing")]) == 1
+        assert "Path not found" in capsys.readouterr().err
+        assert self.run_main(["bench", str(tmp_path)]) == 1
+        assert "No files found" in capsys.readouterr().out
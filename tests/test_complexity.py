@@ -0,0 +1,229 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Complexity regression tests: public operations must scale near-linearly.
+
+Each case runs an operation at input sizes N, 2N and 4N, fits the exponent k
+of time ~ size^k on a log-log scale, and fails when k exceeds MAX_EXPONENT.
+Linear work gives k ≈ 1 and quadratic work k ≈ 2, so the threshold leaves
+room for noise while still catching a rescan of the file per line or a loop
+over all boxes per box.
+
+CPU time of the process is measured, the best of REPEAT runs per size, and a
+case is measured again up to ATTEMPTS times before it fails, so a busy
+machine does not fail the suite.
+"""
+
+import gc
+import math
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from ascii_guard.config import Config
+from ascii_guard.detector import detect_boxes_in_lines, skipped_lines, split_lines
+from ascii_guard.fixer import fix_box
+from ascii_guard.linter import fix_file, lint_text
+from ascii_guard.models import Box
+from ascii_guard.scanner import scan_directory
+from ascii_guard.validator import validate_box
+from benchmarks.corpus import draw_box, generate_document, write_corpus
+
+MAX_EXPONENT = 1.4
+REPEAT = 3
+ATTEMPTS = 3
+
+# Builds the operation to time for input size n; building is not timed
+Case = Callable[[int, Path], Callable[[], object]]
+
+
+def best_time(operation: Callable[[], object]) -> float:
+    """Return the lowest CPU time of REPEAT runs, with garbage collection off."""
+    gc.collect()
+    gc.disable()
+    try:
+        times = []
+        for _ in range(REPEAT):
+            started = time.process_time()
+            operation()
+            times.append(time.process_time() - started)
+        return min(times)
+    finally:
+        gc.enable()
+
+
+def growth_exponent(case: Case, base: int, tmp_path: Path) -> float:
+    """Fit k in time ~ size^k over sizes base, 2 * base and 4 * base."""
+    sizes = [base, 2 * base, 4 * base]
+    operations = [case(size, tmp_path / str(size)) for size in sizes]
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(best_time(operation), 1e-9)) for operation in operations]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys, strict=True))
+    return covariance / sum((x - mean_x) ** 2 for x in xs)
+
+
+def document(diagrams: int, shapes: list[str] | None = None, broken: float = 0.0) -> str:
+    """Return a generated document of every shape (or the given ones)."""
+    if shapes is None:
+        return generate_document(diagrams, seed=1, broken=broken).text
+    return generate_document(diagrams, shapes, seed=1, broken=broken).text
+
+
+def tall_box(rows: int, broken: bool = False) -> Box:
+    """Return a box with the given number of content rows."""
+    lines = draw_box(30, [f"row {i}" for i in range(rows)])
+    if broken:
+        lines[-1] = lines[-1][:-2] + lines[-1][-1]
+    return Box(0, len(lines) - 1, 0, len(lines[0]) - 1, lines, "tall.md")
+
+
+def wide_table(columns: int) -> Box:
+    """Return a table with the given number of columns and a short bottom border."""
+    cells = ["──────"] * columns
+    row = "│" + "│".join([" cell "] * columns) + "│"
+    lines = [
+        "┌" + "┬".join(cells) + "┐",
+        row,
+        "├" + "┼".join(cells) + "┤",
+        row,
+        "└" + "┴".join(cells)[:-1] + "┘",
+    ]
+    return Box(0, len(lines) - 1, 0, len(lines[0]) - 1, lines, "wide.md")
+
+
+def box_pairs(pairs: int) -> bytes:
+    """Return pairs of side-by-side boxes that both need fixing, so fixes merge."""
+    return ("┌────┐  ┌────┐\n│ a  │  │ b  │\n└───┘   └───┘\n\n" * pairs).encode()
+
+
+def detect_mixed(n: int, _: Path) -> Callable[[], object]:
+    """Detect boxes in a document of n diagrams of every shape."""
+    lines = split_lines(document(n))
+    return lambda: detect_boxes_in_lines(lines)
+
+
+def detect_unclosed(n: int, _: Path) -> Callable[[], object]:
+    """Detect boxes in n lines that each open a box that never closes."""
+    lines = ["┌───┐ note"] * n
+    return lambda: detect_boxes_in_lines(lines)
+
+
+def skip_fences_and_markers(n: int, _: Path) -> Callable[[], object]:
+    """Mark skipped lines of n fenced and ignored diagrams."""
+    lines = split_lines(document(n, ["fenced", "ignored"]))
+    return lambda: skipped_lines(lines, exclude_code_blocks=True)
+
+
+def validate_tall(n: int, _: Path) -> Callable[[], object]:
+    """Validate a box of n rows."""
+    box = tall_box(n)
+    return lambda: validate_box(box)
+
+
+def validate_wide(n: int, _: Path) -> Callable[[], object]:
+    """Validate a table of n columns."""
+    box = wide_table(n)
+    return lambda: validate_box(box)
+
+
+def fix_tall(n: int, _: Path) -> Callable[[], object]:
+    """Fix a broken box of n rows."""
+    box = tall_box(n, broken=True)
+    return lambda: fix_box(box)
+
+
+def fix_wide(n: int, _: Path) -> Callable[[], object]:
+    """Fix a broken table of n columns."""
+    box = wide_table(n)
+    return lambda: fix_box(box)
+
+
+def lint_mixed(n: int, _: Path) -> Callable[[], object]:
+    """Lint a document of n diagrams, half of them broken."""
+    text = document(n, broken=0.5)
+    return lambda: lint_text(text)
+
+
+def fix_data(data: bytes) -> Callable[[], object]:
+    """Return a dry-run fix of in-memory content."""
+    return lambda: fix_file("doc.md", dry_run=True, data=data)
+
+
+def fix_mixed(n: int, _: Path) -> Callable[[], object]:
+    """Fix a document of n diagrams, half of them broken."""
+    return fix_data(document(n, broken=0.5).encode())
+
+
+def fix_nested(n: int, _: Path) -> Callable[[], object]:
+    """Fix a document of n valid nested diagrams, which must be left alone."""
+    return fix_data(document(n, ["nested"]).encode())
+
+
+def fix_pairs(n: int, _: Path) -> Callable[[], object]:
+    """Fix n pairs of broken side-by-side boxes, whose fixes are merged per line."""
+    return fix_data(box_pairs(n))
+
+
+def scan_tree(n: int, root: Path) -> Callable[[], object]:
+    """Scan a tree of n generated files."""
+    write_corpus(root, files=n, diagrams=1)
+    config = Config()
+    return lambda: scan_directory(root, config)
+
+
+# Operation builder and base size N, chosen so N takes a few milliseconds
+CASES: dict[str, tuple[Case, int]] = {
+    "detect_mixed": (detect_mixed, 200),
+    "detect_unclosed_corners": (detect_unclosed, 4000),
+    "skipped_lines_fences_and_markers": (skip_fences_and_markers, 1000),
+    "validate_tall_box": (validate_tall, 4000),
+    "validate_wide_table": (validate_wide, 400),
+    "fix_tall_box": (fix_tall, 2000),
+    "fix_wide_table": (fix_wide, 400),
+    "lint_mixed": (lint_mixed, 200),
+    "fix_mixed": (fix_mixed, 200),
+    "fix_nested": (fix_nested, 200),
+    "fix_merged_side_by_side": (fix_pairs, 250),
+    "scan_directory": (scan_tree, 200),
+}
+
+
+class TestScaling:
+    """Test that operations scale near-linearly with input size."""
+
+    @pytest.mark.parametrize("name", CASES)
+    def test_near_linear(self, name: str, tmp_path: Path) -> None:
+        """Test that the fitted growth exponent stays below MAX_EXPONENT."""
+        case, base = CASES[name]
+        exponents = []
+        for attempt in range(ATTEMPTS):
+            exponents.append(growth_exponent(case, base, tmp_path / str(attempt)))
+            if exponents[-1] <= MAX_EXPONENT:
+                return
+        pytest.fail(f"{name} grows like size^{min(exponents):.2f} (limit {MAX_EXPONENT})")
+
+    def test_exponent_fit(self, tmp_path: Path) -> None:
+        """Test that the fit tells linear from quadratic work."""
+
+        def linear(n: int, _: Path) -> Callable[[], object]:
+            return lambda: sum(range(n * 1000))
+
+        def quadratic(n: int, _: Path) -> Callable[[], object]:
+            return lambda: [sum(range(n)) for _ in range(n)]
+
+        assert growth_exponent(linear, 100, tmp_path) < MAX_EXPONENT
+        assert growth_exponent(quadratic, 300, tmp_path) > MAX_EXPONENT
@@ -14,6 +14,7 @@
 
 """Tests for configuration file parsing."""
 
+import os
 import sys
 import tempfile
 from pathlib import Path
@@ -23,6 +24,8 @@ import pytest
 from ascii_guard.config import (
     DEFAULT_EXCLUDES,
     Config,
+    ConfigResolver,
+    PerformanceConfig,
     find_config_file,
     load_config,
 )
@@ -150,6 +153,125 @@ class TestConfigFileDiscovery:
             assert found.resolve() == (git_root / ".ascii-guard.toml").resolve()
 
 
+class TestConfigResolver:
+    """Test memoized per-directory config discovery."""
+
+    @pytest.fixture
+    def monorepo(self, tmp_path: Path) -> Path:
+        """Create a repo with a root config and one subproject config."""
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".ascii-guard.toml").write_text('[files]\nextensions = [".md"]\n')
+        (tmp_path / "app" / "docs").mkdir(parents=True)
+        (tmp_path / "lib" / "src").mkdir(parents=True)
+        (tmp_path / "lib" / ".ascii-guard.toml").write_text('[files]\nextensions = [".txt"]\n')
+        return tmp_path
+
+    def test_nearest_config_applies(self, monorepo: Path) -> None:
+        """Test that each directory uses the nearest config file."""
+        resolver = ConfigResolver()
+
+        assert resolver.find_config_file(monorepo / "app" / "docs") == (
+            monorepo / ".ascii-guard.toml"
+        )
+        assert resolver.find_config_file(monorepo / "lib" / "src") == (
+            monorepo / "lib" / ".ascii-guard.toml"
+        )
+        assert resolver.config_for(monorepo / "app" / "docs" / "a.md").extensions == [".md"]
+        assert resolver.config_for(monorepo / "lib" / "src" / "b.txt").extensions == [".txt"]
+
+    def test_resolve_returns_config_directory(self, monorepo: Path) -> None:
+        """Test that resolve reports where the config came from."""
+        config, config_dir = ConfigResolver().resolve(monorepo / "lib" / "src")
+
+        assert config.extensions == [".txt"]
+        assert config_dir == monorepo / "lib"
+
+    def test_default_when_no_config(self, tmp_path: Path) -> None:
+        """Test that the default config applies without a config file."""
+        (tmp_path / ".git").mkdir()
+        default = Config(max_file_size=3)
+        resolver = ConfigResolver(default)
+
+        assert resolver.resolve(tmp_path) == (default, None)
+
+    def test_stops_at_git_root(self, tmp_path: Path) -> None:
+        """Test that configs above the git root are not used."""
+        (tmp_path / ".ascii-guard.toml").write_text("[files]\n")
+        repo = tmp_path / "repo"
+        (repo / ".git").mkdir(parents=True)
+
+        assert ConfigResolver().find_config_file(repo) is None
+
+    def test_lookups_are_memoized(self, monorepo: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that each directory is probed and each config parsed once."""
+        from ascii_guard import config as config_module
+
+        probed: list[Path] = []
+        parsed: list[Path] = []
+        original_probe = config_module._config_in_directory
+        original_load = config_module.load_config
+
+        def probe(directory: Path) -> Path | None:
+            probed.append(directory)
+            return original_probe(directory)
+
+        def load(path: Path) -> Config:
+            parsed.append(path)
+            return original_load(path)
+
+        monkeypatch.setattr(config_module, "_config_in_directory", probe)
+        monkeypatch.setattr(config_module, "load_config", load)
+
+        resolver = ConfigResolver()
+        for _ in range(100):
+            resolver.config_for(monorepo / "app" / "docs" / "a.md")
+            resolver.config_for(monorepo / "app" / "b.md")
+
+        assert sorted(probed) == sorted([monorepo, monorepo / "app", monorepo / "app" / "docs"])
+        assert parsed == [monorepo / ".ascii-guard.toml"]
+
+    def test_refresh_picks_up_changes(self, monorepo: Path) -> None:
+        """Test that refresh reloads edited configs and finds new and deleted ones."""
+        resolver = ConfigResolver()
+        docs = monorepo / "app" / "docs"
+        assert resolver.config_for(docs / "a.md").extensions == [".md"]
+        assert resolver.config_for(monorepo / "lib" / "b.txt").extensions == [".txt"]
+
+        root_config = monorepo / ".ascii-guard.toml"
+        root_config.write_text('[files]\nextensions = [".rst"]\n')
+        stat = root_config.stat()
+        os.utime(root_config, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        (monorepo / "lib" / ".ascii-guard.toml").unlink()
+        (monorepo / "app" / ".ascii-guard.toml").write_text('[files]\nextensions = [".adoc"]\n')
+
+        assert resolver.config_for(docs / "a.md").extensions == [".md"]  # Memoized
+        resolver.refresh()
+
+        assert resolver.config_for(docs / "a.md").extensions == [".adoc"]
+        assert resolver.config_for(monorepo / "lib" / "b.txt").extensions == [".rst"]
+
+    def test_refresh_keeps_unchanged_configs(
+        self, monorepo: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that unchanged config files are not parsed again."""
+        from ascii_guard import config as config_module
+
+        parsed: list[Path] = []
+        original_load = config_module.load_config
+
+        def load(path: Path) -> Config:
+            parsed.append(path)
+            return original_load(path)
+
+        monkeypatch.setattr(config_module, "load_config", load)
+        resolver = ConfigResolver()
+        resolver.config_for(monorepo / "app" / "a.md")
+        resolver.refresh()
+        resolver.config_for(monorepo / "app" / "a.md")
+
+        assert parsed == [monorepo / ".ascii-guard.toml"]
+
+
 class TestConfigLoading:
     """Test configuration file loading and parsing."""
 
@@ -318,8 +440,9 @@ unknown_key = "value"
             assert config is not None
 
             captured = capsys.readouterr()
-            assert "Warning" in captured.out
-            assert "unknown_key" in captured.out
+            assert "Warning" in captured.err
+            assert captured.out == ""
+            assert "unknown_key" in captured.err
 
     def test_load_config_warns_unknown_sections(self, capsys) -> None:  # type: ignore[no-untyped-def]
         """Test that unknown sections produce warnings."""
@@ -340,8 +463,123 @@ key = "value"
             assert config is not None
 
             captured = capsys.readouterr()
-            assert "Warning" in captured.out
-            assert "unknown_section" in captured.out
+            assert "Warning" in captured.err
+            assert captured.out == ""
+            assert "unknown_section" in captured.err
+
+
+class TestPerformanceConfig:
+    """Test the [performance] section."""
+
+    def write_config(self, tmp_path: Path, body: str) -> Path:
+        """Write a config file with the given [performance] body."""
+        config_file = tmp_path / ".ascii-guard.toml"
+        config_file.write_text(f"[performance]\n{body}\n")
+        return config_file
+
+    def test_defaults(self) -> None:
+        """Test that configs without [performance] get the defaults."""
+        assert Config().performance == PerformanceConfig()
+        assert PerformanceConfig().prefilter is True
+        assert PerformanceConfig().cache is False
+
+    def test_all_keys(self, tmp_path: Path) -> None:
+        """Test that every documented key is parsed."""
+        config_file = self.write_config(
+            tmp_path,
+            """
+jobs = 4
+backend = "thread"
+cache = true
+cache_dir = "build/lint-cache"
+cache_max_size = 128
+max_box_height = 200
+file_timeout = 2.5
+prefilter = false
+prefetch = 16
+""",
+        )
+
+        performance = load_config(config_file).performance
+
+        assert performance == PerformanceConfig(
+            jobs=4,
+            backend="thread",
+            cache=True,
+            cache_dir=str(tmp_path.resolve() / "build/lint-cache"),
+            cache_max_size=128,
+            max_box_height=200,
+            file_timeout=2.5,
+            prefilter=False,
+            prefetch=16,
+        )
+
+    def test_integer_timeout_accepted(self, tmp_path: Path) -> None:
+        """Test that file_timeout accepts integers."""
+        config_file = self.write_config(tmp_path, "file_timeout = 3")
+        assert load_config(config_file).performance.file_timeout == 3.0
+
+    def test_cache_dir_relative_to_config_file(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a relative cache_dir does not depend on the working directory."""
+        config_file = self.write_config(tmp_path, 'cache_dir = "cache"')
+        elsewhere = tmp_path / "sub"
+        elsewhere.mkdir()
+
+        monkeypatch.chdir(elsewhere)
+        from_subdirectory = load_config(config_file).performance.cache_dir
+        monkeypatch.chdir(tmp_path)
+        from_config_directory = load_config(".ascii-guard.toml").performance.cache_dir
+
+        assert from_subdirectory == from_config_directory == str(tmp_path.resolve() / "cache")
+
+    def test_absolute_cache_dir_kept(self, tmp_path: Path) -> None:
+        """Test that an absolute cache_dir is used as is."""
+        cache_dir = tmp_path / "elsewhere"
+        config_file = self.write_config(tmp_path, f"cache_dir = {str(cache_dir)!r}")
+        assert load_config(config_file).performance.cache_dir == str(cache_dir)
+
+    @pytest.mark.parametrize(
+        ("body", "message"),
+        [
+            ("jobs = -1", "jobs must be non-negative"),
+            ('jobs = "4"', "jobs must be an integer"),
+            ("prefetch = true", "prefetch must be an integer"),
+            ("max_box_height = 1.5", "max_box_height must be an integer"),
+            ('backend = "gpu"', "backend must be one of process, thread, serial"),
+            ("cache = 1", "cache must be a boolean"),
+            ('prefilter = "yes"', "prefilter must be a boolean"),
+            ('cache_dir = ""', "cache_dir must be a non-empty string"),
+            ("file_timeout = -0.5", "file_timeout must be non-negative"),
+            ('file_timeout = "1s"', "file_timeout must be a number"),
+            ("file_timeout = nan", "file_timeout must be a finite number"),
+            ("file_timeout = inf", "file_timeout must be a finite number"),
+        ],
+    )
+    def test_invalid_values(self, tmp_path: Path, body: str, message: str) -> None:
+        """Test that invalid values raise ValueError naming the key."""
+        config_file = self.write_config(tmp_path, body)
+        with pytest.raises(ValueError, match=message):
+            load_config(config_file)
+
+    def test_not_a_table(self, tmp_path: Path) -> None:
+        """Test that a non-table [performance] value raises ValueError."""
+        config_file = tmp_path / ".ascii-guard.toml"
+        config_file.write_text('performance = "fast"\n')
+        with pytest.raises(ValueError, match=r"\[performance\] must be a table"):
+            load_config(config_file)
+
+    def test_warns_unknown_keys(self, tmp_path: Path, capsys) -> None:  # type: ignore[no-untyped-def]
+        """Test that unknown keys in [performance] produce warnings."""
+        config_file = self.write_config(tmp_path, "workers = 8")
+
+        config = load_config(config_file)
+
+        assert config.performance == PerformanceConfig()
+        captured = capsys.readouterr()
+        assert "[performance]" in captured.err
+        assert "workers" in captured.err
 
 
 class TestConfigEdgeCases:
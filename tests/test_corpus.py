@@ -0,0 +1,115 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the synthetic corpus generator (benchmarks/corpus.py).
+
+The generator reports the boxes and broken diagrams of each document, so
+these tests also check the detector, validator and fixer on every shape.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from ascii_guard.linter import fix_file, lint_text
+from benchmarks.__main__ import main
+from benchmarks.corpus import SHAPES, generate_document, write_corpus
+
+# Shapes whose broken diagrams are fixed back to the valid document
+FIXABLE_SHAPES = [shape for shape in SHAPES if shape != "ignored"]
+
+# Shapes that fix does not restore yet (docs/bugs/FIX_NESTED_AND_STYLED_BOXES.md):
+# heavy and double boxes are redrawn in light style, and nested right borders
+# are taken for leftover duplicates
+FIX_KNOWN_BUGS = {"boxes", "nested", "fenced"}
+
+
+class TestGenerateDocument:
+    """Test generated documents against the linter."""
+
+    def test_deterministic(self) -> None:
+        """Test that a seed always produces the same document."""
+        assert generate_document(50, seed=7) == generate_document(50, seed=7)
+        assert generate_document(50, seed=7).text != generate_document(50, seed=8).text
+
+    @pytest.mark.parametrize("shape", SHAPES)
+    def test_valid_shape_lints_clean(self, shape: str) -> None:
+        """Test that valid diagrams are detected completely and pass lint."""
+        document = generate_document(30, [shape], seed=1)
+        result = lint_text(document.text)
+
+        assert result.boxes_found == document.boxes
+        assert not result.errors
+        assert not result.warnings
+
+    @pytest.mark.parametrize("shape", SHAPES)
+    def test_broken_shape_reported(self, shape: str) -> None:
+        """Test that every broken diagram (outside ignore regions) has one error."""
+        document = generate_document(30, [shape], seed=1, broken=0.5)
+        result = lint_text(document.text)
+
+        assert result.boxes_found == document.boxes
+        assert len(result.errors) == document.broken
+        assert document.broken > 0 or shape == "ignored"
+
+    @pytest.mark.parametrize(
+        "shape",
+        [
+            pytest.param(
+                shape,
+                marks=pytest.mark.xfail(
+                    reason="docs/bugs/FIX_NESTED_AND_STYLED_BOXES.md", strict=True
+                ),
+            )
+            if shape in FIX_KNOWN_BUGS
+            else shape
+            for shape in FIXABLE_SHAPES
+        ],
+    )
+    def test_fix_restores_valid_document(self, shape: str, tmp_path: Path) -> None:
+        """Test that fixing a broken document yields the valid one with the same seed."""
+        valid = generate_document(30, [shape], seed=2)
+        broken = generate_document(30, [shape], seed=2, broken=1.0)
+        path = tmp_path / "doc.md"
+        path.write_text(broken.text, encoding="utf-8")
+
+        result = fix_file(path)
+
+        assert result.boxes_fixed == broken.broken == 30
+        assert path.read_text(encoding="utf-8") == valid.text
+
+    def test_unknown_shape(self) -> None:
+        """Test that unknown shapes are rejected."""
+        with pytest.raises(ValueError, match="spiral"):
+            generate_document(1, ["spiral"])
+
+
+class TestWriteCorpus:
+    """Test writing corpora to disk."""
+
+    def test_files_differ_and_are_spread(self, tmp_path: Path) -> None:
+        """Test that each file gets its own seed and directories stay small."""
+        paths = write_corpus(tmp_path, files=150, diagrams=2)
+
+        assert len(paths) == 150
+        assert {path.parent.name for path in paths} == {"part-000", "part-001"}
+        assert paths[0].read_text() != paths[1].read_text()
+
+    def test_command_line(self, tmp_path: Path) -> None:
+        """Test python -m benchmarks corpus."""
+        args = ["corpus", str(tmp_path), "--files", "2", "--shape", "table", "--broken", "1"]
+        assert main(args) == 0
+
+        text = (tmp_path / "part-000" / "doc-00001.md").read_text()
+        assert "┼" in text
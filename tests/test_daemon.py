@@ -0,0 +1,196 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the daemon and its thin client."""
+
+import io
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from ascii_guard import daemon
+from ascii_guard.cli import WarmState
+from ascii_guard.client import forward, request
+from tests.conftest import BROKEN_BOX, GOOD_BOX
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+@pytest.fixture
+def socket_path() -> Iterator[Path]:
+    """Return a socket path short enough for AF_UNIX (tmp_path can be too long)."""
+    directory = tempfile.mkdtemp(prefix="ag-", dir="/tmp")
+    yield Path(directory) / "d.sock"
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def server(socket_path: Path) -> Iterator[Path]:
+    """Run a daemon in a background thread; stop it afterwards."""
+    thread = threading.Thread(target=daemon.serve, args=(socket_path, 30), daemon=True)
+    thread.start()
+    for _ in range(200):
+        if daemon.is_running(socket_path):
+            break
+        time.sleep(0.01)
+    yield socket_path
+    if daemon.is_running(socket_path):
+        daemon.stop(socket_path)
+    thread.join(timeout=10)
+
+
+class TestDaemon:
+    """Test serving forwarded commands."""
+
+    def test_lint_matches_local_run(
+        self, server: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that forwarded lint prints the same output and exit code."""
+        from ascii_guard.cli import main
+
+        (tmp_path / "bad.md").write_text(BROKEN_BOX)
+
+        exit_code = forward(["lint", str(tmp_path)], server)
+        remote = capsys.readouterr()
+
+        sys.argv = ["ascii-guard", "lint", str(tmp_path)]
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+        local = capsys.readouterr()
+
+        assert exit_code == exc_info.value.code == 1
+        assert remote.out == local.out
+        assert remote.err == local.err
+
+    def test_fix_stdin(
+        self,
+        server: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsysbinary: pytest.CaptureFixture[bytes],
+    ) -> None:
+        """Test that stdin content is forwarded and fixed text returned."""
+        stdin = io.TextIOWrapper(io.BytesIO(BROKEN_BOX.encode()), encoding="utf-8")
+        monkeypatch.setattr(sys, "stdin", stdin)
+
+        assert forward(["fix", "-"], server) == 0
+        assert capsysbinary.readouterr().out.decode() == GOOD_BOX
+
+    def test_files_from_stdin(
+        self,
+        server: Path,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test that a path list read from stdin is forwarded."""
+        (tmp_path / "bad.md").write_text(BROKEN_BOX)
+        listing = f"{tmp_path / 'bad.md'}\0".encode()
+        stdin = io.TextIOWrapper(io.BytesIO(listing), encoding="utf-8")
+        monkeypatch.setattr(sys, "stdin", stdin)
+
+        assert forward(["lint", "--files-from=-", "-0"], server) == 1
+        assert "bad.md" in capsys.readouterr().out
+
+    def test_config_hot_reload(
+        self, server: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that an edited config applies to the next request."""
+        (tmp_path / ".git").mkdir()
+        (tmp_path / "notes.txt").write_text(BROKEN_BOX)
+        config = tmp_path / ".ascii-guard.toml"
+        config.write_text('[files]\nextensions = [".md"]\n')
+
+        assert forward(["lint", str(tmp_path)], server) == 0
+        capsys.readouterr()
+
+        config.write_text('[files]\nextensions = [".md", ".txt"]\n')
+        os.utime(config, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+
+        assert forward(["lint", str(tmp_path)], server) == 1
+        assert "notes.txt" in capsys.readouterr().out
+
+    def test_argument_errors(self, server: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that argparse errors come back as exit code 2 with usage."""
+        assert forward(["lint", "--no-such-option", "x"], server) == 2
+        assert "unrecognized arguments" in capsys.readouterr().err
+
+    def test_ping_and_stop(self, server: Path) -> None:
+        """Test status and shutdown requests."""
+        assert request(server, {"command": "ping"})["pid"] == os.getpid()
+
+        daemon.stop(server)
+
+        for _ in range(200):
+            if not server.exists():
+                break
+            time.sleep(0.01)
+        assert not daemon.is_running(server)
+        assert not server.exists()
+
+    def test_refuses_second_daemon(self, server: Path) -> None:
+        """Test that a second daemon does not steal the socket."""
+        with pytest.raises(daemon.DaemonError, match="already listening"):
+            daemon.serve(server)
+
+    def test_idle_timeout(self, socket_path: Path) -> None:
+        """Test that the daemon exits and cleans up when idle."""
+        started = time.monotonic()
+        daemon.serve(socket_path, idle_timeout=0.2)
+
+        assert time.monotonic() - started < 5
+        assert not socket_path.exists()
+
+    def test_version_mismatch_is_refused(self) -> None:
+        """Test that requests from another version are not served."""
+        response = daemon.run_request({"version": "0.0.0", "argv": ["lint", "."]}, WarmState())
+        assert "error" in response
+
+
+class TestClient:
+    """Test the client without a daemon."""
+
+    def test_no_daemon_runs_locally(self, socket_path: Path) -> None:
+        """Test that forward declines when nothing listens."""
+        assert forward(["lint", "."], socket_path) is None
+
+    @pytest.mark.parametrize("problem", ["mode", "owner"])
+    def test_foreign_socket_is_not_used(
+        self, server: Path, problem: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a socket others can reach, or another user owns, is refused."""
+        served: list[dict[str, object]] = []
+        monkeypatch.setattr(daemon, "run_request", lambda *args: served.append(args[0]) or {})
+        if problem == "mode":
+            os.chmod(server, 0o666)
+        else:
+            monkeypatch.setattr(os, "getuid", lambda: os.geteuid() + 1)
+
+        assert forward(["lint", "."], server) is None
+        assert served == []
+        monkeypatch.undo()
+        os.chmod(server, 0o600)
+
+    def test_local_commands_are_not_forwarded(self, server: Path) -> None:
+        """Test that commands other than lint and fix never leave the client."""
+        assert forward(["--version"], server) is None
+        assert forward(["daemon", "--status"], server) is None
+        assert forward(["lint", "--watch", "."], server) is None
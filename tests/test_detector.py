@@ -22,7 +22,12 @@ from pathlib import Path
 
 import pytest
 
-from ascii_guard.detector import detect_boxes
+from ascii_guard.detector import (
+    detect_boxes,
+    is_in_code_fence,
+    is_in_ignore_region,
+    skipped_lines,
+)
 
 
 class TestBoxDetection:
@@ -284,6 +289,27 @@ class TestDetectorEdgeCases:
         line = "This is just plain text"
         assert not has_box_drawing_chars(line)
 
+    def test_split_lines_matches_readlines(self, tmp_path: Path) -> None:
+        """Test that split_lines matches text-mode readlines()."""
+        from ascii_guard.detector import split_lines
+
+        samples = ["", "a", "a\n", "a\nb", "a\r\nb\r\n", "a\rb\n\n", "\n\n"]
+        for sample in samples:
+            test_file = tmp_path / "sample.txt"
+            test_file.write_bytes(sample.encode())
+            with open(test_file, encoding="utf-8") as f:
+                expected = [line.rstrip("\n") for line in f.readlines()]
+            assert split_lines(sample) == expected, repr(sample)
+
+    def test_might_contain_boxes(self) -> None:
+        """Test the top-left corner prefilter."""
+        from ascii_guard.detector import might_contain_boxes
+
+        assert might_contain_boxes("text ┌──┐")
+        assert might_contain_boxes("╔══╗")
+        assert might_contain_boxes("┏━━┓")
+        assert not might_contain_boxes("│ ─ └ ┘ plain text")
+
     def test_detect_boxes_file_not_found(self, tmp_path: Path) -> None:
         """Test detecting boxes when file doesn't exist."""
         non_existent = tmp_path / "does_not_exist.txt"
@@ -561,3 +587,34 @@ class TestIgnoreMarkers:
         boxes = detect_boxes(str(test_file), exclude_code_blocks=True)
         assert len(boxes) == 1
         assert boxes[0].lines[1] == "│ Detected     │"
+
+
+class TestSkippedLines:
+    """Test the single-pass skip mask used by detection."""
+
+    def test_matches_per_line_checks(self) -> None:
+        """Test that the mask equals is_in_ignore_region/is_in_code_fence per line."""
+        lines = [
+            "text",
+            "```",
+            "┌──┐",
+            "```",
+            "<!-- ascii-guard-ignore-next -->",
+            "",
+            "┌──┐",
+            "after",
+            "  <!-- ascii-guard-ignore -->",
+            "ignored",
+            "<!-- ascii-guard-ignore-end -->",
+            "```python",
+            "<!-- ascii-guard-ignore -->",
+            "```",
+            "tail",
+        ]
+        for exclude_code_blocks in (False, True):
+            expected = [
+                (exclude_code_blocks and is_in_code_fence(i, lines))
+                or is_in_ignore_region(i, lines)
+                for i in range(len(lines))
+            ]
+            assert skipped_lines(lines, exclude_code_blocks) == expected
@@ -17,12 +17,15 @@
 Tests the high-level lint_file and fix_file functions.
 """
 
+import os
+import stat
 import sys
 from pathlib import Path
 
 import pytest
 
-from ascii_guard.linter import fix_file, lint_file
+from ascii_guard.config import PerformanceConfig
+from ascii_guard.linter import fix_file, lint_file, lint_text, write_lines
 
 
 class TestLintFile:
@@ -87,6 +90,60 @@ class TestLintFile:
             lint_file("/nonexistent/file.txt")
 
 
+class TestPreReadContent:
+    """Test linting and fixing from content that has already been read."""
+
+    @pytest.fixture
+    def fixtures_dir(self) -> Path:
+        """Return the path to test fixtures directory."""
+        return Path(__file__).parent / "fixtures"
+
+    def test_lint_file_with_data_does_not_reopen(self, tmp_path: Path) -> None:
+        """Test that lint_file uses the supplied buffer instead of the file."""
+        missing = tmp_path / "missing.txt"
+        data = "┌────┐\n│Test│\n└───┘\n".encode()
+
+        result = lint_file(missing, data=data)
+
+        assert result.file_path == str(missing)
+        assert result.boxes_found == 1
+        assert result.has_errors
+
+    def test_lint_file_with_data_matches_disk(self, fixtures_dir: Path) -> None:
+        """Test that linting a buffer gives the same result as reading the file."""
+        for name in ("perfect_box.txt", "broken_box.txt", "multiple_boxes.md"):
+            test_file = fixtures_dir / name
+            from_disk = lint_file(test_file)
+            from_data = lint_file(test_file, data=test_file.read_bytes())
+            assert from_data == from_disk
+
+    def test_lint_text_without_box_chars(self) -> None:
+        """Test that text without corners is reported clean without detection."""
+        result = lint_text("Just prose with │ and ─ but no corners\n", "notes.md")
+
+        assert result.boxes_found == 0
+        assert result.is_clean
+        assert result.file_path == "notes.md"
+
+    def test_lint_text_crlf_line_endings(self) -> None:
+        """Test that CRLF content is split like text-mode reads."""
+        result = lint_text("┌────┐\r\n│Test│\r\n└────┘\r\n")
+
+        assert result.boxes_found == 1
+        assert result.is_clean
+
+    def test_fix_file_with_data(self, tmp_path: Path) -> None:
+        """Test that fix_file fixes from the supplied buffer."""
+        test_file = tmp_path / "test.txt"
+        content = "┌────┐\n│Test│\n└───┘\n"
+        test_file.write_text(content)
+
+        result = fix_file(test_file, dry_run=True, data=content.encode())
+
+        assert result.boxes_fixed == 1
+        assert result.lines[2] == "└────┘"
+
+
 class TestFixFile:
     """Test suite for file fixing."""
 
@@ -416,3 +473,149 @@ class TestLinterEdgeCases:
         # Verify file was actually written
         content = test_file.read_text()
         assert "│ Content  │" in content or "│ Content │" in content
+
+
+class TestPerformanceSettings:
+    """Test that [performance] settings reach the linter."""
+
+    TALL_BOX = "┌────┐\n" + "│ ok │\n" * 10 + "└────┘\n"
+
+    def test_max_box_height_limits_detection(self) -> None:
+        """Test that boxes taller than max_box_height are not detected."""
+        assert lint_text(self.TALL_BOX).boxes_found == 1
+        assert (
+            lint_text(self.TALL_BOX, performance=PerformanceConfig(max_box_height=12)).boxes_found
+            == 1
+        )
+        assert (
+            lint_text(self.TALL_BOX, performance=PerformanceConfig(max_box_height=11)).boxes_found
+            == 0
+        )
+
+    def test_max_box_height_applies_to_fix(self, tmp_path: Path) -> None:
+        """Test that fix_file honours max_box_height."""
+        test_file = tmp_path / "tall.md"
+        test_file.write_text("┌────┐\n│ ok\n│ ok │\n└────┘\n")
+
+        result = fix_file(test_file, dry_run=True, performance=PerformanceConfig(max_box_height=3))
+
+        assert result.boxes_fixed == 0
+
+    def test_file_timeout_raises(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a file exceeding its time budget raises TimeoutError."""
+        clock = iter(range(0, 1000, 10))
+        monkeypatch.setattr("ascii_guard.linter.time.monotonic", lambda: next(clock))
+
+        with pytest.raises(TimeoutError, match="time budget"):
+            lint_text(self.TALL_BOX, performance=PerformanceConfig(file_timeout=1))
+
+    def test_file_timeout_leaves_file_untouched(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that fix_file writes nothing when the budget runs out."""
+        test_file = tmp_path / "box.md"
+        original = "┌────┐\n│ ok\n└────┘\n"
+        test_file.write_text(original)
+        clock = iter(range(0, 1000, 10))
+        monkeypatch.setattr("ascii_guard.linter.time.monotonic", lambda: next(clock))
+
+        with pytest.raises(TimeoutError):
+            fix_file(test_file, performance=PerformanceConfig(file_timeout=1))
+
+        assert test_file.read_text() == original
+
+    def test_prefilter_can_be_disabled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that prefilter=False runs detection on every file."""
+        calls: list[int] = []
+
+        def detect(lines, *args, **kwargs):  # type: ignore[no-untyped-def]
+            calls.append(len(lines))
+            return []
+
+        monkeypatch.setattr("ascii_guard.linter.detect_boxes_in_lines", detect)
+
+        lint_text("no boxes here\n")
+        assert calls == []
+        lint_text("no boxes here\n", performance=PerformanceConfig(prefilter=False))
+        assert calls == [1]
+
+
+class TestWriteLines:
+    """Test safe file replacement used by fix_file."""
+
+    def test_replaces_content_and_keeps_mode(self, tmp_path: Path) -> None:
+        """Test that content is replaced and permissions are kept."""
+        target = tmp_path / "doc.md"
+        target.write_text("old\n")
+        target.chmod(0o640)
+
+        write_lines(target, ["new", "content"])
+
+        assert target.read_text() == "new\ncontent\n"
+        assert stat.S_IMODE(target.stat().st_mode) == 0o640
+        assert [p.name for p in tmp_path.iterdir()] == ["doc.md"]
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Symlinks need privileges on Windows")
+    def test_writes_through_symlinks(self, tmp_path: Path) -> None:
+        """Test that a symlinked file is updated, not replaced by a copy."""
+        target = tmp_path / "real.md"
+        target.write_text("old\n")
+        link = tmp_path / "link.md"
+        link.symlink_to(target)
+
+        write_lines(link, ["new"])
+
+        assert link.is_symlink()
+        assert target.read_text() == "new\n"
+
+    def test_hard_links_see_the_change(self, tmp_path: Path) -> None:
+        """Test that every hard link of a fixed file sees the new content."""
+        target = tmp_path / "a.md"
+        target.write_text("old\n")
+        other = tmp_path / "b.md"
+        os.link(target, other)
+
+        write_lines(target, ["new"])
+
+        assert other.read_text() == "new\n"
+
+
+class TestLineRanges:
+    """Test validating only boxes touched by changed lines."""
+
+    TWO_BROKEN_BOXES = "┌────┐\n│One │\n└───┘\n\ntext\n\n┌────┐\n│Two │\n└───┘\n"
+
+    def test_only_touched_boxes_report_errors(self) -> None:
+        """Test that errors come only from boxes overlapping a range."""
+        full = lint_text(self.TWO_BROKEN_BOXES)
+        second = lint_text(self.TWO_BROKEN_BOXES, line_ranges=[(7, 7)])
+
+        assert full.has_errors
+        assert second.errors == [e for e in full.errors if e.line >= 6]
+        assert second.boxes_found == 2
+
+    def test_untouched_file_is_clean(self) -> None:
+        """Test that ranges outside every box validate nothing."""
+        result = lint_text(self.TWO_BROKEN_BOXES, line_ranges=[(4, 4)])
+        assert result.is_clean
+
+    def test_box_edges_count_as_touched(self) -> None:
+        """Test that ranges touching the border lines select the box."""
+        assert lint_text(self.TWO_BROKEN_BOXES, line_ranges=[(2, 3)]).has_errors
+        assert lint_text(self.TWO_BROKEN_BOXES, line_ranges=[(5, 6)]).has_errors
+
+    def test_validate_box_not_called_for_untouched(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that untouched boxes are not validated at all."""
+        from ascii_guard import linter
+
+        validated: list[int] = []
+        original = linter.validate_box
+
+        def recording(box):  # type: ignore[no-untyped-def]
+            validated.append(box.top_line)
+            return original(box)
+
+        monkeypatch.setattr(linter, "validate_box", recording)
+        lint_text(self.TWO_BROKEN_BOXES, line_ranges=[(0, 0)])
+
+        assert validated == [0]
@@ -0,0 +1,361 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the Language Server Protocol server."""
+
+import io
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from ascii_guard.lsp import (
+    INVALID_PARAMS,
+    MESSAGE_ERROR,
+    METHOD_NOT_FOUND,
+    SERVER_NOT_INITIALIZED,
+    LanguageServer,
+    TextDocument,
+    read_message,
+    write_message,
+)
+from tests.conftest import BROKEN_BOX, GOOD_BOX
+
+URI = "untitled:doc.md"
+
+
+def frame(*messages: dict[str, Any]) -> bytes:
+    """Encode messages as a client would send them."""
+    stream = io.BytesIO()
+    for message in messages:
+        write_message(stream, message)
+    return stream.getvalue()
+
+
+def sent(server: LanguageServer) -> list[dict[str, Any]]:
+    """Return and clear the messages the server has written."""
+    assert isinstance(server.writer, io.BytesIO)
+    stream = io.BytesIO(server.writer.getvalue())
+    server.writer.seek(0)
+    server.writer.truncate()
+    messages = []
+    while (message := read_message(stream)) is not None:
+        messages.append(message)
+    return messages
+
+
+def position(line: int, character: int) -> dict[str, int]:
+    """Return an LSP position."""
+    return {"line": line, "character": character}
+
+
+@pytest.fixture
+def server() -> LanguageServer:
+    """Return an initialized server writing to memory."""
+    lsp = LanguageServer(io.BytesIO(), io.BytesIO())
+    lsp.dispatch({"jsonrpc": "2.0", "id": 0, "method": "initialize", "params": {}})
+    sent(lsp)
+    return lsp
+
+
+def open_document(server: LanguageServer, text: str, uri: str = URI) -> list[dict[str, Any]]:
+    """Open a document and return the published diagnostics."""
+    server.dispatch(
+        {
+            "jsonrpc": "2.0",
+            "method": "textDocument/didOpen",
+            "params": {
+                "textDocument": {"uri": uri, "languageId": "markdown", "version": 1, "text": text}
+            },
+        }
+    )
+    (notification,) = sent(server)
+    assert notification["method"] == "textDocument/publishDiagnostics"
+    return list(notification["params"]["diagnostics"])
+
+
+def change(
+    server: LanguageServer, start: dict[str, int], end: dict[str, int], text: str, uri: str = URI
+) -> list[dict[str, Any]]:
+    """Apply an incremental edit and return the published diagnostics."""
+    server.dispatch(
+        {
+            "jsonrpc": "2.0",
+            "method": "textDocument/didChange",
+            "params": {
+                "textDocument": {"uri": uri, "version": 2},
+                "contentChanges": [{"range": {"start": start, "end": end}, "text": text}],
+            },
+        }
+    )
+    (notification,) = sent(server)
+    return list(notification["params"]["diagnostics"])
+
+
+def apply_edits(text: str, edits: list[dict[str, Any]]) -> str:
+    """Apply TextEdits the way an editor would (no overlapping edits)."""
+    document = TextDocument(URI, text, 0)
+    for edit in sorted(edits, key=lambda e: e["range"]["start"]["line"], reverse=True):
+        document.apply_change({"range": edit["range"], "text": edit["newText"]})
+    return document.text
+
+
+class TestFraming:
+    """Test Content-Length message framing."""
+
+    def test_round_trip(self) -> None:
+        """Test that written messages read back, non-ASCII content included."""
+        stream = io.BytesIO(frame({"id": 1, "text": "┌─┐"}, {"id": 2}))
+        assert read_message(stream) == {"id": 1, "text": "┌─┐"}
+        assert read_message(stream) == {"id": 2}
+        assert read_message(stream) is None
+
+    def test_missing_length(self) -> None:
+        """Test that a message without Content-Length is rejected."""
+        with pytest.raises(ValueError, match="Content-Length"):
+            read_message(io.BytesIO(b"Content-Type: x\r\n\r\n{}"))
+
+
+class TestTextDocument:
+    """Test incremental document edits."""
+
+    def test_multiline_edit(self) -> None:
+        """Test replacing a range that spans lines."""
+        document = TextDocument(URI, "one\ntwo\nthree\n", 1)
+        document.apply_change(
+            {"range": {"start": position(0, 1), "end": position(2, 2)}, "text": "X\nY"}
+        )
+        assert document.text == "oX\nYree\n"
+
+    def test_full_replacement(self) -> None:
+        """Test a change without a range."""
+        document = TextDocument(URI, "old\r\ntext", 1)
+        document.apply_change({"text": "new"})
+        assert document.lines == ["new"]
+
+    def test_utf16_positions(self) -> None:
+        """Test that characters after an astral character are addressed in UTF-16 units."""
+        document = TextDocument(URI, "😀ab\n", 1)
+        document.apply_change(
+            {"range": {"start": position(0, 2), "end": position(0, 3)}, "text": ""}
+        )
+        assert document.lines[0] == "😀b"
+        assert document.character(0, 1) == 2
+
+    def test_utf32_positions(self) -> None:
+        """Test code point positions when negotiated."""
+        document = TextDocument(URI, "😀ab\n", 1, utf16=False)
+        document.apply_change(
+            {"range": {"start": position(0, 1), "end": position(0, 2)}, "text": ""}
+        )
+        assert document.lines[0] == "😀b"
+
+
+class TestDiagnostics:
+    """Test published diagnostics."""
+
+    def test_broken_box(self, server: LanguageServer) -> None:
+        """Test that a misaligned box is reported as an error."""
+        diagnostics = open_document(server, BROKEN_BOX)
+
+        assert diagnostics
+        assert diagnostics[0]["severity"] == 1
+        assert diagnostics[0]["source"] == "ascii-guard"
+        assert diagnostics[0]["range"]["start"]["line"] == 2
+
+    def test_edit_clears_diagnostics(self, server: LanguageServer) -> None:
+        """Test that fixing the box through an edit clears the diagnostics."""
+        open_document(server, BROKEN_BOX)
+        assert change(server, position(2, 4), position(2, 4), "─") == []
+
+    def test_only_changed_boxes_are_validated(self, server: LanguageServer) -> None:
+        """Test that editing one box of many validates that box alone."""
+        open_document(server, "text\n\n".join([GOOD_BOX] * 50))
+        document = server.documents[URI]
+        assert document.boxes_validated == 1  # All boxes have the same content
+
+        change(server, position(2, 0), position(2, 6), "└───┘")
+        assert document.boxes_validated == 2
+
+        # Moving boxes down does not validate them again
+        diagnostics = change(server, position(0, 0), position(0, 0), "intro\n\n")
+        assert document.boxes_validated == 2
+        assert {d["range"]["start"]["line"] for d in diagnostics} == {4}
+
+    def test_excluded_document(self, tmp_path: Path) -> None:
+        """Test that a file a scan would skip gets no diagnostics."""
+        (tmp_path / ".ascii-guard.toml").write_text('[files]\nextensions = [".md"]\n')
+        lsp = LanguageServer(io.BytesIO(), io.BytesIO())
+        lsp.dispatch({"jsonrpc": "2.0", "id": 0, "method": "initialize", "params": {}})
+        sent(lsp)
+
+        assert open_document(lsp, BROKEN_BOX, (tmp_path / "a.txt").as_uri()) == []
+        assert open_document(lsp, BROKEN_BOX, (tmp_path / "a.md").as_uri()) != []
+
+    def test_invalid_config_is_shown(self, tmp_path: Path) -> None:
+        """Test that a document under an invalid config gets no diagnostics and a message."""
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".ascii-guard.toml").write_text("[files]\nexclude = 5\n")
+        lsp = LanguageServer(io.BytesIO(), io.BytesIO())
+        lsp.dispatch({"jsonrpc": "2.0", "id": 0, "method": "initialize", "params": {}})
+        sent(lsp)
+        uri = (tmp_path / "a.md").as_uri()
+
+        lsp.dispatch(
+            {
+                "jsonrpc": "2.0",
+                "method": "textDocument/didOpen",
+                "params": {
+                    "textDocument": {"uri": uri, "languageId": "markdown", "text": BROKEN_BOX}
+                },
+            }
+        )
+        message, notification = sent(lsp)
+
+        assert message["method"] == "window/showMessage"
+        assert message["params"]["type"] == MESSAGE_ERROR
+        assert "[files] exclude must be a list" in message["params"]["message"]
+        assert notification["method"] == "textDocument/publishDiagnostics"
+        assert notification["params"]["diagnostics"] == []
+
+        # Fixing the config and saving it checks the document again
+        (tmp_path / ".ascii-guard.toml").write_text("[files]\n")
+        lsp.dispatch(
+            {
+                "jsonrpc": "2.0",
+                "method": "textDocument/didSave",
+                "params": {"textDocument": {"uri": uri}},
+            }
+        )
+        (notification,) = sent(lsp)
+        assert notification["params"]["diagnostics"] != []
+
+    def test_large_document(self, server: LanguageServer) -> None:
+        """Test that an edit in a 10k-line document is handled quickly."""
+        open_document(server, "".join(["prose line\n" * 6 + GOOD_BOX] * 1000))
+
+        started = time.monotonic()
+        diagnostics = change(server, position(5012, 0), position(5012, 6), "└───┘")
+
+        assert time.monotonic() - started < 2
+        assert {d["range"]["start"]["line"] for d in diagnostics} == {5012}
+
+
+class TestCodeActions:
+    """Test quick fixes."""
+
+    def actions(self, server: LanguageServer, line: int, only: list[str] | None = None) -> Any:
+        """Request code actions for one line."""
+        context: dict[str, Any] = {"diagnostics": []}
+        if only is not None:
+            context["only"] = only
+        server.dispatch(
+            {
+                "jsonrpc": "2.0",
+                "id": 7,
+                "method": "textDocument/codeAction",
+                "params": {
+                    "textDocument": {"uri": URI},
+                    "range": {"start": position(line, 0), "end": position(line, 0)},
+                    "context": context,
+                },
+            }
+        )
+        (response,) = sent(server)
+        return response["result"]
+
+    def test_fix_box(self, server: LanguageServer) -> None:
+        """Test that the quick fix replaces the box with fix_box() output."""
+        text = "intro\n" + BROKEN_BOX
+        open_document(server, text)
+
+        (action,) = self.actions(server, 2, only=["quickfix"])
+
+        assert action["kind"] == "quickfix"
+        assert action["diagnostics"]
+        assert apply_edits(text, action["edit"]["changes"][URI]) == "intro\n" + GOOD_BOX
+
+    def test_no_fix_outside_boxes(self, server: LanguageServer) -> None:
+        """Test that lines outside boxes offer no quick fix."""
+        open_document(server, "intro\n" + BROKEN_BOX)
+        assert self.actions(server, 0, only=["quickfix"]) == []
+
+    def test_fix_all(self, server: LanguageServer) -> None:
+        """Test the source.fixAll action."""
+        text = BROKEN_BOX + "\n" + BROKEN_BOX
+        open_document(server, text)
+
+        (action,) = self.actions(server, 0, only=["source"])
+
+        assert action["kind"] == "source.fixAll"
+        assert apply_edits(text, action["edit"]["changes"][URI]) == GOOD_BOX + "\n" + GOOD_BOX
+
+
+class TestLifecycle:
+    """Test initialization, errors and shutdown."""
+
+    def test_request_before_initialize(self) -> None:
+        """Test that requests are refused until initialize."""
+        lsp = LanguageServer(io.BytesIO(), io.BytesIO())
+        lsp.dispatch({"jsonrpc": "2.0", "id": 1, "method": "shutdown"})
+        assert sent(lsp)[0]["error"]["code"] == SERVER_NOT_INITIALIZED
+
+    def test_capabilities(self) -> None:
+        """Test incremental sync and UTF-32 negotiation."""
+        lsp = LanguageServer(io.BytesIO(), io.BytesIO())
+        lsp.dispatch(
+            {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "initialize",
+                "params": {"capabilities": {"general": {"positionEncodings": ["utf-32"]}}},
+            }
+        )
+        capabilities = sent(lsp)[0]["result"]["capabilities"]
+        assert capabilities["textDocumentSync"]["change"] == 2
+        assert capabilities["positionEncoding"] == "utf-32"
+
+    def test_errors(self, server: LanguageServer) -> None:
+        """Test unknown methods and bad params."""
+        server.dispatch({"jsonrpc": "2.0", "id": 1, "method": "no/such"})
+        server.dispatch({"jsonrpc": "2.0", "method": "$/unknownNotification"})
+        server.dispatch({"jsonrpc": "2.0", "id": 2, "method": "textDocument/codeAction"})
+
+        errors = [message["error"]["code"] for message in sent(server)]
+        assert errors == [METHOD_NOT_FOUND, INVALID_PARAMS]
+
+    def test_notification_errors_are_logged(self, server: LanguageServer) -> None:
+        """Test that a failing notification, which gets no reply, is logged."""
+        server.dispatch({"jsonrpc": "2.0", "method": "textDocument/didChange", "params": {}})
+
+        (message,) = sent(server)
+        assert message["method"] == "window/logMessage"
+        assert "textDocument/didChange failed" in message["params"]["message"]
+
+    @pytest.mark.parametrize(("shutdown", "exit_code"), [(True, 0), (False, 1)])
+    def test_serve_until_exit(self, shutdown: bool, exit_code: int) -> None:
+        """Test a whole session over streams and the exit code."""
+        messages = [
+            {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}},
+            {"jsonrpc": "2.0", "method": "initialized", "params": {}},
+        ]
+        if shutdown:
+            messages.append({"jsonrpc": "2.0", "id": 2, "method": "shutdown"})
+        messages.append({"jsonrpc": "2.0", "method": "exit"})
+        lsp = LanguageServer(io.BytesIO(frame(*messages)), io.BytesIO())
+
+        assert lsp.serve() == exit_code
+        responses = sent(lsp)
+        assert [r["id"] for r in responses] == ([1, 2] if shutdown else [1])
@@ -0,0 +1,117 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for memory instrumentation (--memstats)."""
+
+import json
+import tracemalloc
+from pathlib import Path
+
+from ascii_guard.linter import fix_file
+from ascii_guard.memstats import MEMORY_MODULES, MemoryTracker, format_bytes
+from ascii_guard.stats import RunStats
+from tests.conftest import BROKEN_BOX
+
+
+class TestMemoryTracker:
+    """Test recording memory per phase and file."""
+
+    def test_nested_phase_peaks_are_inclusive(self) -> None:
+        """Test that an inner phase's allocations count toward the outer peak."""
+        tracker = MemoryTracker()
+        tracker.start()
+        try:
+            with tracker.phase("fix"):
+                kept = bytearray(100_000)
+                with tracker.phase("validate"):
+                    temporary = bytearray(400_000)
+                    del temporary
+        finally:
+            tracker.stop()
+
+        # Allow for small unrelated allocations and frees (e.g. by coverage)
+        assert tracker.phases["validate"].peak > 390_000
+        assert abs(tracker.phases["validate"].retained) < 50_000
+        assert tracker.phases["fix"].peak > 490_000
+        assert 90_000 < tracker.phases["fix"].retained < 150_000
+        assert tracker.phases["fix"].calls == 1
+        assert tracker.peak > 490_000
+        assert len(kept) == 100_000
+        assert not tracemalloc.is_tracing()
+
+    def test_files_with_highest_peaks(self) -> None:
+        """Test that each file is charged the memory used since the previous one."""
+        tracker = MemoryTracker(top=2)
+        tracker.start()
+        try:
+            for name, size in [("a.md", 10_000), ("b.md", 300_000), ("c.md", 200_000)]:
+                data = bytearray(size)
+                del data
+                tracker.end_file(name)
+        finally:
+            tracker.stop()
+
+        assert [entry.path for entry in tracker.largest] == ["b.md", "c.md"]
+        assert tracker.largest[0].peak > 290_000
+
+    def test_lines_in_core_modules(self, tmp_path: Path) -> None:
+        """Test that allocations are attributed to lines of the tracked modules."""
+        path = tmp_path / "box.md"
+        path.write_text(BROKEN_BOX * 50)
+        tracker = MemoryTracker()
+        tracker.start()
+        try:
+            fix_file(path, dry_run=True, timer=tracker.timer())
+        finally:
+            tracker.stop()
+
+        assert tracker.high_water
+        assert {line.module for line in tracker.high_water} <= set(MEMORY_MODULES)
+        assert tracker.phases["detect"].calls == 1
+        assert tracker.phases["fix"].peak > 0
+
+    def test_run_stats_timers_report_to_tracker(self) -> None:
+        """Test that RunStats hands out tracking timers and ends files."""
+        tracker = MemoryTracker()
+        stats = RunStats(memory=tracker)
+        tracker.start()
+        try:
+            timer = stats.new_timer()
+            with timer.phase("read"):
+                data = b"x" * 50_000
+            stats.add_file("a.md", data, 0, timer.totals())
+        finally:
+            tracker.stop()
+
+        assert tracker.phases["read"].retained > 45_000
+        assert "read" in timer.wall
+        assert tracker.largest[0].path == "a.md"
+
+    def test_to_dict_is_json(self) -> None:
+        """Test that the structured form serializes."""
+        tracker = MemoryTracker()
+        tracker.start()
+        tracker.end_file("a.md")
+        tracker.stop()
+
+        data = json.loads(json.dumps(tracker.to_dict()))
+        assert data["largest"][0]["path"] == "a.md"
+        assert "detect" in data["phases"]
+
+    def test_format_bytes(self) -> None:
+        """Test byte counts with binary units."""
+        assert format_bytes(512) == "512 B"
+        assert format_bytes(1536) == "1.5 KiB"
+        assert format_bytes(-3 * 1024 * 1024) == "-3.0 MiB"
+        assert format_bytes(2 * 1024**3) == "2.0 GiB"
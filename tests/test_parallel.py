@@ -0,0 +1,344 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for parallel linting and fixing."""
+
+import os
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from ascii_guard import parallel
+from ascii_guard.config import PerformanceConfig
+from ascii_guard.linter import lint_file
+from ascii_guard.models import FixResult, LintResult
+from ascii_guard.parallel import (
+    Payload,
+    TaskOptions,
+    WorkerCrashError,
+    WorkerPool,
+    available_cpus,
+    chunk_files,
+    decode_outcome,
+    iter_results,
+    process_chunk,
+    resolve_jobs,
+)
+from ascii_guard.scanner import ScannedFile, scan_files
+from ascii_guard.stats import RunStats
+from tests.conftest import GOOD_BOX
+
+
+def crashing_chunk(chunk: Payload, options: TaskOptions) -> list[parallel.Encoded]:
+    """Pool worker that kills its process on files named crash.md."""
+    if any(Path(path).name == "crash.md" for path, _ in chunk):
+        os._exit(1)
+    return process_chunk(chunk, options)
+
+
+def slow_big_chunk(chunk: Payload, options: TaskOptions) -> list[parallel.Encoded]:
+    """Pool worker that takes its time over chunks holding a file named big.md."""
+    if any(Path(path).name == "big.md" for path, _ in chunk):
+        time.sleep(0.2)
+    return process_chunk(chunk, options)
+
+
+class TestAvailableCpus:
+    """Test CPU counting."""
+
+    def test_at_least_one(self) -> None:
+        """Test that at least one CPU is always reported."""
+        assert available_cpus() >= 1
+
+    def test_cgroup_quota_limits_count(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a cgroup quota caps the CPU count."""
+        monkeypatch.setattr(parallel, "_cgroup_cpu_limit", lambda: 1.5)
+        assert available_cpus() <= 2
+
+    def test_resolve_jobs(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test explicit, configured and automatic worker counts."""
+        monkeypatch.setattr(parallel, "available_cpus", lambda: 6)
+        assert resolve_jobs(3) == 3
+        assert resolve_jobs(0) == 6
+        assert resolve_jobs(None) == 6
+        assert resolve_jobs(None, PerformanceConfig(jobs=4)) == 4
+
+
+class TestChunkFiles:
+    """Test size-based chunking."""
+
+    def test_small_files_are_batched(self) -> None:
+        """Test that small files share chunks up to the file limit."""
+        files = [ScannedFile(Path(f"{i}.md"), b"x" * 10) for i in range(5)]
+        chunks = list(chunk_files(files, chunk_bytes=1000, chunk_files=2))
+        assert [len(c) for c in chunks] == [2, 2, 1]
+
+    def test_large_files_travel_alone(self) -> None:
+        """Test that a file over the byte target gets its own chunk."""
+        files = [
+            ScannedFile(Path("a.md"), b"x" * 10),
+            ScannedFile(Path("big.md"), b"x" * 500),
+            ScannedFile(Path("b.md"), b"x" * 10),
+        ]
+        chunks = list(chunk_files(files, chunk_bytes=100, chunk_files=10))
+        assert [[f.path.name for f in c] for c in chunks] == [["a.md"], ["big.md"], ["b.md"]]
+
+
+class TestCompactResults:
+    """Test the worker result encoding."""
+
+    def test_lint_round_trip(self, docs: Path) -> None:
+        """Test that decoded lint results equal direct lint_file results."""
+        options = TaskOptions()
+        path = str(docs / "file00.md")
+
+        encoded = process_chunk([(path, None)], options)
+        decoded = decode_outcome(path, encoded[0], options)
+
+        assert decoded == lint_file(path)
+
+    def test_exceptions_are_per_file(self, tmp_path: Path) -> None:
+        """Test that a failing file does not fail its chunk."""
+        good = tmp_path / "good.md"
+        good.write_text(GOOD_BOX)
+        options = TaskOptions()
+
+        encoded = process_chunk([(str(tmp_path / "missing.md"), None), (str(good), None)], options)
+
+        assert isinstance(encoded[0], FileNotFoundError)
+        assert isinstance(decode_outcome(str(good), encoded[1], options), LintResult)
+
+
+class TestIterResults:
+    """Test parallel dispatch."""
+
+    def run(self, docs: Path, options: TaskOptions, **kwargs) -> list[tuple[str, object]]:  # type: ignore[no-untyped-def]
+        """Process docs and return (file name, outcome) pairs."""
+        kwargs.setdefault("min_parallel_files", 1)
+        results = iter_results(scan_files([docs]), options, **kwargs)
+        return [(scanned.path.name, outcome) for scanned, outcome in results]
+
+    @pytest.mark.parametrize("backend", ["thread", "process"])
+    def test_matches_serial_in_input_order(self, docs: Path, backend: str) -> None:
+        """Test that pool results equal serial results, in the same order."""
+        options = TaskOptions()
+        serial = self.run(docs, options, jobs=1)
+        pooled = self.run(docs, options, jobs=3, backend=backend)
+
+        assert pooled == serial
+        assert [name for name, _ in pooled] == [f.path.name for f in scan_files([docs])]
+
+    def test_small_runs_stay_inline(self, docs: Path) -> None:
+        """Test that runs below the thresholds never start a pool."""
+        calls: list[str] = []
+
+        def inline(scanned: ScannedFile) -> LintResult:
+            calls.append(scanned.path.name)
+            return lint_file(scanned.path)
+
+        results = list(
+            iter_results(
+                scan_files([docs]), TaskOptions(), jobs=4, run_inline=inline, min_parallel_files=100
+            )
+        )
+
+        assert len(calls) == len(results) == 12
+
+    def test_warm_cache_streams_before_walk_ends(self, docs: Path) -> None:
+        """Test that cache hits are yielded while the walk is still running."""
+        options = TaskOptions()
+        scanned_files = list(scan_files([docs]))
+        encoded = {
+            scanned.path: process_chunk([(str(scanned.path), None)], options)[0]
+            for scanned in scanned_files
+        }
+        walked: list[int] = []
+
+        def walk() -> Iterator[ScannedFile]:
+            for i in range(parallel.LOOKAHEAD_FILES * 4):
+                walked.append(i)
+                yield scanned_files[i % len(scanned_files)]
+
+        results = iter_results(
+            walk(), options, jobs=4, backend="thread", cached=lambda s: encoded[s.path]
+        )
+        first, outcome = next(results)
+
+        assert first.path == scanned_files[0].path
+        assert isinstance(outcome, LintResult)
+        assert len(walked) == 1
+        assert len(list(results)) == parallel.LOOKAHEAD_FILES * 4 - 1
+
+    def test_sparse_misses_do_not_buffer_the_walk(self, docs: Path) -> None:
+        """Test that a mostly warm cache still bounds the look-ahead."""
+        options = TaskOptions()
+        scanned_files = list(scan_files([docs]))
+        encoded = process_chunk([(str(scanned_files[0].path), None)], options)[0]
+        total = parallel.LOOKAHEAD_FILES * 4
+        walked: list[int] = []
+
+        def walk() -> Iterator[ScannedFile]:
+            for i in range(total):
+                walked.append(i)
+                yield scanned_files[0]
+
+        # Every 100th file is a miss: too few for a pool
+        results = iter_results(
+            walk(),
+            options,
+            jobs=4,
+            backend="thread",
+            cached=lambda s: None if len(walked) % 100 == 1 else encoded,
+        )
+        next(results)
+
+        assert len(walked) <= parallel.LOOKAHEAD_FILES + 1
+        assert len(list(results)) == total - 1
+
+    def test_worker_crash_is_reported_per_file(self, docs: Path) -> None:
+        """Test that a dying worker fails only the file it was processing."""
+        (docs / "crash.md").write_text(GOOD_BOX)
+
+        results = dict(
+            self.run(docs, TaskOptions(), jobs=2, backend="process", worker=crashing_chunk)
+        )
+
+        assert isinstance(results.pop("crash.md"), WorkerCrashError)
+        assert len(results) == 12
+        assert all(isinstance(outcome, LintResult) for outcome in results.values())
+
+    def test_parallel_fix(self, docs: Path) -> None:
+        """Test that fix mode writes every file exactly once."""
+        options = TaskOptions(mode="fix")
+        results = dict(self.run(docs, options, jobs=2, backend="process"))
+
+        fixed = {name for name, outcome in results.items() if outcome.boxes_fixed}  # type: ignore[attr-defined]
+        assert fixed == {"file00.md", "file03.md", "file06.md", "file09.md"}
+        assert all(isinstance(outcome, FixResult) for outcome in results.values())
+        assert all(p.read_text() == GOOD_BOX for p in docs.glob("*.md"))
+        assert not [p for p in docs.iterdir() if p.suffix == ".tmp"]
+
+    def test_unordered_yields_as_completed(self, docs: Path) -> None:
+        """Test that with ordered=False a slow first chunk does not hold back the rest."""
+        # Larger than CHUNK_BYTES, so it travels alone and comes first
+        (docs / "big.md").write_text(GOOD_BOX * (parallel.CHUNK_BYTES // len(GOOD_BOX.encode())))
+        files = sorted(scan_files([docs]), key=lambda scanned: scanned.path.name != "big.md")
+
+        results = iter_results(
+            files,
+            TaskOptions(),
+            jobs=2,
+            backend="thread",
+            min_parallel_files=1,
+            worker=slow_big_chunk,
+            ordered=False,
+        )
+        names = [scanned.path.name for scanned, _ in results]
+
+        assert names[-1] == "big.md"
+        assert sorted(names) == sorted(scanned.path.name for scanned in files)
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_stats_from_workers(self, docs: Path, jobs: int) -> None:
+        """Test that timings come back from worker processes as from inline runs."""
+        stats = RunStats(top=3)
+        options = TaskOptions(stats=True)
+        results = self.run(docs, options, jobs=jobs, backend="process", stats=stats)
+
+        assert results == self.run(docs, TaskOptions(), jobs=1)
+        assert stats.files == 12
+        assert stats.cached == 0
+        assert stats.boxes == 12
+        assert stats.lines == 12 * 3
+        assert stats.phases["detect"].wall > 0
+        assert len(stats.slowest) == 3
+
+
+class TestWorkerPool:
+    """Test long-lived worker pools."""
+
+    def test_pool_survives_runs(self, docs: Path) -> None:
+        """Test that a shared pool is reused and left running between runs."""
+        pool = WorkerPool("thread", 2)
+        try:
+            first = list(
+                iter_results(
+                    scan_files([docs]),
+                    TaskOptions(),
+                    jobs=2,
+                    backend="thread",
+                    min_parallel_files=1,
+                    pool=pool,
+                )
+            )
+            executor = pool.executor
+            second = list(
+                iter_results(
+                    scan_files([docs]),
+                    TaskOptions(),
+                    jobs=2,
+                    backend="thread",
+                    min_parallel_files=1,
+                    pool=pool,
+                )
+            )
+
+            assert pool.executor is executor
+            assert first == second
+            assert len(first) == 12
+        finally:
+            pool.shutdown()
+
+    def test_external_executor_is_not_shut_down(self, docs: Path) -> None:
+        """Test that a pool wrapping a caller's executor leaves it running."""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pool = WorkerPool("thread", 2, executor)
+            results = list(iter_results(scan_files([docs]), TaskOptions(), jobs=1, pool=pool))
+            pool.shutdown()
+
+            assert len(results) == 12
+            assert pool.restart() is executor
+            assert executor.submit(len, "ok").result() == 2
+
+    def test_abandoned_run_leaves_pool_usable(self, docs: Path) -> None:
+        """Test that stopping early cancels queued work but keeps the pool."""
+        pool = WorkerPool("thread", 2)
+        try:
+            results = iter_results(
+                scan_files([docs]),
+                TaskOptions(),
+                jobs=2,
+                backend="thread",
+                min_parallel_files=1,
+                pool=pool,
+            )
+            next(results)
+            results.close()
+
+            again = list(
+                iter_results(
+                    scan_files([docs]),
+                    TaskOptions(),
+                    jobs=2,
+                    backend="thread",
+                    min_parallel_files=1,
+                    pool=pool,
+                )
+            )
+            assert len(again) == 12
+        finally:
+            pool.shutdown()
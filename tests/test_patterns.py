@@ -17,7 +17,7 @@
 import tempfile
 from pathlib import Path
 
-from ascii_guard.patterns import filter_paths, match_path
+from ascii_guard.patterns import PathMatcher, compile_patterns, filter_paths, match_path
 
 
 class TestSimplePatterns:
@@ -339,3 +339,55 @@ class TestPatternsEdgeCases:
             # Pattern matching directory name at any level
             assert match_path(path, ["components"], base_path=base)
             assert match_path(path, ["Button"], base_path=base)
+
+
+class TestPathMatcher:
+    """Test compiled pattern matching."""
+
+    PATTERNS = [
+        "# comment",
+        "",
+        "build/",
+        "*.log",
+        "**/node_modules/**",
+        "docs/**",
+        "!docs/keep.md",
+        "!important.log",
+    ]
+
+    def test_matches_like_match_path(self, tmp_path: Path) -> None:
+        """Test that match and match_relative agree with match_path."""
+        files = [
+            "build/out.txt",
+            "src/build/x.txt",
+            "app.log",
+            "important.log",
+            "web/node_modules/pkg/index.md",
+            "docs/guide.md",
+            "docs/keep.md",
+            "README.md",
+        ]
+        for rel in files:
+            (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / rel).write_text("x")
+
+        matcher = PathMatcher(self.PATTERNS)
+        for rel in files + ["build", "src/build", "docs", "web/node_modules"]:
+            path = tmp_path / rel
+            expected = match_path(path, self.PATTERNS, tmp_path)
+            assert matcher.match(path, tmp_path) == expected, rel
+            assert matcher.match_relative(rel, path.is_dir()) == expected, rel
+
+    def test_last_matching_pattern_wins(self) -> None:
+        """Test that later patterns override earlier ones."""
+        assert PathMatcher(["*.md", "!a.md"]).match_relative("a.md", False) is False
+        assert PathMatcher(["!a.md", "*.md"]).match_relative("a.md", False) is True
+
+    def test_empty_and_comment_only(self) -> None:
+        """Test that pattern lists without rules never match."""
+        assert PathMatcher([]).match_relative("a.md", False) is False
+        assert PathMatcher(["# only a comment", ""]).match_relative("a.md", False) is False
+
+    def test_compile_patterns_is_cached(self) -> None:
+        """Test that identical pattern lists share a matcher."""
+        assert compile_patterns(("*.md", "build/")) is compile_patterns(("*.md", "build/"))
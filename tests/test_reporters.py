@@ -0,0 +1,209 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for machine-readable output formats."""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from ascii_guard.defaults import OUTPUT_FORMATS
+from ascii_guard.models import LintResult, ValidationError
+from ascii_guard.reporters import REPORTERS, Reporter, create_reporter
+
+BROKEN = LintResult(
+    file_path="docs/a.md",
+    boxes_found=2,
+    errors=[ValidationError(line=2, column=5, message="Right border misaligned", severity="error")],
+    warnings=[ValidationError(line=7, column=0, message="Missing junction", severity="warning")],
+)
+CLEAN = LintResult(file_path="b.md", boxes_found=1, errors=[], warnings=[])
+
+
+def run(output_format: str) -> tuple[str, Reporter]:
+    """Report a broken file, a clean file and a failure; return the output."""
+    stream = io.StringIO()
+    reporter = create_reporter(output_format, stream)
+    reporter.start()
+    reporter.result("docs/a.md", BROKEN)
+    reporter.result("b.md", CLEAN)
+    reporter.failure("c.md", OSError("Permission denied"))
+    reporter.finish()
+    return stream.getvalue(), reporter
+
+
+class TestJsonLines:
+    """Test the JSON Lines format."""
+
+    def test_one_record_per_file(self) -> None:
+        """Test that every file gets exactly one line."""
+        output, _ = run("jsonl")
+        records = [json.loads(line) for line in output.splitlines()]
+
+        assert records == [
+            {
+                "path": "docs/a.md",
+                "boxes_found": 2,
+                "errors": [
+                    {
+                        "line": 3,
+                        "column": 6,
+                        "message": "Right border misaligned",
+                        "severity": "error",
+                    }
+                ],
+                "warnings": [
+                    {"line": 8, "column": 1, "message": "Missing junction", "severity": "warning"}
+                ],
+            },
+            {"path": "b.md", "boxes_found": 1, "errors": [], "warnings": []},
+            {"path": "c.md", "failure": "Permission denied"},
+        ]
+
+    def test_records_are_written_as_results_arrive(self) -> None:
+        """Test that output is not held back until finish()."""
+        stream = io.StringIO()
+        reporter = create_reporter("jsonl", stream)
+        reporter.start()
+        reporter.result("b.md", CLEAN)
+
+        assert json.loads(stream.getvalue())["path"] == "b.md"
+
+
+class TestJson:
+    """Test the JSON document format."""
+
+    def test_document(self) -> None:
+        """Test that the streamed document parses, with files and summary."""
+        output, _ = run("json")
+        document = json.loads(output)
+
+        assert [f["path"] for f in document["files"]] == ["docs/a.md", "b.md", "c.md"]
+        assert document["summary"] == {
+            "total_files": 3,
+            "files_with_errors": 1,
+            "files_failed": 1,
+            "total_boxes": 3,
+            "total_errors": 1,
+            "total_warnings": 1,
+        }
+
+    def test_empty_run(self) -> None:
+        """Test that a run without files is still valid JSON."""
+        stream = io.StringIO()
+        reporter = create_reporter("json", stream)
+        reporter.start()
+        reporter.finish()
+
+        assert json.loads(stream.getvalue())["files"] == []
+
+
+class TestSarif:
+    """Test the SARIF format."""
+
+    def test_log(self) -> None:
+        """Test results, levels, locations and failure notifications."""
+        output, _ = run("sarif")
+        log = json.loads(output)
+
+        assert log["version"] == "2.1.0"
+        (sarif_run,) = log["runs"]
+        assert sarif_run["tool"]["driver"]["name"] == "ascii-guard"
+        results = sarif_run["results"]
+        assert [r["level"] for r in results] == ["error", "warning"]
+        location = results[0]["locations"][0]["physicalLocation"]
+        assert location["artifactLocation"]["uri"] == "docs/a.md"
+        assert location["region"] == {"startLine": 3, "startColumn": 6}
+        (invocation,) = sarif_run["invocations"]
+        assert invocation["executionSuccessful"] is False
+        assert invocation["toolExecutionNotifications"][0]["message"]["text"] == (
+            "Permission denied"
+        )
+
+    def test_paths_are_uris(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that relative paths are escaped and outside paths are file URIs."""
+        monkeypatch.chdir(tmp_path)
+        stream = io.StringIO()
+        reporter = create_reporter("sarif", stream)
+        reporter.start()
+        reporter.result(str(tmp_path / "my doc.md"), BROKEN)
+        reporter.result("/elsewhere/x.md", BROKEN)
+        reporter.finish()
+
+        results = json.loads(stream.getvalue())["runs"][0]["results"]
+        uris = [r["locations"][0]["physicalLocation"]["artifactLocation"]["uri"] for r in results]
+        assert uris[0] == "my%20doc.md"
+        assert uris[2] == "file:///elsewhere/x.md"
+
+
+class TestGithub:
+    """Test GitHub Actions annotations."""
+
+    def test_annotations(self) -> None:
+        """Test one workflow command per issue and failure."""
+        output, _ = run("github")
+
+        assert output.splitlines() == [
+            "::error file=docs/a.md,line=3,col=6,title=ascii-guard::Right border misaligned",
+            "::warning file=docs/a.md,line=8,col=1,title=ascii-guard::Missing junction",
+            "::error file=c.md,title=ascii-guard::Error processing file: Permission denied",
+        ]
+
+    def test_escaping(self) -> None:
+        """Test that special characters cannot break the command syntax."""
+        stream = io.StringIO()
+        result = LintResult(
+            file_path="a,b:c.md",
+            boxes_found=1,
+            errors=[ValidationError(0, 0, "50% off\nnext", "error")],
+            warnings=[],
+        )
+        reporter = create_reporter("github", stream)
+        reporter.result("a,b:c.md", result)
+
+        assert stream.getvalue() == (
+            "::error file=a%2Cb%3Ac.md,line=1,col=1,title=ascii-guard::50%25 off%0Anext\n"
+        )
+
+
+class TestCreateReporter:
+    """Test reporter selection."""
+
+    def test_unknown_format(self) -> None:
+        """Test that an unknown format raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown output format"):
+            create_reporter("xml", io.StringIO())
+
+    def test_every_format_has_a_reporter(self) -> None:
+        """Test that each --format value other than text has a reporter."""
+        assert set(REPORTERS) == set(OUTPUT_FORMATS) - {"text"}
+
+    def test_summary(self) -> None:
+        """Test that reporters keep run totals for the exit code."""
+        _, reporter = run("jsonl")
+        assert reporter.summary.files == 3
+        assert reporter.summary.files_with_errors == 1
+        assert reporter.summary.files_failed == 1
+
+    def test_hooks_are_abstract(self) -> None:
+        """Test that a reporter missing a required hook cannot be created."""
+
+        class Incomplete(Reporter):
+            def _result(self, path: str, result: LintResult) -> None:
+                pass
+
+        with pytest.raises(TypeError, match="_failure"):
+            Incomplete(io.StringIO())  # type: ignore[abstract]
@@ -14,13 +14,28 @@
 
 """Tests for directory scanner."""
 
+import io
+import os
+import sys
 import tempfile
+import threading
+from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
 
-from ascii_guard.config import Config
-from ascii_guard.scanner import is_text_file, scan_directory, scan_paths
+from ascii_guard.config import Config, ConfigResolver
+from ascii_guard.scanner import (
+    SNIFF_SIZE,
+    is_text_file,
+    iter_scan_paths,
+    prefetch,
+    read_text_file,
+    scan_directory,
+    scan_files,
+    scan_paths,
+    select_path,
+)
 
 
 class TestIsTextFile:
@@ -81,6 +96,404 @@ class TestIsTextFile:
             assert is_text_file(utf8_file) is True
 
 
+class TestReadTextFile:
+    """Test combined text detection and reading."""
+
+    def test_returns_content_for_text_file(self, tmp_path: Path) -> None:
+        """Test that text files are returned in full."""
+        text_file = tmp_path / "test.txt"
+        text_file.write_bytes(b"line 1\nline 2\n" * 2000)
+
+        assert read_text_file(text_file) == b"line 1\nline 2\n" * 2000
+
+    def test_binary_file_rejected(self, tmp_path: Path) -> None:
+        """Test that binary files return None."""
+        binary_file = tmp_path / "test.bin"
+        binary_file.write_bytes(b"\x00\x01\x02\x03")
+
+        assert read_text_file(binary_file) is None
+
+    def test_binary_file_read_stops_after_sniff(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a binary file is not read past its first SNIFF_SIZE bytes."""
+        binary_file = tmp_path / "asset.bin"
+        binary_file.write_bytes(b"\x00" * (SNIFF_SIZE * 8))
+        reads: list[int] = []
+
+        class RecordingFile(io.BufferedReader):
+            def read(self, size: int | None = -1) -> bytes:
+                data = super().read(size)
+                reads.append(len(data))
+                return data
+
+        monkeypatch.setattr(
+            "ascii_guard.scanner.open",
+            lambda path, mode: RecordingFile(io.FileIO(path, "r")),
+            raising=False,
+        )
+
+        assert read_text_file(binary_file) is None
+        assert reads == [SNIFF_SIZE]
+
+    def test_large_file_rejected(self, tmp_path: Path) -> None:
+        """Test that files exceeding max_size are rejected."""
+        large_file = tmp_path / "large.txt"
+        large_file.write_text("x" * (2 * 1024 * 1024))
+
+        assert read_text_file(large_file, max_size_mb=1) is None
+        assert read_text_file(large_file, max_size_mb=0) is not None
+
+    def test_nonexistent_file(self, tmp_path: Path) -> None:
+        """Test that non-existent files return None."""
+        assert read_text_file(tmp_path / "missing.txt") is None
+
+    def test_agrees_with_is_text_file(self, tmp_path: Path) -> None:
+        """Test that read_text_file accepts exactly what is_text_file accepts."""
+        samples = {
+            "empty.txt": b"",
+            "text.txt": "┌──┐\n│ok│\n└──┘\n".encode(),
+            "binary.bin": b"abc\x00def",
+            "latin1.txt": b"caf\xe9",
+        }
+        for name, content in samples.items():
+            path = tmp_path / name
+            path.write_bytes(content)
+            assert (read_text_file(path) is not None) == is_text_file(path), name
+
+
+class TestScanFiles:
+    """Test scanning that yields file content."""
+
+    def test_matches_scan_paths(self, tmp_path: Path) -> None:
+        """Test that scan_files selects the same files as scan_paths."""
+        (tmp_path / "a.md").write_text("# A\n")
+        (tmp_path / "b.txt").write_text("B\n")
+        (tmp_path / "c.bin").write_bytes(b"\x00\x01")
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "node_modules" / "d.md").write_text("D\n")
+
+        config = Config()
+        scanned = list(scan_files([tmp_path], config))
+
+        assert sorted(f.path for f in scanned) == sorted(scan_paths([tmp_path], config))
+        assert {f.path.name: f.data for f in scanned} == {"a.md": b"# A\n", "b.txt": b"B\n"}
+
+    def test_explicit_file_bypasses_filters(self, tmp_path: Path) -> None:
+        """Test that explicit files are yielded with their content."""
+        test_file = tmp_path / "data.bin"
+        test_file.write_bytes(b"\x00abc")
+
+        scanned = list(scan_files([test_file]))
+
+        assert len(scanned) == 1
+        assert scanned[0].path == test_file.resolve()
+        assert scanned[0].data == b"\x00abc"
+
+    def test_missing_paths(self, tmp_path: Path) -> None:
+        """Test that missing paths are skipped, or yielded unread with report_missing."""
+        (tmp_path / "a.md").write_text("A\n")
+        paths = [tmp_path / "missing.md", tmp_path]
+
+        assert [f.path.name for f in scan_files(paths)] == ["a.md"]
+        assert [(f.path.name, f.data) for f in scan_files(paths, report_missing=True)] == [
+            ("missing.md", None),
+            ("a.md", b"A\n"),
+        ]
+
+    @pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs FIFOs")
+    def test_explicit_fifo_is_skipped(self, tmp_path: Path) -> None:
+        """Test that a FIFO named explicitly is skipped without blocking."""
+        fifo = tmp_path / "pipe.md"
+        os.mkfifo(fifo)
+
+        assert list(scan_files([fifo], report_missing=True)) == []
+
+    def test_is_lazy(self, tmp_path: Path) -> None:
+        """Test that scan_files yields results as the walk proceeds."""
+        for i in range(3):
+            (tmp_path / f"file{i}.txt").write_text("text\n")
+
+        iterator = scan_files([tmp_path])
+        first = next(iterator)
+
+        assert first.data == b"text\n"
+
+
+class TestIterScanPaths:
+    """Test the streaming path scanner."""
+
+    def test_is_generator_matching_scan_paths(self, tmp_path: Path) -> None:
+        """Test that iter_scan_paths yields the same files as scan_paths."""
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "a.md").write_text("A\n")
+        (tmp_path / "sub" / "b.md").write_text("B\n")
+        (tmp_path / "c.bin").write_bytes(b"\x00")
+
+        iterator = iter_scan_paths([tmp_path])
+
+        assert not isinstance(iterator, list)
+        assert sorted(iterator) == sorted(scan_paths([tmp_path]))
+
+    def test_accepts_any_iterable(self, tmp_path: Path) -> None:
+        """Test that paths can be supplied lazily."""
+        test_file = tmp_path / "a.md"
+        test_file.write_text("A\n")
+
+        found = list(iter_scan_paths(p for p in [test_file, tmp_path / "missing"]))
+
+        assert found == [test_file.resolve()]
+
+
+def reference_scan(directory: Path, config: Config) -> list[Path]:
+    """Original os.walk + match_path scan, used to check the optimized walker."""
+    import os
+
+    from ascii_guard.patterns import match_path
+
+    dir_path = directory.resolve()
+    patterns = config.exclude + config.include
+    found = []
+    for root, dirs, files in os.walk(dir_path, followlinks=config.follow_symlinks):
+        root_path = Path(root)
+        dirs[:] = [d for d in dirs if not match_path(root_path / d, patterns, dir_path)]
+        for filename in files:
+            file_path = root_path / filename
+            if match_path(file_path, patterns, dir_path):
+                continue
+            if config.extensions and not any(filename.endswith(e) for e in config.extensions):
+                continue
+            if is_text_file(file_path, config.max_file_size):
+                found.append(file_path)
+    return found
+
+
+class TestWalkerEquivalence:
+    """Test that the scandir walker selects what os.walk + match_path did."""
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="symlinks need privileges on Windows")
+    @pytest.mark.parametrize("follow_symlinks", [False, True])
+    def test_matches_reference(self, tmp_path: Path, follow_symlinks: bool) -> None:
+        """Test equivalence on a tree with excludes, includes and symlinks."""
+        outside = tmp_path / "outside"
+        (outside / "docs").mkdir(parents=True)
+        (outside / "docs" / "ext.md").write_text("ext\n")
+        root = tmp_path / "root"
+        for rel in [
+            "README.md",
+            "notes.txt",
+            "build/out.md",
+            "docs/guide.md",
+            "docs/keep.md",
+            "docs/api/ref.md",
+            "src/node_modules/pkg/readme.md",
+            "src/main.md",
+        ]:
+            (root / rel).parent.mkdir(parents=True, exist_ok=True)
+            (root / rel).write_text("text\n")
+        (root / "linked").symlink_to(outside / "docs", target_is_directory=True)
+        (root / "docs" / "link.md").symlink_to(outside / "docs" / "ext.md")
+
+        config = Config(
+            exclude=["build/", "**/node_modules/**", "docs/**", "*.txt"],
+            include=["!docs/keep.md"],
+            follow_symlinks=follow_symlinks,
+        )
+
+        assert sorted(scan_directory(root, config)) == sorted(reference_scan(root, config))
+
+
+class TestPerDirectoryConfig:
+    """Test scanning with per-directory config resolution."""
+
+    def test_subproject_configs_apply(self, tmp_path: Path) -> None:
+        """Test that each subproject's config filters its own files."""
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".ascii-guard.toml").write_text(
+            '[files]\nextensions = [".md"]\nexclude = [".git/", "generated/"]\n'
+        )
+        (tmp_path / "a" / "generated").mkdir(parents=True)
+        (tmp_path / "b" / "generated").mkdir(parents=True)
+        (tmp_path / "b" / ".ascii-guard.toml").write_text(
+            '[files]\nextensions = [".txt"]\nexclude = ["skip.txt"]\n'
+        )
+        for rel in [
+            "root.md",
+            "root.txt",
+            "a/doc.md",
+            "a/generated/gen.md",
+            "b/doc.md",
+            "b/notes.txt",
+            "b/skip.txt",
+            "b/generated/gen.txt",
+        ]:
+            (tmp_path / rel).write_text("text\n")
+
+        found = scan_paths([tmp_path], resolver=ConfigResolver())
+
+        assert sorted(p.relative_to(tmp_path).as_posix() for p in found) == [
+            "a/doc.md",
+            "b/generated/gen.txt",
+            "b/notes.txt",
+            "root.md",
+        ]
+
+    def test_patterns_relative_to_config_directory(self, tmp_path: Path) -> None:
+        """Test that patterns apply relative to the config file's directory."""
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".ascii-guard.toml").write_text('[files]\nexclude = [".git/", "docs/old/"]\n')
+        (tmp_path / "docs" / "old").mkdir(parents=True)
+        (tmp_path / "docs" / "new.md").write_text("new\n")
+        (tmp_path / "docs" / "old" / "old.md").write_text("old\n")
+
+        # Scanning a subdirectory still honours the root config's patterns
+        found = scan_paths([tmp_path / "docs"], resolver=ConfigResolver())
+
+        assert found == [(tmp_path / "docs" / "new.md").resolve()]
+
+    def test_without_config_files_uses_default(self, tmp_path: Path) -> None:
+        """Test that the resolver's default config applies without config files."""
+        (tmp_path / ".git").mkdir()
+        (tmp_path / "a.md").write_text("A\n")
+        (tmp_path / "b.txt").write_text("B\n")
+
+        resolver = ConfigResolver(Config(extensions=[".md"]))
+
+        assert scan_paths([tmp_path], resolver=resolver) == [(tmp_path / "a.md").resolve()]
+
+
+class TestScanOnly:
+    """Test restricting a scan to a given set of files."""
+
+    @pytest.fixture
+    def monorepo(self, tmp_path: Path) -> Path:
+        """Create a tree with a subproject config, excludes and binaries."""
+        root = tmp_path.resolve()
+        (root / ".git").mkdir()
+        (root / ".ascii-guard.toml").write_text(
+            '[files]\nexclude = [".git/", "vendor/", "*.log"]\n'
+        )
+        (root / "sub").mkdir()
+        (root / "sub" / ".ascii-guard.toml").write_text('[files]\nextensions = [".md"]\n')
+        for rel in [
+            "README.md",
+            "run.log",
+            "vendor/lib/doc.md",
+            "sub/doc.md",
+            "sub/notes.txt",
+            "docs/guide.md",
+        ]:
+            (root / rel).parent.mkdir(parents=True, exist_ok=True)
+            (root / rel).write_text("text\n")
+        (root / "docs" / "image.md").write_bytes(b"\x00\x01binary")
+        return root
+
+    def test_same_selection_as_full_scan(self, monorepo: Path) -> None:
+        """Test that only= yields exactly the full scan intersected with the set."""
+        every_file = {p for p in monorepo.rglob("*") if p.is_file() and ".git" not in p.parts}
+        full = {f.path for f in scan_files([monorepo], resolver=ConfigResolver())}
+
+        restricted = {
+            f.path for f in scan_files([monorepo], resolver=ConfigResolver(), only=every_file)
+        }
+
+        assert restricted == full
+        assert monorepo / "vendor" / "lib" / "doc.md" not in restricted
+        assert monorepo / "sub" / "notes.txt" not in restricted
+        assert monorepo / "docs" / "image.md" not in restricted
+
+    def test_subset_and_outside_files(self, monorepo: Path, tmp_path: Path) -> None:
+        """Test that files outside the inputs or missing on disk are ignored."""
+        only = {
+            monorepo / "sub" / "doc.md",
+            monorepo / "deleted.md",
+            tmp_path.parent / "elsewhere.md",
+        }
+
+        found = [
+            f.path for f in scan_files([monorepo / "sub"], resolver=ConfigResolver(), only=only)
+        ]
+
+        assert found == [monorepo / "sub" / "doc.md"]
+
+    def test_explicit_file_must_be_in_set(self, monorepo: Path) -> None:
+        """Test that explicit file inputs are kept only when in the set."""
+        readme = monorepo / "README.md"
+        log = monorepo / "run.log"
+
+        found = [f.path for f in scan_files([readme, log], only={log})]
+
+        assert found == [log]  # Explicit files still bypass the filters
+
+    def test_select_path_matches_scan(
+        self, monorepo: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that select_path agrees with a full scan, for files that need not exist."""
+        monkeypatch.chdir(monorepo)
+        resolver = ConfigResolver()
+
+        assert select_path("README.md", resolver=resolver) is not None
+        assert select_path("new/unsaved.md", resolver=resolver) is not None
+        assert select_path("vendor/lib/doc.md", resolver=resolver) is None
+        assert select_path("debug.log", resolver=resolver) is None
+        sub_config = select_path(monorepo / "sub" / "doc.md", resolver=resolver)
+        assert sub_config is not None and sub_config.extensions == [".md"]
+        assert select_path(monorepo / "sub" / "notes.txt", resolver=resolver) is None
+
+
+class TestPrefetch:
+    """Test the bounded background prefetch pipeline."""
+
+    def test_preserves_order(self) -> None:
+        """Test that items are yielded in production order."""
+        assert list(prefetch(range(500), maxsize=4)) == list(range(500))
+
+    def test_without_thread(self) -> None:
+        """Test that maxsize=0 iterates directly."""
+        assert list(prefetch(iter([1, 2, 3]), maxsize=0)) == [1, 2, 3]
+
+    def test_reraises_producer_error(self) -> None:
+        """Test that exceptions in the producer reach the consumer."""
+
+        def failing() -> Iterator[int]:
+            yield 1
+            raise PermissionError("denied")
+
+        consumed = []
+        with pytest.raises(PermissionError, match="denied"):
+            for item in prefetch(failing(), maxsize=2):
+                consumed.append(item)
+        assert consumed == [1]
+
+    def test_early_close_stops_producer(self) -> None:
+        """Test that abandoning the iterator stops the background thread."""
+        produced = []
+
+        def endless() -> Iterator[int]:
+            i = 0
+            while True:
+                produced.append(i)
+                yield i
+                i += 1
+
+        iterator = prefetch(endless(), maxsize=2)
+        assert next(iterator) == 0
+        iterator.close()
+
+        assert len(produced) <= 5
+        assert all(t.name != "ascii-guard-scan" for t in threading.enumerate())
+
+    def test_scan_files_pipeline(self, tmp_path: Path) -> None:
+        """Test prefetching scanned files from a directory walk."""
+        for i in range(20):
+            (tmp_path / f"file{i:02}.md").write_text(f"content {i}\n")
+
+        scanned = list(prefetch(scan_files([tmp_path]), maxsize=3))
+
+        assert len(scanned) == 20
+        assert {f.data for f in scanned} == {f"content {i}\n".encode() for i in range(20)}
+
+
 class TestScanDirectory:
     """Test directory scanning."""
 
@@ -0,0 +1,170 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for reusable linting sessions (Linter)."""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from ascii_guard import Linter, lint_paths, session
+from ascii_guard.cache import ResultCache
+from ascii_guard.linter import lint_text
+from ascii_guard.models import LintResult
+from ascii_guard.scanner import scan_paths
+from tests.conftest import BROKEN_BOX, GOOD_BOX, config
+
+
+@pytest.fixture
+def docs(docs: Path) -> Path:
+    """Give every file of the shared docs tree different content.
+
+    The document cache answers files with the same content without linting
+    them again, which would hide how many files a session lints.
+    """
+    for i, path in enumerate(sorted(docs.glob("*.md"))):
+        path.write_text(f"# File {i}\n\n{path.read_text()}")
+    return docs
+
+
+@pytest.fixture
+def linted(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Record every file the session actually lints."""
+    paths: list[str] = []
+    lint_file = session.lint_file
+
+    def recording(file_path: str, *args: Any, **kwargs: Any) -> LintResult:
+        paths.append(file_path)
+        return lint_file(file_path, *args, **kwargs)
+
+    monkeypatch.setattr(session, "lint_file", recording)
+    return paths
+
+
+class TestLint:
+    """Test linting and fixing paths in a session."""
+
+    def test_matches_lint_paths(self, docs: Path) -> None:
+        """Test that results equal those of lint_paths, for trees and single files."""
+        with Linter(config()) as linter:
+            results = list(linter.lint(docs, ordered=True))
+            single = list(linter.lint(docs / "file00.md"))
+
+        assert results == list(lint_paths(docs, config(), ordered=True))
+        assert len(results) == 12
+        assert single == [results[0]]
+
+    def test_state_is_reused(self, docs: Path, linted: list[str]) -> None:
+        """Test that repeated boxes are validated once and unchanged files not relinted."""
+        linter = Linter(config())
+
+        first = list(linter.lint(docs, ordered=True))
+        second = list(linter.lint(docs, ordered=True))
+
+        assert first == second
+        assert len(linted) == 12
+        assert linter.memo.misses == 2  # One broken and one good box
+        assert linter.memo.hits == 10
+
+    def test_fix(self, docs: Path) -> None:
+        """Test that fix writes the broken files once."""
+        linter = Linter(config())
+
+        fixed = [result for result in linter.fix([docs, docs]) if result.modified]
+
+        assert len(fixed) == 4
+        assert not any(result.has_errors for result in linter.lint(docs))
+
+    def test_executor(self, docs: Path) -> None:
+        """Test that an executor gives the same results and survives the session."""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            with Linter(config(), executor=executor, jobs=2) as linter:
+                results = list(linter.lint(docs, ordered=True))
+            assert executor.submit(int).result() == 0
+
+        assert results == list(lint_paths(docs, config(), ordered=True))
+
+    def test_scan(self, docs: Path) -> None:
+        """Test that scan yields the files a scan_paths call would."""
+        linter = Linter(config())
+
+        assert list(linter.scan(docs)) == scan_paths([docs], config())
+        assert list(linter.scan([docs])) == list(linter.scan(docs))
+
+
+class TestLintText:
+    """Test linting in-memory text in a session."""
+
+    def test_document_cache(self) -> None:
+        """Test that text seen before is answered from the cache under its new path."""
+        linter = Linter(config())
+
+        first = linter.lint_text(BROKEN_BOX * 3, "a.md")
+        second = linter.lint_text(BROKEN_BOX * 3, "b.md")
+
+        assert first == lint_text(BROKEN_BOX * 3, "a.md")
+        assert second == lint_text(BROKEN_BOX * 3, "b.md")
+        assert (linter.memo.hits, linter.memo.misses) == (2, 1)
+
+    def test_line_ranges(self) -> None:
+        """Test that only boxes in the given ranges are validated."""
+        linter = Linter(config())
+        text = GOOD_BOX + BROKEN_BOX
+
+        result = linter.lint_text(text, "a.md", line_ranges=[(0, 2)])
+
+        assert result.boxes_found == 2
+        assert not result.has_errors
+        assert linter.lint_text(text, "a.md").has_errors
+
+
+class TestLifecycle:
+    """Test caches on disk and closing the session."""
+
+    def test_persistent_caches(self, docs: Path, tmp_path: Path, linted: list[str]) -> None:
+        """Test that caches are loaded from and saved to the cache directory."""
+        cache_dir = tmp_path / "cache"
+        settings = config(cache=True, cache_dir=str(cache_dir))
+
+        with Linter(settings) as linter:
+            list(linter.lint(docs))
+        assert (cache_dir / ResultCache.FILE_NAME).exists()
+
+        with Linter(settings) as linter:
+            results = list(linter.lint(docs))
+        assert len(results) == 12
+        assert len(linted) == 12  # The second session linted nothing
+
+    def test_memory_only_by_default(self, docs: Path, linted: list[str]) -> None:
+        """Test that caches stay in memory when [performance] cache is off."""
+        with Linter(config()) as linter:
+            list(linter.lint(docs))
+            list(linter.lint(docs))
+
+        assert (linter.scan_cache.path, linter.result_cache.path) == (None, None)
+        assert len(linted) == 12
+
+    def test_closed(self, docs: Path) -> None:
+        """Test that a closed session refuses work and can be closed again."""
+        with Linter(config()) as linter:
+            linter.lint_text(BROKEN_BOX)
+
+        linter.close()
+        assert len(linter.memo) == 0
+        with pytest.raises(ValueError, match="closed"):
+            linter.lint(docs)
+        with pytest.raises(ValueError, match="closed"):
+            linter.lint_text(BROKEN_BOX)
@@ -0,0 +1,110 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for cold-start cost: which modules a cold start imports."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import ascii_guard
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+# Modules a run without config file, scan or worker pool must not import
+DEFERRED_MODULES = {
+    "tomllib",
+    "tomli",
+    "multiprocessing",
+    "concurrent.futures",
+    "subprocess",
+    "ascii_guard.bench",
+    "ascii_guard.cache",
+    "ascii_guard.parallel",
+    "ascii_guard.scanner",
+    "ascii_guard.vcs",
+    "ascii_guard.watch",
+}
+
+# Modules only needed once a command runs: --version and --help build the
+# parser and exit, so they must not import these either
+COMMAND_MODULES = {
+    "socket",
+    "ascii_guard.client",
+    "ascii_guard.detector",
+    "ascii_guard.fixer",
+    "ascii_guard.linter",
+    "ascii_guard.reporters",
+    "ascii_guard.stats",
+    "ascii_guard.validator",
+}
+
+
+def all_imports(tmp_path: Path, *args: str) -> set[str]:
+    """Return every module imported (at any depth) after interpreter startup."""
+    env = {**os.environ, "PYTHONPATH": str(SRC_DIR)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        env=env,
+        capture_output=True,
+        check=True,
+        text=True,
+        cwd=tmp_path,
+    )
+    lines = result.stderr.splitlines()
+    site = next(i for i, line in enumerate(lines) if line.endswith("| site"))
+    return {line.split("|")[2].strip() for line in lines[site + 1 :] if line.count("|") == 2}
+
+
+class TestLazyImports:
+    """Test that modules are only imported when used."""
+
+    def test_public_api_still_available(self) -> None:
+        """Test that every public name resolves and is listed by dir()."""
+        for name in ascii_guard.__all__:
+            assert getattr(ascii_guard, name) is not None
+            assert name in dir(ascii_guard)
+
+        from ascii_guard.linter import lint_file
+
+        assert ascii_guard.lint_file is lint_file
+
+    def test_unknown_attribute(self) -> None:
+        """Test that unknown names still raise AttributeError."""
+        with pytest.raises(AttributeError, match="no_such_name"):
+            _ = ascii_guard.no_such_name  # type: ignore[attr-defined]
+
+    def test_package_import_is_minimal(self, tmp_path: Path) -> None:
+        """Test that importing the package loads none of its modules."""
+        imported = all_imports(tmp_path, "-c", "import ascii_guard")
+        assert not {name for name in imported if name.startswith("ascii_guard.")}
+
+    def test_version_defers_heavy_modules(self, tmp_path: Path) -> None:
+        """Test that --version (no config file present) skips TOML, pools and git."""
+        imported = all_imports(tmp_path, "-m", "ascii_guard.cli", "--version")
+        assert not imported & DEFERRED_MODULES
+
+    @pytest.mark.parametrize("flag", ["--version", "--help"])
+    def test_parser_defers_command_modules(self, tmp_path: Path, flag: str) -> None:
+        """Test that --version and --help load only the config, defaults and models modules."""
+        imported = all_imports(tmp_path, "-m", "ascii_guard.cli", flag)
+        assert not imported & (DEFERRED_MODULES | COMMAND_MODULES)
+        assert {name for name in imported if name.startswith("ascii_guard.")} == {
+            "ascii_guard.config",
+            "ascii_guard.defaults",
+            "ascii_guard.models",
+        }
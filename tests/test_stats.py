@@ -0,0 +1,124 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for run instrumentation (--stats and --profile)."""
+
+import json
+import pstats
+import time
+from pathlib import Path
+
+from ascii_guard.linter import fix_file, lint_file
+from ascii_guard.stats import PHASES, PhaseTimer, RunStats, count_lines, profiled
+from tests.conftest import BROKEN_BOX
+
+
+class TestPhaseTimer:
+    """Test charging time to phases."""
+
+    def test_nested_phases_are_exclusive(self) -> None:
+        """Test that time in an inner phase is not charged to the outer one."""
+        timer = PhaseTimer()
+        with timer.phase("read"):
+            time.sleep(0.01)
+            with timer.phase("detect"):
+                time.sleep(0.05)
+
+        assert timer.wall["detect"] >= 0.05
+        assert 0.01 <= timer.wall["read"] < 0.05
+        assert set(timer.totals()) == {"read", "detect"}
+
+    def test_iterate_and_wrap(self) -> None:
+        """Test timing an iterator and a function nested inside it."""
+        timer = PhaseTimer()
+
+        def slow_read(n: int) -> int:
+            time.sleep(0.01)
+            return n
+
+        read = timer.wrap("read", slow_read)
+
+        assert list(timer.iterate("scan", (read(n) for n in range(3)))) == [0, 1, 2]
+        assert timer.wall["read"] >= 0.03
+        assert timer.wall["scan"] < timer.wall["read"]
+
+    def test_linter_phases(self, tmp_path: Path) -> None:
+        """Test that lint_file and fix_file charge their phases."""
+        path = tmp_path / "box.md"
+        path.write_text(BROKEN_BOX)
+
+        lint_timer = PhaseTimer()
+        lint_file(path, timer=lint_timer)
+        assert set(lint_timer.wall) == {"read", "detect", "validate"}
+
+        fix_timer = PhaseTimer()
+        fix_file(path, dry_run=True, timer=fix_timer)
+        assert set(fix_timer.wall) == {"read", "detect", "validate", "fix"}
+
+
+class TestRunStats:
+    """Test aggregating a run."""
+
+    def test_counts_and_throughput(self) -> None:
+        """Test file, line and box counts and the rates derived from them."""
+        stats = RunStats()
+        stats.add_file("a.md", b"one\ntwo\n", 2, {"detect": (0.5, 0.4)})
+        stats.add_file("b.md", b"last line", 1, {"detect": (0.25, 0.25)})
+        stats.add_file("c.md", None, 3, None)  # From the result cache
+        stats.wall = 2.0
+
+        assert (stats.files, stats.cached, stats.lines, stats.boxes) == (3, 1, 3, 6)
+        assert stats.phases["detect"].wall == 0.75
+        assert stats.files_per_second == 1.5
+        assert stats.boxes_per_second == 3.0
+        assert list(stats.phases) == list(PHASES)
+
+    def test_slowest_files(self) -> None:
+        """Test that only the top N files are kept, slowest first."""
+        stats = RunStats(top=2)
+        for i, seconds in enumerate([0.1, 0.5, 0.2, 0.4]):
+            stats.add_file(f"{i}.md", b"x\n", i, {"detect": (seconds, seconds)})
+
+        assert [entry.path for entry in stats.slowest] == ["1.md", "3.md"]
+        assert stats.slowest[0].boxes == 1
+
+    def test_to_dict_is_json(self) -> None:
+        """Test that the structured form serializes."""
+        stats = RunStats()
+        stats.add_file("a.md", b"x\n", 1, {"read": (0.1, 0.0)})
+        with stats.timer.phase("output"):
+            pass
+        stats.finish()
+
+        data = json.loads(json.dumps(stats.to_dict()))
+        assert data["files"] == 1
+        assert data["slowest"][0]["path"] == "a.md"
+        assert set(data["phases"]) == set(PHASES)
+        assert stats.wall > 0
+
+    def test_count_lines(self) -> None:
+        """Test that a last line without newline is counted."""
+        assert [count_lines(d) for d in (None, b"", b"a", b"a\n", b"a\nb")] == [0, 0, 1, 1, 2]
+
+
+class TestProfiled:
+    """Test cProfile output."""
+
+    def test_writes_pstats(self, tmp_path: Path) -> None:
+        """Test that profiled() writes a profile pstats can load."""
+        out = tmp_path / "run.pstats"
+        with profiled(out):
+            sum(range(1000))
+
+        assert pstats.Stats(str(out)).get_stats_profile().func_profiles
@@ -160,6 +160,33 @@ class TestStdlibOnly:
             "sys",
             "os",  # For directory walking
             "fnmatch",  # For pattern matching
+            "collections",  # For collections.abc type hints
+            "queue",  # For the bounded scan pipeline
+            "threading",  # For the background scan thread
+            "functools",  # For the compiled pattern cache
+            "contextlib",  # For best-effort cache cleanup
+            "hashlib",  # For cache keys
+            "json",  # For the on-disk cache format
+            "time",  # For cache timestamps
+            "tempfile",  # For atomic fix writes
+            "stat",  # For preserving file permissions
+            "math",  # For CPU quota rounding
+            "multiprocessing",  # For the worker process start method
+            "concurrent",  # For the worker pools (concurrent.futures)
+            "asyncio",  # For the asyncio API (ascii_guard.aio)
+            "abc",  # For the Reporter base class
+            "itertools",  # For grouping cached and uncached files
+            "subprocess",  # For git (--changed-since)
+            "re",  # For parsing diff hunk headers
+            "urllib",  # For SARIF artifact URIs
+            "io",  # For stdin content and captured daemon output
+            "socket",  # For the daemon's Unix socket
+            "signal",  # For stopping the daemon cleanly
+            "types",  # For signal handler type hints
+            "importlib",  # For the package's lazy public API
+            "heapq",  # For the slowest files in --stats
+            "bisect",  # For finding box bottoms in the detector
+            "tracemalloc",  # For --memstats
         }
 
         found_imports = set()
@@ -18,7 +18,7 @@ Verifies that ASCII box validation correctly identifies alignment issues.
 """
 
 from ascii_guard.models import Box
-from ascii_guard.validator import validate_box
+from ascii_guard.validator import ValidationMemo, validate_box
 
 
 class TestBoxValidation:
@@ -567,3 +567,44 @@ class TestValidatorEdgeCases:
         errors = validate_box(box)
         # Should detect left border missing (line too short)
         assert any("left border missing" in e.message.lower() for e in errors)
+
+
+class TestValidationMemo:
+    """Test reusing validation results of boxes seen before."""
+
+    @staticmethod
+    def broken_box(top_line: int, right_col: int = 5) -> Box:
+        """Return a box with a short bottom border starting at top_line."""
+        return Box(
+            top_line=top_line,
+            bottom_line=top_line + 2,
+            left_col=0,
+            right_col=right_col,
+            lines=["┌────┐", "│Test│", "└───┘"],
+            file_path="test.md",
+        )
+
+    def test_moved_box_is_not_validated_again(self) -> None:
+        """Test that a box seen at another line gets errors at its own lines."""
+        memo = ValidationMemo()
+
+        first = memo.validate(self.broken_box(0))
+        moved = memo.validate(self.broken_box(10))
+
+        assert first == validate_box(self.broken_box(0))
+        assert moved == validate_box(self.broken_box(10))
+        assert moved and moved[0].line == first[0].line + 10
+        assert (memo.hits, memo.misses) == (1, 1)
+
+    def test_least_recently_used_dropped(self) -> None:
+        """Test that the memo keeps at most max_size boxes."""
+        memo = ValidationMemo(max_size=2)
+
+        memo.validate(self.broken_box(0, right_col=5))
+        memo.validate(self.broken_box(0, right_col=6))
+        memo.validate(self.broken_box(0, right_col=5))
+        memo.validate(self.broken_box(0, right_col=7))
+        memo.validate(self.broken_box(0, right_col=5))
+
+        assert len(memo) == 2
+        assert (memo.hits, memo.misses) == (2, 3)
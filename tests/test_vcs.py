@@ -0,0 +1,229 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the git integration."""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from ascii_guard.vcs import (
+    GitError,
+    changed_files,
+    changed_lines,
+    parse_unified_diff,
+    repository_root,
+)
+
+needs_git = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def git(repo: Path, *args: str) -> None:
+    """Run a git command in repo with a fixed identity."""
+    subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    """Create a repository with a main branch and a feature branch."""
+    root = tmp_path / "repo"
+    root.mkdir()
+    git(root, "init", "-q", "-b", "main")
+    (root / ".gitignore").write_text("ignored.md\n")
+    (root / "unchanged.md").write_text("same\n")
+    (root / "edited.md").write_text("before\n")
+    (root / "deleted.md").write_text("gone soon\n")
+    git(root, "add", ".")
+    git(root, "commit", "-q", "-m", "initial")
+    git(root, "checkout", "-q", "-b", "feature")
+    return root.resolve()
+
+
+@needs_git
+class TestChangedFiles:
+    """Test changed file discovery."""
+
+    def test_committed_staged_and_untracked(self, repo: Path) -> None:
+        """Test that every kind of change is reported."""
+        (repo / "edited.md").write_text("after\n")
+        git(repo, "commit", "-q", "-am", "edit")
+        (repo / "staged.md").write_text("staged\n")
+        git(repo, "add", "staged.md")
+        (repo / "docs").mkdir()
+        (repo / "docs" / "new file.md").write_text("untracked\n")
+        (repo / "ignored.md").write_text("ignored\n")
+        (repo / "deleted.md").unlink()
+
+        assert changed_files("main", repo) == {
+            repo / "edited.md",
+            repo / "staged.md",
+            repo / "docs" / "new file.md",
+        }
+
+    def test_changes_on_ref_after_branch_point_excluded(self, repo: Path) -> None:
+        """Test that commits made on the ref after branching are not reported."""
+        git(repo, "checkout", "-q", "main")
+        (repo / "unchanged.md").write_text("changed on main\n")
+        git(repo, "commit", "-q", "-am", "main moves on")
+        git(repo, "checkout", "-q", "feature")
+
+        assert changed_files("main", repo) == set()
+
+    def test_works_from_subdirectory(self, repo: Path) -> None:
+        """Test that paths are absolute when called from a subdirectory."""
+        (repo / "sub").mkdir()
+        (repo / "sub" / "a.md").write_text("a\n")
+
+        assert repository_root(repo / "sub") == repo
+        assert changed_files("main", repo / "sub") == {repo / "sub" / "a.md"}
+
+    def test_unknown_ref(self, repo: Path) -> None:
+        """Test that an unknown ref raises GitError."""
+        with pytest.raises(GitError):
+            changed_files("no-such-branch", repo)
+
+    def test_not_a_repository(self, tmp_path: Path) -> None:
+        """Test that a directory outside any repository raises GitError."""
+        outside = tmp_path / "plain"
+        outside.mkdir()
+        (outside / ".git").write_text("not a repository\n")  # Stop discovery here
+
+        with pytest.raises(GitError):
+            changed_files("main", outside)
+
+
+class TestParseUnifiedDiff:
+    """Test mapping unified diffs to changed line ranges."""
+
+    def test_git_diff(self, tmp_path: Path) -> None:
+        """Test added, changed and deleted hunks in git format."""
+        diff = """diff --git a/docs/a.md b/docs/a.md
+index 1111111..2222222 100644
+--- a/docs/a.md
++++ b/docs/a.md
+@@ -3 +3 @@ Title
+-old
++new
+@@ -10,0 +11,2 @@ Section
++added 1
++added 2
+@@ -20,3 +21,0 @@
+-gone 1
+-gone 2
+-gone 3
+diff --git a/old.md b/old.md
+deleted file mode 100644
+--- a/old.md
++++ /dev/null
+@@ -1 +0,0 @@
+-bye
+diff --git a/new.md b/new.md
+new file mode 100644
+--- /dev/null
++++ b/new.md
+@@ -0,0 +1,3 @@
++one
++two
++three
+"""
+        assert parse_unified_diff(diff, tmp_path) == {
+            tmp_path / "docs" / "a.md": [(2, 2), (10, 11), (20, 21)],
+            tmp_path / "new.md": [(0, 2)],
+        }
+
+    def test_header_lookalikes_in_hunk_body(self, tmp_path: Path) -> None:
+        """Test that removed '-- x' and added '++ y' lines are not headers."""
+        diff = """--- a/doc.md
++++ b/doc.md
+@@ -1,2 +1,2 @@
+--- removed line that starts with two dashes
++++ added line that starts with two pluses
+ context
+@@ -9 +9 @@
+-x
++y
+"""
+        assert parse_unified_diff(diff, tmp_path) == {tmp_path / "doc.md": [(0, 1), (8, 8)]}
+
+    def test_line_separators_in_content(self, tmp_path: Path) -> None:
+        """Test that only newlines end diff lines, not e.g. U+2028 or form feeds."""
+        diff = (
+            "--- a/x.md\r\n"
+            "+++ b/x.md\r\n"
+            "@@ -1,2 +1,2 @@\n"
+            " context\u2028with a line separator\x0c\n"
+            "--- old rule\n"
+            "+++ new rule\n"
+            "@@ -20 +20 @@\n"
+            "-a\x85\n"
+            "+b\n"
+        )
+        assert parse_unified_diff(diff, tmp_path) == {tmp_path / "x.md": [(0, 1), (19, 19)]}
+
+    def test_plain_diff_without_prefixes(self, tmp_path: Path) -> None:
+        """Test diff -u output with timestamps and no a/ b/ prefixes."""
+        diff = """--- docs/a.md\t2025-01-01 00:00:00
++++ docs/a.md\t2025-01-02 00:00:00
+@@ -1,3 +1,4 @@
+ one
++inserted
+ two
+ three
+\\ No newline at end of file
+"""
+        assert parse_unified_diff(diff, tmp_path) == {tmp_path / "docs" / "a.md": [(0, 3)]}
+
+    def test_quoted_names(self, tmp_path: Path) -> None:
+        """Test git's C-quoted file names."""
+        diff = """--- "a/na\\303\\257ve.md"
++++ "b/na\\303\\257ve.md"
+@@ -1 +1 @@
+-a
++b
+"""
+        assert parse_unified_diff(diff, tmp_path) == {tmp_path / "naïve.md": [(0, 0)]}
+
+
+@needs_git
+class TestChangedLines:
+    """Test changed line discovery with git."""
+
+    def test_hunks_and_untracked(self, repo: Path) -> None:
+        """Test that edits map to hunks and untracked files to None."""
+        (repo / "edited.md").write_text("before\nmore\n")
+        (repo / "untracked.md").write_text("new\n")
+
+        assert changed_lines("main", repo) == {
+            repo / "edited.md": [(1, 1)],
+            repo / "untracked.md": None,
+        }
+
+    @pytest.mark.parametrize(
+        "setting", ["diff.mnemonicPrefix=true", "diff.noprefix=true", "diff.srcPrefix=x/"]
+    )
+    def test_prefix_config_ignored(self, repo: Path, setting: str) -> None:
+        """Test that path prefix settings in the user's git config do not move paths."""
+        key, value = setting.split("=")
+        git(repo, "config", key, value)
+        (repo / "edited.md").write_text("before\nmore\n")
+
+        assert changed_lines("main", repo) == {repo / "edited.md": [(1, 1)]}
+        assert changed_files("main", repo) == {repo / "edited.md"}
@@ -0,0 +1,113 @@
+# Copyright 2025 Oliver Ratzesberger
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for watch mode change detection."""
+
+import os
+from pathlib import Path
+
+from ascii_guard.models import ValidationError
+from ascii_guard.watch import MAX_INTERVAL, MIN_INTERVAL, FileWatcher, compare_issues
+
+
+def touch(path: Path, text: str) -> None:
+    """Rewrite a file and move its mtime forward, whatever the timestamp resolution."""
+    mtime = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(text)
+    os.utime(path, ns=(mtime + 1_000_000_000, mtime + 1_000_000_000))
+
+
+class TestFileWatcher:
+    """Test polling for changes."""
+
+    def test_modified_and_deleted_files(self, tmp_path: Path) -> None:
+        """Test that each changed file is reported once."""
+        a, b = tmp_path / "a.md", tmp_path / "b.md"
+        a.write_text("a")
+        b.write_text("b")
+        watcher = FileWatcher([a, b])
+
+        assert not watcher.poll()
+        touch(a, "changed")
+        assert watcher.poll().files == [a]
+        assert not watcher.poll()
+
+        b.unlink()
+        assert b in watcher.poll().files
+
+    def test_new_file_requests_rescan(self, tmp_path: Path) -> None:
+        """Test that a file added next to a watched one triggers a rescan."""
+        (tmp_path / "a.md").write_text("a")
+        watcher = FileWatcher([tmp_path / "a.md"])
+        directory_mtime = tmp_path.stat().st_mtime_ns
+
+        (tmp_path / "new.md").write_text("new")
+        os.utime(tmp_path, ns=(directory_mtime + 10**9, directory_mtime + 10**9))
+
+        changes = watcher.poll()
+        assert changes.rescan
+        assert changes.files == []
+
+    def test_trigger_files(self, tmp_path: Path) -> None:
+        """Test that a changed trigger (e.g. a config file) requests a rescan."""
+        config = tmp_path / ".ascii-guard.toml"
+        config.write_text("")
+        watcher = FileWatcher([], [config])
+
+        touch(config, "[files]\n")
+        assert watcher.poll().rescan
+
+    def test_adaptive_interval(self) -> None:
+        """Test that the interval backs off while idle and resets on change."""
+        watcher = FileWatcher()
+        intervals = [watcher.next_interval(changed=False) for _ in range(20)]
+
+        assert intervals == sorted(intervals)
+        assert intervals[-1] == MAX_INTERVAL
+        assert watcher.next_interval(changed=True) == MIN_INTERVAL
+
+    def test_interval_covers_poll_cost(self, tmp_path: Path) -> None:
+        """Test that slow polls stretch the interval so polling stays cheap."""
+        watcher = FileWatcher([tmp_path / f"missing-{i}.md" for i in range(2000)])
+        watcher.poll()
+        watcher._cost = 1.0  # Simulate a poll that took a second
+
+        assert watcher.next_interval(changed=True) >= 50
+
+
+class TestCompareIssues:
+    """Test the difference between two lint results."""
+
+    def test_introduced_and_resolved(self) -> None:
+        """Test that only issues that differ are reported."""
+        kept = ValidationError(line=1, column=0, message="kept", severity="error")
+        gone = ValidationError(line=2, column=3, message="gone", severity="error")
+        new = ValidationError(line=4, column=3, message="new", severity="warning")
+
+        assert compare_issues([kept, gone], [kept, new]) == ([new], [gone])
+
+    def test_moved_issue_is_unchanged(self) -> None:
+        """Test that an issue on a box that moved down is neither new nor resolved."""
+        before = ValidationError(line=1, column=5, message="misaligned", severity="error")
+        after = ValidationError(line=9, column=5, message="misaligned", severity="error")
+
+        assert compare_issues([before], [after]) == ([], [])
+
+    def test_duplicates_are_counted(self) -> None:
+        """Test that a second identical issue counts as introduced."""
+        issue = ValidationError(line=1, column=5, message="misaligned", severity="error")
+
+        introduced, resolved = compare_issues([issue], [issue, issue])
+        assert len(introduced) == 1
+        assert resolved == []